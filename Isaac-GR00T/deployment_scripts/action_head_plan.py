@@ -0,0 +1,274 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+
+import torch
+from transformers.feature_extraction_utils import BatchFeature
+
+# Execution plans kept per action head, one per (backbone features, state) shape
+MAX_EXECUTION_PLANS = 8
+
+
+def _meta_dtype(meta, name):
+    for item in meta:
+        if item[0] == name:
+            return item[2]
+    raise KeyError(f"Unknown tensor {name}")
+
+
+class ActionHeadExecutionPlan:
+    """
+    Shape-stable execution of the action head engines (TensorRT engines or ONNX Runtime sessions).
+
+    For given backbone features and state shapes, the plan preallocates every intermediate buffer
+    at a fixed address, prepares each engine run on them once (input shapes and bindings), and
+    precomputes the per-step timestep tensors, the positional embeddings and the future tokens. A
+    call then only copies the inputs in and replays the denoising loop: each step runs the prepared
+    engines, adds the positional embeddings in place and integrates the actions in place.
+
+    Args:
+        action_head: The action head, with the engines set by `setup_tensorrt_engines` or
+            `setup_onnxruntime_sessions`
+        backbone_features_shape: Shape of the backbone features (batch, sequence length, dim)
+        state_shape: Shape of the state (batch, state horizon, state dim)
+    """
+
+    def __init__(self, action_head, backbone_features_shape, state_shape):
+        config = action_head.config
+        batch_size, state_horizon, _ = state_shape
+        assert (
+            backbone_features_shape[0] == batch_size
+        ), f"Batch size mismatch: {backbone_features_shape[0]} != {batch_size}"
+        self.batch_size = batch_size
+        self.num_steps = action_head.num_inference_timesteps
+        self.dt = 1.0 / self.num_steps
+        self.action_horizon = config.action_horizon
+        self.device = action_head.DiT_engine.device
+
+        vlln_engine = action_head.vlln_vl_self_attention_engine
+        state_encoder_engine = action_head.state_encoder_engine
+        action_encoder_engine = action_head.action_encoder_engine
+        dit_engine = action_head.DiT_engine
+        action_decoder_engine = action_head.action_decoder_engine
+
+        def empty(shape, engine, name, output=False):
+            dtype = _meta_dtype(engine.out_meta if output else engine.in_meta, name)
+            return torch.empty(shape, dtype=dtype, device=self.device)
+
+        # Inputs, copied in at each call
+        self.backbone_features = empty(backbone_features_shape, vlln_engine, "backbone_features")
+        self.state = empty(state_shape, state_encoder_engine, "state")
+        self.embodiment_id = empty((batch_size,), state_encoder_engine, "embodiment_id")
+        self.actions = empty(
+            (batch_size, config.action_horizon, config.action_dim), action_encoder_engine, "actions"
+        )
+
+        # Intermediate buffers
+        num_future_tokens = config.num_target_vision_tokens
+        self.vl_embs = empty(backbone_features_shape, vlln_engine, "output", output=True)
+        self.state_features = empty(
+            (batch_size, state_horizon, config.input_embedding_dim),
+            state_encoder_engine,
+            "output",
+            output=True,
+        )
+        self.action_features = empty(
+            (batch_size, config.action_horizon, config.input_embedding_dim),
+            action_encoder_engine,
+            "output",
+            output=True,
+        )
+        sa_len = state_horizon + num_future_tokens + config.action_horizon
+        self.sa_embs = empty(
+            (batch_size, sa_len, config.input_embedding_dim), dit_engine, "sa_embs"
+        )
+        self.model_output = empty(
+            (batch_size, sa_len, config.hidden_size), dit_engine, "output", output=True
+        )
+        self.pred = empty(
+            (batch_size, sa_len, config.action_dim), action_decoder_engine, "output", output=True
+        )
+        self.pred_velocity = self.pred[:, -self.action_horizon :]
+
+        # Engine inputs that are the outputs of other engines share their buffers, unless their
+        # dtypes differ (e.g. mixed precision engines)
+        self.dit_vl_embs = self._input_like(self.vl_embs, dit_engine, "vl_embs")
+        self.decoder_model_output = self._input_like(
+            self.model_output, action_decoder_engine, "model_output"
+        )
+        self.decoder_embodiment_id = self._input_like(
+            self.embodiment_id, action_decoder_engine, "embodiment_id"
+        )
+        self.action_encoder_embodiment_id = self._input_like(
+            self.embodiment_id, action_encoder_engine, "embodiment_id"
+        )
+
+        # Constant parts of the state-action embeddings
+        self.sa_state = self.sa_embs[:, :state_horizon]
+        self.sa_actions = self.sa_embs[:, state_horizon + num_future_tokens :]
+        with torch.no_grad():
+            future_tokens = action_head.future_tokens.weight.to(self.device, self.sa_embs.dtype)
+            self.sa_embs[:, state_horizon : state_horizon + num_future_tokens] = future_tokens
+            self.pos_embs = None
+            if config.add_pos_embed:
+                pos_ids = torch.arange(
+                    config.action_horizon,
+                    dtype=torch.long,
+                    device=action_head.position_embedding.weight.device,
+                )
+                self.pos_embs = (
+                    action_head.position_embedding(pos_ids)
+                    .unsqueeze(0)
+                    .to(self.device, self.sa_embs.dtype)
+                )
+
+        # Per-step timesteps, e.g. 0, 1/N, 2/N, ... discretized in the timestep buckets
+        self.timesteps = []
+        for t in range(self.num_steps):
+            t_discretized = int(t / float(self.num_steps) * action_head.num_timestep_buckets)
+            self.timesteps.append(
+                torch.full(
+                    (batch_size,),
+                    t_discretized,
+                    dtype=_meta_dtype(action_encoder_engine.in_meta, "timesteps_tensor"),
+                    device=self.device,
+                )
+            )
+
+        # Prepared engine runs
+        self.run_vlln = vlln_engine.prepare(
+            {"backbone_features": self.backbone_features}, {"output": self.vl_embs}
+        )
+        self.run_state_encoder = state_encoder_engine.prepare(
+            {"state": self.state, "embodiment_id": self.embodiment_id},
+            {"output": self.state_features},
+        )
+        self.run_action_encoder = []
+        self.run_dit = []
+        for timesteps in self.timesteps:
+            self.run_action_encoder.append(
+                action_encoder_engine.prepare(
+                    {
+                        "actions": self.actions,
+                        "timesteps_tensor": timesteps,
+                        "embodiment_id": self.action_encoder_embodiment_id,
+                    },
+                    {"output": self.action_features},
+                )
+            )
+            self.run_dit.append(
+                dit_engine.prepare(
+                    {
+                        "sa_embs": self.sa_embs,
+                        "vl_embs": self.dit_vl_embs,
+                        "timesteps_tensor": timesteps.to(
+                            _meta_dtype(dit_engine.in_meta, "timesteps_tensor")
+                        ),
+                    },
+                    {"output": self.model_output},
+                )
+            )
+        self.run_action_decoder = action_decoder_engine.prepare(
+            {
+                "model_output": self.decoder_model_output,
+                "embodiment_id": self.decoder_embodiment_id,
+            },
+            {"output": self.pred},
+        )
+
+    def _input_like(self, tensor, engine, name):
+        dtype = _meta_dtype(engine.in_meta, name)
+        if tensor.dtype == dtype:
+            return tensor
+        return torch.empty(tensor.shape, dtype=dtype, device=self.device)
+
+    @staticmethod
+    def _sync(src, dst):
+        if dst is not src:
+            dst.copy_(src)
+
+    @torch.no_grad()
+    def __call__(self, backbone_features, state, embodiment_id, init_actions=None):
+        """
+        Run the action head.
+
+        Args:
+            backbone_features: The backbone features, of the plan shape
+            state: The state, of the plan shape
+            embodiment_id: The embodiment id of each batch item
+            init_actions: The initial actions (the noise), broadcast to the batch. Sampled when
+                None.
+
+        Returns:
+            The predicted actions (batch, action horizon, action dim).
+        """
+        self.backbone_features.copy_(backbone_features)
+        self.state.copy_(state)
+        self.embodiment_id.copy_(embodiment_id)
+        self._sync(self.embodiment_id, self.action_encoder_embodiment_id)
+        self._sync(self.embodiment_id, self.decoder_embodiment_id)
+        if init_actions is not None:
+            self.actions.copy_(init_actions.expand(self.actions.shape))
+        else:
+            torch.randn(self.actions.shape, out=self.actions)
+
+        self.run_vlln()
+        self._sync(self.vl_embs, self.dit_vl_embs)
+        self.run_state_encoder()
+        self.sa_state.copy_(self.state_features)
+
+        for step in range(self.num_steps):
+            self.run_action_encoder[step]()
+            if self.pos_embs is not None:
+                torch.add(self.action_features, self.pos_embs, out=self.sa_actions)
+            else:
+                self.sa_actions.copy_(self.action_features)
+            self.run_dit[step]()
+            self._sync(self.model_output, self.decoder_model_output)
+            self.run_action_decoder()
+            # Update actions using euler integration.
+            self.actions.add_(self.pred_velocity, alpha=self.dt)
+
+        return self.actions.clone()
+
+
+def action_head_plan_forward(self, backbone_output, action_input, denoising=None):
+    """
+    `action_head_tensorrt_forward` on an execution plan, created on the first call with new
+    backbone features or state shapes, or a new number of denoising steps, and replayed afterwards.
+    """
+    assert (
+        denoising is None
+    ), "The engines run the exported uniform Euler steps, denoising cannot be set"
+    backbone_features = backbone_output.backbone_features
+    state = action_input.state
+    # the plan fixes the number of denoising steps when it is built
+    key = (tuple(backbone_features.shape), tuple(state.shape), self.num_inference_timesteps)
+    if not hasattr(self, "execution_plans"):
+        self.execution_plans = OrderedDict()
+    plan = self.execution_plans.get(key)
+    if plan is None:
+        plan = ActionHeadExecutionPlan(self, backbone_features.shape, state.shape)
+        self.execution_plans[key] = plan
+        if len(self.execution_plans) > MAX_EXECUTION_PLANS:
+            self.execution_plans.popitem(last=False)
+    else:
+        self.execution_plans.move_to_end(key)
+
+    # This attribute is used to ensure the same actions is used for both PyTorch and TensorRT inference
+    init_actions = self.init_actions if hasattr(self, "init_actions") else None
+    actions = plan(backbone_features, state, action_input.embodiment_id, init_actions)
+    return BatchFeature(data={"action_pred": actions})
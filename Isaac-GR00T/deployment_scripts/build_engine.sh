@@ -40,6 +40,10 @@ VIT_DTYPE=${VIT_DTYPE:-fp8}     # Options: fp16, fp8
 LLM_DTYPE=${LLM_DTYPE:-nvfp4}   # Options: fp16, nvfp4, nvfp4_full, fp8
 DIT_DTYPE=${DIT_DTYPE:-fp8}     # Options: fp16, fp8
 
+# Fused action head (export_onnx.py --fused-action-head), built for DENOISING_STEPS steps
+FUSED_ACTION_HEAD=${FUSED_ACTION_HEAD:-0}   # Options: 0 (default), 1
+DENOISING_STEPS=${DENOISING_STEPS:-4}
+
 # Define max batch size (default 8, will be overridden for nvfp4 LLM variants)
 MAX_BATCH=${MAX_BATCH:-8}
 
@@ -80,6 +84,13 @@ trtexec --useCudaGraph --verbose --stronglyTyped --separateProfileRun --noDataTr
 echo "------------Building Action Decoder--------------------"
 trtexec --useCudaGraph --verbose --stronglyTyped --separateProfileRun --noDataTransfers --onnx=gr00t_onnx/action_head/action_decoder.onnx --saveEngine=gr00t_engine/action_decoder.engine --minShapes=model_output:1x49x1024,embodiment_id:1  --optShapes=model_output:1x49x1024,embodiment_id:1  --maxShapes=model_output:${MAX_BATCH}x49x1024,embodiment_id:${MAX_BATCH} > gr00t_engine/action_decoder.log 2>&1
 
+# Fused Action Head
+if [ "$FUSED_ACTION_HEAD" = "1" ]; then
+    echo "------------Building Fused Action Head (${DIT_DTYPE}, ${DENOISING_STEPS} steps)--------------------"
+    FUSED_NAME=action_head_fused_${DIT_DTYPE}_steps${DENOISING_STEPS}
+    trtexec --useCudaGraph --verbose --stronglyTyped --separateProfileRun --noDataTransfers --onnx=gr00t_onnx/action_head/${FUSED_NAME}.onnx --saveEngine=gr00t_engine/${FUSED_NAME}.engine --minShapes=backbone_features:1x${MIN_LEN}x2048,state:1x1x64,embodiment_id:1,init_actions:1x16x32 --optShapes=backbone_features:1x${OPT_LEN}x2048,state:1x1x64,embodiment_id:1,init_actions:1x16x32 --maxShapes=backbone_features:${MAX_BATCH}x${MAX_LEN}x2048,state:${MAX_BATCH}x1x64,embodiment_id:${MAX_BATCH},init_actions:${MAX_BATCH}x16x32 > gr00t_engine/${FUSED_NAME}.log 2>&1
+fi
+
 # VLM-ViT
 echo "------------Building VLM-ViT (${VIT_DTYPE})--------------------"
 trtexec --useCudaGraph --verbose --stronglyTyped --separateProfileRun --noDataTransfers --onnx=gr00t_onnx/eagle2/vit_${VIT_DTYPE}.onnx  --saveEngine=gr00t_engine/vit_${VIT_DTYPE}.engine --minShapes=pixel_values:1x3x224x224,position_ids:1x256 --optShapes=pixel_values:${VIDEO_VIEWS}x3x224x224,position_ids:${VIDEO_VIEWS}x256 --maxShapes=pixel_values:${MAX_BATCH}x3x224x224,position_ids:${MAX_BATCH}x256  > gr00t_engine/vit_${VIT_DTYPE}.log 2>&1
@@ -19,7 +19,6 @@ import os
 import time
 from typing import Dict, Optional
 
-import modelopt.torch.quantization as mtq
 import numpy as np
 import torch
 import torch.utils.checkpoint as cp
@@ -37,6 +36,12 @@ from gr00t.experiment.data_config import load_data_config
 from gr00t.model.backbone.eagle_backbone import DEFAULT_EAGLE_PATH, EagleBackbone
 from gr00t.model.policy import Gr00tPolicy, unsqueeze_dict_values
 
+try:
+    import modelopt.torch.quantization as mtq
+except ImportError:
+    # only needed to quantize, the fp16 graphs export without it
+    mtq = None
+
 
 def no_batch_collate_fn(batch):
     """Collate function that returns the first item without adding batch dimension."""
@@ -1242,6 +1247,107 @@ class VLLN_VLSelfAttention(torch.nn.Module):
         return x
 
 
+class FusedActionHead(torch.nn.Module):
+    """
+    `FlowmatchingActionHead.get_action` as a single module, for a fixed number of denoising steps.
+
+    The module runs the backbone features processing, the state encoding and the denoising loop,
+    which is unrolled when exported, so that the runtime can fuse and schedule across the step
+    boundaries without returning to Python at each step. The initial actions (the noise) are an
+    input, the graph is deterministic.
+    """
+
+    def __init__(self, action_head, denoising_steps):
+        super().__init__()
+        self.vlln = action_head.vlln
+        self.vl_self_attention = action_head.vl_self_attention
+        self.state_encoder = action_head.state_encoder
+        self.action_encoder = action_head.action_encoder
+        self.model = action_head.model
+        self.action_decoder = action_head.action_decoder
+        self.position_embedding = action_head.position_embedding
+        self.future_tokens = action_head.future_tokens
+        self.add_pos_embed = action_head.config.add_pos_embed
+        self.action_horizon = action_head.config.action_horizon
+        self.num_timestep_buckets = action_head.num_timestep_buckets
+        self.denoising_steps = denoising_steps
+
+    def forward(self, backbone_features, state, embodiment_id, init_actions):
+        vl_embs = self.vl_self_attention(self.vlln(backbone_features))
+        state_features = self.state_encoder(state, embodiment_id)
+        future_tokens = self.future_tokens.weight.unsqueeze(0).expand(vl_embs.shape[0], -1, -1)
+        future_tokens = future_tokens.to(state_features.dtype)
+        if self.add_pos_embed:
+            pos_ids = torch.arange(self.action_horizon, dtype=torch.long, device=vl_embs.device)
+            pos_embs = self.position_embedding(pos_ids).unsqueeze(0)
+
+        actions = init_actions
+        dt = 1.0 / self.denoising_steps
+        for t in range(self.denoising_steps):
+            t_cont = t / float(self.denoising_steps)  # e.g. goes 0, 1/N, 2/N, ...
+            t_discretized = int(t_cont * self.num_timestep_buckets)
+            timesteps_tensor = torch.full_like(embodiment_id, t_discretized)
+
+            action_features = self.action_encoder(actions, timesteps_tensor, embodiment_id)
+            if self.add_pos_embed:
+                action_features = action_features + pos_embs.to(action_features.dtype)
+            sa_embs = torch.cat((state_features, future_tokens, action_features), dim=1)
+            model_output = self.model(
+                hidden_states=sa_embs,
+                encoder_hidden_states=vl_embs,
+                timestep=timesteps_tensor,
+            )
+            pred = self.action_decoder(model_output, embodiment_id)
+            pred_velocity = pred[:, -self.action_horizon :]
+
+            # Update actions using euler integration.
+            actions = actions + dt * pred_velocity
+        return actions
+
+
+def export_fused_action_head(action_head, onnx_path, backbone_features, state, denoising_steps=4):
+    """
+    Export the whole action head to a single ONNX graph, see `FusedActionHead`.
+
+    The graph has the inputs "backbone_features", "state", "embodiment_id" and "init_actions" and
+    the output "actions", with a dynamic batch size and backbone sequence length.
+
+    Args:
+        action_head: FlowmatchingActionHead instance
+        onnx_path: Path to save the ONNX graph
+        backbone_features: Example backbone features, their dtype and device are the graph ones
+        state: Example state tensor
+        denoising_steps: Number of denoising steps unrolled in the graph
+    """
+    fused_action_head = FusedActionHead(action_head, denoising_steps).eval()
+    batch_size = backbone_features.shape[0]
+    embodiment_id = torch.ones((batch_size,), dtype=torch.int64, device=backbone_features.device)
+    init_actions = torch.randn(
+        (batch_size, action_head.config.action_horizon, action_head.config.action_dim),
+        dtype=backbone_features.dtype,
+        device=backbone_features.device,
+    )
+
+    with torch.no_grad():
+        torch.onnx.export(
+            fused_action_head,
+            (backbone_features, state, embodiment_id, init_actions),
+            onnx_path,
+            export_params=True,
+            do_constant_folding=True,
+            input_names=["backbone_features", "state", "embodiment_id", "init_actions"],
+            output_names=["actions"],
+            dynamic_axes={
+                "backbone_features": {0: "batch_size", 1: "sequence_length"},
+                "state": {0: "batch_size"},
+                "embodiment_id": {0: "batch_size"},
+                "init_actions": {0: "batch_size"},
+                "actions": {0: "batch_size"},
+            },
+        )
+    print(f"Fused action head ONNX exported to {onnx_path}")
+
+
 def export_action_head(
     policy,
     ONNX_export_path,
@@ -1256,6 +1362,7 @@ def export_action_head(
     data_config="fourier_gr1_arms_only",
     model_path="nvidia/GR00T-N1.5-3B",
     video_backend="decord",
+    fused_action_head=False,
 ):
     """
     Export the action head models to ONNX format with optional DiT quantization.
@@ -1270,6 +1377,9 @@ def export_action_head(
         modality_configs: Modality configuration
         embodiment_tag: Embodiment tag
         calib_size: Number of calibration samples
+        denoising_steps: Number of denoising steps, unrolled in the fused action head graph
+        fused_action_head: Also export the whole action head to a single graph,
+            "action_head_fused_{dit_dtype}_steps{denoising_steps}.onnx"
     """
     process_backbone_model = (
         VLLN_VLSelfAttention(
@@ -1431,6 +1541,18 @@ def export_action_head(
         },
     )
 
+    if fused_action_head:
+        export_fused_action_head(
+            policy.model.action_head,
+            os.path.join(
+                ONNX_export_path,
+                f"action_head/action_head_fused_{dit_dtype}_steps{denoising_steps}.onnx",
+            ),
+            backbone_features,
+            state_tensor,
+            denoising_steps=denoising_steps,
+        )
+
 
 def run_groot_inference(
     dataset_path: str,
@@ -1447,6 +1569,7 @@ def run_groot_inference(
     calib_size: int = 10,
     video_backend: str = "decord",
     full_layer_quant: bool = False,
+    fused_action_head: bool = False,
 ) -> Dict[str, float]:
 
     # load the policy
@@ -1528,6 +1651,7 @@ def run_groot_inference(
         data_config=data_config,
         model_path=model_path,
         video_backend=video_backend,
+        fused_action_head=fused_action_head,
     )
 
     return predicted_action
@@ -1629,6 +1753,12 @@ if __name__ == "__main__":
         help="Enable full layer nvfp4 quantization for LLM (default: False, which disables down_proj and o_proj layers)",
     )
 
+    parser.add_argument(
+        "--fused-action-head",
+        action="store_true",
+        help="Also export the whole action head, with the denoising steps unrolled, to a single graph",
+    )
+
     args = parser.parse_args()
 
     print(f"Dataset path: {args.dataset_path}")
@@ -1644,6 +1774,7 @@ if __name__ == "__main__":
     print(f"Calibration dataset path: {args.calib_dataset_path or args.dataset_path}")
     print(f"Calibration size: {args.calib_size}")
     print(f"Full layer quantization: {args.full_layer_quant}")
+    print(f"Fused action head: {args.fused_action_head}")
 
     predicted_action = run_groot_inference(
         args.dataset_path,
@@ -1659,6 +1790,7 @@ if __name__ == "__main__":
         calib_size=args.calib_size,
         video_backend=args.video_backend,
         full_layer_quant=args.full_layer_quant,
+        fused_action_head=args.fused_action_head,
     )
 
     for key, value in predicted_action.items():
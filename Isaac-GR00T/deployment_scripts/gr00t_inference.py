@@ -18,36 +18,49 @@ import os
 from functools import partial
 
 import torch
-from action_head_utils import action_head_pytorch_forward
-from trt_model_forward import setup_tensorrt_engines
 
 import gr00t
+from deployment_scripts.action_head_utils import action_head_pytorch_forward
 from gr00t.data.dataset import LeRobotSingleDataset
 from gr00t.model.policy import Gr00tPolicy
 
 
-def compare_predictions(pred_tensorrt, pred_torch):
+def compare_predictions(
+    pred_tensorrt,
+    pred_torch,
+    min_cosine_similarity=None,
+    max_l1_mean_distance=None,
+    backend="TensorRT",
+):
     """
-    Compare the similarity between TensorRT and PyTorch predictions
+    Compare the similarity between TensorRT (or ONNX Runtime) and PyTorch predictions
 
     Args:
         pred_tensorrt: TensorRT prediction results (numpy array)
         pred_torch: PyTorch prediction results (numpy array)
+        min_cosine_similarity: If set, the minimum cosine similarity of each key, checked after printing
+        max_l1_mean_distance: If set, the maximum mean L1 distance of each key, checked after printing
+        backend: Name of the compared backend, for display
+
+    Returns:
+        The cosine similarity and L1 mean/max distance of each key.
     """
     print("\n=== Prediction Comparison ===")
 
     # Ensure both predictions contain the same keys
     assert pred_tensorrt.keys() == pred_torch.keys(), "Prediction keys do not match"
 
+    labels = {
+        "cos_sim": f"Cosine Similarity (PyTorch/{backend}):",
+        "l1": f"L1 Mean/Max Distance (PyTorch/{backend}):",
+        "max": f"Max Output Values (PyTorch/{backend}):",
+        "mean": f"Mean Output Values (PyTorch/{backend}):",
+        "min": f"Min Output Values (PyTorch/{backend}):",
+    }
     # Calculate max label width for alignment
-    max_label_width = max(
-        len("Cosine Similarity (PyTorch/TensorRT):"),
-        len("L1 Mean/Max Distance (PyTorch/TensorRT):"),
-        len("Max Output Values (PyTorch/TensorRT):"),
-        len("Mean Output Values (PyTorch/TensorRT):"),
-        len("Min Output Values (PyTorch/TensorRT):"),
-    )
+    max_label_width = max(len(label) for label in labels.values())
 
+    metrics = {}
     for key in pred_tensorrt.keys():
         tensorrt_array = pred_tensorrt[key]
         torch_array = pred_torch[key]
@@ -73,22 +86,38 @@ def compare_predictions(pred_tensorrt, pred_torch):
 
         # Calculate L1 distance
         l1_dist = torch.abs(flat_tensorrt - flat_torch)
+        metrics[key] = {
+            "cosine_similarity": cos_sim.item(),
+            "l1_mean_distance": l1_dist.mean().item(),
+            "l1_max_distance": l1_dist.max().item(),
+        }
 
         print(f"\n{key}:")
-        print(f'{"Cosine Similarity (PyTorch/TensorRT):".ljust(max_label_width)} {cos_sim.item()}')
+        print(f'{labels["cos_sim"].ljust(max_label_width)} {cos_sim.item()}')
         print(
-            f'{"L1 Mean/Max Distance (PyTorch/TensorRT):".ljust(max_label_width)} {l1_dist.mean().item():.4f}/{l1_dist.max().item():.4f}'
+            f'{labels["l1"].ljust(max_label_width)} {l1_dist.mean().item():.4f}/{l1_dist.max().item():.4f}'
         )
         print(
-            f'{"Max Output Values (PyTorch/TensorRT):".ljust(max_label_width)} {torch_tensor.max().item():.4f}/{tensorrt_tensor.max().item():.4f}'
+            f'{labels["max"].ljust(max_label_width)} {torch_tensor.max().item():.4f}/{tensorrt_tensor.max().item():.4f}'
         )
         print(
-            f'{"Mean Output Values (PyTorch/TensorRT):".ljust(max_label_width)} {torch_tensor.mean().item():.4f}/{tensorrt_tensor.mean().item():.4f}'
+            f'{labels["mean"].ljust(max_label_width)} {torch_tensor.mean().item():.4f}/{tensorrt_tensor.mean().item():.4f}'
         )
         print(
-            f'{"Min Output Values (PyTorch/TensorRT):".ljust(max_label_width)} {torch_tensor.min().item():.4f}/{tensorrt_tensor.min().item():.4f}'
+            f'{labels["min"].ljust(max_label_width)} {torch_tensor.min().item():.4f}/{tensorrt_tensor.min().item():.4f}'
         )
 
+    for key, key_metrics in metrics.items():
+        if min_cosine_similarity is not None:
+            assert (
+                key_metrics["cosine_similarity"] >= min_cosine_similarity
+            ), f"{key}: cosine similarity {key_metrics['cosine_similarity']} < {min_cosine_similarity}"
+        if max_l1_mean_distance is not None:
+            assert (
+                key_metrics["l1_mean_distance"] <= max_l1_mean_distance
+            ), f"{key}: L1 mean distance {key_metrics['l1_mean_distance']} > {max_l1_mean_distance}"
+    return metrics
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run GR00T inference")
@@ -116,9 +145,16 @@ if __name__ == "__main__":
     parser.add_argument(
         "--inference-mode",
         type=str,
-        choices=["pytorch", "tensorrt", "compare"],
+        choices=["pytorch", "tensorrt", "onnxruntime", "compare"],
         default="pytorch",
-        help="Inference mode: 'pytorch' for PyTorch inference, 'tensorrt' for TensorRT inference, 'compare' for compare PyTorch and TensorRT outputs similarity",
+        help="Inference mode: 'pytorch' for PyTorch inference, 'tensorrt' for TensorRT inference, 'onnxruntime' for ONNX Runtime inference of the exported ONNX graphs, 'compare' for compare PyTorch and TensorRT (or ONNX Runtime, see --compare-backend) outputs similarity",
+    )
+    parser.add_argument(
+        "--compare-backend",
+        type=str,
+        choices=["tensorrt", "onnxruntime"],
+        help="Backend compared with PyTorch in 'compare' mode",
+        default="tensorrt",
     )
     parser.add_argument(
         "--denoising-steps",
@@ -132,6 +168,44 @@ if __name__ == "__main__":
         help="Path to the TensorRT engine",
         default="gr00t_engine",
     )
+    parser.add_argument(
+        "--onnx-model-path",
+        type=str,
+        help="Path to the exported ONNX graphs, used by ONNX Runtime",
+        default="gr00t_onnx",
+    )
+    parser.add_argument(
+        "--ort-providers",
+        type=str,
+        nargs="+",
+        help="ONNX Runtime execution providers, in order of preference",
+        default=["CPUExecutionProvider"],
+    )
+    parser.add_argument(
+        "--ort-intra-op-threads",
+        type=int,
+        help="ONNX Runtime threads used to parallelize an op (0 lets ONNX Runtime choose)",
+        default=0,
+    )
+    parser.add_argument(
+        "--ort-inter-op-threads",
+        type=int,
+        help="ONNX Runtime threads used to run independent ops in parallel (0 lets ONNX Runtime choose)",
+        default=0,
+    )
+    parser.add_argument(
+        "--ort-graph-optimization-level",
+        type=str,
+        choices=["disable", "basic", "extended", "all"],
+        help="ONNX Runtime graph optimization level",
+        default="all",
+    )
+    parser.add_argument(
+        "--min-cosine-similarity",
+        type=float,
+        help="In 'compare' mode, fail if the cosine similarity of an action is below this value",
+        default=None,
+    )
     parser.add_argument(
         "--video-backend",
         type=str,
@@ -201,6 +275,29 @@ if __name__ == "__main__":
 
     step_data = dataset[0]
 
+    def setup_engines(backend):
+        if backend == "tensorrt":
+            from deployment_scripts.trt_model_forward import setup_tensorrt_engines
+
+            setup_tensorrt_engines(
+                policy, args.trt_engine_path, args.vit_dtype, args.llm_dtype, args.dit_dtype
+            )
+        else:
+            # the fp8/nvfp4 graphs are quantized for TensorRT, ONNX Runtime runs the fp16 graphs
+            from deployment_scripts.ort_model_forward import setup_onnxruntime_sessions
+
+            setup_onnxruntime_sessions(
+                policy,
+                args.onnx_model_path,
+                vit_dtype="fp16",
+                llm_dtype="fp16",
+                dit_dtype="fp16",
+                providers=args.ort_providers,
+                intra_op_num_threads=args.ort_intra_op_threads,
+                inter_op_num_threads=args.ort_inter_op_threads,
+                graph_optimization_level=args.ort_graph_optimization_level,
+            )
+
     if args.inference_mode == "pytorch":
         predicted_action = policy.get_action(step_data)
         print("\n=== PyTorch Inference Results ===")
@@ -209,15 +306,22 @@ if __name__ == "__main__":
 
     elif args.inference_mode == "tensorrt":
         # Setup TensorRT engines
-        setup_tensorrt_engines(
-            policy, args.trt_engine_path, args.vit_dtype, args.llm_dtype, args.dit_dtype
-        )
+        setup_engines(args.inference_mode)
 
         predicted_action = policy.get_action(step_data)
         print("\n=== TensorRT Inference Results ===")
         for key, value in predicted_action.items():
             print(key, value.shape)
 
+    elif args.inference_mode == "onnxruntime":
+        # Setup ONNX Runtime sessions
+        setup_engines(args.inference_mode)
+
+        predicted_action = policy.get_action(step_data)
+        print("\n=== ONNX Runtime Inference Results ===")
+        for key, value in predicted_action.items():
+            print(key, value.shape)
+
     else:
         # ensure PyTorch and TensorRT have the same init_actions
         if not hasattr(policy.model.action_head, "init_actions"):
@@ -232,11 +336,14 @@ if __name__ == "__main__":
         )
         predicted_action_torch = policy.get_action(step_data)
 
-        # Setup TensorRT engines and run inference
-        setup_tensorrt_engines(
-            policy, args.trt_engine_path, args.vit_dtype, args.llm_dtype, args.dit_dtype
-        )
+        # Setup TensorRT engines (or ONNX Runtime sessions) and run inference
+        setup_engines(args.compare_backend)
         predicted_action_tensorrt = policy.get_action(step_data)
 
         # Compare predictions
-        compare_predictions(predicted_action_tensorrt, predicted_action_torch)
+        compare_predictions(
+            predicted_action_tensorrt,
+            predicted_action_torch,
+            min_cosine_similarity=args.min_cosine_similarity,
+            backend="TensorRT" if args.compare_backend == "tensorrt" else "ONNX Runtime",
+        )
@@ -0,0 +1,108 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from functools import partial
+
+from deployment_scripts.trt_model_forward import (
+    release_torch_modules,
+    set_engine_forwards,
+)
+
+
+def setup_onnxruntime_sessions(
+    policy,
+    onnx_model_path,
+    vit_dtype="fp16",
+    llm_dtype="fp16",
+    dit_dtype="fp16",
+    providers=None,
+    intra_op_num_threads=0,
+    inter_op_num_threads=0,
+    graph_optimization_level="all",
+    use_execution_plan=True,
+    fused_action_head=False,
+):
+    """
+    Setup ONNX Runtime sessions for GR00T model inference, from the graphs of `export_onnx.py`.
+
+    The sessions replace the TensorRT engines in the same forward functions, so that the exported
+    graphs can be served and benchmarked without CUDA (e.g. on GPU-less edge boxes and CI). The
+    quantized fp8/nvfp4 graphs target TensorRT, export the graphs in fp16 to run them with ONNX
+    Runtime.
+
+    Args:
+        policy: GR00T policy model instance
+        onnx_model_path: Path to the directory containing the exported ONNX graphs
+        vit_dtype: ViT model dtype
+        llm_dtype: LLM model dtype
+        dit_dtype: DiT model dtype
+        providers: ONNX Runtime execution providers, defaults to the CPU execution provider
+        intra_op_num_threads: Threads used to parallelize an op, 0 lets ONNX Runtime choose
+        inter_op_num_threads: Threads used to run independent ops in parallel, 0 lets ONNX Runtime choose
+        graph_optimization_level: ONNX Runtime graph optimization level (disable, basic, extended, all)
+        use_execution_plan: Run the action head on shape-stable execution plans
+        fused_action_head: Run the action head on its single fused graph, exported with the
+            denoising steps of the policy (`export_onnx.py --fused-action-head`)
+    """
+    import deployment_scripts.ort_torch as ort
+
+    session = partial(
+        ort.Session,
+        providers=providers,
+        intra_op_num_threads=intra_op_num_threads,
+        inter_op_num_threads=inter_op_num_threads,
+        graph_optimization_level=graph_optimization_level,
+    )
+
+    release_torch_modules(policy)
+
+    # Setup backbone sessions
+    policy.model.backbone.vit_engine = session(
+        os.path.join(onnx_model_path, "eagle2", f"vit_{vit_dtype}.onnx")
+    )
+    policy.model.backbone.llm_engine = session(
+        os.path.join(onnx_model_path, "eagle2", f"llm_{llm_dtype}.onnx")
+    )
+
+    # Setup action head sessions
+    if fused_action_head:
+        denoising_steps = policy.model.action_head.num_inference_timesteps
+        policy.model.action_head.fused_action_head_engine = session(
+            os.path.join(
+                onnx_model_path,
+                "action_head",
+                f"action_head_fused_{dit_dtype}_steps{denoising_steps}.onnx",
+            )
+        )
+    else:
+        policy.model.action_head.vlln_vl_self_attention_engine = session(
+            os.path.join(onnx_model_path, "action_head", "vlln_vl_self_attention.onnx")
+        )
+        policy.model.action_head.action_encoder_engine = session(
+            os.path.join(onnx_model_path, "action_head", "action_encoder.onnx")
+        )
+        policy.model.action_head.action_decoder_engine = session(
+            os.path.join(onnx_model_path, "action_head", "action_decoder.onnx")
+        )
+        policy.model.action_head.DiT_engine = session(
+            os.path.join(onnx_model_path, "action_head", f"DiT_{dit_dtype}.onnx")
+        )
+        policy.model.action_head.state_encoder_engine = session(
+            os.path.join(onnx_model_path, "action_head", "state_encoder.onnx")
+        )
+
+    # Set the engine forward functions, running the sessions
+    set_engine_forwards(policy, use_execution_plan, fused_action_head)
@@ -0,0 +1,324 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import numpy as np
+import onnx
+import onnxruntime as ort
+import torch
+from onnx import numpy_helper
+
+GRAPH_OPTIMIZATION_LEVELS = {
+    "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+_ORT_TO_TORCH_DTYPE = {
+    "tensor(float)": torch.float32,
+    "tensor(float16)": torch.float16,
+    "tensor(int8)": torch.int8,
+    "tensor(int32)": torch.int32,
+    "tensor(bool)": torch.bool,
+    "tensor(uint8)": torch.uint8,
+    "tensor(int64)": torch.int64,
+}
+
+_TORCH_TO_NUMPY_DTYPE = {
+    torch.float32: np.float32,
+    torch.float16: np.float16,
+    torch.int8: np.int8,
+    torch.int32: np.int32,
+    torch.bool: np.bool_,
+    torch.uint8: np.uint8,
+    torch.int64: np.int64,
+}
+
+
+def torch_type(ort_type):
+    if ort_type in _ORT_TO_TORCH_DTYPE:
+        return _ORT_TO_TORCH_DTYPE[ort_type]
+
+    raise TypeError(
+        f"Could not resolve ONNX Runtime datatype to an equivalent torch datatype. {ort_type}"
+    )
+
+
+def _upcast_tensor(tensor):
+    if tensor.data_type == onnx.TensorProto.FLOAT16:
+        array = numpy_helper.to_array(tensor).astype(np.float32)
+        tensor.CopyFrom(numpy_helper.from_array(array, tensor.name))
+
+
+def _upcast_graph(graph):
+    for value in list(graph.input) + list(graph.output) + list(graph.value_info):
+        if value.type.tensor_type.elem_type == onnx.TensorProto.FLOAT16:
+            value.type.tensor_type.elem_type = onnx.TensorProto.FLOAT
+    for initializer in graph.initializer:
+        _upcast_tensor(initializer)
+    for node in graph.node:
+        for attribute in node.attribute:
+            if attribute.type == onnx.AttributeProto.TENSOR:
+                _upcast_tensor(attribute.t)
+            elif attribute.type == onnx.AttributeProto.GRAPH:
+                _upcast_graph(attribute.g)
+            elif attribute.type == onnx.AttributeProto.GRAPHS:
+                for subgraph in attribute.graphs:
+                    _upcast_graph(subgraph)
+            elif (
+                attribute.name in ("to", "dtype")
+                and attribute.type == onnx.AttributeProto.INT
+                and attribute.i == onnx.TensorProto.FLOAT16
+            ):
+                # e.g. Cast(to=float16), RandomNormal(dtype=float16)
+                attribute.i = onnx.TensorProto.FLOAT
+
+
+def upcast_float16_model(file, output_file=None):
+    """
+    Convert the float16 tensors, casts and I/O of an ONNX graph to float32.
+
+    The ONNX graphs are exported in float16 for TensorRT, but most CPU kernels of ONNX Runtime
+    only exist (or are only fast) in float32. The converted graph is written once next to the
+    original one and reused as long as it is newer than it.
+
+    Args:
+        file: Path to the float16 ONNX graph.
+        output_file: Path to the float32 ONNX graph, defaults to "<file>_fp32.onnx".
+
+    Returns:
+        The path to the float32 ONNX graph.
+    """
+    if output_file is None:
+        output_file = f"{os.path.splitext(file)[0]}_fp32.onnx"
+    if os.path.exists(output_file) and os.path.getmtime(output_file) >= os.path.getmtime(file):
+        return output_file
+
+    model = onnx.load(file, load_external_data=True)
+    _upcast_graph(model.graph)
+    # the weights go to a single external file, the LLM graph does not fit in a 2GB protobuf
+    onnx.save_model(
+        model,
+        output_file,
+        save_as_external_data=True,
+        all_tensors_to_one_file=True,
+        location=f"{os.path.basename(output_file)}_data",
+        size_threshold=1024,
+    )
+    return output_file
+
+
+def is_float16_model(file):
+    model = onnx.load(file, load_external_data=False)
+    return any(
+        value.type.tensor_type.elem_type == onnx.TensorProto.FLOAT16
+        for value in list(model.graph.input) + list(model.graph.output)
+    )
+
+
+class Session(object):
+    """
+    ONNX Runtime counterpart of `trt_torch.Engine`: runs an ONNX graph on torch tensors.
+
+    The inputs are bound to the session with I/O binding directly from the memory of the torch
+    tensors, so that running the graph does not copy them. `set_runtime_tensor_shape` is a no-op,
+    ONNX Runtime infers the shapes from the bound inputs, so the TensorRT forward functions run
+    unchanged on either backend.
+
+    Args:
+        file: Path to the ONNX graph.
+        providers: The execution providers, defaults to the CPU execution provider.
+        intra_op_num_threads: Threads used to parallelize an op, 0 lets ONNX Runtime choose.
+        inter_op_num_threads: Threads used to run independent ops in parallel, 0 lets ONNX Runtime
+            choose. Above 1, the graph runs in parallel execution mode.
+        graph_optimization_level: One of "disable", "basic", "extended" or "all".
+        upcast_fp16: Whether to run float16 graphs in float32, see `upcast_float16_model`. Defaults
+            to True with the CPU execution provider only.
+        optimized_model_file: Where to save the optimized graph, to inspect it or to skip the
+            optimizations when it is loaded again.
+    """
+
+    def __init__(
+        self,
+        file,
+        providers=None,
+        intra_op_num_threads=0,
+        inter_op_num_threads=0,
+        graph_optimization_level="all",
+        upcast_fp16=None,
+        optimized_model_file=None,
+    ):
+        super().__init__()
+        assert (
+            graph_optimization_level in GRAPH_OPTIMIZATION_LEVELS
+        ), f"Invalid graph optimization level {graph_optimization_level}, expected one of {list(GRAPH_OPTIMIZATION_LEVELS)}"
+
+        self.providers = list(providers) if providers else ["CPUExecutionProvider"]
+        if upcast_fp16 is None:
+            upcast_fp16 = self.providers == ["CPUExecutionProvider"]
+        if upcast_fp16 and is_float16_model(file):
+            file = upcast_float16_model(file)
+        self.file = file
+
+        self.session_options = ort.SessionOptions()
+        self.session_options.intra_op_num_threads = intra_op_num_threads
+        self.session_options.inter_op_num_threads = inter_op_num_threads
+        self.session_options.execution_mode = (
+            ort.ExecutionMode.ORT_PARALLEL
+            if inter_op_num_threads > 1
+            else ort.ExecutionMode.ORT_SEQUENTIAL
+        )
+        self.session_options.graph_optimization_level = GRAPH_OPTIMIZATION_LEVELS[
+            graph_optimization_level
+        ]
+        if optimized_model_file is not None:
+            self.session_options.optimized_model_filepath = optimized_model_file
+
+        self.load(file)
+        self.print()
+
+    def print(self):
+        if int(os.getenv("LOCAL_RANK", -1)) not in [0, -1]:
+            return
+
+        print("============= ONNX Runtime Session Detail =============")
+        print(f"ONNX file: {self.file}")
+        print(f"Providers: {self.session.get_providers()}")
+        print(f"Inputs: {len(self.in_meta)}")
+        for ib, item in enumerate(self.in_meta):
+            tensor_name, shape, dtype = item[:3]
+            print(f"   {ib}. {tensor_name}: {'x'.join(map(str, shape))} [{dtype}]")
+
+        print(f"Outputs: {len(self.out_meta)}")
+        for ib, item in enumerate(self.out_meta):
+            tensor_name, shape, dtype = item[:3]
+            print(f"   {ib}. {tensor_name}: {'x'.join(map(str, shape))} [{dtype}]")
+        print("=======================================================")
+
+    def load(self, file):
+        self.session = ort.InferenceSession(
+            file, sess_options=self.session_options, providers=self.providers
+        )
+        # inputs are bound where the session runs, the outputs are read back on the CPU
+        self.device = (
+            "cuda" if self.session.get_providers()[0] == "CUDAExecutionProvider" else "cpu"
+        )
+        self.in_meta = [
+            [item.name, item.shape, torch_type(item.type)] for item in self.session.get_inputs()
+        ]
+        self.out_meta = [
+            [item.name, item.shape, torch_type(item.type)] for item in self.session.get_outputs()
+        ]
+
+    def __call__(self, *args, **inputs):
+        return self.forward(*args, **inputs)
+
+    def set_runtime_tensor_shape(self, name, shape):
+        pass
+
+    def _bind_buffer(self, bind, name, dtype, x):
+        assert isinstance(x, torch.Tensor), f"Unsupported tensor[{name}] type: {type(x)}"
+        assert (
+            dtype == x.dtype
+        ), f"Invalid tensor[{name}] dtype, expected {dtype}, but got {x.dtype}"
+        assert (
+            x.device.type == self.device
+        ), f"Invalid tensor[{name}] device, expected {self.device}, but got {x.device}"
+        assert x.is_contiguous(), f"Tensor[{name}] must be contiguous"
+        bind(
+            name,
+            x.device.type,
+            x.device.index or 0,
+            _TORCH_TO_NUMPY_DTYPE[dtype],
+            tuple(x.shape),
+            x.data_ptr(),
+        )
+
+    def prepare(self, inputs, outputs):
+        """
+        Prepare the runs of the session on preallocated tensors.
+
+        All the inputs and outputs are bound once, a prepared run only executes the graph, reading
+        and writing the bound tensors in place.
+
+        Args:
+            inputs: The input tensors, by name, with the dtypes of the graph and on its device.
+            outputs: The output tensors, by name, with their runtime shapes.
+
+        Returns:
+            A function running the session on the bound tensors.
+        """
+        io_binding = self.session.io_binding()
+        for name, _, dtype in self.in_meta:
+            self._bind_buffer(io_binding.bind_input, name, dtype, inputs[name])
+        for name, _, dtype in self.out_meta:
+            self._bind_buffer(io_binding.bind_output, name, dtype, outputs[name])
+
+        def run():
+            self.session.run_with_iobinding(io_binding)
+
+        # keep the bound memory alive as long as the run
+        run.tensors = [*inputs.values(), *outputs.values()]
+        return run
+
+    def _bind_input(self, io_binding, name, dtype, x, reference_tensors):
+        assert isinstance(x, torch.Tensor), f"Unsupported tensor[{name}] type: {type(x)}"
+        # only copies when the dtype or device differs from the graph input, e.g. the float16
+        # inputs of the TensorRT forward functions fed to an upcast graph
+        x = x.to(device=self.device, dtype=dtype).contiguous()
+        io_binding.bind_input(
+            name=name,
+            device_type=x.device.type,
+            device_id=x.device.index or 0,
+            element_type=_TORCH_TO_NUMPY_DTYPE[dtype],
+            shape=tuple(x.shape),
+            buffer_ptr=x.data_ptr(),
+        )
+        # keep the bound memory alive until the session has run
+        reference_tensors.append(x)
+
+    def forward(self, *args, **kwargs):
+        return_list = kwargs.pop("return_list", False)
+        io_binding = self.session.io_binding()
+        reference_tensors = []
+        output_device = None
+        for iarg, x in enumerate(args):
+            name, _, dtype = self.in_meta[iarg]
+            output_device = output_device or x.device
+            self._bind_input(io_binding, name, dtype, x, reference_tensors)
+
+        for name, _, dtype in self.in_meta:
+            if name not in kwargs:
+                continue
+            output_device = output_device or kwargs[name].device
+            self._bind_input(io_binding, name, dtype, kwargs[name], reference_tensors)
+
+        assert len(reference_tensors) == len(
+            self.in_meta
+        ), f"Invalid input tensors. The expected input tensors are {len(self.in_meta)}, but got {len(reference_tensors)}"
+
+        for name, _, _ in self.out_meta:
+            io_binding.bind_output(name, "cpu")
+        self.session.run_with_iobinding(io_binding)
+        outputs = [
+            torch.from_numpy(value.numpy()).to(output_device) for value in io_binding.get_outputs()
+        ]
+
+        if return_list:
+            return outputs
+        else:
+            return {item[0]: outputs[i] for i, item in enumerate(self.out_meta)}
@@ -20,7 +20,7 @@ import torch
 import torch.utils.checkpoint as cp
 from transformers.feature_extraction_utils import BatchFeature
 
-import deployment_scripts.trt_torch as trt
+from deployment_scripts.action_head_plan import action_head_plan_forward
 
 
 def eagle_tensorrt_forward(self, vl_input):
@@ -33,7 +33,9 @@ def eagle_tensorrt_forward(self, vl_input):
 
     self.set_frozen_modules_to_eval_mode()
     batch_size = vl_input["pixel_values"].shape[0]
-    position_ids = torch.arange(self.num_patches, device="cuda").expand((batch_size, -1))
+    position_ids = torch.arange(self.num_patches, device=vl_input["pixel_values"].device).expand(
+        (batch_size, -1)
+    )
     if vl_input["pixel_values"].dtype != torch.float16:
         vl_input["pixel_values"] = vl_input["pixel_values"].to(torch.float16)
 
@@ -56,6 +58,9 @@ def eagle_tensorrt_forward(self, vl_input):
             vit_embeds.shape[0], -1, vit_embeds.shape[-1]
         )  # torch.Size([B, 16, 16, 4096]) -> torch.Size([B, 256, 4096])
 
+    if not torch.is_autocast_enabled(vit_embeds.device.type):
+        # e.g. on the CPU, where the policy autocast is disabled
+        vit_embeds = vit_embeds.to(next(self.eagle_model.mlp1.parameters()).dtype)
     if self.eagle_model.mlp_checkpoint and vit_embeds.requires_grad:
         vit_embeds = cp.checkpoint(self.eagle_model.mlp1, vit_embeds)
     else:
@@ -101,7 +106,10 @@ def eagle_tensorrt_forward(self, vl_input):
     )
 
 
-def action_head_tensorrt_forward(self, backbone_output, action_input):
+def action_head_tensorrt_forward(self, backbone_output, action_input, denoising=None):
+    assert (
+        denoising is None
+    ), "The engines run the exported uniform Euler steps, denoising cannot be set"
     # backbone_output = self.process_backbone_output(backbone_output)
     if backbone_output.backbone_features.dtype != torch.float16:
         backbone_output.backbone_features = backbone_output.backbone_features.to(torch.float16)
@@ -192,18 +200,46 @@ def action_head_tensorrt_forward(self, backbone_output, action_input):
     return BatchFeature(data={"action_pred": actions})
 
 
-def setup_tensorrt_engines(
-    policy, trt_engine_path, vit_dtype="fp8", llm_dtype="nvfp4", dit_dtype="fp8"
-):
+def action_head_fused_forward(self, backbone_output, action_input, denoising=None):
     """
-    Setup TensorRT engines for GR00T model inference.
+    `action_head_tensorrt_forward` on the single action head graph of `export_onnx.py
+    --fused-action-head`, which runs all the denoising steps at once.
+    """
+    assert (
+        denoising is None
+    ), "The engines run the exported uniform Euler steps, denoising cannot be set"
+    backbone_features = backbone_output.backbone_features
+    batch_size = backbone_features.shape[0]
+
+    # This attribute is used to ensure the same actions is used for both PyTorch and TensorRT inference
+    if hasattr(self, "init_actions"):
+        actions = self.init_actions.expand((batch_size, -1, -1))
+    else:
+        actions = torch.randn(
+            size=(batch_size, self.config.action_horizon, self.config.action_dim),
+            dtype=backbone_features.dtype,
+            device=backbone_features.device,
+        )
+
+    inputs = {
+        "backbone_features": backbone_features,
+        "state": action_input.state,
+        "embodiment_id": action_input.embodiment_id,
+        "init_actions": actions,
+    }
+    for name, _, dtype in self.fused_action_head_engine.in_meta:
+        inputs[name] = inputs[name].to(dtype).contiguous()
+        self.fused_action_head_engine.set_runtime_tensor_shape(name, inputs[name].shape)
+    actions = self.fused_action_head_engine(**inputs)["actions"]
+    return BatchFeature(data={"action_pred": actions})
+
+
+def release_torch_modules(policy):
+    """
+    Delete the torch modules replaced by the exported graphs, keeping the layers that still run in torch.
 
     Args:
         policy: GR00T policy model instance
-        trt_engine_path: Path to the directory containing TensorRT engine files
-        vit_dtype: ViT model dtype (fp16, fp8)
-        llm_dtype: LLM model dtype (fp16, nvfp4)
-        dit_dtype: DiT model dtype (fp16, fp8)
     """
     policy.model.backbone.num_patches = (
         policy.model.backbone.eagle_model.vision_model.vision_model.embeddings.num_patches
@@ -234,6 +270,55 @@ def setup_tensorrt_engines(
         del policy.model.action_head.action_decoder
     torch.cuda.empty_cache()
 
+
+def set_engine_forwards(policy, use_execution_plan=True, fused_action_head=False):
+    """
+    Route the backbone and action head of the policy through their engines (TensorRT engines or ONNX Runtime
+    sessions).
+
+    Args:
+        policy: GR00T policy model instance
+        use_execution_plan: Run the action head on shape-stable execution plans, see
+            `action_head_plan.ActionHeadExecutionPlan`
+        fused_action_head: Run the action head on its single fused graph, see
+            `action_head_fused_forward`
+    """
+    policy.model.backbone.forward = partial(eagle_tensorrt_forward, policy.model.backbone)
+    if fused_action_head:
+        action_head_forward = action_head_fused_forward
+    elif use_execution_plan:
+        action_head_forward = action_head_plan_forward
+    else:
+        action_head_forward = action_head_tensorrt_forward
+    policy.model.action_head.get_action = partial(action_head_forward, policy.model.action_head)
+
+
+def setup_tensorrt_engines(
+    policy,
+    trt_engine_path,
+    vit_dtype="fp8",
+    llm_dtype="nvfp4",
+    dit_dtype="fp8",
+    use_execution_plan=True,
+    fused_action_head=False,
+):
+    """
+    Setup TensorRT engines for GR00T model inference.
+
+    Args:
+        policy: GR00T policy model instance
+        trt_engine_path: Path to the directory containing TensorRT engine files
+        vit_dtype: ViT model dtype (fp16, fp8)
+        llm_dtype: LLM model dtype (fp16, nvfp4)
+        dit_dtype: DiT model dtype (fp16, fp8)
+        use_execution_plan: Run the action head on shape-stable execution plans
+        fused_action_head: Run the action head on its single fused graph engine, built for the
+            denoising steps of the policy
+    """
+    import deployment_scripts.trt_torch as trt
+
+    release_torch_modules(policy)
+
     # Setup backbone engines
     policy.model.backbone.vit_engine = trt.Engine(
         os.path.join(trt_engine_path, f"vit_{vit_dtype}.engine")
@@ -243,24 +328,29 @@ def setup_tensorrt_engines(
     )
 
     # Setup action head engines
-    policy.model.action_head.vlln_vl_self_attention_engine = trt.Engine(
-        os.path.join(trt_engine_path, "vlln_vl_self_attention.engine")
-    )
-    policy.model.action_head.action_encoder_engine = trt.Engine(
-        os.path.join(trt_engine_path, "action_encoder.engine")
-    )
-    policy.model.action_head.action_decoder_engine = trt.Engine(
-        os.path.join(trt_engine_path, "action_decoder.engine")
-    )
-    policy.model.action_head.DiT_engine = trt.Engine(
-        os.path.join(trt_engine_path, f"DiT_{dit_dtype}.engine")
-    )
-    policy.model.action_head.state_encoder_engine = trt.Engine(
-        os.path.join(trt_engine_path, "state_encoder.engine")
-    )
+    if fused_action_head:
+        denoising_steps = policy.model.action_head.num_inference_timesteps
+        policy.model.action_head.fused_action_head_engine = trt.Engine(
+            os.path.join(
+                trt_engine_path, f"action_head_fused_{dit_dtype}_steps{denoising_steps}.engine"
+            )
+        )
+    else:
+        policy.model.action_head.vlln_vl_self_attention_engine = trt.Engine(
+            os.path.join(trt_engine_path, "vlln_vl_self_attention.engine")
+        )
+        policy.model.action_head.action_encoder_engine = trt.Engine(
+            os.path.join(trt_engine_path, "action_encoder.engine")
+        )
+        policy.model.action_head.action_decoder_engine = trt.Engine(
+            os.path.join(trt_engine_path, "action_decoder.engine")
+        )
+        policy.model.action_head.DiT_engine = trt.Engine(
+            os.path.join(trt_engine_path, f"DiT_{dit_dtype}.engine")
+        )
+        policy.model.action_head.state_encoder_engine = trt.Engine(
+            os.path.join(trt_engine_path, "state_encoder.engine")
+        )
 
     # Set TensorRT forward functions
-    policy.model.backbone.forward = partial(eagle_tensorrt_forward, policy.model.backbone)
-    policy.model.action_head.get_action = partial(
-        action_head_tensorrt_forward, policy.model.action_head
-    )
+    set_engine_forwards(policy, use_execution_plan, fused_action_head)
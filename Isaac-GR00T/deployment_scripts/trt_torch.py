@@ -84,6 +84,9 @@ class Engine(object):
             ), f"Failed to deserialize the cuda engine from file: {file}"
 
         self.execution_context = self.handle.create_execution_context()
+        self.device = "cuda"
+        # input shapes of the prepared run set on the execution context, if any
+        self._prepared_shapes = None
         self.meta, self.in_meta, self.out_meta = [], [], []
         for tensor_name in self.handle:
             shape = self.handle.get_tensor_shape(tensor_name)
@@ -97,8 +100,57 @@ class Engine(object):
         return self.forward(*args, **inputs)
 
     def set_runtime_tensor_shape(self, name, shape):
+        self._prepared_shapes = None
         self.execution_context.set_input_shape(name, shape)
 
+    def _set_prepared_shapes(self, shapes):
+        if self._prepared_shapes != shapes:
+            for name, shape in shapes:
+                self.execution_context.set_input_shape(name, shape)
+            self._prepared_shapes = shapes
+
+    def prepare(self, inputs, outputs):
+        """
+        Prepare the runs of the engine on preallocated tensors.
+
+        The tensors are validated once. A prepared run only updates the tensor addresses (and the
+        input shapes, when another prepared run of different shapes ran in between) and enqueues the
+        engine on the current stream, without synchronizing.
+
+        Args:
+            inputs: The input tensors, by name, with the dtypes of the engine.
+            outputs: The output tensors, by name, with their runtime shapes.
+
+        Returns:
+            A function running the engine on the prepared tensors.
+        """
+        shapes = tuple((name, tuple(inputs[name].shape)) for name, _, _ in self.in_meta)
+        self._set_prepared_shapes(shapes)
+        addresses = []
+        for meta, tensors in ((self.in_meta, inputs), (self.out_meta, outputs)):
+            for name, _, dtype in meta:
+                x = tensors[name]
+                runtime_shape = tuple(self.execution_context.get_tensor_shape(name))
+                assert isinstance(x, torch.Tensor), f"Unsupported tensor[{name}] type: {type(x)}"
+                assert (
+                    runtime_shape == x.shape
+                ), f"Invalid tensor[{name}] shape: {x.shape}, but the expected shape is: {runtime_shape}"
+                assert (
+                    dtype == x.dtype
+                ), f"Invalid tensor[{name}] dtype, expected dtype is {dtype}, but got {x.dtype}"
+                assert x.is_cuda and x.is_contiguous(), f"Tensor[{name}] must be contiguous on cuda"
+                addresses.append((name, x.data_ptr()))
+
+        def run():
+            self._set_prepared_shapes(shapes)
+            for name, address in addresses:
+                self.execution_context.set_tensor_address(name, address)
+            self.execution_context.execute_async_v3(torch.cuda.current_stream().cuda_stream)
+
+        # keep the prepared memory alive as long as the run
+        run.tensors = [*inputs.values(), *outputs.values()]
+        return run
+
     def forward(self, *args, **kwargs):
         return_list = kwargs.pop("return_list", False)
         reference_tensors = []
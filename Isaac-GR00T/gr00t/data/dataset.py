@@ -585,7 +585,11 @@ class LeRobotSingleDataset(Dataset):
                 episode_chunk=chunk_index, episode_index=trajectory_id
             )
             assert parquet_path.exists(), f"Parquet file not found at {parquet_path}"
-            return pd.read_parquet(parquet_path)
+            # Keep the trajectory cached, consecutive steps of the same trajectory are common
+            # (see `block_size` in gr00t/data/sampler.py)
+            self.curr_traj_data = pd.read_parquet(parquet_path)
+            self.curr_traj_id = trajectory_id
+            return self.curr_traj_data
 
     def get_trajectory_index(self, trajectory_id: int) -> int:
         """Get the index of the trajectory in the dataset by the trajectory ID.
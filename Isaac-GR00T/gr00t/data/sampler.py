@@ -0,0 +1,241 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Lazy, constant-memory shuffling of dataset indices.
+
+`ShardedSampler` never materializes a permutation of the dataset: the index at position `t` of an
+epoch is computed on the fly with a keyed Feistel network (a bijection on [0, n) thanks to cycle
+walking), so an epoch over hundreds of millions of steps costs O(1) memory and resuming in the
+middle of an epoch is a jump to position `t`, not a replay of the first `t` indices.
+
+Episode locality: the dataset indices are grouped into blocks of `block_size` consecutive indices
+(consecutive steps of the same trajectory for `LeRobotSingleDataset`); the order of the blocks and
+the order inside each block are shuffled independently. With `block_size > 1`, a batch (which
+is loaded by a single DataLoader worker) contains runs of steps from the same trajectory, so the
+per-worker trajectory cache of the dataset gets hits. `block_size=1` is a plain uniform shuffle.
+"""
+
+import math
+from typing import Iterator
+
+import numpy as np
+from torch.utils.data import Dataset, Sampler
+
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer, a cheap invertible 64-bit hash."""
+    with np.errstate(over="ignore"):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def _hash_key(*values: int) -> np.uint64:
+    key = np.zeros(1, dtype=np.uint64)
+    for value in values:
+        with np.errstate(over="ignore"):
+            key = _mix64(key ^ np.uint64(int(value) & 0xFFFFFFFFFFFFFFFF))
+    return key[0]
+
+
+def _half_bits(size: int) -> int:
+    return max(1, math.ceil(math.ceil(math.log2(max(size, 2))) / 2))
+
+
+def feistel_permute(
+    x: np.ndarray, size: np.ndarray | int, key: np.ndarray | int, rounds: int = 4
+) -> np.ndarray:
+    """
+    Map positions `x` in [0, size) to their image under a keyed pseudo-random permutation of
+    [0, size). `size` and `key` may be arrays broadcastable to `x`, to permute many small domains
+    (e.g. the blocks of an epoch) in one call.
+
+    Args:
+        x (np.ndarray): The positions, of integer dtype.
+        size (np.ndarray | int): The size of the permuted domain of each position.
+        key (np.ndarray | int): The key of the permutation of each position.
+        rounds (int): The number of Feistel rounds.
+
+    Returns:
+        np.ndarray: The permuted positions, as uint64.
+    """
+    x = np.asarray(x, dtype=np.uint64)
+    size = np.broadcast_to(np.asarray(size, dtype=np.uint64), x.shape)
+    key = np.broadcast_to(np.asarray(key, dtype=np.uint64), x.shape)
+    half_bits = _half_bits(int(size.max())) if x.size > 0 else 1
+    shift = np.uint64(half_bits)
+    mask = np.uint64((1 << half_bits) - 1)
+    round_keys = [_mix64(key ^ np.uint64(r + 1)) for r in range(rounds)]
+
+    def _encrypt(values: np.ndarray, keys: list[np.ndarray]) -> np.ndarray:
+        left, right = values >> shift, values & mask
+        for round_key in keys:
+            left, right = right, left ^ (_mix64(right ^ round_key) & mask)
+        return (left << shift) | right
+
+    # Cycle walking: re-encrypt the values that fall outside of their domain
+    y = _encrypt(x, round_keys)
+    outside = y >= size
+    while outside.any():
+        y[outside] = _encrypt(y[outside], [round_key[outside] for round_key in round_keys])
+        outside[outside] = y[outside] >= size[outside]
+    return y
+
+
+class ShardedSampler(Sampler):
+    """
+    Deterministic, lazily computed shuffle of a dataset, sharded across `num_replicas` ranks.
+
+    Rank `rank` yields the positions `rank, rank + num_replicas, ...` of the epoch's permutation
+    (the epoch is padded by wrapping around to a multiple of `num_replicas`, as in
+    `torch.utils.data.DistributedSampler`). When used through the HF Trainer, keep the default
+    `num_replicas=1`: accelerate already shards the batches across ranks.
+
+    Like `BaseSampler`, `set_epoch` is forwarded to the dataset.
+
+    Args:
+        data_source (Dataset): The dataset to sample from.
+        shuffle (bool): Whether to shuffle, if False the indices are yielded in order.
+        seed (int): The seed of the permutations, combined with the epoch.
+        block_size (int): Number of consecutive dataset indices kept together, see module docstring.
+        num_replicas (int): Number of ranks the epoch is sharded across.
+        rank (int): The rank of this sampler.
+        chunk_size (int): Number of indices computed at once.
+    """
+
+    def __init__(
+        self,
+        data_source: Dataset,
+        shuffle: bool = True,
+        seed: int = 0,
+        block_size: int = 1,
+        num_replicas: int = 1,
+        rank: int = 0,
+        chunk_size: int = 8192,
+    ):
+        assert block_size >= 1, f"block_size must be >= 1, got {block_size}"
+        assert 0 <= rank < num_replicas, f"Invalid rank {rank} for {num_replicas} replicas"
+        self.data_source = data_source
+        self.shuffle = shuffle
+        self.seed = seed
+        self.block_size = block_size
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.chunk_size = chunk_size
+        self.epoch = 0
+        # Position of this rank's stream to start from, set by `load_state_dict` for one epoch
+        self._resume_epoch: int | None = None
+        self._resume_start = 0
+
+    @property
+    def num_indices(self) -> int:
+        return len(self.data_source)
+
+    def __len__(self) -> int:
+        return math.ceil(self.num_indices / self.num_replicas)
+
+    def set_epoch(self, epoch: int):
+        self.epoch = epoch
+        if hasattr(self.data_source, "set_epoch"):
+            # this is important for dataset
+            self.data_source.set_epoch(epoch)
+
+    def indices_at(self, positions: np.ndarray, epoch: int | None = None) -> np.ndarray:
+        """
+        Dataset indices at the given positions of the (unsharded) permutation of an epoch.
+
+        Args:
+            positions (np.ndarray): Positions in [0, len(dataset)).
+            epoch (int | None): The epoch, defaults to the current one.
+
+        Returns:
+            np.ndarray: The dataset indices, as int64.
+        """
+        positions = np.asarray(positions, dtype=np.uint64)
+        if not self.shuffle:
+            return positions.astype(np.int64)
+        epoch = self.epoch if epoch is None else epoch
+        n = self.num_indices
+        block_size = self.block_size
+        num_full_blocks = n // block_size
+        tail = n - num_full_blocks * block_size
+        epoch_key = _hash_key(self.seed, epoch)
+
+        # The shorter tail block is inserted at a pseudo-random slot among the full blocks
+        tail_slot = int(_hash_key(epoch_key, 1) % np.uint64(num_full_blocks + 1)) if tail else 0
+        tail_start = np.uint64(tail_slot * block_size)
+        in_tail = (positions >= tail_start) & (positions < tail_start + np.uint64(tail))
+        after_tail = positions >= tail_start + np.uint64(tail)
+        shifted = (
+            np.where(after_tail, positions - np.uint64(tail), positions) if tail else positions
+        )
+
+        # (the tail positions are computed separately below)
+        slots = np.where(in_tail, np.uint64(0), shifted // np.uint64(block_size))
+        offsets = shifted % np.uint64(block_size)
+        blocks = slots
+        if num_full_blocks > 1:
+            blocks = feistel_permute(slots, num_full_blocks, _hash_key(epoch_key, 2))
+        if block_size > 1:
+            block_keys = _mix64(blocks ^ _hash_key(epoch_key, 3))
+            offsets = feistel_permute(offsets, block_size, block_keys)
+        indices = blocks * np.uint64(block_size) + offsets
+        if tail and in_tail.any():
+            tail_offsets = positions[in_tail] - tail_start
+            if tail > 1:
+                tail_offsets = feistel_permute(tail_offsets, tail, _hash_key(epoch_key, 4))
+            indices[in_tail] = np.uint64(num_full_blocks * block_size) + tail_offsets
+        return indices.astype(np.int64)
+
+    def __iter__(self) -> Iterator[int]:
+        start = 0
+        if self._resume_epoch == self.epoch:
+            start = self._resume_start
+        self._resume_epoch = None
+        num_samples = len(self)
+        for chunk_start in range(start, num_samples, self.chunk_size):
+            local = np.arange(chunk_start, min(chunk_start + self.chunk_size, num_samples))
+            positions = (local * self.num_replicas + self.rank) % self.num_indices
+            yield from self.indices_at(positions).tolist()
+
+    def state_dict(self, num_consumed: int = 0) -> dict:
+        """
+        The state needed to resume this sampler's stream.
+
+        Args:
+            num_consumed (int): Number of indices of the current epoch already consumed by this rank.
+        """
+        return {
+            "seed": self.seed,
+            "shuffle": self.shuffle,
+            "block_size": self.block_size,
+            "num_replicas": self.num_replicas,
+            "num_indices": self.num_indices,
+            "epoch": self.epoch,
+            "num_consumed": num_consumed,
+        }
+
+    def load_state_dict(self, state: dict):
+        """Resume from a `state_dict`: the next iteration over `state["epoch"]` starts after the consumed indices."""
+        for key in ["seed", "shuffle", "block_size", "num_replicas", "num_indices"]:
+            current = self.num_indices if key == "num_indices" else getattr(self, key)
+            if state[key] != current:
+                raise ValueError(
+                    f"Cannot resume the sampler: {key}={state[key]} in the saved state, "
+                    f"but {current} in the current run"
+                )
+        self._resume_epoch = state["epoch"]
+        self._resume_start = state["num_consumed"]
@@ -0,0 +1,348 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Admission control and deadline-aware scheduling of the inference requests.
+
+A request can carry metadata, as top-level fields of the ZMQ request or of the HTTP payload:
+    - "client_id": a stable id of the client (e.g. the robot), which survives reconnections
+    - "timestamp": when the observation was captured, in seconds since the epoch (client clock)
+    - "deadline": when the action stops being useful, in seconds since the epoch (client clock)
+    - "priority": higher priorities are served first, 0 by default
+
+The deadline is converted to a budget relative to the timestamp, so that the client and server
+clocks need not be synchronized. Only `AdmissionConfig.max_age_ms` compares the timestamp with the
+server clock.
+
+A request that cannot be served is answered with an error and a "status" among
+`REJECTION_STATUSES`, which the clients raise as `RequestRejectedError`.
+"""
+
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Optional
+
+# Why a request was not served
+EXPIRED = "expired"
+BUSY = "busy"
+SUPERSEDED = "superseded"
+CANCELLED = "cancelled"
+REJECTION_STATUSES = (EXPIRED, BUSY, SUPERSEDED, CANCELLED)
+
+
+class RequestRejectedError(RuntimeError):
+    """A request rejected by the admission control of the server, e.g. expired or busy."""
+
+    def __init__(self, status: str, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class AdmissionConfig:
+    """Admission control of an inference server. The default admits and serves every request."""
+
+    max_queue_depth: Optional[int] = None
+    """Maximum number of requests waiting to be served, the following ones are answered "busy".
+    None for no limit."""
+
+    max_age_ms: Optional[float] = None
+    """Maximum age of an observation, from its client "timestamp" to the start of its serving.
+    Requires synchronized client and server clocks. None for no limit."""
+
+    default_timeout_ms: Optional[float] = None
+    """Maximum time a request without deadline waits to be served. None to wait indefinitely."""
+
+    newest_first: bool = False
+    """Only serve the newest `get_action` request of a client: a new observation supersedes the
+    ones of the same client still waiting."""
+
+
+@dataclass
+class RequestMetadata:
+    """The metadata of a request, see the module docstring."""
+
+    client_id: Optional[Hashable] = None
+    timestamp: Optional[float] = None
+    deadline: Optional[float] = None
+    priority: int = 0
+
+    @classmethod
+    def from_request(cls, request: dict) -> "RequestMetadata":
+        return cls(
+            client_id=request.get("client_id"),
+            timestamp=request.get("timestamp"),
+            deadline=request.get("deadline"),
+            priority=request.get("priority") or 0,
+        )
+
+    def to_request(self) -> dict:
+        """The request fields of the metadata that are set."""
+        fields = {
+            "client_id": self.client_id,
+            "timestamp": self.timestamp,
+            "deadline": self.deadline,
+            "priority": self.priority or None,
+        }
+        return {key: value for key, value in fields.items() if value is not None}
+
+
+@dataclass
+class AdmissionEntry:
+    """A request waiting in an `AdmissionQueue`."""
+
+    item: Any
+    client: Hashable
+    metadata: RequestMetadata
+    endpoint: str = "get_action"
+    received_at: float = field(default_factory=time.monotonic)
+    expires_at: Optional[float] = None
+    status: Optional[str] = None
+
+
+class AdmissionQueue:
+    """
+    The requests waiting to be served, with their admission control. Not thread-safe, see
+    `AdmissionController` for threaded servers.
+
+    The waiting requests are served by decreasing priority, then round robin across the clients
+    (the least recently served client first), then by earliest deadline. Expired requests are
+    dropped instead of being served.
+
+    Args:
+        config: The admission control configuration.
+    """
+
+    def __init__(self, config: Optional[AdmissionConfig] = None):
+        self.config = config or AdmissionConfig()
+        self.entries: list[AdmissionEntry] = []
+        self.counters = Counter()
+        self._last_served: dict[Hashable, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def make_entry(
+        self,
+        item: Any,
+        client: Hashable,
+        metadata: RequestMetadata,
+        endpoint: str = "get_action",
+        timeout_ms: Optional[float] = None,
+    ) -> AdmissionEntry:
+        """
+        Create the entry of a received request, with its expiry time on the server clock.
+
+        Args:
+            item: The request, as used by the server.
+            client: The client of the request, when the metadata has no client id.
+            metadata: The request metadata.
+            endpoint: The endpoint of the request.
+            timeout_ms: The maximum time the request waits to be served, defaults to
+                `default_timeout_ms` for the requests without deadline.
+        """
+        now = time.monotonic()
+        wall_now = time.time()
+        candidates = []
+        if metadata.deadline is not None:
+            # the budget of the client, independent of the clock offset between client and server
+            start = metadata.timestamp if metadata.timestamp is not None else wall_now
+            candidates.append(now + metadata.deadline - start)
+        if timeout_ms is None and metadata.deadline is None:
+            timeout_ms = self.config.default_timeout_ms
+        if timeout_ms is not None:
+            candidates.append(now + timeout_ms / 1000.0)
+        if self.config.max_age_ms is not None and metadata.timestamp is not None:
+            candidates.append(
+                now + self.config.max_age_ms / 1000.0 - (wall_now - metadata.timestamp)
+            )
+        return AdmissionEntry(
+            item=item,
+            client=metadata.client_id if metadata.client_id is not None else client,
+            metadata=metadata,
+            endpoint=endpoint,
+            received_at=now,
+            expires_at=min(candidates) if candidates else None,
+        )
+
+    def _reject(self, entry: AdmissionEntry, status: str) -> AdmissionEntry:
+        entry.status = status
+        self.counters[status] += 1
+        return entry
+
+    def push(self, entry: AdmissionEntry) -> list[AdmissionEntry]:
+        """
+        Admit a request.
+
+        Returns:
+            The rejected requests, possibly including this one, with their rejection status.
+        """
+        self.counters["received"] += 1
+        if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            return [self._reject(entry, EXPIRED)]
+
+        rejected = []
+        if self.config.newest_first and entry.endpoint == "get_action":
+            for other in self.entries:
+                if other.client == entry.client and other.endpoint == "get_action":
+                    rejected.append(self._reject(other, SUPERSEDED))
+            self.entries = [other for other in self.entries if other.status is None]
+
+        max_queue_depth = self.config.max_queue_depth
+        if max_queue_depth is not None and len(self.entries) >= max_queue_depth:
+            rejected.append(self._reject(entry, BUSY))
+        else:
+            self.entries.append(entry)
+        return rejected
+
+    def expire(self) -> list[AdmissionEntry]:
+        """
+        Drop the expired requests.
+
+        Returns:
+            The expired requests.
+        """
+        now = time.monotonic()
+        expired = [
+            self._reject(entry, EXPIRED)
+            for entry in self.entries
+            if entry.expires_at is not None and entry.expires_at <= now
+        ]
+        if expired:
+            self.entries = [entry for entry in self.entries if entry.status is None]
+        return expired
+
+    def remove(self, predicate: Callable[[AdmissionEntry], bool]) -> list[AdmissionEntry]:
+        """
+        Cancel the waiting requests matching a predicate.
+
+        Returns:
+            The cancelled requests.
+        """
+        cancelled = [self._reject(entry, CANCELLED) for entry in self.entries if predicate(entry)]
+        if cancelled:
+            self.entries = [entry for entry in self.entries if entry.status is None]
+        return cancelled
+
+    def _order(self, entry: AdmissionEntry):
+        return (
+            -entry.metadata.priority,
+            self._last_served.get(entry.client, 0.0),
+            entry.expires_at if entry.expires_at is not None else float("inf"),
+            entry.received_at,
+        )
+
+    def pop(
+        self, can_serve: Optional[Callable[[AdmissionEntry], bool]] = None
+    ) -> Optional[AdmissionEntry]:
+        """
+        Take the next request to serve. The expired requests are dropped by `expire` beforehand.
+
+        Args:
+            can_serve: Whether a request can be served now, e.g. whether its worker is idle.
+
+        Returns:
+            The request to serve, or None.
+        """
+        for entry in sorted(self.entries, key=self._order):
+            if can_serve is None or can_serve(entry):
+                self.entries.remove(entry)
+                self._last_served[entry.client] = time.monotonic()
+                self.counters["served"] += 1
+                return entry
+        return None
+
+    def forget_clients(self, max_idle_s: float):
+        """Forget the clients not served for `max_idle_s` seconds and without waiting request."""
+        now = time.monotonic()
+        waiting = {entry.client for entry in self.entries}
+        for client, last_served in list(self._last_served.items()):
+            if now - last_served > max_idle_s and client not in waiting:
+                del self._last_served[client]
+
+    def stats(self) -> dict:
+        """The load shedding counters and the queue depth."""
+        stats = {key: self.counters[key] for key in ("received", "served", *REJECTION_STATUSES)}
+        stats["queue_depth"] = len(self.entries)
+        return stats
+
+
+def rejection_reply(entry: AdmissionEntry) -> dict:
+    """The reply to a rejected request."""
+    waited_ms = (time.monotonic() - entry.received_at) * 1000.0
+    messages = {
+        EXPIRED: f"Request expired after waiting {waited_ms:.0f} ms",
+        BUSY: "Server busy, too many requests waiting",
+        SUPERSEDED: "Request superseded by a newer observation of the same client",
+        CANCELLED: "Request cancelled",
+    }
+    return {"error": messages[entry.status], "status": entry.status}
+
+
+class AdmissionController:
+    """
+    Thread-safe admission control for servers handling each request in its own thread (e.g. the
+    HTTP server), running one request at a time in the order of an `AdmissionQueue`.
+
+    Args:
+        config: The admission control configuration.
+    """
+
+    # Maximum wait between two checks of the expired requests, in seconds
+    poll_interval_s = 0.01
+
+    def __init__(self, config: Optional[AdmissionConfig] = None):
+        self.queue = AdmissionQueue(config)
+        self._condition = threading.Condition()
+        self._running = False
+
+    def stats(self) -> dict:
+        with self._condition:
+            return self.queue.stats()
+
+    @contextmanager
+    def admit(self, client: Hashable, metadata: RequestMetadata, endpoint: str = "get_action"):
+        """
+        Wait for the turn of a request, then run the body of the `with` statement.
+
+        Raises:
+            RequestRejectedError: If the request is rejected (busy, expired or superseded).
+        """
+        entry = self.queue.make_entry(None, client, metadata, endpoint)
+        with self._condition:
+            self.queue.push(entry)
+            self._condition.notify_all()
+            while entry.status is None:
+                if not self._running:
+                    self.queue.expire()
+                    next_entry = self.queue.pop()
+                    if next_entry is not None:
+                        next_entry.status = "running"
+                        self._running = True
+                        self._condition.notify_all()
+                        continue
+                self._condition.wait(timeout=self.poll_interval_s)
+            if entry.status != "running":
+                reply = rejection_reply(entry)
+                raise RequestRejectedError(entry.status, reply["error"])
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._running = False
+                self._condition.notify_all()
@@ -12,14 +12,21 @@ Dependencies:
 
 import json
 import logging
+import time
 import traceback
 from typing import Any, Dict, Optional
 
 import json_numpy
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 
+from gr00t.eval.admission import (
+    AdmissionConfig,
+    AdmissionController,
+    RequestMetadata,
+    RequestRejectedError,
+)
 from gr00t.model.policy import Gr00tPolicy
 
 # Patch json to handle numpy arrays
@@ -28,24 +35,43 @@ json_numpy.patch()
 
 class HTTPInferenceServer:
     def __init__(
-        self, policy: Gr00tPolicy, port: int, host: str = "0.0.0.0", api_token: Optional[str] = None
+        self,
+        policy: Gr00tPolicy,
+        port: int,
+        host: str = "0.0.0.0",
+        api_token: Optional[str] = None,
+        admission: Optional[AdmissionConfig] = None,
     ):
         """
         A simple HTTP server for GR00T models; exposes `/act` to predict an action for a given observation.
             => Takes in observation dict with numpy arrays
             => Returns action dict with numpy arrays
+
+        The policy runs one request at a time, in the order of the admission control. The payload
+        can carry the request metadata of `gr00t.eval.admission` next to the observation. A
+        rejected request (e.g. expired or busy) is answered with a 503 status and the rejection
+        status in the detail.
         """
         self.policy = policy
         self.port = port
         self.host = host
         self.api_token = api_token
+        self.admission = AdmissionController(admission)
         self.app = FastAPI(title="GR00T Inference Server", version="1.0.0")
 
         # Register endpoints
         self.app.post("/act")(self.predict_action)
+        self.app.post("/reset")(self.reset)
         self.app.get("/health")(self.health_check)
+        self.app.get("/stats")(self.stats)
+
+    @staticmethod
+    def _client(request: Optional[Request]):
+        if request is None or request.client is None:
+            return None
+        return f"{request.client.host}:{request.client.port}"
 
-    def predict_action(self, payload: Dict[str, Any]) -> JSONResponse:
+    def predict_action(self, payload: Dict[str, Any], request: Request = None) -> JSONResponse:
         """Predict action from observation."""
         try:
             # Handle double-encoded payloads (for compatibility)
@@ -61,12 +87,18 @@ class HTTPInferenceServer:
 
             obs = payload["observation"]
 
-            # Run inference
-            action = self.policy.get_action(obs)
+            # Run inference, when admitted
+            with self.admission.admit(self._client(request), RequestMetadata.from_request(payload)):
+                start = time.perf_counter()
+                action = self.policy.get_action(obs)
+            if payload.get("server_timing"):
+                action["server_timing"] = {"inference_ms": (time.perf_counter() - start) * 1000.0}
 
             # Return action as JSON with numpy arrays
             return JSONResponse(content=action)
 
+        except RequestRejectedError as e:
+            raise HTTPException(status_code=503, detail={"error": str(e), "status": e.status})
         except Exception as e:
             logging.error(traceback.format_exc())
             logging.warning(
@@ -76,6 +108,22 @@ class HTTPInferenceServer:
             )
             raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+    def reset(self, request: Request = None, model: Optional[str] = None) -> Dict[str, str]:
+        """
+        Reset the per-episode state of the policy, at an episode boundary. The `model` query
+        parameter selects the policy of a `PolicyHost`.
+        """
+        try:
+            with self.admission.admit(self._client(request), RequestMetadata(), endpoint="reset"):
+                self.policy.reset(**({} if model is None else {"model": model}))
+        except RequestRejectedError as e:
+            raise HTTPException(status_code=503, detail={"error": str(e), "status": e.status})
+        return {"status": "ok"}
+
+    def stats(self) -> Dict[str, int]:
+        """Load shedding counters of the admission control."""
+        return self.admission.stats()
+
     def health_check(self) -> Dict[str, str]:
         """Health check endpoint."""
         return {"status": "healthy", "model": "GR00T"}
@@ -85,12 +133,18 @@ class HTTPInferenceServer:
         print(f"Starting GR00T HTTP server on {self.host}:{self.port}")
         print("Available endpoints:")
         print("  POST /act - Get action prediction from observation")
+        print("  POST /reset - Reset the policy at an episode boundary (?model=<hosted policy>)")
         print("  GET  /health - Health check")
+        print("  GET  /stats - Load shedding counters")
         uvicorn.run(self.app, host=self.host, port=self.port)
 
 
 def create_http_server(
-    policy: Gr00tPolicy, port: int, host: str = "0.0.0.0", api_token: Optional[str] = None
+    policy: Gr00tPolicy,
+    port: int,
+    host: str = "0.0.0.0",
+    api_token: Optional[str] = None,
+    admission: Optional[AdmissionConfig] = None,
 ) -> HTTPInferenceServer:
     """Factory function to create an HTTP inference server."""
-    return HTTPInferenceServer(policy, port, host, api_token)
+    return HTTPInferenceServer(policy, port, host, api_token, admission)
@@ -0,0 +1,380 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Load testing of the ZMQ and HTTP inference servers.
+
+Simulated clients send observations at an open-loop target rate: the requests are sent on a fixed
+schedule whatever the latency of the previous ones, and their latency is measured from their
+scheduled send time. A saturated server thus shows up as growing latencies instead of a lower
+request rate (coordinated omission).
+
+The latency of every request is split into:
+    - serialize: encoding the request and decoding the reply on the client
+    - inference: the endpoint call on the server, reported with the "server_timing" request field
+    - network: the rest, i.e. the transport, the (de)serialization and the queueing on the server
+
+See `scripts/benchmark_inference_server.py` for the command line entry point, and `StubPolicy` to
+measure the serving overhead without model weights.
+"""
+
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Literal, Optional, Sequence
+
+import numpy as np
+import zmq
+
+from gr00t.data.dataset import ModalityConfig
+from gr00t.eval.service import MsgSerializer
+from gr00t.model.policy import BasePolicy
+from gr00t.utils.benchmark import StageTimer
+
+# Latency percentiles of the reports
+PERCENTILES = (50, 95, 99, 99.9)
+
+
+class StubPolicy(BasePolicy):
+    """
+    A policy returning zero actions after a fixed latency, to load test the servers on CPU without
+    model weights.
+
+    Args:
+        modality_config: The modality config of the policy, its action keys are returned.
+        action_dim: The dimension of every action key.
+        latency_ms: The time taken by every `get_action` call, sleeping like a policy waiting for
+            its GPU.
+    """
+
+    def __init__(
+        self, modality_config: Dict[str, ModalityConfig], action_dim: int = 7, latency_ms: float = 0
+    ):
+        self.modality_config = modality_config
+        self.action_dim = action_dim
+        self.latency_ms = latency_ms
+
+    def get_action(self, observations: Dict[str, Any]) -> Dict[str, Any]:
+        time.sleep(self.latency_ms / 1000.0)
+        action_config = self.modality_config["action"]
+        return {
+            key: np.zeros((len(action_config.delta_indices), self.action_dim), dtype=np.float32)
+            for key in action_config.modality_keys
+        }
+
+    def get_modality_config(self) -> Dict[str, ModalityConfig]:
+        return self.modality_config
+
+
+def synthetic_observations(
+    modality_config: Dict[str, ModalityConfig],
+    num_observations: int = 8,
+    image_size: tuple[int, int] = (256, 256),
+    state_dim: int = 7,
+    seed: int = 42,
+) -> list[dict]:
+    """
+    Random observations with the keys of a modality config, shaped like the unbatched
+    observations of `Gr00tPolicy.get_action`.
+
+    Args:
+        modality_config: The modality config of the policy.
+        num_observations: The number of different observations.
+        image_size: The (height, width) of the camera images.
+        state_dim: The dimension of every state key.
+        seed: The seed of the observations.
+    """
+    rng = np.random.default_rng(seed)
+    observations = []
+    for _ in range(num_observations):
+        observation = {}
+        for modality in ("video", "state", "language"):
+            config = modality_config.get(modality)
+            if config is None:
+                continue
+            horizon = len(config.delta_indices)
+            for key in config.modality_keys:
+                if modality == "video":
+                    shape = (horizon, *image_size, 3)
+                    observation[key] = rng.integers(0, 256, shape, dtype=np.uint8)
+                elif modality == "state":
+                    observation[key] = rng.random((horizon, state_dim))
+                else:
+                    observation[key] = ["do your thing!"]
+        observations.append(observation)
+    return observations
+
+
+def recorded_observations(dataset, num_observations: int = 8) -> list[dict]:
+    """
+    Observations replayed from a dataset without transforms (see `scripts/eval_policy.py`), evenly
+    spaced across the dataset.
+
+    Args:
+        dataset (LeRobotSingleDataset): The dataset to replay.
+        num_observations: The number of observations.
+    """
+    indices = np.linspace(0, len(dataset) - 1, num_observations).astype(int)
+    return [
+        {key: value for key, value in dataset[index].items() if not key.startswith("action.")}
+        for index in indices
+    ]
+
+
+@dataclass
+class LoadTestConfig:
+    """A load test of an inference server."""
+
+    protocol: Literal["zmq", "http"] = "zmq"
+    """The protocol of the server."""
+
+    host: str = "localhost"
+    """The host of the server."""
+
+    port: int = 5555
+    """The port of the server."""
+
+    api_token: Optional[str] = None
+    """The API token of the ZMQ server."""
+
+    num_clients: int = 4
+    """The number of simulated clients, each with its own connection."""
+
+    rate_hz: float = 10.0
+    """The target request rate of all the clients together, in requests per second."""
+
+    duration_s: float = 10.0
+    """The duration of the measured requests schedule."""
+
+    warmup_s: float = 1.0
+    """The duration of the requests schedule before the measured one, excluded from the report."""
+
+    poisson: bool = False
+    """Whether to send the requests at Poisson arrival times instead of evenly spaced ones."""
+
+    drain_timeout_s: float = 10.0
+    """How long to wait for the replies after the end of the schedule."""
+
+    max_in_flight: int = 64
+    """The maximum number of requests in flight per HTTP client (one thread per request)."""
+
+    seed: int = 42
+    """The seed of the Poisson arrival times."""
+
+
+def _schedule(config: LoadTestConfig, client: int, start: float) -> np.ndarray:
+    """The send times of the requests of a client, on the `time.perf_counter` clock."""
+    client_rate_hz = config.rate_hz / config.num_clients
+    end = start + config.warmup_s + config.duration_s
+    if config.poisson:
+        rng = np.random.default_rng(config.seed + client)
+        num_requests = int(math.ceil(client_rate_hz * (end - start) * 2)) + 16
+        times = start + np.cumsum(rng.exponential(1.0 / client_rate_hz, num_requests))
+    else:
+        # the clients are evenly staggered
+        offset = client / config.rate_hz
+        times = start + offset + np.arange(0.0, end - start, 1.0 / client_rate_hz)
+    return times[times < end]
+
+
+class _Recorder:
+    """The outcome of the requests of all the clients, thread-safe."""
+
+    def __init__(self, measure_from: float):
+        self.measure_from = measure_from
+        self.timer = StageTimer()
+        self.errors: dict[str, int] = {}
+        self.sent = 0
+        self.completed = 0
+        self.unanswered = 0
+        self.last_reply = measure_from
+        self._lock = threading.Lock()
+
+    def measured(self, scheduled: float) -> bool:
+        return scheduled >= self.measure_from
+
+    def record_sent(self, scheduled: float):
+        if self.measured(scheduled):
+            with self._lock:
+                self.sent += 1
+
+    def record_reply(self, scheduled: float, total: float, serialize: float, reply: dict):
+        if not self.measured(scheduled):
+            return
+        with self._lock:
+            self.last_reply = max(self.last_reply, scheduled + total)
+            if "error" in reply:
+                status = reply.get("status", "error")
+                self.errors[status] = self.errors.get(status, 0) + 1
+                return
+            self.completed += 1
+            inference = reply.get("server_timing", {}).get("inference_ms", 0.0) / 1000.0
+            self.timer.add("total", total)
+            self.timer.add("serialize", serialize)
+            self.timer.add("inference", inference)
+            self.timer.add("network", total - serialize - inference)
+
+    def record_unanswered(self, scheduled: float):
+        if self.measured(scheduled):
+            with self._lock:
+                self.unanswered += 1
+
+
+def _zmq_client(
+    config: LoadTestConfig, observations: Sequence[dict], schedule: np.ndarray, recorder: _Recorder
+):
+    """
+    Send the requests of a client on a DEALER socket, with as many requests in flight as needed.
+    The replies are matched with their request by "request_id", and the error replies (which have
+    none) with the oldest request in flight.
+    """
+    socket = zmq.Context.instance().socket(zmq.DEALER)
+    socket.setsockopt(zmq.LINGER, 0)
+    socket.connect(f"tcp://{config.host}:{config.port}")
+    in_flight: dict[int, tuple[float, float]] = {}
+    drain_deadline = (schedule[-1] if len(schedule) else 0.0) + config.drain_timeout_s
+    index = 0
+    try:
+        while index < len(schedule) or in_flight:
+            now = time.perf_counter()
+            if index < len(schedule) and schedule[index] <= now:
+                request = {
+                    "endpoint": "get_action",
+                    "data": observations[index % len(observations)],
+                    "request_id": index,
+                    "server_timing": True,
+                }
+                if config.api_token:
+                    request["api_token"] = config.api_token
+                start = time.perf_counter()
+                message = MsgSerializer.to_bytes(request)
+                in_flight[index] = (schedule[index], time.perf_counter() - start)
+                # the empty delimiter frame of a REQ socket, for the REP and ROUTER servers
+                socket.send_multipart([b"", message])
+                recorder.record_sent(schedule[index])
+                index += 1
+                continue
+            if now > drain_deadline:
+                break
+
+            next_event = schedule[index] if index < len(schedule) else drain_deadline
+            if not socket.poll(max(int(math.ceil((next_event - now) * 1000.0)), 0)):
+                continue
+            message = socket.recv_multipart()[-1]
+            received = time.perf_counter()
+            reply = MsgSerializer.from_bytes(message)
+            deserialize = time.perf_counter() - received
+
+            request_id = reply.get("server_timing", {}).get("request_id")
+            if request_id not in in_flight:
+                request_id = min(in_flight)
+            scheduled, serialize = in_flight.pop(request_id)
+            recorder.record_reply(scheduled, received - scheduled, serialize + deserialize, reply)
+    finally:
+        for scheduled, _ in in_flight.values():
+            recorder.record_unanswered(scheduled)
+        socket.close()
+
+
+def _http_client(
+    config: LoadTestConfig, observations: Sequence[dict], schedule: np.ndarray, recorder: _Recorder
+):
+    """Send the requests of a client on the `/act` endpoint, each in a thread of a pool."""
+    import json_numpy
+    import requests
+
+    url = f"http://{config.host}:{config.port}/act"
+    sessions = threading.local()
+
+    def call(scheduled: float, observation: dict):
+        if not hasattr(sessions, "session"):
+            sessions.session = requests.Session()
+        start = time.perf_counter()
+        payload = json_numpy.dumps({"observation": observation, "server_timing": True})
+        serialize = time.perf_counter() - start
+        try:
+            response = sessions.session.post(
+                url,
+                data=payload,
+                headers={"Content-Type": "application/json"},
+                timeout=config.drain_timeout_s,
+            )
+        except requests.RequestException:
+            recorder.record_unanswered(scheduled)
+            return
+        received = time.perf_counter()
+        reply = json_numpy.loads(response.content)
+        serialize += time.perf_counter() - received
+        if response.status_code != 200:
+            detail = reply.get("detail")
+            reply = detail if isinstance(detail, dict) else {"error": str(detail)}
+        recorder.record_reply(scheduled, received - scheduled, serialize, reply)
+
+    with ThreadPoolExecutor(max_workers=config.max_in_flight) as executor:
+        for index, scheduled in enumerate(schedule):
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(call, scheduled, observations[index % len(observations)])
+            recorder.record_sent(scheduled)
+
+
+def run_load_test(config: LoadTestConfig, observations: Sequence[dict]) -> dict:
+    """
+    Run a load test of a running server.
+
+    Args:
+        config: The load test.
+        observations: The observations sent round robin by every client.
+
+    Returns:
+        dict: The request counts, the throughput of the completed requests and the latency
+            summary of every part of the requests (in milliseconds, see the module docstring).
+    """
+    assert config.num_clients > 0 and config.rate_hz > 0, "Invalid load test config"
+    assert len(observations) > 0, "No observations to send"
+    client_fn = {"zmq": _zmq_client, "http": _http_client}[config.protocol]
+
+    start = time.perf_counter() + 0.1
+    recorder = _Recorder(measure_from=start + config.warmup_s)
+    threads = [
+        threading.Thread(
+            target=client_fn,
+            args=(config, observations, _schedule(config, client, start), recorder),
+            daemon=True,
+        )
+        for client in range(config.num_clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "protocol": config.protocol,
+        "num_clients": config.num_clients,
+        "target_rate_hz": config.rate_hz,
+        "duration_s": config.duration_s,
+        "sent": recorder.sent,
+        "completed": recorder.completed,
+        "errors": recorder.errors,
+        "unanswered": recorder.unanswered,
+        # over the time to the last reply, which exceeds the schedule once the server saturates
+        "throughput_hz": recorder.completed
+        / max(recorder.last_reply - recorder.measure_from, config.duration_s),
+        "latency": recorder.timer.summary(percentiles=PERCENTILES),
+    }
@@ -13,28 +13,128 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Sequence
 
 from gr00t.data.dataset import ModalityConfig
-from gr00t.eval.service import BaseInferenceClient, BaseInferenceServer
+from gr00t.eval.admission import AdmissionConfig
+from gr00t.eval.service import (
+    BaseInferenceClient,
+    BaseInferenceServer,
+    RouterInferenceServer,
+)
 from gr00t.model.policy import BasePolicy
 
 
+def _model_kwargs(data: Optional[dict]) -> dict:
+    """
+    The policy of a request, for the servers of a `PolicyHost`: the "model" of the request data,
+    see `RobotInferenceClient(model=...)`.
+    """
+    model = (data or {}).get("model")
+    return {} if model is None else {"model": model}
+
+
 class RobotInferenceServer(BaseInferenceServer):
     """
-    Server with three endpoints for real robot policies
+    Server with four endpoints for real robot policies
     """
 
-    def __init__(self, model, host: str = "*", port: int = 5555, api_token: str = None):
-        super().__init__(host, port, api_token)
+    def __init__(
+        self,
+        model,
+        host: str = "*",
+        port: int = 5555,
+        api_token: str = None,
+        admission: Optional[AdmissionConfig] = None,
+    ):
+        super().__init__(host, port, api_token, admission)
+        self.model = model
         self.register_endpoint("get_action", model.get_action)
-        self.register_endpoint(
-            "get_modality_config", model.get_modality_config, requires_input=False
+        self.register_endpoint("get_modality_config", self._handle_get_modality_config)
+        self.register_endpoint("reset", self._handle_reset)
+
+    def _handle_get_modality_config(self, data: Optional[dict] = None) -> dict:
+        return self.model.get_modality_config(**_model_kwargs(data))
+
+    def _handle_reset(self, data: Optional[dict] = None) -> dict:
+        """
+        Reset the per-episode state of the policy, at an episode boundary.
+        """
+        self.model.reset(**_model_kwargs(data))
+        return {"status": "ok"}
+
+    @staticmethod
+    def start_server(
+        policy: BasePolicy,
+        port: int,
+        api_token: str = None,
+        admission: Optional[AdmissionConfig] = None,
+    ):
+        server = RobotInferenceServer(policy, port=port, api_token=api_token, admission=admission)
+        server.run()
+
+
+class MultiWorkerRobotInferenceServer(RouterInferenceServer):
+    """
+    `RobotInferenceServer` with a worker per policy replica, see `RouterInferenceServer`. The
+    replicas are typically loaded from the same checkpoint, one per worker.
+    """
+
+    def __init__(
+        self,
+        models: Sequence[BasePolicy],
+        host: str = "*",
+        port: int = 5555,
+        api_token: str = None,
+        admission: Optional[AdmissionConfig] = None,
+        sticky_clients: bool = False,
+    ):
+        super().__init__(
+            host,
+            port,
+            api_token,
+            num_workers=len(models),
+            admission=admission,
+            sticky_clients=sticky_clients,
         )
+        self.models = list(models)
+        for worker, model in enumerate(self.models):
+            self.register_endpoint("get_action", model.get_action, worker=worker)
+            self.register_endpoint(
+                "get_modality_config", self._modality_config_handler(model), worker=worker
+            )
+            self.register_endpoint("reset", self._reset_handler(model), worker=worker)
+
+    @staticmethod
+    def _modality_config_handler(model: BasePolicy):
+        def handle_get_modality_config(data: Optional[dict] = None) -> dict:
+            return model.get_modality_config(**_model_kwargs(data))
+
+        return handle_get_modality_config
+
+    @staticmethod
+    def _reset_handler(model: BasePolicy):
+        def handle_reset(data: Optional[dict] = None) -> dict:
+            model.reset(**_model_kwargs(data))
+            return {"status": "ok"}
+
+        return handle_reset
 
     @staticmethod
-    def start_server(policy: BasePolicy, port: int, api_token: str = None):
-        server = RobotInferenceServer(policy, port=port, api_token=api_token)
+    def start_server(
+        policies: Sequence[BasePolicy],
+        port: int,
+        api_token: str = None,
+        admission: Optional[AdmissionConfig] = None,
+        sticky_clients: bool = False,
+    ):
+        server = MultiWorkerRobotInferenceServer(
+            policies,
+            port=port,
+            api_token=api_token,
+            admission=admission,
+            sticky_clients=sticky_clients,
+        )
         server.run()
 
 
@@ -43,11 +143,43 @@ class RobotInferenceClient(BaseInferenceClient, BasePolicy):
     Client for communicating with the RealRobotServer
     """
 
-    def __init__(self, host: str = "localhost", port: int = 5555, api_token: str = None):
-        super().__init__(host=host, port=port, api_token=api_token)
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 5555,
+        api_token: str = None,
+        client_id: Optional[str] = None,
+        deadline_ms: Optional[float] = None,
+        priority: int = 0,
+        model: Optional[str] = None,
+    ):
+        """
+        Args:
+            model: The hosted policy of the requests (actions, modality config and resets), when
+                the server hosts several, see `PolicyHost`.
+
+        See `BaseInferenceClient` for the other arguments.
+        """
+        super().__init__(
+            host=host,
+            port=port,
+            api_token=api_token,
+            client_id=client_id,
+            deadline_ms=deadline_ms,
+            priority=priority,
+        )
+        self.model = model
 
     def get_action(self, observations: Dict[str, Any]) -> Dict[str, Any]:
+        if self.model is not None:
+            observations = {**observations, "model": self.model}
         return self.call_endpoint("get_action", observations)
 
+    def _model_data(self) -> dict:
+        return {} if self.model is None else {"model": self.model}
+
     def get_modality_config(self) -> Dict[str, ModalityConfig]:
-        return self.call_endpoint("get_modality_config", requires_input=False)
+        return self.call_endpoint("get_modality_config", self._model_data())
+
+    def reset(self) -> None:
+        self.call_endpoint("reset", self._model_data())
@@ -15,14 +15,27 @@
 
 import io
 import json
+import queue
+import threading
+import time
+import traceback
 from dataclasses import dataclass
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Hashable, Optional
 
 import msgpack
 import numpy as np
 import zmq
 
 from gr00t.data.dataset import ModalityConfig
+from gr00t.eval.admission import (
+    REJECTION_STATUSES,
+    AdmissionConfig,
+    AdmissionEntry,
+    AdmissionQueue,
+    RequestMetadata,
+    RequestRejectedError,
+    rejection_reply,
+)
 
 
 class MsgSerializer:
@@ -65,17 +78,31 @@ class BaseInferenceServer:
     Can add custom endpoints by calling `register_endpoint`.
     """
 
-    def __init__(self, host: str = "*", port: int = 5555, api_token: str = None):
+    socket_type = zmq.REP
+    # Endpoints answered without admission control
+    server_endpoints = ("ping", "kill", "stats")
+
+    def __init__(
+        self,
+        host: str = "*",
+        port: int = 5555,
+        api_token: str = None,
+        admission: Optional[AdmissionConfig] = None,
+    ):
         self.running = True
         self.context = zmq.Context()
-        self.socket = self.context.socket(zmq.REP)
+        self.socket = self.context.socket(self.socket_type)
         self.socket.bind(f"tcp://{host}:{port}")
         self._endpoints: dict[str, EndpointHandler] = {}
         self.api_token = api_token
+        # The requests are served one at a time as they are received, only the expired ones are
+        # dropped
+        self.admission = AdmissionQueue(admission)
 
         # Register the ping endpoint by default
         self.register_endpoint("ping", self._handle_ping, requires_input=False)
         self.register_endpoint("kill", self._kill_server, requires_input=False)
+        self.register_endpoint("stats", self._handle_stats, requires_input=False)
 
     def _kill_server(self):
         """
@@ -89,6 +116,12 @@ class BaseInferenceServer:
         """
         return {"status": "ok", "message": "Server is running"}
 
+    def _handle_stats(self) -> dict:
+        """
+        The load shedding counters of the admission control, see `AdmissionQueue.stats`.
+        """
+        return self.admission.stats()
+
     def register_endpoint(self, name: str, handler: Callable, requires_input: bool = True):
         """
         Register a new endpoint to the server.
@@ -108,6 +141,41 @@ class BaseInferenceServer:
             return True  # No token required
         return request.get("api_token") == self.api_token
 
+    def _call_endpoint(self, request: dict, endpoints: dict[str, EndpointHandler] | None = None):
+        """
+        Call the endpoint of a request.
+
+        A request with "server_timing" set gets the endpoint call time and its "request_id" in the
+        "server_timing" entry of a dict result, e.g. for the load tests of `gr00t.eval.load_test`.
+
+        Args:
+            request: The deserialized request.
+            endpoints: The endpoints to look the request endpoint up in, defaults to the registered
+                endpoints.
+        """
+        endpoints = self._endpoints if endpoints is None else endpoints
+        endpoint = request.get("endpoint", "get_action")
+
+        if endpoint not in endpoints:
+            raise ValueError(f"Unknown endpoint: {endpoint}")
+
+        handler = endpoints[endpoint]
+        start = time.perf_counter()
+        result = (
+            handler.handler(request.get("data", {}))
+            if handler.requires_input
+            else handler.handler()
+        )
+        if request.get("server_timing") and isinstance(result, dict):
+            result = {
+                **result,
+                "server_timing": {
+                    "request_id": request.get("request_id"),
+                    "inference_ms": (time.perf_counter() - start) * 1000.0,
+                },
+            }
+        return result
+
     def run(self):
         addr = self.socket.getsockopt_string(zmq.LAST_ENDPOINT)
         print(f"Server is ready and listening on {addr}")
@@ -124,16 +192,21 @@ class BaseInferenceServer:
                     continue
 
                 endpoint = request.get("endpoint", "get_action")
+                if endpoint not in self.server_endpoints:
+                    entry = self.admission.make_entry(
+                        request,
+                        None,
+                        RequestMetadata.from_request(request),
+                        endpoint,
+                        timeout_ms=request.get("timeout_ms"),
+                    )
+                    rejected = self.admission.push(entry)
+                    if rejected:
+                        self.socket.send(MsgSerializer.to_bytes(rejection_reply(rejected[0])))
+                        continue
+                    self.admission.pop()
 
-                if endpoint not in self._endpoints:
-                    raise ValueError(f"Unknown endpoint: {endpoint}")
-
-                handler = self._endpoints[endpoint]
-                result = (
-                    handler.handler(request.get("data", {}))
-                    if handler.requires_input
-                    else handler.handler()
-                )
+                result = self._call_endpoint(request)
                 self.socket.send(MsgSerializer.to_bytes(result))
             except Exception as e:
                 print(f"Error in server: {e}")
@@ -143,6 +216,235 @@ class BaseInferenceServer:
                 self.socket.send(MsgSerializer.to_bytes({"error": str(e)}))
 
 
+@dataclass
+class PendingRequest:
+    """A request received by the `RouterInferenceServer`, waiting for a worker."""
+
+    client: bytes
+    envelope: list[bytes]
+    request: dict
+
+
+class RouterInferenceServer(BaseInferenceServer):
+    """
+    An inference server with a ROUTER socket and a pool of worker threads, each calling its own
+    endpoints (e.g. its own policy replica). It is wire-compatible with the REQ clients of
+    `BaseInferenceClient`, and also serves DEALER clients with several requests in flight.
+
+    - The "ping", "kill", "stats" and "cancel" endpoints are answered by the server thread, the
+      others by the workers, so that a slow request only occupies its worker.
+    - The waiting requests are admitted and ordered by an `AdmissionQueue`: by priority, then
+      round robin across the clients, so a client sending many requests does not delay the
+      others, then by deadline. A request expiring while it waits ("deadline" or "timeout_ms" in
+      the request) is answered with an error instead of being run.
+    - A queued request sent with a "request_id" can be cancelled by the same client with the
+      "cancel" endpoint and `{"request_id": ...}` data. A running request cannot be interrupted.
+
+    Args:
+        host: The host to bind the ROUTER socket on.
+        port: The port to bind the ROUTER socket on.
+        api_token: API token for authentication, disabled when None.
+        num_workers: Number of worker threads.
+        admission: The admission control of the requests, see `AdmissionConfig`.
+        sticky_clients: Always run the requests of a client on the same worker, for policies
+            keeping per-episode state (e.g. the backbone cache).
+    """
+
+    socket_type = zmq.ROUTER
+    # Endpoints answered by the server thread
+    server_endpoints = BaseInferenceServer.server_endpoints + ("cancel",)
+    # Forget a client not seen for this long, in seconds
+    client_expiry_s = 600.0
+
+    def __init__(
+        self,
+        host: str = "*",
+        port: int = 5555,
+        api_token: str = None,
+        num_workers: int = 1,
+        admission: Optional[AdmissionConfig] = None,
+        sticky_clients: bool = False,
+    ):
+        super().__init__(host, port, api_token, admission)
+        assert num_workers > 0, f"Invalid number of workers {num_workers}"
+        self.num_workers = num_workers
+        self.sticky_clients = sticky_clients
+        self._worker_endpoints: list[dict[str, EndpointHandler]] = [{} for _ in range(num_workers)]
+
+        # The workers send their replies back to the server thread, which owns the ROUTER socket
+        self._results_address = f"inproc://router-server-results-{id(self)}"
+        self._results = self.context.socket(zmq.PULL)
+        self._results.bind(self._results_address)
+        self._tasks: list[queue.Queue] = [queue.Queue(maxsize=1) for _ in range(num_workers)]
+        self._idle_workers = set(range(num_workers))
+        self._client_workers: dict[Hashable, int] = {}
+        self._client_last_seen: dict[Hashable, float] = {}
+        self._workers: list[threading.Thread] = []
+
+    def register_endpoint(
+        self,
+        name: str,
+        handler: Callable,
+        requires_input: bool = True,
+        worker: Optional[int] = None,
+    ):
+        """
+        Register a new endpoint to the server.
+
+        Args:
+            name: The name of the endpoint.
+            handler: The handler function that will be called when the endpoint is hit.
+            requires_input: Whether the handler requires input data.
+            worker: The worker calling this handler, e.g. with its own policy replica. When None,
+                the handler is shared by all the workers and must be thread-safe.
+        """
+        if worker is None:
+            super().register_endpoint(name, handler, requires_input)
+        else:
+            self._worker_endpoints[worker][name] = EndpointHandler(handler, requires_input)
+
+    def _reply(self, client: bytes, envelope: list[bytes], result):
+        self.socket.send_multipart([client, *envelope, MsgSerializer.to_bytes(result)])
+
+    def _reply_rejected(self, entries: list[AdmissionEntry]):
+        for entry in entries:
+            self._reply(entry.item.client, entry.item.envelope, rejection_reply(entry))
+
+    def _cancel(self, client: bytes, request_id) -> bool:
+        cancelled = self.admission.remove(
+            lambda entry: entry.item.client == client
+            and entry.item.request.get("request_id") == request_id
+        )
+        self._reply_rejected(cancelled)
+        return len(cancelled) > 0
+
+    def _receive(self):
+        frames = self.socket.recv_multipart()
+        client, envelope = frames[0], frames[1:-1]
+        try:
+            request = MsgSerializer.from_bytes(frames[-1])
+            if not self._validate_token(request):
+                self._reply(client, envelope, {"error": "Unauthorized: Invalid API token"})
+                return
+            endpoint = request.get("endpoint", "get_action")
+            if endpoint == "cancel":
+                cancelled = self._cancel(client, request.get("data", {}).get("request_id"))
+                self._reply(client, envelope, {"status": "ok", "cancelled": cancelled})
+                return
+            if endpoint in self.server_endpoints:
+                self._reply(client, envelope, self._call_endpoint(request))
+                return
+            entry = self.admission.make_entry(
+                PendingRequest(client, envelope, request),
+                client,
+                RequestMetadata.from_request(request),
+                endpoint,
+                timeout_ms=request.get("timeout_ms"),
+            )
+        except Exception as e:
+            print(f"Error in server: {e}")
+            print(traceback.format_exc())
+            self._reply(client, envelope, {"error": str(e)})
+            return
+
+        self._reply_rejected(self.admission.push(entry))
+        self._client_last_seen[entry.client] = time.monotonic()
+
+    def _expire(self):
+        self._reply_rejected(self.admission.expire())
+        now = time.monotonic()
+        for client, last_seen in list(self._client_last_seen.items()):
+            if now - last_seen > self.client_expiry_s:
+                del self._client_last_seen[client]
+                self._client_workers.pop(client, None)
+        self.admission.forget_clients(self.client_expiry_s)
+
+    def _worker_for(self, client: Hashable) -> Optional[int]:
+        if not self.sticky_clients:
+            return next(iter(self._idle_workers), None)
+        if client not in self._client_workers:
+            # the worker with the fewest clients
+            num_clients = [0] * self.num_workers
+            for worker in self._client_workers.values():
+                num_clients[worker] += 1
+            self._client_workers[client] = min(range(self.num_workers), key=num_clients.__getitem__)
+        worker = self._client_workers[client]
+        return worker if worker in self._idle_workers else None
+
+    def _dispatch(self):
+        while self._idle_workers:
+            entry = self.admission.pop(lambda entry: self._worker_for(entry.client) is not None)
+            if entry is None:
+                return
+            worker = self._worker_for(entry.client)
+            self._idle_workers.remove(worker)
+            self._tasks[worker].put(entry.item)
+
+    def _worker_loop(self, worker: int):
+        results = self.context.socket(zmq.PUSH)
+        results.connect(self._results_address)
+        endpoints = {**self._endpoints, **self._worker_endpoints[worker]}
+        while True:
+            item = self._tasks[worker].get()
+            if item is None:
+                break
+            try:
+                result = MsgSerializer.to_bytes(self._call_endpoint(item.request, endpoints))
+            except Exception as e:
+                print(f"Error in worker {worker}: {e}")
+                print(traceback.format_exc())
+                result = MsgSerializer.to_bytes({"error": str(e)})
+            results.send_multipart([str(worker).encode(), item.client, *item.envelope, result])
+        results.close()
+
+    def _forward_results(self, timeout_ms: int = 0):
+        """Send the replies of the workers to their clients, waiting up to `timeout_ms` for each."""
+        while self._results.poll(timeout_ms):
+            worker, *reply = self._results.recv_multipart()
+            self.socket.send_multipart(reply)
+            self._idle_workers.add(int(worker))
+
+    def run(self):
+        addr = self.socket.getsockopt_string(zmq.LAST_ENDPOINT)
+        print(f"Server is ready and listening on {addr} with {self.num_workers} workers")
+        self._workers = [
+            threading.Thread(target=self._worker_loop, args=(worker,), daemon=True)
+            for worker in range(self.num_workers)
+        ]
+        for thread in self._workers:
+            thread.start()
+
+        poller = zmq.Poller()
+        poller.register(self.socket, zmq.POLLIN)
+        poller.register(self._results, zmq.POLLIN)
+        while self.running:
+            events = dict(poller.poll(timeout=10))
+            if self._results in events:
+                self._forward_results()
+            if self.socket in events:
+                self._receive()
+                while self.running and self.socket.poll(0):
+                    self._receive()
+            self._expire()
+            self._dispatch()
+
+        # answer every waiting client before closing the socket, instead of leaving it to its own
+        # timeout: the received and queued requests are cancelled, the running ones are finished
+        drain_until = time.monotonic() + 0.1
+        while self.socket.poll(0) and time.monotonic() < drain_until:
+            self._receive()
+        self._reply_rejected(self.admission.remove(lambda entry: True))
+        for tasks in self._tasks:
+            tasks.put(None)
+        for thread in self._workers:
+            thread.join()
+        self._forward_results(timeout_ms=10)
+        self._results.close()
+        # leave the last replies some time to be sent
+        self.socket.close(linger=1000)
+        self.context.term()
+
+
 class BaseInferenceClient:
     def __init__(
         self,
@@ -150,12 +452,30 @@ class BaseInferenceClient:
         port: int = 5555,
         timeout_ms: int = 15000,
         api_token: str = None,
+        client_id: Optional[str] = None,
+        deadline_ms: Optional[float] = None,
+        priority: int = 0,
     ):
+        """
+        Args:
+            host: The server host.
+            port: The server port.
+            timeout_ms: Unused, kept for compatibility.
+            api_token: API token for authentication.
+            client_id: A stable id of the client (e.g. the robot), sent with each request for the
+                admission control of the server, see `gr00t.eval.admission`.
+            deadline_ms: Time after which the result of a request stops being useful, from its
+                sending. The server drops the request instead of serving it late.
+            priority: Priority of the requests, higher ones are served first.
+        """
         self.context = zmq.Context()
         self.host = host
         self.port = port
         self.timeout_ms = timeout_ms
         self.api_token = api_token
+        self.client_id = client_id
+        self.deadline_ms = deadline_ms
+        self.priority = priority
         self._init_socket()
 
     def _init_socket(self):
@@ -177,6 +497,12 @@ class BaseInferenceClient:
         """
         self.call_endpoint("kill", requires_input=False)
 
+    def stats(self) -> dict:
+        """
+        The load shedding counters of the server, see `AdmissionQueue.stats`.
+        """
+        return self.call_endpoint("stats", requires_input=False)
+
     def call_endpoint(
         self, endpoint: str, data: dict | None = None, requires_input: bool = True
     ) -> dict:
@@ -193,12 +519,24 @@ class BaseInferenceClient:
             request["data"] = data
         if self.api_token:
             request["api_token"] = self.api_token
+        timestamp = time.time()
+        metadata = RequestMetadata(
+            client_id=self.client_id,
+            timestamp=timestamp,
+            deadline=(
+                timestamp + self.deadline_ms / 1000.0 if self.deadline_ms is not None else None
+            ),
+            priority=self.priority,
+        )
+        request.update(metadata.to_request())
 
         self.socket.send(MsgSerializer.to_bytes(request))
         message = self.socket.recv()
         response = MsgSerializer.from_bytes(message)
 
         if "error" in response:
+            if response.get("status") in REJECTION_STATUSES:
+                raise RequestRejectedError(response["status"], f"Server error: {response['error']}")
             raise RuntimeError(f"Server error: {response['error']}")
         return response
 
@@ -12,6 +12,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import atexit
 import time
 from dataclasses import dataclass, field
 from functools import partial
@@ -28,6 +29,7 @@ from robocasa.utils.gym_utils import GrootRoboCasaEnv  # noqa: F401
 
 from gr00t.data.dataset import ModalityConfig
 from gr00t.eval.service import BaseInferenceClient
+from gr00t.eval.vector_env import SharedMemoryVectorEnv
 from gr00t.eval.wrappers.multistep_wrapper import MultiStepWrapper
 from gr00t.eval.wrappers.video_recording_wrapper import (
     VideoRecorder,
@@ -75,6 +77,35 @@ class SimulationConfig:
     n_envs: int = 1
     video: VideoConfig = field(default_factory=VideoConfig)
     multistep: MultiStepConfig = field(default_factory=MultiStepConfig)
+    vector_env_backend: str = "async"
+    """
+    How parallel environments are run when n_envs > 1:
+    - "async": gymnasium AsyncVectorEnv, observations are pickled through pipes.
+    - "shared_memory": SharedMemoryVectorEnv, video/state arrays are returned through shared memory.
+    """
+    persistent_workers: bool = False
+    """Keep the environment workers alive after `run_simulation` so later runs reuse them."""
+
+
+# Vector envs kept alive between simulation runs, keyed by `_env_pool_key`
+_ENV_POOL: Dict[str, gym.vector.VectorEnv] = {}
+
+
+def _env_pool_key(config: SimulationConfig) -> str:
+    # n_episodes does not change the environments, everything else does
+    return repr(
+        (config.env_name, config.n_envs, config.video, config.multistep, config.vector_env_backend)
+    )
+
+
+def close_env_pools():
+    """Close all the persistent environment workers."""
+    for env in _ENV_POOL.values():
+        env.close()
+    _ENV_POOL.clear()
+
+
+atexit.register(close_env_pools)
 
 
 class SimulationInferenceClient(BaseInferenceClient, BasePolicy):
@@ -106,12 +137,25 @@ class SimulationInferenceClient(BaseInferenceClient, BasePolicy):
         # Create vector environment (sync for single env, async for multiple)
         if config.n_envs == 1:
             return gym.vector.SyncVectorEnv(env_fns)
-        else:
+        elif config.vector_env_backend == "shared_memory":
+            return SharedMemoryVectorEnv(env_fns, context="spawn")
+        elif config.vector_env_backend == "async":
             return gym.vector.AsyncVectorEnv(
                 env_fns,
                 shared_memory=False,
                 context="spawn",
             )
+        else:
+            raise ValueError(f"Unknown vector env backend: {config.vector_env_backend}")
+
+    def _acquire_environment(self, config: SimulationConfig) -> gym.vector.VectorEnv:
+        """Return a pooled environment if persistent workers are enabled, otherwise a fresh one."""
+        if not config.persistent_workers:
+            return self.setup_environment(config)
+        key = _env_pool_key(config)
+        if key not in _ENV_POOL:
+            _ENV_POOL[key] = self.setup_environment(config)
+        return _ENV_POOL[key]
 
     def run_simulation(self, config: SimulationConfig) -> Tuple[str, List[bool]]:
         """Run the simulation for the specified number of episodes."""
@@ -120,7 +164,7 @@ class SimulationInferenceClient(BaseInferenceClient, BasePolicy):
             f"Running {config.n_episodes} episodes for {config.env_name} with {config.n_envs} environments"
         )
         # Set up the environment
-        self.env = self.setup_environment(config)
+        self.env = self._acquire_environment(config)
         # Initialize tracking variables
         episode_lengths = []
         current_rewards = [0] * config.n_envs
@@ -153,7 +197,8 @@ class SimulationInferenceClient(BaseInferenceClient, BasePolicy):
             obs = next_obs
         # Clean up
         self.env.reset()
-        self.env.close()
+        if not config.persistent_workers:
+            self.env.close()
         self.env = None
         print(
             f"Collecting {config.n_episodes} episodes took {time.time() - start_time:.2f} seconds"
@@ -216,6 +261,8 @@ def run_evaluation(
     n_envs: int = 1,
     n_action_steps: int = 2,
     max_episode_steps: int = 100,
+    vector_env_backend: str = "async",
+    persistent_workers: bool = False,
 ) -> Tuple[str, List[bool]]:
     """
     Simple entry point to run a simulation evaluation.
@@ -228,6 +275,8 @@ def run_evaluation(
         n_envs: Number of parallel environments
         n_action_steps: Number of action steps per environment step
         max_episode_steps: Maximum number of steps per episode
+        vector_env_backend: "async" or "shared_memory", see `SimulationConfig`
+        persistent_workers: Reuse the environment workers across `run_evaluation` calls
     Returns:
         Tuple of environment name and list of episode success flags
     """
@@ -240,6 +289,8 @@ def run_evaluation(
         multistep=MultiStepConfig(
             n_action_steps=n_action_steps, max_episode_steps=max_episode_steps
         ),
+        vector_env_backend=vector_env_backend,
+        persistent_workers=persistent_workers,
     )
     # Create client and run simulation
     client = SimulationInferenceClient(host=host, port=port)
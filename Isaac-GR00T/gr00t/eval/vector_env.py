@@ -0,0 +1,218 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import multiprocessing
+import sys
+import traceback
+from copy import deepcopy
+from typing import Any, Callable, Dict, List, Sequence
+
+import gymnasium as gym
+import numpy as np
+from gymnasium import spaces
+from gymnasium.error import NoAsyncCallError
+from gymnasium.vector.async_vector_env import AsyncState
+from gymnasium.vector.utils import (
+    concatenate,
+    create_empty_array,
+    write_to_shared_memory,
+)
+
+
+def _shared_memory_keys(observation_space: spaces.Dict) -> List[str]:
+    """Keys of the observation dict that are written to shared memory (video and state arrays)."""
+    return [key for key, space in observation_space.items() if isinstance(space, spaces.Box)]
+
+
+class SharedMemoryVectorEnv(gym.vector.AsyncVectorEnv):
+    """
+    AsyncVectorEnv that returns the array part of dict observations through shared memory.
+
+    The stock `AsyncVectorEnv(shared_memory=True)` writes the whole observation into shared memory,
+    which breaks for the free-form language annotations (`spaces.Text`) returned by the GR00T
+    simulation envs. Here only the `Box` entries (camera frames, proprioception) are written to shared
+    memory by the workers, all other entries are small and still go through the pipes.
+    """
+
+    def __init__(
+        self,
+        env_fns: Sequence[Callable[[], gym.Env]],
+        copy: bool = True,
+        context: str = "spawn",
+        daemon: bool = True,
+    ):
+        super().__init__(
+            env_fns,
+            shared_memory=True,
+            copy=copy,
+            context=context,
+            daemon=daemon,
+            worker=_shared_memory_worker,
+        )
+        assert isinstance(
+            self.single_observation_space, spaces.Dict
+        ), f"SharedMemoryVectorEnv only supports dict observation spaces, got {self.single_observation_space}"
+        self._shm_keys = _shared_memory_keys(self.single_observation_space)
+        self._pipe_keys = [
+            key for key in self.single_observation_space.keys() if key not in self._shm_keys
+        ]
+        self._pipe_buffers = {
+            key: create_empty_array(self.single_observation_space[key], n=self.num_envs)
+            for key in self._pipe_keys
+        }
+
+    def _merge_pipe_observations(self, pipe_observations: List[Dict[str, Any]]):
+        """Merge the entries that were sent through the pipes into the shared observation dict."""
+        for key in self._pipe_keys:
+            self.observations[key] = concatenate(
+                self.single_observation_space[key],
+                [obs[key] for obs in pipe_observations],
+                self._pipe_buffers[key],
+            )
+
+    def reset_wait(self, timeout: int | float | None = None):
+        self._assert_is_running()
+        if self._state != AsyncState.WAITING_RESET:
+            raise NoAsyncCallError(
+                "Calling `reset_wait` without any prior call to `reset_async`.",
+                AsyncState.WAITING_RESET.value,
+            )
+        if not self._poll_pipe_envs(timeout):
+            self._state = AsyncState.DEFAULT
+            raise multiprocessing.TimeoutError(
+                f"The call to `reset_wait` has timed out after {timeout} second(s)."
+            )
+
+        results, successes = zip(*[pipe.recv() for pipe in self.parent_pipes])
+        self._raise_if_errors(successes)
+
+        infos = {}
+        pipe_observations, info_data = zip(*results)
+        for i, info in enumerate(info_data):
+            infos = self._add_info(infos, info, i)
+        self._merge_pipe_observations(pipe_observations)
+
+        self._state = AsyncState.DEFAULT
+        return (deepcopy(self.observations) if self.copy else self.observations), infos
+
+    def step_wait(self, timeout: int | float | None = None):
+        self._assert_is_running()
+        if self._state != AsyncState.WAITING_STEP:
+            raise NoAsyncCallError(
+                "Calling `step_wait` without any prior call to `step_async`.",
+                AsyncState.WAITING_STEP.value,
+            )
+        if not self._poll_pipe_envs(timeout):
+            self._state = AsyncState.DEFAULT
+            raise multiprocessing.TimeoutError(
+                f"The call to `step_wait` has timed out after {timeout} second(s)."
+            )
+
+        pipe_observations, rewards, terminations, truncations, infos = [], [], [], [], {}
+        successes = []
+        for env_idx, pipe in enumerate(self.parent_pipes):
+            env_step_return, success = pipe.recv()
+            successes.append(success)
+            if success:
+                pipe_observations.append(env_step_return[0])
+                rewards.append(env_step_return[1])
+                terminations.append(env_step_return[2])
+                truncations.append(env_step_return[3])
+                infos = self._add_info(infos, env_step_return[4], env_idx)
+        self._raise_if_errors(successes)
+        self._merge_pipe_observations(pipe_observations)
+
+        self._state = AsyncState.DEFAULT
+        return (
+            deepcopy(self.observations) if self.copy else self.observations,
+            np.array(rewards, dtype=np.float64),
+            np.array(terminations, dtype=np.bool_),
+            np.array(truncations, dtype=np.bool_),
+            infos,
+        )
+
+
+def _shared_memory_worker(index, env_fn, pipe, parent_pipe, shared_memory, error_queue):
+    """
+    Worker loop of `SharedMemoryVectorEnv`. Mirrors gymnasium's `_async_worker` (including the
+    next-step autoreset), except that only the `Box` entries of the observation are written to
+    shared memory and the remaining entries are sent back through the pipe.
+    """
+    env = env_fn()
+    observation_space = env.observation_space
+    action_space = env.action_space
+    shm_keys = _shared_memory_keys(observation_space)
+    autoreset = False
+
+    parent_pipe.close()
+
+    def _write_observation(observation):
+        for key in shm_keys:
+            write_to_shared_memory(
+                observation_space[key], index, observation[key], shared_memory[key]
+            )
+        return {key: value for key, value in observation.items() if key not in shm_keys}
+
+    try:
+        while True:
+            command, data = pipe.recv()
+            if command == "reset":
+                observation, info = env.reset(**data)
+                autoreset = False
+                pipe.send(((_write_observation(observation), info), True))
+            elif command == "step":
+                if autoreset:
+                    observation, info = env.reset()
+                    reward, terminated, truncated = 0, False, False
+                else:
+                    observation, reward, terminated, truncated, info = env.step(data)
+                autoreset = terminated or truncated
+                pipe.send(
+                    ((_write_observation(observation), reward, terminated, truncated, info), True)
+                )
+            elif command == "close":
+                pipe.send((None, True))
+                break
+            elif command == "_call":
+                name, args, kwargs = data
+                if name in ["reset", "step", "close", "_setattr", "_check_spaces"]:
+                    raise ValueError(
+                        f"Trying to call function `{name}` with `call`, use `{name}` directly instead."
+                    )
+                attr = env.get_wrapper_attr(name)
+                pipe.send((attr(*args, **kwargs) if callable(attr) else attr, True))
+            elif command == "_setattr":
+                name, value = data
+                env.set_wrapper_attr(name, value)
+                pipe.send((None, True))
+            elif command == "_check_spaces":
+                _, single_obs_space, single_action_space = data
+                pipe.send(
+                    (
+                        (
+                            single_obs_space == observation_space,
+                            single_action_space == action_space,
+                        ),
+                        True,
+                    )
+                )
+            else:
+                raise RuntimeError(f"Received unknown command `{command}`.")
+    except (KeyboardInterrupt, Exception):
+        error_type, error_message, _ = sys.exc_info()
+        error_queue.put((index, error_type, error_message, traceback.format_exc()))
+        pipe.send((None, False))
+    finally:
+        env.close()
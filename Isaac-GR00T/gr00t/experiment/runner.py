@@ -37,12 +37,22 @@ class TrainRunner:
         training_args: TrainingArguments,
         train_dataset: LeRobotSingleDataset | LeRobotMixtureDataset,
         resume_from_checkpoint: bool = False,
+        async_checkpoint: bool = False,
+        max_inflight_checkpoints: int = 1,
+        prefetch_to_device: bool = False,
+        num_prefetch_batches: int = 2,
+        sampler_block_size: int = 1,
     ):
         self.training_args = training_args
         self.output_dir = Path(training_args.output_dir)
         self.exp_cfg_dir = self.output_dir / "experiment_cfg"
         self.exp_cfg_dir.mkdir(parents=True, exist_ok=True)
         self.resume_from_checkpoint = resume_from_checkpoint
+        self.async_checkpoint = async_checkpoint
+        self.max_inflight_checkpoints = max_inflight_checkpoints
+        self.prefetch_to_device = prefetch_to_device
+        self.num_prefetch_batches = num_prefetch_batches
+        self.sampler_block_size = sampler_block_size
         self.train_dataset = train_dataset
         # Set up training arguments
         training_args.run_name = (
@@ -146,6 +156,11 @@ class TrainRunner:
             train_dataset=train_dataset,
             data_collator=data_collator,
             compute_dtype=compute_dtype,
+            async_checkpoint=self.async_checkpoint,
+            max_inflight_checkpoints=self.max_inflight_checkpoints,
+            prefetch_to_device=self.prefetch_to_device,
+            num_prefetch_batches=self.num_prefetch_batches,
+            sampler_block_size=self.sampler_block_size,
         )
 
         # Add checkpoint format callback to ensure experiment_cfg is copied to each checkpoint
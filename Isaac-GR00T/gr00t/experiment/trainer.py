@@ -14,7 +14,10 @@
 # limitations under the License.
 
 
+import dataclasses
+import json
 import os
+from pathlib import Path
 from typing import Optional
 
 import numpy as np
@@ -23,13 +26,28 @@ import transformers
 from torch.utils.data import Dataset, Sampler
 from transformers.trainer import (
     ALL_LAYERNORM_LAYERS,
+    OPTIMIZER_NAME,
+    PREFIX_CHECKPOINT_DIR,
+    SCHEDULER_NAME,
     TRAINER_STATE_NAME,
+    ExportableState,
+    SaveStrategy,
     TrainerState,
     get_last_checkpoint,
     get_parameter_names,
     is_sagemaker_mp_enabled,
 )
 
+from gr00t.data.sampler import ShardedSampler
+from gr00t.utils.async_checkpoint import (
+    AsyncCheckpointWriter,
+    remove_stale_tmp_checkpoints,
+)
+from gr00t.utils.experiment import CheckpointFormatCallback
+from gr00t.utils.prefetch import DevicePrefetchLoader
+
+SAMPLER_STATE_NAME = "sampler_state.json"
+
 
 class BaseSampler(Sampler):
     """Sampler for dataset, which enables `set_epoch` for Dataset.
@@ -64,18 +82,65 @@ class BaseSampler(Sampler):
 class DualBrainTrainer(transformers.Trainer):
     def __init__(self, **kwargs):
         self.compute_dtype = kwargs.pop("compute_dtype")
+        # Write checkpoints in a background thread, see `gr00t/utils/async_checkpoint.py`
+        self.async_checkpoint = kwargs.pop("async_checkpoint", False)
+        max_inflight_checkpoints = kwargs.pop("max_inflight_checkpoints", 1)
+        # Pin and copy the next batch to the device while the current step runs, see
+        # `gr00t/utils/prefetch.py`
+        self.prefetch_to_device = kwargs.pop("prefetch_to_device", False)
+        self.num_prefetch_batches = kwargs.pop("num_prefetch_batches", 2)
+        # Number of consecutive dataset indices kept together by the train sampler,
+        # see `gr00t/data/sampler.py`
+        self.sampler_block_size = kwargs.pop("sampler_block_size", 1)
         super().__init__(**kwargs)
+        self._train_prefetch_loader = None
+        self._train_sampler = None
+        self._train_dataloader_len = None
+        self._sampler_skips_data = False
+        self.checkpoint_writer = (
+            AsyncCheckpointWriter(max_inflight=max_inflight_checkpoints)
+            if self.async_checkpoint
+            else None
+        )
         # Allowlist numpy globals for safe RNG state unpickling in PyTorch 2.1+
         torch.serialization.add_safe_globals(
             [np.core.multiarray._reconstruct, np.ndarray, np.dtype, np.dtypes.UInt32DType]
         )
 
     def _get_train_sampler(self):
-        return BaseSampler(self.train_dataset, shuffle=True, seed=self.args.seed)
+        # Lazily computed permutation: no per-epoch randperm over the whole (mixture) dataset,
+        # and resuming mid-epoch jumps to the saved position instead of replaying the indices
+        self._train_sampler = ShardedSampler(
+            self.train_dataset,
+            shuffle=True,
+            seed=self.args.seed,
+            block_size=self.sampler_block_size,
+        )
+        return self._train_sampler
 
     def _get_eval_sampler(self, eval_dataset):
         return BaseSampler(eval_dataset, shuffle=False)
 
+    def get_train_dataloader(self):
+        dataloader = super().get_train_dataloader()
+        self._train_dataloader_len = len(dataloader)
+        if not self.prefetch_to_device:
+            return dataloader
+        # The accelerate DataLoaderShard would otherwise copy each batch synchronously
+        if getattr(dataloader, "device", None) is not None:
+            dataloader.device = None
+        self._train_prefetch_loader = DevicePrefetchLoader(
+            dataloader, device=self.args.device, num_prefetch=self.num_prefetch_batches
+        )
+        return self._train_prefetch_loader
+
+    def log(self, logs: dict[str, float], start_time: Optional[float] = None) -> None:
+        if self._train_prefetch_loader is not None and "loss" in logs:
+            stats = self._train_prefetch_loader.stall_stats(reset=True)
+            logs["data_stall_s"] = round(stats["stall_s"], 4)
+            logs["data_stall_ms_per_batch"] = round(stats["stall_ms_per_batch"], 2)
+        super().log(logs, start_time)
+
     def compute_loss(self, model, inputs, return_outputs=False, num_items_in_batch=None):
         outputs = model(inputs)
         loss = outputs["loss"]
@@ -132,6 +197,129 @@ class DualBrainTrainer(transformers.Trainer):
         if self.args.should_save:
             return self.model.save_pretrained(output_dir, state_dict=state_dict)
 
+    def _sampler_state(self) -> dict:
+        """State of the train sampler at the current global step."""
+        # Each optimizer step consumes `gradient_accumulation_steps` batches on every rank, and
+        # accelerate shards the sampler's stream batch by batch across ranks
+        num_update_steps_per_epoch = max(
+            self._train_dataloader_len // self.args.gradient_accumulation_steps, 1
+        )
+        epoch, steps_in_epoch = divmod(self.state.global_step, num_update_steps_per_epoch)
+        num_consumed = (
+            steps_in_epoch
+            * self.args.gradient_accumulation_steps
+            * self.args.world_size
+            * self._train_batch_size
+        )
+        sampler_state = self._train_sampler.state_dict(num_consumed=num_consumed)
+        sampler_state["epoch"] = epoch
+        return sampler_state
+
+    def _save_rng_state(self, output_dir):
+        super()._save_rng_state(output_dir)
+        if self._train_sampler is not None and self.args.should_save:
+            with open(os.path.join(output_dir, SAMPLER_STATE_NAME), "w") as f:
+                json.dump(self._sampler_state(), f, indent=2)
+
+    def _load_rng_state(self, checkpoint):
+        super()._load_rng_state(checkpoint)
+        if not self._sampler_skips_data or self._train_sampler is None:
+            return
+        sampler_state_file = os.path.join(checkpoint, SAMPLER_STATE_NAME)
+        if os.path.isfile(sampler_state_file):
+            with open(sampler_state_file) as f:
+                sampler_state = json.load(f)
+        else:
+            # Checkpoints saved before the sampler state was recorded
+            sampler_state = self._sampler_state()
+        self._train_sampler.load_state_dict(sampler_state)
+        print(
+            f"Resuming the train sampler at epoch {sampler_state['epoch']}, "
+            f"after {sampler_state['num_consumed']} samples"
+        )
+
+    def _save_checkpoint(self, model, trial):
+        if (
+            not self.async_checkpoint
+            or self.is_deepspeed_enabled
+            or self.is_fsdp_enabled
+            or self.args.push_to_hub
+        ):
+            return super()._save_checkpoint(model, trial)
+
+        # Same layout as `transformers.Trainer._save_checkpoint`, but only the host snapshot is
+        # taken here; serialization, fsync and rotation happen in the writer thread.
+        if self.hp_search_backend is None and trial is None:
+            self.store_flos()
+        run_dir = self._get_output_dir(trial=trial)
+        output_dir = Path(run_dir) / f"{PREFIX_CHECKPOINT_DIR}-{self.state.global_step}"
+        tmp_dir = AsyncCheckpointWriter.tmp_dir_for(output_dir)
+
+        if self.args.save_strategy in [SaveStrategy.STEPS, SaveStrategy.EPOCH] and (
+            self.state.best_global_step
+        ):
+            best_checkpoint_dir = os.path.join(
+                run_dir, f"{PREFIX_CHECKPOINT_DIR}-{self.state.best_global_step}"
+            )
+            if os.path.exists(best_checkpoint_dir):
+                self.state.best_model_checkpoint = best_checkpoint_dir
+
+        # RNG states are per rank and tiny: every rank writes its own before the main process
+        # renames the directory
+        if not self.args.save_only_model:
+            os.makedirs(tmp_dir, exist_ok=True)
+            self._save_scaler(tmp_dir)
+            self._save_rng_state(tmp_dir)
+        self.accelerator.wait_for_everyone()
+        if not self.args.should_save:
+            return
+
+        for cb in [
+            cb
+            for cb in self.callback_handler.callbacks + [self.control]
+            if isinstance(cb, ExportableState)
+        ]:
+            cb_name = cb.__class__.__name__
+            cb_state = cb.state()
+            if isinstance(self.state.stateful_callbacks[cb_name], list):
+                self.state.stateful_callbacks[cb_name].append(cb_state)
+            else:
+                self.state.stateful_callbacks[cb_name] = cb_state
+
+        state = {
+            "model": self.model.state_dict(),
+            "trainer_state": json.dumps(dataclasses.asdict(self.state), indent=2, sort_keys=True)
+            + "\n",
+        }
+        if not self.args.save_only_model:
+            state["optimizer"] = self.optimizer.state_dict()
+            state["scheduler"] = self.lr_scheduler.state_dict()
+        format_callbacks = [
+            cb for cb in self.callback_handler.callbacks if isinstance(cb, CheckpointFormatCallback)
+        ]
+
+        def write_checkpoint(checkpoint_dir: Path, host_state: dict):
+            self.model.save_pretrained(
+                checkpoint_dir,
+                state_dict=host_state["model"],
+                safe_serialization=self.args.save_safetensors,
+            )
+            if "optimizer" in host_state:
+                torch.save(host_state["optimizer"], checkpoint_dir / OPTIMIZER_NAME)
+                torch.save(host_state["scheduler"], checkpoint_dir / SCHEDULER_NAME)
+            with open(checkpoint_dir / TRAINER_STATE_NAME, "w", encoding="utf-8") as f:
+                f.write(host_state["trainer_state"])
+            for cb in format_callbacks:
+                cb.format_checkpoint(checkpoint_dir)
+
+        self.checkpoint_writer.save(
+            state,
+            write_checkpoint,
+            output_dir,
+            # rotation only sees finished checkpoints, in-flight ones still have the tmp prefix
+            on_complete=lambda _: self._rotate_checkpoints(use_mtime=False, output_dir=run_dir),
+        )
+
     def train(
         self,
         resume_from_checkpoint=None,
@@ -155,4 +343,17 @@ class DualBrainTrainer(transformers.Trainer):
             self.state = TrainerState.load_from_json(
                 os.path.join(resume_from_checkpoint, TRAINER_STATE_NAME)
             )
-        return super().train(resume_from_checkpoint, trial, ignore_keys_for_eval, **kwargs)
+            # The sampler jumps to the saved position (see `_load_rng_state`), so the HF trainer
+            # must not skip the first batches of the epoch by iterating over them
+            self._sampler_skips_data = not self.args.ignore_data_skip
+            self.args.ignore_data_skip = True
+        if self.checkpoint_writer is None:
+            return super().train(resume_from_checkpoint, trial, ignore_keys_for_eval, **kwargs)
+
+        if self.args.should_save:
+            remove_stale_tmp_checkpoints(self.args.output_dir)
+        try:
+            return super().train(resume_from_checkpoint, trial, ignore_keys_for_eval, **kwargs)
+        finally:
+            # Make sure every checkpoint is on disk before the final save / process exit
+            self.checkpoint_writer.wait()
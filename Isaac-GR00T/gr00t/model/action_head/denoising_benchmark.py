@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Latency versus quality of the action head denoising settings.
+
+See `scripts/benchmark_denoising.py` for the command line entry point.
+"""
+
+from dataclasses import asdict
+from typing import Sequence
+
+import torch
+from transformers.feature_extraction_utils import BatchFeature
+
+from gr00t.model.action_head.ode_solvers import DenoisingConfig
+from gr00t.utils.benchmark import StageTimer
+
+
+def benchmark_denoising(
+    action_head: torch.nn.Module,
+    backbone_output: BatchFeature,
+    action_input: BatchFeature,
+    denoisings: Sequence[DenoisingConfig],
+    reference_steps: int = 64,
+    num_repeats: int = 5,
+    seed: int = 42,
+) -> list[dict]:
+    """
+    Measure the latency and the action error of denoising settings of the action head, against
+    a many-step uniform Euler reference from the same noise.
+
+    Args:
+        action_head: The `FlowmatchingActionHead`.
+        backbone_output: The backbone output, copied at each call.
+        action_input: The state and embodiment id.
+        denoisings: The solver, schedule and number of steps settings to measure.
+        reference_steps: Number of Euler steps of the reference actions.
+        num_repeats: Number of timed calls per setting, after a warmup call.
+        seed: Seed of the noise, the same for every call.
+
+    Returns:
+        list[dict]: for each setting, the setting, the number of velocity evaluations, the mean and
+            max absolute error of the actions against the reference and the latency summary.
+    """
+
+    def get_action(denoising):
+        torch.manual_seed(seed)
+        with torch.inference_mode():
+            # the action head replaces the features of its input
+            return action_head.get_action(
+                BatchFeature(data=dict(backbone_output)), action_input, denoising=denoising
+            )
+
+    reference = get_action(DenoisingConfig(num_steps=reference_steps))["action_pred"].float()
+    results = []
+    for denoising in denoisings:
+        get_action(denoising)
+        timer = StageTimer()
+        for _ in range(num_repeats):
+            with timer.time("get_action"):
+                output = get_action(denoising)
+        error = (output["action_pred"].float() - reference).abs()
+        results.append(
+            {
+                "denoising": asdict(denoising),
+                "num_evaluations": output["num_evaluations"],
+                "l1_mean_error": float(error.mean()),
+                "l1_max_error": float(error.max()),
+                "stages": timer.summary(),
+            }
+        )
+    return results
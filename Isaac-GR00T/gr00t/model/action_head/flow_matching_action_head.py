@@ -14,6 +14,7 @@
 # limitations under the License.
 
 from dataclasses import dataclass, field
+from typing import Optional
 
 import torch
 import torch.nn.functional as F
@@ -25,6 +26,7 @@ from transformers.feature_extraction_utils import BatchFeature
 from gr00t.model.action_head.action_encoder import SinusoidalPositionalEncoding, swish
 
 from .cross_attention_dit import DiT, SelfAttentionTransformer
+from .ode_solvers import DenoisingConfig, solve
 
 
 class CategorySpecificLinear(nn.Module):
@@ -347,8 +349,25 @@ class FlowmatchingActionHead(nn.Module):
         return BatchFeature(data=output_dict)
 
     @torch.no_grad()
-    def get_action(self, backbone_output: BatchFeature, action_input: BatchFeature) -> BatchFeature:
+    def get_action(
+        self,
+        backbone_output: BatchFeature,
+        action_input: BatchFeature,
+        denoising: Optional[DenoisingConfig] = None,
+    ) -> BatchFeature:
+        """
+        Sample the actions, integrating the predicted velocity from the noise.
+
+        Args:
+            backbone_output: The backbone output.
+            action_input: The state and embodiment id.
+            denoising: The ODE solver, timestep schedule and number of steps. Defaults to
+                `num_inference_timesteps` uniform Euler steps.
 
+        Returns:
+            The predicted actions, as "action_pred", and the number of velocity evaluations, as
+            "num_evaluations".
+        """
         backbone_output = self.process_backbone_output(backbone_output)
 
         # Get vision and language embeddings.
@@ -367,13 +386,8 @@ class FlowmatchingActionHead(nn.Module):
             device=device,
         )
 
-        num_steps = self.num_inference_timesteps
-        dt = 1.0 / num_steps
-
-        # Run denoising steps.
-        for t in range(num_steps):
-            t_cont = t / float(num_steps)  # e.g. goes 0, 1/N, 2/N, ...
-            t_discretized = int(t_cont * self.num_timestep_buckets)
+        def velocity_fn(actions: torch.Tensor, t: float) -> torch.Tensor:
+            t_discretized = int(t * self.num_timestep_buckets)
 
             # Embed noised action trajectory.
             timesteps_tensor = torch.full(
@@ -397,12 +411,13 @@ class FlowmatchingActionHead(nn.Module):
                 timestep=timesteps_tensor,
             )
             pred = self.action_decoder(model_output, embodiment_id)
+            return pred[:, -self.action_horizon :]
 
-            pred_velocity = pred[:, -self.action_horizon :]
-
-            # Update actions using euler integration.
-            actions = actions + dt * pred_velocity
-        return BatchFeature(data={"action_pred": actions})
+        # Run denoising steps.
+        actions, num_evaluations = solve(
+            velocity_fn, actions, self.num_inference_timesteps, denoising or DenoisingConfig()
+        )
+        return BatchFeature(data={"action_pred": actions, "num_evaluations": num_evaluations})
 
     @property
     def device(self):
@@ -0,0 +1,176 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+ODE solvers and timestep schedules for the flow matching denoising of the action head.
+
+The actions are integrated from the noise at t=0 to the actions at t=1 along the velocity
+predicted by the model, `velocity_fn(actions, t)`.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+import torch
+
+VelocityFn = Callable[[torch.Tensor, float], torch.Tensor]
+
+
+@dataclass
+class DenoisingConfig:
+    """How `FlowmatchingActionHead.get_action` integrates the actions, see `solve`."""
+
+    solver: str = "euler"
+    """ODE solver, one of `ODE_SOLVERS`."""
+
+    num_steps: Optional[int] = None
+    """Number of solver steps, defaults to the `num_inference_timesteps` of the action head."""
+
+    schedule: str = "uniform"
+    """Timestep schedule, one of `TIMESTEP_SCHEDULES`."""
+
+    adaptive_tolerance: Optional[float] = None
+    """If set, stop early once the mean absolute change of the predicted velocity between two
+    steps falls below it, and extrapolate the actions linearly to t=1."""
+
+
+def uniform_schedule(num_steps: int) -> list[float]:
+    """Evenly spaced timesteps, e.g. 0, 1/N, 2/N, ..., 1."""
+    return [i / float(num_steps) for i in range(num_steps + 1)]
+
+
+def cosine_schedule(num_steps: int) -> list[float]:
+    """Timesteps denser near the noise (t=0) and the actions (t=1)."""
+    return [(1 - math.cos(math.pi * i / num_steps)) / 2 for i in range(num_steps + 1)]
+
+
+def quadratic_schedule(num_steps: int) -> list[float]:
+    """Timesteps denser near the actions (t=1)."""
+    return [1 - (1 - i / num_steps) ** 2 for i in range(num_steps + 1)]
+
+
+TIMESTEP_SCHEDULES = {
+    "uniform": uniform_schedule,
+    "cosine": cosine_schedule,
+    "quadratic": quadratic_schedule,
+}
+
+
+class ODESolver(ABC):
+    """A one step method integrating the actions from t to t_next."""
+
+    @abstractmethod
+    def step(
+        self, velocity_fn: VelocityFn, actions: torch.Tensor, t: float, t_next: float
+    ) -> Tuple[torch.Tensor, torch.Tensor, int]:
+        """
+        Args:
+            velocity_fn: The velocity predicted by the model, at given actions and time.
+            actions: The actions at t.
+            t: The current time.
+            t_next: The time to integrate to.
+
+        Returns:
+            The actions at t_next, the velocity predicted at t and the number of velocity
+            evaluations.
+        """
+        raise NotImplementedError
+
+
+class EulerSolver(ODESolver):
+    """First order, one velocity evaluation per step."""
+
+    def step(self, velocity_fn, actions, t, t_next):
+        velocity = velocity_fn(actions, t)
+        return actions + (t_next - t) * velocity, velocity, 1
+
+
+class MidpointSolver(ODESolver):
+    """Second order, two velocity evaluations per step."""
+
+    def step(self, velocity_fn, actions, t, t_next):
+        dt = t_next - t
+        velocity = velocity_fn(actions, t)
+        midpoint_velocity = velocity_fn(actions + dt / 2 * velocity, t + dt / 2)
+        return actions + dt * midpoint_velocity, velocity, 2
+
+
+class HeunSolver(ODESolver):
+    """
+    Second order, two velocity evaluations per step. The last step, which ends on the actions
+    (t=1), is an Euler step as the model is not trained at t=1.
+    """
+
+    def step(self, velocity_fn, actions, t, t_next):
+        dt = t_next - t
+        velocity = velocity_fn(actions, t)
+        next_actions = actions + dt * velocity
+        if t_next >= 1.0:
+            return next_actions, velocity, 1
+        next_velocity = velocity_fn(next_actions, t_next)
+        return actions + dt / 2 * (velocity + next_velocity), velocity, 2
+
+
+ODE_SOLVERS = {
+    "euler": EulerSolver,
+    "midpoint": MidpointSolver,
+    "heun": HeunSolver,
+}
+
+
+def solve(
+    velocity_fn: VelocityFn, actions: torch.Tensor, num_steps: int, config: DenoisingConfig
+) -> Tuple[torch.Tensor, int]:
+    """
+    Integrate the actions from the noise (t=0) to t=1.
+
+    Args:
+        velocity_fn: The velocity predicted by the model, at given actions and time.
+        actions: The initial actions, i.e. the noise.
+        num_steps: Number of solver steps, when not set in the config.
+        config: The solver, schedule and adaptive tolerance.
+
+    Returns:
+        The integrated actions and the number of velocity evaluations.
+    """
+    assert (
+        config.solver in ODE_SOLVERS
+    ), f"Unknown solver {config.solver}, expected one of {list(ODE_SOLVERS)}"
+    assert (
+        config.schedule in TIMESTEP_SCHEDULES
+    ), f"Unknown schedule {config.schedule}, expected one of {list(TIMESTEP_SCHEDULES)}"
+    num_steps = config.num_steps or num_steps
+    assert num_steps > 0, f"Invalid number of steps {num_steps}"
+
+    solver = ODE_SOLVERS[config.solver]()
+    timesteps = TIMESTEP_SCHEDULES[config.schedule](num_steps)
+    num_evaluations = 0
+    previous_velocity = None
+    for t, t_next in zip(timesteps[:-1], timesteps[1:]):
+        next_actions, velocity, step_evaluations = solver.step(velocity_fn, actions, t, t_next)
+        num_evaluations += step_evaluations
+        if (
+            config.adaptive_tolerance is not None
+            and previous_velocity is not None
+            and t_next < 1.0
+            and (velocity - previous_velocity).abs().mean() < config.adaptive_tolerance
+        ):
+            # the flow is straight, follow it to the actions
+            return next_actions + (1.0 - t_next) * velocity, num_evaluations
+        actions = next_actions
+        previous_velocity = velocity
+    return actions, num_evaluations
@@ -13,4 +13,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from .backbone_cache import BackboneCache, BackboneCacheConfig  # noqa: F401
+from .backbone_pool import BackbonePool  # noqa: F401
 from .eagle_backbone import EagleBackbone  # noqa: F401
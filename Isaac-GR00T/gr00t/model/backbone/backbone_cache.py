@@ -0,0 +1,207 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+from typing import Optional
+
+import torch
+from transformers import DynamicCache
+from transformers.feature_extraction_utils import BatchFeature
+
+from .eagle_backbone import EagleBackbone
+
+
+@dataclass
+class BackboneCacheConfig:
+    """Configuration of the backbone cache, see `BackboneCache`."""
+
+    frame_change_threshold: float = 0.0
+    """Mean absolute difference of the (normalized) pixel values of an image above which its vision
+    tokens are recomputed. With 0, the vision tokens are only reused for identical images."""
+
+    refresh_interval: int = 0
+    """Recompute the vision tokens of all the images every `refresh_interval` calls, 0 to never
+    force it."""
+
+    cache_prefix: bool = True
+    """Compute the LLM keys and values of the tokens before the first image once per episode."""
+
+
+class BackboneCache:
+    """
+    Reuses the Eagle backbone computations across the consecutive calls (control ticks) of an
+    episode, where the instruction is constant and the camera images change little.
+
+    - The vision tokens are cached per image, and only recomputed for the images that changed by
+      more than `frame_change_threshold` since their tokens were computed, or every
+      `refresh_interval` calls.
+    - The LLM keys and values of the tokens before the first image (the chat template prefix) are
+      computed once per episode. The instruction follows the images in the token sequence, so its
+      keys and values depend on the images and are recomputed with them.
+    - When no image changed, the previous backbone output is returned as is.
+
+    The cached state is for a single episode: call `reset` at the episode boundaries. A change of
+    the token ids (e.g. a new instruction) or of the image shapes also resets it.
+
+    Args:
+        backbone: The PyTorch Eagle backbone.
+        config: The cache configuration.
+    """
+
+    def __init__(self, backbone: EagleBackbone, config: Optional[BackboneCacheConfig] = None):
+        self.backbone = backbone
+        self.config = config or BackboneCacheConfig()
+        self.reset()
+
+    def reset(self):
+        """Clear the cached state, at an episode boundary."""
+        self.num_calls = 0
+        self.num_recomputed_images = 0
+        self.num_reused_outputs = 0
+        self._input_ids = None
+        self._attention_mask = None
+        self._pixel_values = None
+        self._vit_embeds = None
+        self._prefix_length = 0
+        self._prefix_cache = None
+        self._prefix_features = None
+        self._output = None
+
+    def _is_new_sequence(self, input_ids, attention_mask, pixel_values):
+        return (
+            self._output is None
+            or self._input_ids.shape != input_ids.shape
+            or self._pixel_values.shape != pixel_values.shape
+            or not torch.equal(self._input_ids, input_ids)
+            or not torch.equal(self._attention_mask, attention_mask)
+        )
+
+    def _get_prefix_length(self, input_ids, attention_mask):
+        if not self.config.cache_prefix:
+            return 0
+        is_image = input_ids == self.backbone.eagle_model.image_token_index
+        if not is_image.any(dim=1).all():
+            return 0
+        prefix_length = int(is_image.int().argmax(dim=1).min())
+        # left padded sequences have no common prefix
+        if not attention_mask[:, :prefix_length].all():
+            return 0
+        return prefix_length
+
+    def _update_vit_embeds(self, pixel_values, changed):
+        vit_embeds = self.backbone.eagle_model.extract_feature(pixel_values[changed])
+        if self._vit_embeds is None or len(changed) == len(pixel_values):
+            self._vit_embeds = vit_embeds
+            self._pixel_values = pixel_values.clone()
+        else:
+            self._vit_embeds[changed] = vit_embeds.to(self._vit_embeds.dtype)
+            self._pixel_values[changed] = pixel_values[changed]
+        self.num_recomputed_images += len(changed)
+
+    def _embed(self, input_ids):
+        eagle_model = self.backbone.eagle_model
+        input_embeds = eagle_model.language_model.get_input_embeddings()(input_ids)
+        B, N, C = input_embeds.shape
+        input_embeds = input_embeds.reshape(B * N, C)
+        selected = input_ids.reshape(B * N) == eagle_model.image_token_index
+        vit_embeds = self._vit_embeds.reshape(-1, C)
+        assert (
+            selected.sum() == vit_embeds.shape[0]
+        ), f"Found {selected.sum()} image tokens for {vit_embeds.shape[0]} vision tokens"
+        input_embeds[selected] = vit_embeds.to(input_embeds.dtype)
+        return input_embeds.reshape(B, N, C)
+
+    def _run_language_model(self, input_embeds, attention_mask):
+        language_model = self.backbone.eagle_model.language_model
+        select_layer = self.backbone.select_layer
+        prefix_length = self._prefix_length
+        if prefix_length == 0:
+            output = language_model(
+                inputs_embeds=input_embeds,
+                attention_mask=attention_mask,
+                output_hidden_states=True,
+                return_dict=True,
+            )
+            return output.hidden_states[select_layer]
+
+        if self._prefix_cache is None:
+            self._prefix_cache = DynamicCache()
+            output = language_model(
+                inputs_embeds=input_embeds[:, :prefix_length],
+                attention_mask=attention_mask[:, :prefix_length],
+                past_key_values=self._prefix_cache,
+                use_cache=True,
+                output_hidden_states=True,
+                return_dict=True,
+            )
+            self._prefix_features = output.hidden_states[select_layer]
+
+        output = language_model(
+            inputs_embeds=input_embeds[:, prefix_length:],
+            attention_mask=attention_mask,
+            past_key_values=self._prefix_cache,
+            use_cache=True,
+            output_hidden_states=True,
+            return_dict=True,
+        )
+        # drop the keys and values appended by this call, the prefix ones are kept
+        self._prefix_cache.crop(prefix_length)
+        return torch.cat([self._prefix_features, output.hidden_states[select_layer]], dim=1)
+
+    @torch.no_grad()
+    def __call__(self, vl_input: BatchFeature) -> BatchFeature:
+        """
+        Run the backbone, reusing the cached computations.
+
+        Args:
+            vl_input: The backbone inputs, as for `EagleBackbone.forward`.
+
+        Returns:
+            The backbone output, as `EagleBackbone.forward`.
+        """
+        assert hasattr(
+            self.backbone.eagle_model, "vision_model"
+        ), "The backbone cache runs the PyTorch backbone, it cannot be used with the backbone engines"
+        eagle_prefix = "eagle_"
+        pixel_values = vl_input[f"{eagle_prefix}pixel_values"]
+        input_ids = vl_input[f"{eagle_prefix}input_ids"]
+        attention_mask = vl_input[f"{eagle_prefix}attention_mask"]
+
+        refresh_interval = self.config.refresh_interval
+        if self._is_new_sequence(input_ids, attention_mask, pixel_values):
+            self.reset()
+            self._input_ids = input_ids
+            self._attention_mask = attention_mask
+            self._prefix_length = self._get_prefix_length(input_ids, attention_mask)
+            changed = torch.arange(len(pixel_values), device=pixel_values.device)
+        elif refresh_interval > 0 and self.num_calls % refresh_interval == 0:
+            changed = torch.arange(len(pixel_values), device=pixel_values.device)
+        else:
+            difference = (pixel_values - self._pixel_values).abs().flatten(1).mean(dim=1)
+            changed = torch.nonzero(difference > self.config.frame_change_threshold).flatten()
+        self.num_calls += 1
+
+        if len(changed) == 0:
+            self.num_reused_outputs += 1
+        else:
+            self._update_vit_embeds(pixel_values, changed)
+            input_embeds = self._embed(input_ids)
+            eagle_features = self._run_language_model(input_embeds, attention_mask)
+            self._output = {
+                "backbone_features": self.backbone.eagle_linear(eagle_features),
+                "backbone_attention_mask": attention_mask,
+            }
+        # a new BatchFeature, the action head replaces the features of its input
+        return BatchFeature(data=dict(self._output))
@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import weakref
+
+import torch
+from torch import nn
+
+
+class BackbonePool:
+    """
+    Deduplicates the backbones with identical weights across the models loaded in a process, e.g.
+    the checkpoints finetuned from the same base model with a frozen backbone.
+
+    `share` returns a backbone already in the pool when its weights are equal to the given one, so
+    that the models hold a single copy of it. The pool keeps weak references only: a backbone is
+    freed once no model uses it. The backbones must be stateless across calls (e.g. in eval mode),
+    the per-episode state of `BackboneCache` lives in the cache and not in the backbone.
+    """
+
+    # Number of values of every tensor in the fingerprint
+    num_fingerprint_values = 16
+
+    def __init__(self):
+        self._backbones: dict[tuple, list[weakref.ref]] = {}
+        self._lock = threading.Lock()
+        self.num_shared = 0
+
+    @classmethod
+    def fingerprint(cls, backbone: nn.Module) -> tuple:
+        """
+        A cheap key of the backbone weights: the names, shapes and dtypes of its tensors, and a
+        few values of each. Equal backbones have equal fingerprints, the converse is checked by
+        comparing all the weights.
+        """
+        key = [type(backbone).__name__]
+        with torch.no_grad():
+            for name, tensor in backbone.state_dict().items():
+                values = tensor.flatten()[: cls.num_fingerprint_values].float().cpu()
+                key.append((name, tuple(tensor.shape), str(tensor.dtype), tuple(values.tolist())))
+        return tuple(key)
+
+    @staticmethod
+    def same_weights(backbone: nn.Module, other: nn.Module) -> bool:
+        state_dict, other_state_dict = backbone.state_dict(), other.state_dict()
+        if state_dict.keys() != other_state_dict.keys():
+            return False
+        with torch.no_grad():
+            return all(
+                torch.equal(tensor, other_state_dict[name].to(tensor.device))
+                for name, tensor in state_dict.items()
+            )
+
+    def share(self, backbone: nn.Module) -> nn.Module:
+        """
+        Args:
+            backbone: The backbone of a newly loaded model.
+
+        Returns:
+            The backbone of the pool with the same weights, or the given backbone, added to the
+            pool.
+        """
+        key = self.fingerprint(backbone)
+        with self._lock:
+            references = self._backbones.setdefault(key, [])
+            references[:] = [reference for reference in references if reference() is not None]
+            for reference in references:
+                other = reference()
+                if other is backbone:
+                    return backbone
+                if other is not None and self.same_weights(other, backbone):
+                    self.num_shared += 1
+                    return other
+            references.append(weakref.ref(backbone))
+            return backbone
+
+    def __len__(self) -> int:
+        """The number of backbones in use."""
+        with self._lock:
+            return sum(
+                reference() is not None
+                for references in self._backbones.values()
+                for reference in references
+            )
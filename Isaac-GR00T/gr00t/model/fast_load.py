@@ -0,0 +1,223 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Fast cold start of the models for serving.
+
+`GR00T_N1_5.from_pretrained` initializes every weight on the CPU, reads the checkpoint, copies it
+into the weights, and `Gr00tPolicy` may then rebuild the action head and copy its weights again.
+The fast path instead:
+    - builds the model skeleton without allocating its weights (on the meta device), with its final
+      action horizon
+    - memory-maps the safetensors files and creates every tensor directly on the target device and
+      in the target dtype
+    - assigns the loaded tensors as the model weights, without copies
+
+The skeleton is built in the calling thread, as `init_empty_weights` patches the parameter
+registration of the whole process while it runs, and the weights can then be loaded in a
+background thread. Nothing changes the process-wide default dtype: the weights get the dtypes of
+the loaded tensors.
+
+A serving snapshot (see `save_serving_snapshot`) is a checkpoint directory in its final serving
+form: the weights with their final dtypes and action horizon, the config and the metadata of the
+embodiment, loaded without any conversion.
+"""
+
+import glob
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Union
+
+import torch
+from huggingface_hub import snapshot_download
+from huggingface_hub.errors import HFValidationError, RepositoryNotFoundError
+from safetensors import safe_open
+from safetensors.torch import save_model
+from torch import nn
+
+# The manifest file of a serving snapshot directory
+SERVING_SNAPSHOT_FILE = "serving_snapshot.json"
+SERVING_SNAPSHOT_VERSION = 1
+
+
+class IncompleteCheckpointError(ValueError):
+    """The checkpoint misses weights of the model, which the fast path cannot initialize."""
+
+
+def resolve_model_path(model_path: str) -> str:
+    """The local path of a checkpoint directory or huggingface hub id, downloaded if needed."""
+    try:
+        return snapshot_download(model_path, repo_type="model")
+    except (HFValidationError, RepositoryNotFoundError):
+        return model_path
+
+
+def is_serving_snapshot(model_path: str) -> bool:
+    return os.path.isfile(os.path.join(model_path, SERVING_SNAPSHOT_FILE))
+
+
+def device_name(device: Union[int, str, torch.device]) -> str:
+    """The name of a device, with device indices being CUDA devices as in `nn.Module.to`."""
+    if isinstance(device, int):
+        return f"cuda:{device}"
+    return str(torch.device(device))
+
+
+def load_safetensors(
+    model_path: str,
+    device: Union[int, str, torch.device] = "cpu",
+    dtype: Optional[torch.dtype] = None,
+    dtype_fn: Optional[Callable[[str], Optional[torch.dtype]]] = None,
+    include: Optional[Callable[[str], bool]] = None,
+) -> dict[str, torch.Tensor]:
+    """
+    Load the tensors of the safetensors files of a checkpoint directory. The files are
+    memory-mapped and every tensor is created directly on the device.
+
+    Args:
+        model_path: The checkpoint directory.
+        device: The device of the tensors.
+        dtype: The dtype of the floating point tensors, None to keep their stored dtype.
+        dtype_fn: The dtype of the floating point tensor of a name, overriding `dtype` when it
+            returns a dtype.
+        include: Whether to load the tensor of a name, all the tensors when None.
+    """
+    paths = sorted(glob.glob(os.path.join(model_path, "*.safetensors")))
+    assert len(paths) > 0, f"No safetensors file in {model_path}"
+    state_dict = {}
+    for path in paths:
+        with safe_open(path, framework="pt", device=device_name(device)) as f:
+            for name in f.keys():
+                if include is not None and not include(name):
+                    continue
+                tensor = f.get_tensor(name)
+                if tensor.is_floating_point():
+                    target_dtype = dtype_fn(name) if dtype_fn is not None else None
+                    target_dtype = target_dtype or dtype
+                    if target_dtype is not None and tensor.dtype != target_dtype:
+                        tensor = tensor.to(target_dtype)
+                state_dict[name] = tensor
+    return state_dict
+
+
+def _tie_weights(model: nn.Module):
+    """Tie the weights of the model and of its nested models (e.g. the LLM of the backbone)."""
+    for module in model.modules():
+        if callable(getattr(module, "tie_weights", None)):
+            module.tie_weights()
+
+
+def assign_weights(model: nn.Module, state_dict: dict[str, torch.Tensor]):
+    """
+    Assign the loaded tensors as the weights of a model built without weights (see
+    `accelerate.init_empty_weights`), without copying them.
+
+    Raises:
+        IncompleteCheckpointError: If weights of the model are not in the state dict (besides the
+            tied ones).
+    """
+    # the tied weights are saved once, under any of their names. `init_empty_weights` unties them
+    _tie_weights(model)
+    tied_names = {}
+    for name, parameter in model.named_parameters(remove_duplicate=False):
+        tied_names.setdefault(id(parameter), []).append(name)
+    state_dict = dict(state_dict)
+    for names in tied_names.values():
+        saved = [name for name in names if name in state_dict]
+        for name in names:
+            if saved and name not in state_dict:
+                state_dict[name] = state_dict[saved[0]]
+
+    _, unexpected = model.load_state_dict(state_dict, strict=False, assign=True)
+    if unexpected:
+        print(f"Ignoring {len(unexpected)} unexpected weights, e.g. {unexpected[:3]}")
+    # the assigned tensors are wrapped in separate parameters
+    _tie_weights(model)
+    missing = [
+        name
+        for name, tensor in list(model.named_parameters()) + list(model.named_buffers())
+        if tensor.is_meta
+    ]
+    if missing:
+        raise IncompleteCheckpointError(
+            f"{len(missing)} weights are missing from the checkpoint, e.g. {missing[:3]}"
+        )
+
+
+# The models being loaded in the background, see `prefetch`
+_prefetched: dict[tuple, Future] = {}
+_prefetch_lock = threading.Lock()
+
+
+def prefetch(key: tuple, load_fn: Callable, *args, **kwargs) -> Future:
+    """
+    Start loading a model in a background thread, e.g. while the transforms and the processor
+    are built. `take_prefetched` hands the loading over to its consumer.
+
+    Args:
+        key: The key of the loading, e.g. the arguments of `load_fn`.
+        load_fn: The loading function.
+    """
+    with _prefetch_lock:
+        if key not in _prefetched:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gr00t-prefetch")
+            _prefetched[key] = executor.submit(load_fn, *args, **kwargs)
+            executor.shutdown(wait=False)
+        return _prefetched[key]
+
+
+def take_prefetched(key: tuple) -> Optional[Future]:
+    """The loading of `prefetch` with this key, once, or None."""
+    with _prefetch_lock:
+        return _prefetched.pop(key, None)
+
+
+def save_serving_snapshot(policy, output_dir: str):
+    """
+    Save a policy as a serving snapshot: its model weights (with their final dtypes and action
+    horizon) as a single safetensors file, its config, the metadata of its embodiment and a
+    manifest. `Gr00tPolicy(model_path=output_dir, ...)` loads it with the fast path.
+
+    Args:
+        policy (Gr00tPolicy): The loaded policy.
+        output_dir: The snapshot directory.
+    """
+    os.makedirs(os.path.join(output_dir, "experiment_cfg"), exist_ok=True)
+    model = policy.model
+    model.config.save_pretrained(output_dir)
+    # the tied weights are saved once, see `assign_weights`
+    save_model(model, os.path.join(output_dir, "model.safetensors"))
+
+    with open(policy.model_path / "experiment_cfg" / "metadata.json", "r") as f:
+        metadatas = json.load(f)
+    embodiment_tag = policy.embodiment_tag.value
+    with open(os.path.join(output_dir, "experiment_cfg", "metadata.json"), "w") as f:
+        json.dump({embodiment_tag: metadatas[embodiment_tag]}, f, indent=4)
+    for path in glob.glob(str(policy.model_path / "experiment_cfg" / "*.yaml")):
+        shutil.copy(path, os.path.join(output_dir, "experiment_cfg"))
+
+    dtypes = sorted({str(tensor.dtype) for tensor in model.state_dict().values()})
+    manifest = {
+        "version": SERVING_SNAPSHOT_VERSION,
+        "source_model_path": str(policy.model_path),
+        "embodiment_tag": embodiment_tag,
+        "action_horizon": model.action_horizon,
+        "dtypes": dtypes,
+    }
+    with open(os.path.join(output_dir, SERVING_SNAPSHOT_FILE), "w") as f:
+        json.dump(manifest, f, indent=4)
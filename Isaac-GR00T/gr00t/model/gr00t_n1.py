@@ -14,11 +14,12 @@
 # limitations under the License.
 
 from dataclasses import dataclass, field
-from typing import Tuple
+from typing import Optional, Tuple, Union
 
 import numpy as np
 import torch
 import tree
+from accelerate import init_empty_weights
 from huggingface_hub import snapshot_download
 from huggingface_hub.errors import HFValidationError, RepositoryNotFoundError
 from transformers import AutoConfig, AutoModel, PretrainedConfig, PreTrainedModel
@@ -28,7 +29,14 @@ from .action_head.flow_matching_action_head import (
     FlowmatchingActionHead,
     FlowmatchingActionHeadConfig,
 )
-from .backbone import EagleBackbone
+from .action_head.ode_solvers import DenoisingConfig
+from .backbone import BackboneCache, BackbonePool, EagleBackbone
+from .fast_load import (
+    assign_weights,
+    is_serving_snapshot,
+    load_safetensors,
+    resolve_model_path,
+)
 
 BACKBONE_FEATURE_KEY = "backbone_features"
 ACTION_KEY = "action_pred"
@@ -171,11 +179,21 @@ class GR00T_N1_5(PreTrainedModel):
     def get_action(
         self,
         inputs: dict,
+        backbone_cache: Optional[BackboneCache] = None,
+        denoising: Optional[DenoisingConfig] = None,
     ) -> BatchFeature:
         backbone_inputs, action_inputs = self.prepare_input(inputs)
         # Because the behavior of backbones remains the same for training and inference, we can use `forward` for backbones.
-        backbone_outputs = self.backbone(backbone_inputs)
-        action_head_outputs = self.action_head.get_action(backbone_outputs, action_inputs)
+        if backbone_cache is not None:
+            backbone_outputs = backbone_cache(backbone_inputs)
+        else:
+            backbone_outputs = self.backbone(backbone_inputs)
+        if denoising is not None:
+            action_head_outputs = self.action_head.get_action(
+                backbone_outputs, action_inputs, denoising=denoising
+            )
+        else:
+            action_head_outputs = self.action_head.get_action(backbone_outputs, action_inputs)
         self.validate_data(action_head_outputs, backbone_outputs, is_training=False)
         return action_head_outputs
 
@@ -233,6 +251,123 @@ class GR00T_N1_5(PreTrainedModel):
         )
         return pretrained_model
 
+    @classmethod
+    def from_pretrained_empty(
+        cls, pretrained_model_name_or_path: str, action_horizon: Optional[int] = None
+    ) -> "GR00T_N1_5":
+        """
+        Build the model of a checkpoint without its weights (on the meta device), to be loaded by
+        `load_weights_fast`. Build it in the thread starting the loading, before the concurrent
+        work, see `gr00t.model.fast_load`.
+
+        Args:
+            pretrained_model_name_or_path: The checkpoint directory, huggingface hub id or serving
+                snapshot directory.
+            action_horizon: The action horizon of the action head, which is built with it
+                instead of the one of the checkpoint.
+        """
+        local_model_path = resolve_model_path(pretrained_model_name_or_path)
+        snapshot = is_serving_snapshot(local_model_path)
+        print(
+            f"Fast loading {'serving snapshot' if snapshot else 'pretrained dual brain'} from "
+            f"{local_model_path}"
+        )
+        config = GR00T_N1_5_Config.from_pretrained(local_model_path)
+        rebuild_action_head = (
+            action_horizon is not None
+            and action_horizon != config.action_head_cfg["action_horizon"]
+        )
+        if rebuild_action_head:
+            print(f"Building the action head with action_horizon {action_horizon}")
+            config.action_horizon = action_horizon
+            config.action_head_cfg["action_horizon"] = action_horizon
+
+        with init_empty_weights(include_buffers=False):
+            model = cls(config, local_model_path=local_model_path)
+        model._fast_load_source = (local_model_path, snapshot, rebuild_action_head)
+        return model
+
+    def load_weights_fast(
+        self,
+        torch_dtype: torch.dtype,
+        device: Union[int, str] = "cpu",
+        backbone_pool: Optional[BackbonePool] = None,
+    ) -> "GR00T_N1_5":
+        """
+        Load the weights of a model of `from_pretrained_empty`, with the tensors created on the
+        device and in the dtype directly.
+
+        Args:
+            torch_dtype: The dtype of the weights, the serving snapshots keep their stored dtypes.
+                As the action head rebuilt by `Gr00tPolicy` with another horizon, a rebuilt
+                action head is in float32.
+            device: The device of the weights.
+            backbone_pool: Share the backbone with the models of the pool having identical
+                backbone weights. The backbone is then loaded on the CPU and deduplicated before
+                moving to the device, so that a duplicate backbone never gets there.
+
+        Returns:
+            The model, in eval mode.
+
+        Raises:
+            IncompleteCheckpointError: If the checkpoint misses weights, which only
+                `from_pretrained` initializes.
+        """
+        local_model_path, snapshot, rebuild_action_head = self._fast_load_source
+
+        def action_head_dtype(name: str) -> Optional[torch.dtype]:
+            return torch.float32 if name.startswith("action_head.") else None
+
+        load_kwargs = dict(
+            dtype=None if snapshot else torch_dtype,
+            dtype_fn=action_head_dtype if rebuild_action_head and not snapshot else None,
+        )
+        if backbone_pool is not None:
+            backbone_weights = load_safetensors(
+                local_model_path,
+                device="cpu",
+                include=lambda name: name.startswith("backbone."),
+                **load_kwargs,
+            )
+            assign_weights(
+                self.backbone,
+                {name[len("backbone.") :]: tensor for name, tensor in backbone_weights.items()},
+            )
+            backbone = backbone_pool.share(self.backbone)
+            if backbone is not self.backbone:
+                print("Sharing the backbone of an already loaded model")
+                self.backbone = backbone
+            state_dict = load_safetensors(
+                local_model_path,
+                device=device,
+                include=lambda name: not name.startswith("backbone."),
+                **load_kwargs,
+            )
+        else:
+            state_dict = load_safetensors(local_model_path, device=device, **load_kwargs)
+        assign_weights(self, state_dict)
+        # the backbone loaded on the CPU, and the buffers not saved in the checkpoint
+        self.to(device=device)
+        self.eval()
+        return self
+
+    @classmethod
+    def from_pretrained_fast(
+        cls,
+        pretrained_model_name_or_path: str,
+        torch_dtype: torch.dtype,
+        device: Union[int, str] = "cpu",
+        action_horizon: Optional[int] = None,
+        backbone_pool: Optional[BackbonePool] = None,
+    ) -> "GR00T_N1_5":
+        """
+        Load a checkpoint for inference, without initializing the weights and with the tensors
+        created on the device and in the dtype directly, see `from_pretrained_empty` and
+        `load_weights_fast` for the arguments.
+        """
+        model = cls.from_pretrained_empty(pretrained_model_name_or_path, action_horizon)
+        return model.load_weights_fast(torch_dtype, device=device, backbone_pool=backbone_pool)
+
 
 # register
 AutoConfig.register("gr00t_n1_5", GR00T_N1_5_Config)
@@ -15,6 +15,7 @@
 
 import json
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, Optional, Union
 
@@ -27,6 +28,18 @@ from gr00t.data.dataset import ModalityConfig
 from gr00t.data.embodiment_tags import EmbodimentTag
 from gr00t.data.schema import DatasetMetadata
 from gr00t.data.transform.base import ComposedModalityTransform
+from gr00t.model.action_head.ode_solvers import DenoisingConfig
+from gr00t.model.backbone import BackboneCache, BackboneCacheConfig, BackbonePool
+from gr00t.model.fast_load import (
+    SERVING_SNAPSHOT_FILE,
+    SERVING_SNAPSHOT_VERSION,
+    IncompleteCheckpointError,
+    device_name,
+    is_serving_snapshot,
+    prefetch,
+    resolve_model_path,
+    take_prefetched,
+)
 from gr00t.model.gr00t_n1 import GR00T_N1_5
 
 COMPUTE_DTYPE = torch.bfloat16
@@ -53,6 +66,11 @@ class BasePolicy(ABC):
         """
         raise NotImplementedError
 
+    def reset(self) -> None:
+        """
+        Reset the per-episode state of the policy, at an episode boundary. Stateless by default.
+        """
+
 
 class Gr00tPolicy(BasePolicy):
     """
@@ -70,6 +88,10 @@ class Gr00tPolicy(BasePolicy):
         modality_transform: ComposedModalityTransform,
         denoising_steps: Optional[int] = None,
         device: Union[int, str] = "cuda" if torch.cuda.is_available() else "cpu",
+        backbone_cache: Optional[BackboneCacheConfig] = None,
+        denoising: Optional[DenoisingConfig] = None,
+        backbone_pool: Optional[BackbonePool] = None,
+        fast_start: bool = False,
     ):
         """
         Initialize the Gr00tPolicy.
@@ -81,6 +103,17 @@ class Gr00tPolicy(BasePolicy):
             embodiment_tag (Union[str, EmbodimentTag]): The embodiment tag for the model.
             denoising_steps: Number of denoising steps to use for the action head.
             device (Union[int, str]): Device to run the model on.
+            backbone_cache (Optional[BackboneCacheConfig]): Reuse the backbone computations across
+                the calls of an episode, see `BackboneCache`. Call `reset` at the episode
+                boundaries. Disabled by default.
+            denoising (Optional[DenoisingConfig]): The ODE solver and timestep schedule of the
+                action head, see `DenoisingConfig`. Defaults to `denoising_steps` uniform Euler
+                steps. A request can override it with a "denoising" observation entry.
+            backbone_pool (Optional[BackbonePool]): Share the backbone with the other policies of
+                the pool having identical backbone weights, see `BackbonePool`.
+            fast_start (bool): Load the model with `GR00T_N1_5.from_pretrained_fast`, concurrently
+                with the metadata, and pick up the loading started by `prefetch_model`. Always
+                used for the serving snapshots of `save_serving_snapshot`.
         """
         try:
             # NOTE(YL) this returns the local path to the model which is normally
@@ -97,6 +130,7 @@ class Gr00tPolicy(BasePolicy):
         self._modality_transform.eval()  # set this to eval mode
         self.model_path = Path(model_path)
         self.device = device
+        self.backbone_pool = backbone_pool
 
         # Convert string embodiment tag to EmbodimentTag enum if needed
         if isinstance(embodiment_tag, str):
@@ -104,12 +138,24 @@ class Gr00tPolicy(BasePolicy):
         else:
             self.embodiment_tag = embodiment_tag
 
-        # Load model
-        self._load_model(model_path)
-        # Load transforms
-        self._load_metadata(self.model_path / "experiment_cfg")
-        # Load horizons
-        self._load_horizons()
+        if fast_start or is_serving_snapshot(model_path):
+            # Load the model weights in the background while loading the transforms and horizons
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                model_loading = self._load_model_fast(model_path, executor)
+                self._load_metadata(self.model_path / "experiment_cfg")
+                self._load_horizons()
+                try:
+                    self.model = model_loading.result()
+                except IncompleteCheckpointError as e:
+                    print(f"Policy: {e}, falling back to the regular loading")
+                    self._load_model(model_path)
+        else:
+            # Load model
+            self._load_model(model_path)
+            # Load transforms
+            self._load_metadata(self.model_path / "experiment_cfg")
+            # Load horizons
+            self._load_horizons()
 
         if denoising_steps is not None:
             if hasattr(self.model, "action_head") and hasattr(
@@ -118,6 +164,22 @@ class Gr00tPolicy(BasePolicy):
                 self.model.action_head.num_inference_timesteps = denoising_steps
                 print(f"Set action denoising steps to {denoising_steps}")
 
+        self.denoising = denoising
+        if denoising is not None:
+            print(f"Action denoising: {denoising}")
+
+        self.backbone_cache = None
+        if backbone_cache is not None:
+            self.backbone_cache = BackboneCache(self.model.backbone, backbone_cache)
+            print(f"Backbone cache enabled: {backbone_cache}")
+
+    def reset(self) -> None:
+        """
+        Reset the per-episode state of the policy (the backbone cache), at an episode boundary.
+        """
+        if self.backbone_cache is not None:
+            self.backbone_cache.reset()
+
     def apply_transforms(self, obs: Dict[str, Any]) -> Dict[str, Any]:
         """
         Apply transforms to the observation.
@@ -162,11 +224,18 @@ class Gr00tPolicy(BasePolicy):
             "annotation.<>": np.ndarray, # (B, T, )
         }
 
+        The observation can also carry a "denoising" entry, a `DenoisingConfig` or a dict of its
+        fields, overriding the denoising of the policy for this request (e.g. for quality versus
+        latency sweeps).
+
         Returns:
             Dict[str, Any]: The predicted action.
         """
         # Create a copy to avoid mutating input
         obs_copy = observations.copy()
+        denoising = obs_copy.pop("denoising", None) or self.denoising
+        if isinstance(denoising, dict):
+            denoising = DenoisingConfig(**denoising)
 
         is_batch = self._check_state_is_batched(obs_copy)
         if not is_batch:
@@ -178,17 +247,19 @@ class Gr00tPolicy(BasePolicy):
                 obs_copy[k] = np.array(v)
 
         normalized_input = self.apply_transforms(obs_copy)
-        normalized_action = self._get_action_from_normalized_input(normalized_input)
+        normalized_action = self._get_action_from_normalized_input(normalized_input, denoising)
         unnormalized_action = self._get_unnormalized_action(normalized_action)
 
         if not is_batch:
             unnormalized_action = squeeze_dict_values(unnormalized_action)
         return unnormalized_action
 
-    def _get_action_from_normalized_input(self, normalized_input: Dict[str, Any]) -> torch.Tensor:
+    def _get_action_from_normalized_input(
+        self, normalized_input: Dict[str, Any], denoising: Optional[DenoisingConfig] = None
+    ) -> torch.Tensor:
         # Set up autocast context if needed
         with torch.inference_mode(), torch.autocast(device_type="cuda", dtype=COMPUTE_DTYPE):
-            model_pred = self.model.get_action(normalized_input)
+            model_pred = self.model.get_action(normalized_input, self.backbone_cache, denoising)
 
         normalized_action = model_pred["action_pred"].float()
         return normalized_action
@@ -272,10 +343,81 @@ class Gr00tPolicy(BasePolicy):
             model.action_horizon = expected_action_horizon
             model.config.action_head_cfg["action_horizon"] = expected_action_horizon
 
+        if self.backbone_pool is not None:
+            # before moving to the device, so that a duplicate backbone never gets there
+            backbone = self.backbone_pool.share(model.backbone)
+            if backbone is not model.backbone:
+                print("Policy: Sharing the backbone of an already loaded model")
+                model.backbone = backbone
+
         model.to(device=self.device)  # type: ignore
 
         self.model = model
 
+    @staticmethod
+    def _fast_load_key(model_path: str, action_horizon: int, device: Union[int, str]) -> tuple:
+        return ("gr00t_n1_5", resolve_model_path(model_path), action_horizon, device_name(device))
+
+    @classmethod
+    def prefetch_model(
+        cls,
+        model_path: str,
+        modality_config: Dict[str, ModalityConfig],
+        device: Union[int, str] = "cuda" if torch.cuda.is_available() else "cpu",
+        backbone_pool: Optional[BackbonePool] = None,
+    ):
+        """
+        Start loading the model of a `Gr00tPolicy(fast_start=True)` in the background, e.g. while
+        its transforms and the Eagle processor are built. The model skeleton is built in the
+        calling thread, see `GR00T_N1_5.from_pretrained_empty`.
+
+        Args:
+            model_path (str): The `model_path` of the policy.
+            modality_config (Dict[str, ModalityConfig]): The `modality_config` of the policy.
+            device (Union[int, str]): The `device` of the policy.
+            backbone_pool (Optional[BackbonePool]): The `backbone_pool` of the policy.
+        """
+        action_horizon = len(modality_config["action"].delta_indices)
+        key = cls._fast_load_key(model_path, action_horizon, device)
+        model = GR00T_N1_5.from_pretrained_empty(key[1], action_horizon=action_horizon)
+        prefetch(
+            key,
+            model.load_weights_fast,
+            COMPUTE_DTYPE,
+            device=device,
+            backbone_pool=backbone_pool,
+        )
+
+    def _load_model_fast(self, model_path, executor: ThreadPoolExecutor) -> Future:
+        """
+        Build the model skeleton in this thread, and start loading its weights with the executor
+        (or take the loading started by `prefetch_model`).
+        """
+        expected_action_horizon = len(self._modality_config["action"].delta_indices)
+        if is_serving_snapshot(model_path):
+            with open(Path(model_path) / SERVING_SNAPSHOT_FILE, "r") as f:
+                manifest = json.load(f)
+            assert (
+                manifest["version"] == SERVING_SNAPSHOT_VERSION
+            ), f"Unsupported serving snapshot version {manifest['version']}"
+            assert manifest["embodiment_tag"] == self.embodiment_tag.value, (
+                f"The serving snapshot is for the {manifest['embodiment_tag']} embodiment, "
+                f"not {self.embodiment_tag.value}"
+            )
+
+        prefetched = take_prefetched(
+            self._fast_load_key(model_path, expected_action_horizon, self.device)
+        )
+        if prefetched is not None:
+            return prefetched
+        model = GR00T_N1_5.from_pretrained_empty(model_path, action_horizon=expected_action_horizon)
+        return executor.submit(
+            model.load_weights_fast,
+            COMPUTE_DTYPE,
+            device=self.device,
+            backbone_pool=self.backbone_pool,
+        )
+
     def _load_metadata(self, exp_cfg_dir: Path):
         """Load the transforms for the model."""
         # Load metadata for normalization stats
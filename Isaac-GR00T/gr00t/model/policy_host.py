@@ -0,0 +1,240 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+import itertools
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import torch
+
+from gr00t.data.dataset import ModalityConfig
+from gr00t.experiment.data_config import load_data_config
+from gr00t.model.backbone import BackbonePool
+from gr00t.model.policy import BasePolicy, Gr00tPolicy
+
+
+@dataclass
+class HostedPolicySpec:
+    """A policy hosted by a `PolicyHost`: a checkpoint served for an embodiment."""
+
+    model_path: str
+    """Path to the model checkpoint directory or the huggingface hub id."""
+
+    embodiment_tag: str
+    """The embodiment tag of the policy."""
+
+    data_config: str
+    """The name or "module:ClassName" path of the data config, see
+    gr00t/experiment/data_config.py."""
+
+    name: Optional[str] = None
+    """The key of the policy in the requests, defaults to "<model_path>:<embodiment_tag>"."""
+
+    def __post_init__(self):
+        if self.name is None:
+            self.name = f"{self.model_path}:{self.embodiment_tag}"
+
+    @classmethod
+    def parse(cls, spec: str) -> "HostedPolicySpec":
+        """
+        Parse a "[name=]model_path,embodiment_tag,data_config" command line spec, e.g.
+        "so100=nvidia/GR00T-N1.5-3B,new_embodiment,so100".
+        """
+        name = None
+        if "=" in spec.split(",")[0]:
+            name, spec = spec.split("=", 1)
+        fields = spec.split(",")
+        assert len(fields) == 3, f"Expected model_path,embodiment_tag,data_config, got {spec}"
+        return cls(*fields, name=name)
+
+
+def load_hosted_policy(
+    spec: HostedPolicySpec, backbone_pool: Optional[BackbonePool] = None, **policy_kwargs
+) -> Gr00tPolicy:
+    """Load the `Gr00tPolicy` of a spec, with its own transforms."""
+    data_config = load_data_config(spec.data_config)
+    return Gr00tPolicy(
+        model_path=spec.model_path,
+        embodiment_tag=spec.embodiment_tag,
+        modality_config=data_config.modality_config(),
+        modality_transform=data_config.transform(),
+        backbone_pool=backbone_pool,
+        **policy_kwargs,
+    )
+
+
+class _HostedPolicy:
+    def __init__(self, spec: HostedPolicySpec, policy: BasePolicy):
+        self.spec = spec
+        self.policy = policy
+        # a policy serves one request at a time, its transforms are not thread-safe
+        self.lock = threading.Lock()
+        self.num_users = 0
+
+
+class PolicyHost(BasePolicy):
+    """
+    Hosts several policies (checkpoints and embodiments) in one process, behind a single policy
+    for the inference servers.
+
+    - A request selects its policy with a "model" observation entry, the name of its spec (the
+      default policy when missing). `get_modality_config` and `reset` take the same name.
+    - The policies are loaded on their first request, and the least recently used ones are
+      evicted beyond `max_loaded_policies` or `max_memory_gb`.
+    - Identical backbone weights are loaded once, see `BackbonePool`.
+    - Requests to different policies can run concurrently (e.g. on the workers of a
+      `MultiWorkerRobotInferenceServer`), the requests to the same policy are serialized.
+
+    Args:
+        specs: The policies that can be served.
+        loader: Loads the policy of a spec, sharing its backbone through the pool, see
+            `load_hosted_policy`.
+        default: The name of the policy of the requests without "model", defaults to the first
+            spec.
+        max_loaded_policies: The maximum number of policies loaded at a time, None for no limit.
+        max_memory_gb: The memory budget of the loaded models (their unique parameters and
+            buffers), None for no limit. A policy larger than the budget is still loaded alone.
+    """
+
+    def __init__(
+        self,
+        specs: Sequence[HostedPolicySpec],
+        loader: Callable[[HostedPolicySpec, BackbonePool], BasePolicy] = load_hosted_policy,
+        default: Optional[str] = None,
+        max_loaded_policies: Optional[int] = None,
+        max_memory_gb: Optional[float] = None,
+    ):
+        assert len(specs) > 0, "No policy to host"
+        self.specs = {spec.name: spec for spec in specs}
+        assert len(self.specs) == len(specs), "The hosted policies must have distinct names"
+        self.default = default if default is not None else specs[0].name
+        assert self.default in self.specs, f"Unknown default policy {self.default}"
+        assert max_loaded_policies is None or max_loaded_policies > 0
+        self.loader = loader
+        self.max_loaded_policies = max_loaded_policies
+        self.max_memory_gb = max_memory_gb
+        self.backbone_pool = BackbonePool()
+        self.num_loads = 0
+        self.num_evictions = 0
+
+        self._loaded: OrderedDict[str, _HostedPolicy] = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {name: threading.Lock() for name in self.specs}
+
+    def _acquire(self, name: Optional[str]) -> _HostedPolicy:
+        name = self.default if name is None else name
+        if name not in self.specs:
+            raise ValueError(f"Unknown model {name}, hosted models: {list(self.specs)}")
+
+        with self._load_locks[name]:
+            with self._lock:
+                hosted = self._loaded.get(name)
+                if hosted is not None:
+                    self._loaded.move_to_end(name)
+                    hosted.num_users += 1
+                    return hosted
+
+            print(f"Loading policy {name}...")
+            hosted = _HostedPolicy(
+                self.specs[name], self.loader(self.specs[name], self.backbone_pool)
+            )
+            with self._lock:
+                hosted.num_users += 1
+                self._loaded[name] = hosted
+                self.num_loads += 1
+                self._evict()
+            return hosted
+
+    def _release(self, hosted: _HostedPolicy):
+        with self._lock:
+            hosted.num_users -= 1
+
+    def _over_budget(self) -> bool:
+        if self.max_loaded_policies is not None and len(self._loaded) > self.max_loaded_policies:
+            return True
+        return self.max_memory_gb is not None and self.memory_bytes() > self.max_memory_gb * 1e9
+
+    def _evict(self):
+        """Evict the least recently used policies not in use while over budget."""
+        evicted = False
+        while self._over_budget():
+            idle = [name for name, hosted in self._loaded.items() if hosted.num_users == 0]
+            if not idle:
+                break
+            print(f"Evicting policy {idle[0]}")
+            del self._loaded[idle[0]]
+            self.num_evictions += 1
+            evicted = True
+        if evicted:
+            gc.collect()
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+
+    def memory_bytes(self) -> int:
+        """The memory of the unique parameters and buffers of the loaded models."""
+        storages = {}
+        for hosted in list(self._loaded.values()):
+            model = getattr(hosted.policy, "model", None)
+            if not isinstance(model, torch.nn.Module):
+                continue
+            for tensor in itertools.chain(model.parameters(), model.buffers()):
+                storage = tensor.untyped_storage()
+                storages[(storage.device, storage.data_ptr())] = storage.nbytes()
+        return sum(storages.values())
+
+    @property
+    def loaded_policies(self) -> list[str]:
+        """The names of the loaded policies, from the least to the most recently used."""
+        with self._lock:
+            return list(self._loaded)
+
+    def get_action(self, observations: Dict[str, Any]) -> Dict[str, Any]:
+        observations = dict(observations)
+        hosted = self._acquire(observations.pop("model", None))
+        try:
+            with hosted.lock:
+                return hosted.policy.get_action(observations)
+        finally:
+            self._release(hosted)
+
+    def get_modality_config(self, model: Optional[str] = None) -> Dict[str, ModalityConfig]:
+        """The modality config of a policy, the default one when `model` is None."""
+        hosted = self._acquire(model)
+        try:
+            return hosted.policy.get_modality_config()
+        finally:
+            self._release(hosted)
+
+    def reset(self, model: Optional[str] = None) -> None:
+        """
+        Reset the per-episode state of a policy, the default one when `model` is None. A policy
+        that is not loaded has no state to reset.
+        """
+        name = self.default if model is None else model
+        if name not in self.specs:
+            raise ValueError(f"Unknown model {name}, hosted models: {list(self.specs)}")
+        with self._lock:
+            hosted = self._loaded.get(name)
+            if hosted is None:
+                return
+            hosted.num_users += 1
+        try:
+            with hosted.lock:
+                hosted.policy.reset()
+        finally:
+            self._release(hosted)
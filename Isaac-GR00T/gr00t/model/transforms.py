@@ -15,6 +15,7 @@
 
 import random
 import re
+import threading
 from typing import Any, Dict, List, Optional
 
 import numpy as np
@@ -52,6 +53,22 @@ def build_eagle_processor(eagle_path: str) -> ProcessorMixin:
     return eagle_processor
 
 
+# The Eagle processors shared by the transforms, built on first use, see `get_eagle_processor`
+_eagle_processors: Dict[str, ProcessorMixin] = {}
+_eagle_processors_lock = threading.Lock()
+
+
+def get_eagle_processor(eagle_path: str) -> ProcessorMixin:
+    """
+    The shared Eagle processor of a path, built on the first call rather than at import time, so
+    that it can be built while the model loads (see `Gr00tPolicy.prefetch_model`).
+    """
+    with _eagle_processors_lock:
+        if eagle_path not in _eagle_processors:
+            _eagle_processors[eagle_path] = build_eagle_processor(eagle_path)
+        return _eagle_processors[eagle_path]
+
+
 def collate(features: List[dict], eagle_processor) -> dict:
     batch = {}
     keys = features[0].keys()
@@ -114,7 +131,9 @@ class GR00TTransform(InvertibleModalityTransform):
     # Private attributes to keep track of shapes/dimensions across apply/unapply
     _language_key: Optional[list[str]] = PrivateAttr(default=None)
 
-    eagle_processor: ProcessorMixin = Field(default=build_eagle_processor(DEFAULT_EAGLE_PATH))
+    eagle_processor: ProcessorMixin = Field(
+        default_factory=lambda: get_eagle_processor(DEFAULT_EAGLE_PATH)
+    )
 
     # XEmbDiT arguments
     default_instruction: str = Field(default="Perform the default behavior.")
@@ -0,0 +1,218 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Background checkpoint writer used by `DualBrainTrainer` when `async_checkpoint=True`.
+
+The training loop only pays for a device -> host copy of the state: tensors are copied into
+(pinned, when CUDA is available) host buffers, and a writer thread serializes them into a
+temporary directory, fsyncs it and atomically renames it to its final `checkpoint-{step}` name.
+A checkpoint directory therefore either exists complete or not at all, which is what
+`transformers.trainer_utils.get_last_checkpoint` relies on when resuming after a preemption.
+"""
+
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+import torch
+
+# Prefix of the directories that are still being written. It must not match the `checkpoint-*`
+# glob used by the HF trainer for rotation, nor the regex used by `get_last_checkpoint`.
+TMP_CHECKPOINT_PREFIX = ".tmp-"
+
+
+def _fsync_tree(path: Path):
+    """fsync every file and directory below `path`, and `path` itself."""
+    for root, _, files in os.walk(path):
+        for name in files:
+            with open(os.path.join(root, name), "rb") as f:
+                os.fsync(f.fileno())
+        _fsync_dir(Path(root))
+
+
+def _fsync_dir(path: Path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def remove_stale_tmp_checkpoints(output_dir: str | Path):
+    """Remove the temporary directories left behind by writes that were interrupted."""
+    output_dir = Path(output_dir)
+    if not output_dir.exists():
+        return
+    for path in output_dir.glob(f"{TMP_CHECKPOINT_PREFIX}*"):
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+
+
+class AsyncCheckpointWriter:
+    """
+    Writes checkpoints in a background thread, with at most `max_inflight` checkpoints being
+    snapshotted or written at the same time. `save` blocks when that limit is reached, so the host
+    memory used by the snapshots stays bounded.
+    """
+
+    def __init__(self, max_inflight: int = 1):
+        assert max_inflight >= 1, f"max_inflight must be >= 1, got {max_inflight}"
+        self.max_inflight = max_inflight
+        self._slots = threading.BoundedSemaphore(max_inflight)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpoint-writer")
+        self._lock = threading.Lock()
+        # Host buffers of finished writes, reused by the next snapshots
+        self._free_buffers: list[dict[str, torch.Tensor]] = []
+        self._futures: list[Future] = []
+        self._error: BaseException | None = None
+
+    def _copy_to_host(
+        self, obj: Any, buffers: dict[str, torch.Tensor], memo: dict[tuple, torch.Tensor], path: str
+    ) -> Any:
+        if isinstance(obj, torch.Tensor):
+            # Keep tensors that share memory (e.g. tied weights) shared in the snapshot
+            key = (obj.device, obj.data_ptr(), obj.dtype, tuple(obj.shape), obj.stride())
+            if obj.numel() > 0 and key in memo:
+                return memo[key]
+            src = obj.detach()
+            buffer = buffers.get(path)
+            if buffer is None or buffer.shape != src.shape or buffer.dtype != src.dtype:
+                buffer = torch.empty(
+                    src.shape,
+                    dtype=src.dtype,
+                    device="cpu",
+                    pin_memory=src.is_cuda and torch.cuda.is_available(),
+                )
+                buffers[path] = buffer
+            buffer.copy_(src, non_blocking=src.is_cuda)
+            memo[key] = buffer
+            return buffer
+        if isinstance(obj, dict):
+            return {k: self._copy_to_host(v, buffers, memo, f"{path}/{k}") for k, v in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            return type(obj)(
+                self._copy_to_host(v, buffers, memo, f"{path}/{i}") for i, v in enumerate(obj)
+            )
+        return obj
+
+    def _raise_pending_error(self):
+        with self._lock:
+            error, self._error = self._error, None
+        if error is not None:
+            raise RuntimeError("A background checkpoint write failed") from error
+
+    def save(
+        self,
+        state: dict[str, Any],
+        write_fn: Callable[[Path, dict[str, Any]], None],
+        checkpoint_dir: str | Path,
+        on_complete: Callable[[Path], None] | None = None,
+    ) -> Future:
+        """
+        Snapshot `state` to host memory and write it to `checkpoint_dir` in the background.
+
+        Args:
+            state (dict[str, Any]): Nested dicts/lists of tensors and python objects to snapshot,
+                e.g. {"model": model.state_dict(), "optimizer": optimizer.state_dict()}.
+            write_fn (Callable): Called in the writer thread as `write_fn(tmp_dir, host_state)`,
+                writes all the checkpoint files into `tmp_dir`.
+            checkpoint_dir (str | Path): The final checkpoint directory.
+            on_complete (Callable | None): Called in the writer thread with the final directory,
+                once the checkpoint is durable, e.g. to rotate older checkpoints.
+
+        Returns:
+            Future: resolves to the final checkpoint directory.
+        """
+        self._raise_pending_error()
+        checkpoint_dir = Path(checkpoint_dir)
+        tmp_dir = self.tmp_dir_for(checkpoint_dir)
+
+        self._slots.acquire()
+        try:
+            with self._lock:
+                buffers = self._free_buffers.pop() if self._free_buffers else {}
+            host_state = self._copy_to_host(state, buffers, {}, "")
+            if torch.cuda.is_available():
+                # Wait for the non-blocking device -> host copies before training mutates the state
+                torch.cuda.synchronize()
+        except BaseException:
+            self._slots.release()
+            raise
+
+        future = self._executor.submit(
+            self._write, write_fn, host_state, buffers, tmp_dir, checkpoint_dir, on_complete
+        )
+        with self._lock:
+            self._futures = [f for f in self._futures if not f.done()] + [future]
+        return future
+
+    @staticmethod
+    def tmp_dir_for(checkpoint_dir: str | Path) -> Path:
+        checkpoint_dir = Path(checkpoint_dir)
+        return checkpoint_dir.parent / f"{TMP_CHECKPOINT_PREFIX}{checkpoint_dir.name}"
+
+    def _write(
+        self,
+        write_fn: Callable[[Path, dict[str, Any]], None],
+        host_state: dict[str, Any],
+        buffers: dict[str, torch.Tensor],
+        tmp_dir: Path,
+        checkpoint_dir: Path,
+        on_complete: Callable[[Path], None] | None,
+    ) -> Path:
+        try:
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            write_fn(tmp_dir, host_state)
+            _fsync_tree(tmp_dir)
+            if checkpoint_dir.exists():
+                shutil.rmtree(checkpoint_dir)
+            os.replace(tmp_dir, checkpoint_dir)
+            _fsync_dir(checkpoint_dir.parent)
+            if on_complete is not None:
+                on_complete(checkpoint_dir)
+            return checkpoint_dir
+        except BaseException as e:
+            with self._lock:
+                self._error = e
+            raise
+        finally:
+            del host_state
+            with self._lock:
+                self._free_buffers.append(buffers)
+            self._slots.release()
+
+    @property
+    def num_inflight(self) -> int:
+        with self._lock:
+            return sum(not f.done() for f in self._futures)
+
+    def wait(self):
+        """Block until all the pending checkpoints are written, re-raising any write error."""
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.exception()
+        with self._lock:
+            self._futures = [f for f in self._futures if not f.done()]
+        self._raise_pending_error()
+
+    def close(self):
+        self.wait()
+        self._executor.shutdown(wait=True)
+        self._free_buffers.clear()
@@ -0,0 +1,210 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Helpers to measure where time goes in the training input pipeline:
+    LeRobotSingleDataset.__getitem__ -> transforms -> DefaultDataCollator -> model forward
+
+See `scripts/benchmark_input_pipeline.py` for the command line entry point.
+"""
+
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Sequence
+
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, RandomSampler
+
+from gr00t.data.dataset import LeRobotSingleDataset
+
+
+class StageTimer:
+    """Collects wall-clock latencies, in seconds, for named stages."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+
+    @contextmanager
+    def time(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.latencies[stage].append(time.perf_counter() - start)
+
+    def add(self, stage: str, latency: float):
+        self.latencies[stage].append(latency)
+
+    def total(self, stage: str) -> float:
+        return float(np.sum(self.latencies[stage]))
+
+    def summary(self, percentiles: Sequence[float] = (50, 90, 99)) -> dict[str, dict[str, float]]:
+        """Count, mean and latency percentiles (in milliseconds) of every stage."""
+        summary = {}
+        for stage, latencies in self.latencies.items():
+            latencies_ms = np.asarray(latencies) * 1000.0
+            stats = {"count": len(latencies_ms), "mean_ms": float(latencies_ms.mean())}
+            for p in percentiles:
+                stats[f"p{p:g}_ms"] = float(np.percentile(latencies_ms, p))
+            summary[stage] = stats
+        return summary
+
+
+def list_collate(features: list[dict]) -> list[dict]:
+    """Identity collate function, used when the benchmark runs without the Eagle collator."""
+    return features
+
+
+def profile_dataset_stages(
+    dataset: LeRobotSingleDataset,
+    indices: Sequence[int],
+    video_backends: Sequence[str],
+    collate_fn: Callable | None = None,
+    batch_size: int = 1,
+    model: torch.nn.Module | None = None,
+) -> dict:
+    """
+    Time each stage of the input pipeline in the main process, sample by sample.
+
+    Stages:
+        - getitem: the full `dataset[index]` call with the dataset's own video backend
+        - parquet_load: reading the trajectory parquet file
+        - video_decode/<backend>: decoding the frames of one video key with every requested backend
+        - state_fetch / action_fetch / language_fetch: slicing and padding of the low-dim data
+        - transform/<i>_<name>: every transform of the dataset's ComposedModalityTransform
+        - collate: `collate_fn` over `batch_size` transformed samples
+        - compute_loss: `model(batch)["loss"]`, as in `DualBrainTrainer.compute_loss`
+
+    Args:
+        dataset (LeRobotSingleDataset): The dataset to profile.
+        indices (Sequence[int]): The dataset indices to load.
+        video_backends (Sequence[str]): The video backends to time the decoding with.
+        collate_fn (Callable | None): The collator, e.g. DefaultDataCollator. Collation is skipped if None.
+        batch_size (int): The number of samples per collated batch.
+        model (torch.nn.Module | None): If given, the forward pass is timed on each collated batch.
+
+    Returns:
+        dict: samples/s of `dataset[index]` and the latency summary of every stage.
+    """
+    timer = StageTimer()
+    default_backend = dataset.video_backend
+    transforms = dataset.transforms.transforms
+    pending_batch = []
+    for index in indices:
+        with timer.time("getitem"):
+            dataset[index]
+
+        trajectory_id, base_index = dataset.all_steps[index]
+        # Invalidate the trajectory cache filled by `dataset[index]`
+        dataset.curr_traj_id = None
+        with timer.time("parquet_load"):
+            dataset.curr_traj_data = dataset.get_trajectory_data(trajectory_id)
+        data = {}
+        for modality, keys in dataset.modality_keys.items():
+            for key in keys:
+                if modality != "video":
+                    with timer.time(f"{modality}_fetch"):
+                        data[key] = dataset.get_data_by_modality(
+                            trajectory_id, modality, key, base_index
+                        )
+                    continue
+                for backend in video_backends:
+                    dataset.video_backend = backend
+                    try:
+                        with timer.time(f"video_decode/{backend}"):
+                            data[key] = dataset.get_video(trajectory_id, key, base_index)
+                    finally:
+                        dataset.video_backend = default_backend
+
+        for i, transform in enumerate(transforms):
+            with timer.time(f"transform/{i}_{type(transform).__name__}"):
+                data = transform(data)
+
+        if collate_fn is None:
+            continue
+        pending_batch.append(data)
+        if len(pending_batch) < batch_size:
+            continue
+        with timer.time("collate"):
+            batch = collate_fn(pending_batch)
+        pending_batch = []
+        if model is not None:
+            with timer.time("compute_loss"):
+                model(batch)["loss"]
+
+    getitem_total = timer.total("getitem")
+    return {
+        "num_samples": len(indices),
+        "samples_per_second": len(indices) / getitem_total if getitem_total > 0 else 0.0,
+        "stages": timer.summary(),
+    }
+
+
+def benchmark_dataloader(
+    dataset: LeRobotSingleDataset,
+    batch_size: int,
+    num_workers: int,
+    prefetch_factor: int | None,
+    num_batches: int,
+    collate_fn: Callable | None = None,
+    seed: int = 42,
+) -> dict:
+    """
+    Measure the throughput of a torch DataLoader over the dataset, as configured by the trainer's
+    `dataloader_num_workers` / `dataloader_prefetch_factor`.
+
+    Returns:
+        dict: the loader settings, the time to the first batch, samples/s after the first batch and
+            the latency summary of the wait for each following batch.
+    """
+    generator = torch.Generator()
+    generator.manual_seed(seed)
+    loader = DataLoader(
+        dataset,
+        batch_size=batch_size,
+        sampler=RandomSampler(dataset, generator=generator),
+        num_workers=num_workers,
+        prefetch_factor=prefetch_factor if num_workers > 0 else None,
+        collate_fn=collate_fn if collate_fn is not None else list_collate,
+    )
+    timer = StageTimer()
+    start = time.perf_counter()
+    iterator = iter(loader)
+    next(iterator)
+    first_batch_s = time.perf_counter() - start
+
+    num_loaded = 0
+    steady_start = time.perf_counter()
+    for _ in range(num_batches):
+        try:
+            with timer.time("batch_wait"):
+                next(iterator)
+        except StopIteration:
+            break
+        num_loaded += 1
+    steady_s = time.perf_counter() - steady_start
+    del iterator
+
+    return {
+        "batch_size": batch_size,
+        "num_workers": num_workers,
+        "prefetch_factor": prefetch_factor if num_workers > 0 else None,
+        "num_batches": num_loaded,
+        "first_batch_s": first_batch_s,
+        "samples_per_second": num_loaded * batch_size / steady_s if steady_s > 0 else 0.0,
+        "stages": timer.summary(),
+    }
@@ -50,13 +50,18 @@ class CheckpointFormatCallback(TrainerCallback):
         """
         self.exp_cfg_dir = exp_cfg_dir
 
+    def format_checkpoint(self, checkpoint_dir: Path):
+        """Copy the experiment config directory into `checkpoint_dir`."""
+        if self.exp_cfg_dir is not None:
+            exp_cfg_dst = checkpoint_dir / self.exp_cfg_dir.name
+            if self.exp_cfg_dir.exists():
+                shutil.copytree(self.exp_cfg_dir, exp_cfg_dst, dirs_exist_ok=True)
+
     def on_save(self, args, state, control, **kwargs):
         """Called after the trainer saves a checkpoint."""
         if state.is_world_process_zero:
             checkpoint_dir = Path(args.output_dir) / f"checkpoint-{state.global_step}"
-
-            # Copy experiment config directory if provided
-            if self.exp_cfg_dir is not None:
-                exp_cfg_dst = checkpoint_dir / self.exp_cfg_dir.name
-                if self.exp_cfg_dir.exists():
-                    shutil.copytree(self.exp_cfg_dir, exp_cfg_dst, dirs_exist_ok=True)
+            # With async checkpointing the directory does not exist yet, the writer thread
+            # calls `format_checkpoint` itself before publishing the checkpoint
+            if checkpoint_dir.exists():
+                self.format_checkpoint(checkpoint_dir)
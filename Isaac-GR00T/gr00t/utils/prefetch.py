@@ -0,0 +1,198 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Device-side prefetching of training batches, used by `DualBrainTrainer` when
+`prefetch_to_device=True`.
+
+    DataLoader workers -> [pin thread] -> queue -> [side CUDA stream H2D copy] -> training step
+
+A background thread pulls collated batches from the wrapped loader and pins them, while the
+host -> device copy of batch i+1 is issued on a side stream before batch i is handed to the
+training step, so the copy overlaps with the step's compute. Without CUDA the wrapper degrades
+to a plain CPU prefetch queue filled by the background thread.
+
+When training resumes in the middle of an epoch, the HF trainer rebuilds a plain DataLoader to
+skip the already seen batches; that partial epoch runs without device prefetching and the
+wrapper is used again from the next epoch on.
+"""
+
+import queue
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Iterable, Iterator
+
+import torch
+
+_END_OF_EPOCH = object()
+
+
+class _ProducerError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _map_tensors(data: Any, fn) -> Any:
+    """Apply `fn` to every tensor of a (nested) batch, preserving the container types (e.g. BatchFeature)."""
+    if isinstance(data, torch.Tensor):
+        return fn(data)
+    if isinstance(data, Mapping):
+        return type(data)({k: _map_tensors(v, fn) for k, v in data.items()})
+    if isinstance(data, (list, tuple)):
+        return type(data)(_map_tensors(v, fn) for v in data)
+    return data
+
+
+class DevicePrefetchLoader:
+    """
+    Wraps an iterable of batches (typically the trainer's DataLoader) and prefetches them to `device`.
+
+    Attributes that are not defined here (`dataset`, `sampler`, `batch_size`, ...) are forwarded to
+    the wrapped loader, so the HF training loop can use the wrapper in place of the DataLoader.
+
+    Args:
+        loader (Iterable): The loader to wrap. It should not move batches to the device itself.
+        device (str | torch.device): The device the batches are moved to.
+        num_prefetch (int): The maximum number of pinned batches waiting in the queue.
+        pin_memory (bool): Whether to pin the batches in the background thread (CUDA only).
+    """
+
+    def __init__(
+        self,
+        loader: Iterable,
+        device: str | torch.device,
+        num_prefetch: int = 2,
+        pin_memory: bool = True,
+    ):
+        assert num_prefetch >= 1, f"num_prefetch must be >= 1, got {num_prefetch}"
+        self.loader = loader
+        self.device = torch.device(device)
+        self.num_prefetch = num_prefetch
+        self.use_cuda = self.device.type == "cuda" and torch.cuda.is_available()
+        self.pin_memory = pin_memory and self.use_cuda
+        self.reset_stall_stats()
+
+    def __len__(self) -> int:
+        return len(self.loader)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes that are not found on the wrapper itself
+        if name == "loader":
+            raise AttributeError(name)
+        return getattr(self.loader, name)
+
+    def set_epoch(self, epoch: int):
+        if hasattr(self.loader, "set_epoch"):
+            self.loader.set_epoch(epoch)
+
+    def reset_stall_stats(self):
+        self._stall_s = 0.0
+        self._num_batches = 0
+
+    def stall_stats(self, reset: bool = False) -> dict[str, float]:
+        """
+        Time the consumer spent blocked waiting for the background thread, since the last reset.
+
+        Returns:
+            dict[str, float]: the number of batches, the total stall time in seconds and the
+                mean stall time per batch in milliseconds.
+        """
+        stats = {
+            "num_batches": self._num_batches,
+            "stall_s": self._stall_s,
+            "stall_ms_per_batch": (
+                1000.0 * self._stall_s / self._num_batches if self._num_batches > 0 else 0.0
+            ),
+        }
+        if reset:
+            self.reset_stall_stats()
+        return stats
+
+    def _produce(self, batches: queue.Queue, stop: threading.Event):
+        if self.use_cuda:
+            torch.cuda.set_device(self.device)
+
+        def _put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        try:
+            for batch in self.loader:
+                if self.pin_memory:
+                    batch = _map_tensors(batch, lambda t: t if t.is_cuda else t.pin_memory())
+                if not _put(batch):
+                    return
+        except BaseException as e:
+            _put(_ProducerError(e))
+            return
+        _put(_END_OF_EPOCH)
+
+    def _next_host_batch(self, batches: queue.Queue) -> Any:
+        start = time.perf_counter()
+        item = batches.get()
+        if item is not _END_OF_EPOCH:
+            self._stall_s += time.perf_counter() - start
+            self._num_batches += 1
+        if isinstance(item, _ProducerError):
+            raise item.error
+        return item
+
+    def _to_device(self, batch: Any, stream: torch.cuda.Stream | None) -> Any:
+        if stream is None:
+            return _map_tensors(batch, lambda t: t.to(self.device))
+        with torch.cuda.stream(stream):
+            return _map_tensors(batch, lambda t: t.to(self.device, non_blocking=True))
+
+    def __iter__(self) -> Iterator:
+        batches = queue.Queue(maxsize=self.num_prefetch)
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=self._produce, args=(batches, stop), name="device-prefetch", daemon=True
+        )
+        producer.start()
+        stream = torch.cuda.Stream(device=self.device) if self.use_cuda else None
+        try:
+            host_batch = self._next_host_batch(batches)
+            next_batch = (
+                None if host_batch is _END_OF_EPOCH else self._to_device(host_batch, stream)
+            )
+            while next_batch is not None:
+                batch = next_batch
+                if stream is not None:
+                    current_stream = torch.cuda.current_stream(self.device)
+                    current_stream.wait_stream(stream)
+                    # The tensors were allocated on the side stream but are consumed on the current one
+                    _map_tensors(batch, lambda t: t.record_stream(current_stream))
+                # Issue the copy of the next batch before handing this one to the training step
+                host_batch = self._next_host_batch(batches)
+                next_batch = (
+                    None if host_batch is _END_OF_EPOCH else self._to_device(host_batch, stream)
+                )
+                yield batch
+        finally:
+            stop.set()
+            # Unblock the producer if it waits on a full queue, then let it exit
+            while producer.is_alive():
+                try:
+                    batches.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            producer.join()
@@ -0,0 +1,241 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the latency and the action error of the action head denoising settings on CPU.
+
+Every solver, timestep schedule and number of steps is compared with a many-step Euler
+reference from the same noise. The action head is loaded from a checkpoint (only its weights, the
+backbone is not needed) and run on random backbone features, or is randomly initialized without a
+checkpoint.
+
+Example:
+    python scripts/benchmark_denoising.py \
+        --model-path nvidia/GR00T-N1.5-3B \
+        --solvers euler heun midpoint --schedules uniform cosine \
+        --num-steps 1 2 4 8 --output-json /tmp/denoising.json
+"""
+
+import glob
+import json
+import os
+import platform
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+import torch
+import tyro
+from huggingface_hub import snapshot_download
+from safetensors import safe_open
+from transformers.feature_extraction_utils import BatchFeature
+
+from gr00t.model.action_head.denoising_benchmark import benchmark_denoising
+from gr00t.model.action_head.flow_matching_action_head import (
+    FlowmatchingActionHead,
+    FlowmatchingActionHeadConfig,
+)
+from gr00t.model.action_head.ode_solvers import DenoisingConfig
+
+# Action head randomly initialized without a checkpoint
+RANDOM_ACTION_HEAD_CFG = dict(
+    add_pos_embed=True,
+    input_embedding_dim=256,
+    backbone_embedding_dim=256,
+    hidden_size=256,
+    max_seq_len=1024,
+    action_dim=32,
+    action_horizon=16,
+    num_timestep_buckets=1000,
+    num_inference_timesteps=4,
+    max_num_embodiments=32,
+    max_state_dim=64,
+    num_target_vision_tokens=32,
+    use_vlln=True,
+    diffusion_model_cfg=dict(
+        num_attention_heads=4,
+        attention_head_dim=64,
+        output_dim=256,
+        num_layers=4,
+        cross_attention_dim=256,
+        dropout=0.0,
+        final_dropout=False,
+    ),
+    vl_self_attention_cfg=dict(
+        num_attention_heads=4,
+        attention_head_dim=64,
+        output_dim=256,
+        num_layers=2,
+        dropout=0.0,
+        final_dropout=False,
+    ),
+)
+
+
+@dataclass
+class ArgsConfig:
+    """Configuration for the action head denoising benchmark."""
+
+    model_path: Optional[str] = None
+    """Path or huggingface hub id of the checkpoint to load the action head from. A randomly
+    initialized action head is benchmarked when not given."""
+
+    solvers: List[str] = field(default_factory=lambda: ["euler", "midpoint", "heun"])
+    """ODE solvers to benchmark."""
+
+    schedules: List[str] = field(default_factory=lambda: ["uniform", "cosine", "quadratic"])
+    """Timestep schedules to benchmark."""
+
+    num_steps: List[int] = field(default_factory=lambda: [1, 2, 4, 8])
+    """Numbers of solver steps to benchmark."""
+
+    adaptive_tolerances: List[float] = field(default_factory=list)
+    """Adaptive early stop tolerances to benchmark, with each solver and schedule at the largest
+    number of steps."""
+
+    reference_steps: int = 64
+    """Number of Euler steps of the reference actions."""
+
+    batch_size: int = 1
+    """Batch size of the requests."""
+
+    vl_seq_len: int = 300
+    """Sequence length of the random backbone features."""
+
+    embodiment_id: int = 0
+    """Embodiment id of the requests (a projector index of the action head)."""
+
+    num_repeats: int = 5
+    """Number of timed calls per setting."""
+
+    num_threads: Optional[int] = None
+    """Number of torch CPU threads, torch chooses when not given."""
+
+    seed: int = 42
+    """Seed for the backbone features, the state and the noise."""
+
+    output_json: Optional[str] = None
+    """Where to write the results as JSON."""
+
+
+def load_action_head(model_path: str) -> FlowmatchingActionHead:
+    """Load the action head of a GR00T checkpoint, without its backbone."""
+    if not os.path.isdir(model_path):
+        model_path = snapshot_download(model_path, repo_type="model")
+    with open(os.path.join(model_path, "config.json"), "r") as f:
+        action_head_cfg = json.load(f)["action_head_cfg"]
+    action_head = FlowmatchingActionHead(FlowmatchingActionHeadConfig(**action_head_cfg))
+
+    prefix = "action_head."
+    state_dict = {}
+    for path in sorted(glob.glob(os.path.join(model_path, "*.safetensors"))):
+        with safe_open(path, framework="pt") as f:
+            for key in f.keys():
+                if key.startswith(prefix):
+                    state_dict[key[len(prefix) :]] = f.get_tensor(key)
+    action_head.load_state_dict(state_dict)
+    return action_head
+
+
+def main(config: ArgsConfig):
+    if config.num_threads is not None:
+        torch.set_num_threads(config.num_threads)
+
+    torch.manual_seed(config.seed)
+    if config.model_path is not None:
+        action_head = load_action_head(config.model_path)
+    else:
+        action_head = FlowmatchingActionHead(FlowmatchingActionHeadConfig(**RANDOM_ACTION_HEAD_CFG))
+    action_head = action_head.float().eval()
+
+    action_head_cfg = action_head.config
+    generator = torch.Generator().manual_seed(config.seed)
+    backbone_output = BatchFeature(
+        data={
+            "backbone_features": torch.randn(
+                config.batch_size,
+                config.vl_seq_len,
+                action_head_cfg.backbone_embedding_dim,
+                generator=generator,
+            )
+        }
+    )
+    action_input = BatchFeature(
+        data={
+            "state": torch.randn(
+                config.batch_size, 1, action_head_cfg.max_state_dim, generator=generator
+            ),
+            "embodiment_id": torch.full((config.batch_size,), config.embodiment_id),
+        }
+    )
+
+    denoisings = [
+        DenoisingConfig(solver=solver, num_steps=num_steps, schedule=schedule)
+        for solver in config.solvers
+        for schedule in config.schedules
+        for num_steps in config.num_steps
+    ]
+    denoisings += [
+        DenoisingConfig(
+            solver=solver,
+            num_steps=max(config.num_steps),
+            schedule=schedule,
+            adaptive_tolerance=tolerance,
+        )
+        for solver in config.solvers
+        for schedule in config.schedules
+        for tolerance in config.adaptive_tolerances
+    ]
+
+    print(f"Benchmarking {len(denoisings)} denoising settings...")
+    sweep = benchmark_denoising(
+        action_head,
+        backbone_output,
+        action_input,
+        denoisings,
+        reference_steps=config.reference_steps,
+        num_repeats=config.num_repeats,
+        seed=config.seed,
+    )
+    for result in sweep:
+        denoising = result["denoising"]
+        stats = result["stages"]["get_action"]
+        print(
+            f"{denoising['solver']:<9} {denoising['schedule']:<10} steps={denoising['num_steps']:<3} "
+            f"tol={denoising['adaptive_tolerance']} nfe={result['num_evaluations']:<3} "
+            f"l1_mean={result['l1_mean_error']:.5f} l1_max={result['l1_max_error']:.5f} "
+            f"mean={stats['mean_ms']:8.2f}ms p99={stats['p99_ms']:8.2f}ms"
+        )
+
+    results = {
+        "config": asdict(config),
+        "environment": {
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "cpu_count": os.cpu_count(),
+            "num_threads": torch.get_num_threads(),
+            "platform": platform.platform(),
+        },
+        "denoising_sweep": sweep,
+    }
+    if config.output_json is not None:
+        with open(config.output_json, "w") as f:
+            json.dump(results, f, indent=4)
+        print(f"Results written to {config.output_json}")
+    return results
+
+
+if __name__ == "__main__":
+    config = tyro.cli(ArgsConfig)
+    main(config)
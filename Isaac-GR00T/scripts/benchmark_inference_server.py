@@ -0,0 +1,246 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Load test a ZMQ or HTTP inference server (see `scripts/inference_service.py`) at open-loop target
+rates, and report the throughput and the latency percentiles split into serialization, network and
+inference time (see `gr00t.eval.load_test`).
+
+The observations are replayed from a dataset, or are random ones with the keys of the data config.
+The server is either already running, or a stub policy server is started on CPU to measure the
+serving overhead without model weights.
+
+Example:
+    python scripts/benchmark_inference_server.py \
+        --launch-stub-server --stub-latency-ms 30 --stub-num-workers 2 \
+        --num-clients 4 --rates-hz 10 50 100 --output-json /tmp/serving.json
+
+    # against a running server, failing above a p99 latency budget
+    python scripts/benchmark_inference_server.py --protocol http --port 8000 \
+        --dataset-path demo_data/robot_sim.PickNPlace --data-config fourier_gr1_arms_only \
+        --rates-hz 20 --max-p99-ms 150
+"""
+
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field, replace
+from typing import List, Literal, Optional
+
+import tyro
+
+from gr00t.data.dataset import LeRobotSingleDataset
+from gr00t.data.embodiment_tags import EMBODIMENT_TAG_MAPPING
+from gr00t.eval.load_test import (
+    LoadTestConfig,
+    recorded_observations,
+    run_load_test,
+    synthetic_observations,
+)
+from gr00t.experiment.data_config import load_data_config
+
+
+@dataclass
+class ArgsConfig:
+    """Configuration for the inference server load test."""
+
+    protocol: Literal["zmq", "http"] = "zmq"
+    """The protocol of the server."""
+
+    host: str = "localhost"
+    """The host of the server."""
+
+    port: int = 5555
+    """The port of the server."""
+
+    api_token: Optional[str] = None
+    """The API token of the ZMQ server."""
+
+    num_clients: int = 4
+    """The number of simulated clients, each with its own connection."""
+
+    rates_hz: List[float] = field(default_factory=lambda: [10.0, 50.0, 100.0])
+    """The target request rates of all the clients together to sweep, in requests per second."""
+
+    duration_s: float = 10.0
+    """The duration of the measured requests schedule of every rate."""
+
+    warmup_s: float = 1.0
+    """The duration of the requests schedule before the measured one."""
+
+    poisson: bool = False
+    """Whether to send the requests at Poisson arrival times instead of evenly spaced ones."""
+
+    data_config: str = "fourier_gr1_arms_waist"
+    """The data config of the observation keys, see gr00t/experiment/data_config.py."""
+
+    dataset_path: Optional[str] = None
+    """The dataset to replay the observations from. Random observations when not given."""
+
+    embodiment_tag: Literal[tuple(EMBODIMENT_TAG_MAPPING.keys())] = "gr1"
+    """The embodiment tag of the dataset."""
+
+    video_backend: Literal["decord", "torchvision_av"] = "decord"
+    """The video backend of the dataset."""
+
+    num_observations: int = 8
+    """The number of different observations sent round robin."""
+
+    image_size: tuple[int, int] = (256, 256)
+    """The (height, width) of the random camera images."""
+
+    state_dim: int = 7
+    """The dimension of the random state keys."""
+
+    launch_stub_server: bool = False
+    """Whether to start a stub policy server (`--stub-policy` of scripts/inference_service.py) on
+    the port for the duration of the load test."""
+
+    stub_latency_ms: float = 0.0
+    """The latency of the stub policy."""
+
+    stub_num_workers: int = 1
+    """The number of workers of the stub ZMQ server."""
+
+    max_p99_ms: Optional[float] = None
+    """Exit with an error if the p99 latency of a rate exceeds this budget, or if a request fails,
+    e.g. to gate regressions."""
+
+    output_json: Optional[str] = None
+    """Where to write the results as JSON."""
+
+
+def launch_stub_server(config: ArgsConfig, timeout_s: float = 120.0) -> subprocess.Popen:
+    """Start a stub policy server in a subprocess, and wait until it answers."""
+    command = [
+        sys.executable,
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "inference_service.py"),
+        "--server",
+        "--stub-policy",
+        "--stub-latency-ms",
+        str(config.stub_latency_ms),
+        "--data-config",
+        config.data_config,
+        "--port",
+        str(config.port),
+        "--num-workers",
+        str(config.stub_num_workers),
+    ]
+    if config.protocol == "http":
+        command += ["--http-server", "--host", config.host]
+    if config.api_token:
+        command += ["--api-token", config.api_token]
+    server = subprocess.Popen(command)
+
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        assert server.poll() is None, "The stub server exited"
+        try:
+            # both servers are ready once their port is bound
+            socket.create_connection((config.host, config.port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.5)
+    server.kill()
+    raise TimeoutError(f"The stub server did not start within {timeout_s} s")
+
+
+def main(config: ArgsConfig):
+    data_config = load_data_config(config.data_config)
+    modality_config = data_config.modality_config()
+    if config.dataset_path is not None:
+        dataset = LeRobotSingleDataset(
+            dataset_path=config.dataset_path,
+            modality_configs=modality_config,
+            video_backend=config.video_backend,
+            transforms=None,
+            embodiment_tag=config.embodiment_tag,
+        )
+        observations = recorded_observations(dataset, config.num_observations)
+    else:
+        observations = synthetic_observations(
+            modality_config,
+            config.num_observations,
+            image_size=config.image_size,
+            state_dim=config.state_dim,
+        )
+
+    server = launch_stub_server(config) if config.launch_stub_server else None
+    load_test = LoadTestConfig(
+        protocol=config.protocol,
+        host=config.host,
+        port=config.port,
+        api_token=config.api_token,
+        num_clients=config.num_clients,
+        duration_s=config.duration_s,
+        warmup_s=config.warmup_s,
+        poisson=config.poisson,
+    )
+    sweep = []
+    try:
+        for rate_hz in config.rates_hz:
+            print(f"Load testing at {rate_hz} requests/s from {config.num_clients} clients...")
+            result = run_load_test(replace(load_test, rate_hz=rate_hz), observations)
+            sweep.append(result)
+            latency = result["latency"]
+            print(
+                f"  sent={result['sent']} completed={result['completed']} "
+                f"errors={result['errors']} unanswered={result['unanswered']} "
+                f"throughput={result['throughput_hz']:.1f}/s"
+            )
+            for part in ("total", "serialize", "network", "inference"):
+                if part in latency:
+                    stats = latency[part]
+                    print(
+                        f"  {part:<10} p50={stats['p50_ms']:8.2f}ms p95={stats['p95_ms']:8.2f}ms "
+                        f"p99={stats['p99_ms']:8.2f}ms p99.9={stats['p99.9_ms']:8.2f}ms"
+                    )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    results = {
+        "config": asdict(config),
+        "environment": {
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "platform": platform.platform(),
+        },
+        "load_sweep": sweep,
+    }
+    if config.output_json is not None:
+        with open(config.output_json, "w") as f:
+            json.dump(results, f, indent=4)
+        print(f"Results written to {config.output_json}")
+
+    if config.max_p99_ms is not None:
+        for result in sweep:
+            failed = sum(result["errors"].values()) + result["unanswered"]
+            p99_ms = result["latency"].get("total", {}).get("p99_ms", float("inf"))
+            assert failed == 0 and p99_ms <= config.max_p99_ms, (
+                f"At {result['target_rate_hz']} requests/s: {failed} failed requests, "
+                f"p99 latency {p99_ms:.2f} ms above the {config.max_p99_ms} ms budget"
+            )
+    return results
+
+
+if __name__ == "__main__":
+    config = tyro.cli(ArgsConfig)
+    main(config)
@@ -0,0 +1,169 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the training input pipeline on CPU.
+
+Example:
+    python scripts/benchmark_input_pipeline.py \
+        --dataset-path demo_data/robot_sim.PickNPlace \
+        --video-backends decord torchvision_av \
+        --num-workers 0 2 4 --prefetch-factors 2 4 \
+        --output-json /tmp/input_pipeline.json
+"""
+
+import json
+import os
+import platform
+from dataclasses import asdict, dataclass, field
+from typing import List, Literal
+
+import numpy as np
+import torch
+import tyro
+
+from gr00t.data.dataset import LeRobotSingleDataset
+from gr00t.data.schema import EmbodimentTag
+from gr00t.experiment.data_config import load_data_config
+from gr00t.model.transforms import EMBODIMENT_TAG_MAPPING, DefaultDataCollator
+from gr00t.utils.benchmark import benchmark_dataloader, profile_dataset_stages
+
+
+@dataclass
+class ArgsConfig:
+    """Configuration for the input pipeline benchmark."""
+
+    dataset_path: str = "demo_data/robot_sim.PickNPlace"
+    """Path to the dataset directory."""
+
+    data_config: str = "fourier_gr1_arms_only"
+    """Data configuration providing the modality configs and transforms, see gr00t/experiment/data_config.py."""
+
+    embodiment_tag: Literal[tuple(EMBODIMENT_TAG_MAPPING.keys())] = "gr1"
+    """Embodiment tag of the dataset."""
+
+    video_backend: Literal["torchcodec", "decord", "torchvision_av"] = "decord"
+    """Video backend used by the dataset (end-to-end timings and the dataloader sweep)."""
+
+    video_backends: List[str] = field(default_factory=lambda: ["decord", "torchvision_av"])
+    """Video backends whose decoding latency is measured per stage."""
+
+    num_samples: int = 64
+    """Number of samples to profile stage by stage."""
+
+    batch_size: int = 8
+    """Batch size for collation and the dataloader sweep."""
+
+    collate: bool = True
+    """Whether to include DefaultDataCollator (Eagle processor) in the measurements."""
+
+    num_workers: List[int] = field(default_factory=lambda: [0, 2, 4])
+    """Values of dataloader_num_workers to sweep."""
+
+    prefetch_factors: List[int] = field(default_factory=lambda: [2, 4])
+    """Values of dataloader_prefetch_factor to sweep (ignored when num_workers is 0)."""
+
+    num_batches: int = 16
+    """Number of batches to load for each dataloader setting, after the first one."""
+
+    base_model_path: str | None = None
+    """If given, the model forward (DualBrainTrainer.compute_loss) is timed on the collated batches."""
+
+    seed: int = 42
+    """Seed for the sample selection and the dataloader shuffling."""
+
+    output_json: str | None = None
+    """Where to write the results as JSON."""
+
+
+def main(config: ArgsConfig):
+    data_config_cls = load_data_config(config.data_config)
+    dataset = LeRobotSingleDataset(
+        dataset_path=config.dataset_path,
+        modality_configs=data_config_cls.modality_config(),
+        transforms=data_config_cls.transform(),
+        embodiment_tag=EmbodimentTag(config.embodiment_tag),
+        video_backend=config.video_backend,
+    )
+    collate_fn = DefaultDataCollator() if config.collate else None
+
+    model = None
+    if config.base_model_path is not None:
+        from gr00t.model.gr00t_n1 import GR00T_N1_5
+
+        model = GR00T_N1_5.from_pretrained(config.base_model_path)
+        model.compute_dtype = "float32"
+        model.config.compute_dtype = "float32"
+
+    rng = np.random.default_rng(config.seed)
+    indices = rng.choice(len(dataset), size=min(config.num_samples, len(dataset)), replace=False)
+
+    print(f"Profiling {len(indices)} samples of {dataset.dataset_name}...")
+    stages = profile_dataset_stages(
+        dataset,
+        indices.tolist(),
+        video_backends=config.video_backends,
+        collate_fn=collate_fn,
+        batch_size=config.batch_size,
+        model=model,
+    )
+    print(f"dataset[index]: {stages['samples_per_second']:.1f} samples/s")
+    for stage, stats in stages["stages"].items():
+        print(
+            f"  {stage:<50} n={stats['count']:<5} mean={stats['mean_ms']:8.2f}ms "
+            f"p50={stats['p50_ms']:8.2f}ms p99={stats['p99_ms']:8.2f}ms"
+        )
+
+    sweep = []
+    for num_workers in config.num_workers:
+        prefetch_factors = config.prefetch_factors if num_workers > 0 else [None]
+        for prefetch_factor in prefetch_factors:
+            result = benchmark_dataloader(
+                dataset,
+                batch_size=config.batch_size,
+                num_workers=num_workers,
+                prefetch_factor=prefetch_factor,
+                num_batches=config.num_batches,
+                collate_fn=collate_fn,
+                seed=config.seed,
+            )
+            print(
+                f"num_workers={num_workers} prefetch_factor={prefetch_factor}: "
+                f"{result['samples_per_second']:.1f} samples/s, "
+                f"first batch {result['first_batch_s']:.2f}s"
+            )
+            sweep.append(result)
+
+    results = {
+        "config": asdict(config),
+        "environment": {
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "cpu_count": os.cpu_count(),
+            "platform": platform.platform(),
+        },
+        "stages": stages,
+        "dataloader_sweep": sweep,
+    }
+    if config.output_json is not None:
+        with open(config.output_json, "w") as f:
+            json.dump(results, f, indent=4)
+        print(f"Results written to {config.output_json}")
+    return results
+
+
+if __name__ == "__main__":
+    config = tyro.cli(ArgsConfig)
+    main(config)
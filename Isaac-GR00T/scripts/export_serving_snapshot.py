@@ -0,0 +1,139 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Export a checkpoint as a serving snapshot for an embodiment: its weights in their final dtypes and
+action horizon, with the metadata of the embodiment, loaded by `Gr00tPolicy` without any conversion
+(see `gr00t.model.fast_load`).
+
+Example:
+    python scripts/export_serving_snapshot.py --model-path nvidia/GR00T-N1.5-3B \
+        --embodiment-tag gr1 --data-config fourier_gr1_arms_waist --output-dir /tmp/gr1_snapshot --verify
+
+    python scripts/inference_service.py --server --model-path /tmp/gr1_snapshot \
+        --embodiment-tag gr1 --data-config fourier_gr1_arms_waist
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+import torch
+import tyro
+
+from gr00t.data.embodiment_tags import EMBODIMENT_TAG_MAPPING
+from gr00t.eval.load_test import synthetic_observations
+from gr00t.experiment.data_config import load_data_config
+from gr00t.model.fast_load import save_serving_snapshot
+from gr00t.model.policy import Gr00tPolicy
+
+
+@dataclass
+class ArgsConfig:
+    """Configuration for exporting a serving snapshot."""
+
+    model_path: str = "nvidia/GR00T-N1.5-3B"
+    """Path to the model checkpoint directory or the huggingface hub id."""
+
+    embodiment_tag: Literal[tuple(EMBODIMENT_TAG_MAPPING.keys())] = "gr1"
+    """The embodiment tag of the snapshot."""
+
+    data_config: str = "fourier_gr1_arms_waist"
+    """The name or "module:ClassName" path of the data config, see
+    gr00t/experiment/data_config.py."""
+
+    output_dir: str = "serving_snapshot"
+    """The snapshot directory."""
+
+    verify: bool = False
+    """Reload the snapshot, and check that its actions match the ones of the checkpoint on random
+    observations."""
+
+    num_observations: int = 4
+    """The number of random observations of the verification."""
+
+    atol: float = 1e-2
+    """The tolerance of the actions of the verification."""
+
+
+def _load_policy(config: ArgsConfig, model_path: str, fast_start: bool) -> Gr00tPolicy:
+    data_config = load_data_config(config.data_config)
+    modality_config = data_config.modality_config()
+    if fast_start:
+        Gr00tPolicy.prefetch_model(model_path, modality_config)
+    return Gr00tPolicy(
+        model_path=model_path,
+        embodiment_tag=config.embodiment_tag,
+        modality_config=modality_config,
+        modality_transform=data_config.transform(),
+        fast_start=fast_start,
+    )
+
+
+def _random_observations(policy: Gr00tPolicy, num_observations: int) -> list[dict]:
+    observations = synthetic_observations(policy.get_modality_config(), num_observations, seed=0)
+    rng = np.random.default_rng(0)
+    for observation in observations:
+        for key, value in observation.items():
+            if key.startswith("state."):
+                # the state dimensions of the embodiment, for its normalization
+                shape = policy.metadata.modalities.state[key.split(".", 1)[1]].shape
+                observation[key] = rng.random((value.shape[0], *shape))
+    return observations
+
+
+def _actions(policy: Gr00tPolicy, observations: list[dict]) -> list[dict]:
+    actions = []
+    for i, observation in enumerate(observations):
+        # the same initial noise for both policies
+        torch.manual_seed(i)
+        actions.append(policy.get_action(observation))
+    return actions
+
+
+def main(config: ArgsConfig):
+    start = time.perf_counter()
+    policy = _load_policy(config, config.model_path, fast_start=False)
+    load_s = time.perf_counter() - start
+    print(f"Loaded {config.model_path} in {load_s:.2f} s")
+
+    save_serving_snapshot(policy, config.output_dir)
+    print(f"Serving snapshot written to {config.output_dir}")
+    if not config.verify:
+        return
+
+    observations = _random_observations(policy, config.num_observations)
+    expected = _actions(policy, observations)
+    del policy
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+    start = time.perf_counter()
+    snapshot_policy = _load_policy(config, config.output_dir, fast_start=True)
+    snapshot_load_s = time.perf_counter() - start
+    print(f"Loaded the serving snapshot in {snapshot_load_s:.2f} s (was {load_s:.2f} s)")
+
+    for expected_action, action in zip(expected, _actions(snapshot_policy, observations)):
+        assert expected_action.keys() == action.keys()
+        for key in expected_action:
+            max_diff = np.max(np.abs(expected_action[key] - action[key]))
+            assert max_diff <= config.atol, f"{key} differs by {max_diff} from the checkpoint"
+    print(f"The actions of the serving snapshot match the checkpoint (atol={config.atol})")
+
+
+if __name__ == "__main__":
+    config = tyro.cli(ArgsConfig)
+    main(config)
@@ -66,6 +66,12 @@ class ArgsConfig:
     save_steps: int = 1000
     """Number of steps between saving checkpoints."""
 
+    async_checkpoint: bool = False
+    """Write checkpoints in a background thread instead of blocking training while saving."""
+
+    max_inflight_checkpoints: int = 1
+    """Maximum number of checkpoints being written in the background at the same time."""
+
     # Model parameters
     base_model_path: str = "nvidia/GR00T-N1.5-3B"
     """Path or HuggingFace model ID for the base model."""
@@ -116,6 +122,15 @@ class ArgsConfig:
     dataloader_prefetch_factor: int = 4
     """Prefetch factor for data loading."""
 
+    prefetch_to_device: bool = False
+    """Pin batches in a background thread and copy the next batch to the GPU while the current step runs."""
+
+    num_prefetch_batches: int = 2
+    """Number of pinned batches queued ahead of the training step when prefetch_to_device is set."""
+
+    sampler_block_size: int = 1
+    """Number of consecutive steps of a trajectory kept together when shuffling. Larger values increase data loading cache hits at the cost of less diverse batches."""
+
     report_to: Literal["wandb", "tensorboard", "azure_ml"] = "wandb"
     """Where to report training metrics (e.g., 'wandb', 'tensorboard', 'azure_ml')."""
 
@@ -354,6 +369,7 @@ def main(config: ArgsConfig):
         per_device_train_batch_size=config.batch_size,
         gradient_accumulation_steps=config.gradient_accumulation_steps,
         dataloader_num_workers=config.dataloader_num_workers,
+        # With prefetch_to_device, batches are pinned by the prefetch thread instead
         dataloader_pin_memory=False,
         dataloader_prefetch_factor=config.dataloader_prefetch_factor,
         dataloader_persistent_workers=config.dataloader_num_workers > 0,
@@ -386,6 +402,11 @@ def main(config: ArgsConfig):
         model=model,
         training_args=training_args,
         resume_from_checkpoint=config.resume,
+        async_checkpoint=config.async_checkpoint,
+        max_inflight_checkpoints=config.max_inflight_checkpoints,
+        prefetch_to_device=config.prefetch_to_device,
+        num_prefetch_batches=config.num_prefetch_batches,
+        sampler_block_size=config.sampler_block_size,
     )
 
     # 2.3 run experiment
@@ -52,19 +52,101 @@ TensorRT HTTP Server Usage:
 
 Note: TensorRT engines must be built before running with --use-tensorrt flag.
 See deployment_scripts/README.md for instructions on building TensorRT engines.
+
+4. ONNX Runtime Support:
+
+To serve the ONNX graphs exported by deployment_scripts/export_onnx.py without CUDA (e.g. on a GPU-less edge
+box or in CI), run the server with the --use-onnxruntime flag. The fp16 graphs are used, on the CPU by default:
+
+ONNX Runtime Server Usage:
+    python scripts/inference_service.py --server --use-onnxruntime --onnx-model-path gr00t_onnx --ort-intra-op-threads 8
+
+5. Backbone Cache:
+
+In closed-loop control, the backbone computations can be reused across the calls of an episode, recomputing the
+vision tokens of the camera images that changed. The clients reset the policy at the episode boundaries
+(`RobotInferenceClient.reset()` or `POST /reset`):
+
+    python scripts/inference_service.py --server --backbone-cache --backbone-cache-threshold 0.01
+
+6. Multi-Worker Server:
+
+The ZMQ server can run several policy replicas (e.g. one per GPU memory budget), each in its own worker, behind a
+ROUTER socket. The existing clients are unchanged. The requests are served round robin across the clients:
+
+    python scripts/inference_service.py --server --num-workers 2
+
+7. Denoising:
+
+The action head integrates the actions with `--denoising-steps` uniform Euler steps by default. Other ODE solvers,
+timestep schedules and an adaptive early stop trade latency for action quality, see
+`scripts/benchmark_denoising.py` to measure them. A request can also override them with a "denoising" observation
+entry, e.g. {"solver": "heun", "num_steps": 2}:
+
+    python scripts/inference_service.py --server --denoising-solver heun --denoising-steps 2
+
+8. Admission Control:
+
+A request can carry a client id, the timestamp of its observation, a deadline and a priority (see
+`gr00t.eval.admission`), e.g. `RobotInferenceClient(client_id="arm0", deadline_ms=100)`. All the servers serve the
+waiting requests by priority, then round robin across the clients, then by earliest deadline. Instead of being
+served late, a request is answered with a "status" error that the ZMQ client raises as `RequestRejectedError`
+(HTTP status 503): "expired" past its deadline or `--request-timeout-ms`, "busy" beyond `--max-queue-depth`
+waiting requests, "superseded" by a newer observation of the same client with `--newest-first`. The counters are
+served by the "stats" endpoint (`RobotInferenceClient.stats()` or `GET /stats`):
+
+    python scripts/inference_service.py --server --max-queue-depth 4 --request-timeout-ms 200 --newest-first
+    python scripts/inference_service.py --client --deadline-ms 150
+
+9. Load Testing:
+
+`--stub-policy` serves zero actions after `--stub-latency-ms` without loading the model, to measure the serving
+overhead on CPU. See `scripts/benchmark_inference_server.py` to load test a server at open-loop target rates:
+
+    python scripts/inference_service.py --server --stub-policy --stub-latency-ms 30 --num-workers 2
+    python scripts/benchmark_inference_server.py --num-clients 4 --rates-hz 10 50 100
+
+10. Multi-Model Hosting:
+
+One server can host several checkpoints and embodiments, as "[name=]model_path,embodiment_tag,data_config" specs. A
+request selects its policy with a "model" observation entry (`RobotInferenceClient(model="so100")`), the first one by
+default. The policies are loaded on their first request and the least recently used ones are evicted beyond the
+budget. Identical backbone weights (e.g. checkpoints finetuned with a frozen backbone) are loaded once:
+
+    python scripts/inference_service.py --server --max-loaded-policies 2 --hosted-models \
+        so100=<SO100_CHECKPOINT>,new_embodiment,so100 gr1=nvidia/GR00T-N1.5-3B,gr1,fourier_gr1_arms_waist
+    python scripts/inference_service.py --client --model gr1
+
+11. Fast Start:
+
+`--fast-start` builds the model without initializing its weights, memory-maps the checkpoint straight to the device
+and dtype, and loads it while the transforms and the Eagle processor are built. A serving snapshot (the weights in
+their final dtypes and action horizon, with the metadata of one embodiment) is always loaded this way:
+
+    python scripts/export_serving_snapshot.py --model-path nvidia/GR00T-N1.5-3B --output-dir /tmp/gr1_snapshot --verify
+    python scripts/inference_service.py --server --model-path /tmp/gr1_snapshot
 """
 
 import time
-from dataclasses import dataclass
-from typing import Literal
+from dataclasses import dataclass, field, replace
+from typing import List, Literal, Optional
 
 import numpy as np
 import tyro
 
 from gr00t.data.embodiment_tags import EMBODIMENT_TAG_MAPPING
-from gr00t.eval.robot import RobotInferenceClient, RobotInferenceServer
+from gr00t.eval.admission import AdmissionConfig
+from gr00t.eval.load_test import StubPolicy
+from gr00t.eval.robot import (
+    MultiWorkerRobotInferenceServer,
+    RobotInferenceClient,
+    RobotInferenceServer,
+)
 from gr00t.experiment.data_config import load_data_config
+from gr00t.model.action_head.ode_solvers import DenoisingConfig
+from gr00t.model.backbone import BackboneCacheConfig, BackbonePool
 from gr00t.model.policy import Gr00tPolicy
+from gr00t.model.policy_host import HostedPolicySpec, PolicyHost
 
 
 @dataclass
@@ -100,6 +182,16 @@ class ArgsConfig:
     denoising_steps: int = 4
     """The number of denoising steps to use."""
 
+    denoising_solver: Literal["euler", "midpoint", "heun"] = "euler"
+    """The ODE solver of the action head denoising. Only with the PyTorch action head."""
+
+    denoising_schedule: Literal["uniform", "cosine", "quadratic"] = "uniform"
+    """The timestep schedule of the action head denoising. Only with the PyTorch action head."""
+
+    denoising_tolerance: Optional[float] = None
+    """Stop the denoising early once the predicted velocity changes by less than this tolerance
+    between two steps. Only with the PyTorch action head."""
+
     api_token: str = None
     """API token for authentication. If not provided, authentication is disabled."""
 
@@ -121,17 +213,104 @@ class ArgsConfig:
     dit_dtype: Literal["fp16", "fp8"] = "fp8"
     """DiT model dtype (fp16, fp8). Only used when use_tensorrt is True."""
 
+    use_onnxruntime: bool = False
+    """Whether to run the exported fp16 ONNX graphs with ONNX Runtime, e.g. on a GPU-less machine."""
+
+    onnx_model_path: str = "gr00t_onnx"
+    """Path to the exported ONNX graphs directory. Only used when use_onnxruntime is True."""
+
+    ort_providers: tuple[str, ...] = ("CPUExecutionProvider",)
+    """ONNX Runtime execution providers, in order of preference."""
+
+    ort_intra_op_threads: int = 0
+    """ONNX Runtime threads used to parallelize an op, 0 lets ONNX Runtime choose."""
+
+    ort_inter_op_threads: int = 0
+    """ONNX Runtime threads used to run independent ops in parallel, 0 lets ONNX Runtime choose."""
+
+    ort_graph_optimization_level: Literal["disable", "basic", "extended", "all"] = "all"
+    """ONNX Runtime graph optimization level. Only used when use_onnxruntime is True."""
+
+    num_workers: int = 1
+    """Number of ZMQ server workers, each running its own policy replica on a ROUTER socket. With
+    1, the single-threaded REP server is used."""
+
+    request_timeout_ms: Optional[int] = None
+    """Maximum time a request without deadline waits to be served before being answered with an
+    "expired" error, None to wait indefinitely."""
+
+    max_queue_depth: Optional[int] = None
+    """Maximum number of requests waiting to be served, the following ones are answered with a
+    "busy" error. None for no limit."""
+
+    max_age_ms: Optional[float] = None
+    """Maximum age of an observation, from its client timestamp to the start of its serving.
+    Requires synchronized client and server clocks. None for no limit."""
+
+    newest_first: bool = False
+    """Only serve the newest observation of each client, dropping its older waiting ones."""
+
+    deadline_ms: Optional[float] = None
+    """Client only: deadline of the requests, relative to the observation timestamp."""
+
+    hosted_models: List[str] = field(default_factory=list)
+    """Host several policies in this process instead of the one of --model-path, as
+    "[name=]model_path,embodiment_tag,data_config" specs. A request selects one with a "model"
+    observation entry, the first one by default."""
+
+    max_loaded_policies: Optional[int] = None
+    """Maximum number of hosted policies loaded at a time, the least recently used ones are
+    evicted. None for no limit."""
+
+    max_memory_gb: Optional[float] = None
+    """Memory budget of the loaded hosted policies, the least recently used ones are evicted. None
+    for no limit."""
+
+    model: Optional[str] = None
+    """Client only: the hosted policy to request."""
+
+    fast_start: bool = False
+    """Load the model straight to the device and dtype, while the transforms are built, see
+    `GR00T_N1_5.from_pretrained_fast`. Always used for the serving snapshots of
+    scripts/export_serving_snapshot.py."""
+
+    stub_policy: bool = False
+    """Serve a stub policy returning zero actions without loading the model, to load test the
+    servers on CPU, see scripts/benchmark_inference_server.py."""
+
+    stub_latency_ms: float = 0.0
+    """The latency of the stub policy."""
+
+    backbone_cache: bool = False
+    """Whether to reuse the backbone computations across the calls of an episode. The clients call
+    the reset endpoint at the episode boundaries. Only with the PyTorch backbone."""
+
+    backbone_cache_threshold: float = 0.0
+    """Mean absolute pixel difference above which the vision tokens of an image are recomputed."""
+
+    backbone_cache_refresh_interval: int = 0
+    """Recompute the vision tokens of all the images every N calls, 0 to never force it."""
+
 
 #####################################################################################
 
 
-def _example_zmq_client_call(obs: dict, host: str, port: int, api_token: str):
+def _example_zmq_client_call(
+    obs: dict,
+    host: str,
+    port: int,
+    api_token: str,
+    deadline_ms: Optional[float] = None,
+    model: Optional[str] = None,
+):
     """
     Example ZMQ client call to the server.
     """
     # Original ZMQ client mode
     # Create a policy wrapper
-    policy_client = RobotInferenceClient(host=host, port=port, api_token=api_token)
+    policy_client = RobotInferenceClient(
+        host=host, port=port, api_token=api_token, deadline_ms=deadline_ms, model=model
+    )
 
     print("Available modality config available:")
     modality_configs = policy_client.get_modality_config()
@@ -167,6 +346,81 @@ def _example_http_client_call(obs: dict, host: str, port: int, api_token: str):
         return {}
 
 
+def _load_policy(
+    args: ArgsConfig, data_config, backbone_pool: Optional[BackbonePool] = None
+) -> Gr00tPolicy:
+    """
+    Load a policy, with its TensorRT engines or ONNX Runtime sessions if requested. Each policy
+    has its own transforms, so that the replicas of the workers share no state.
+    """
+    denoising = DenoisingConfig(
+        solver=args.denoising_solver,
+        schedule=args.denoising_schedule,
+        adaptive_tolerance=args.denoising_tolerance,
+    )
+    modality_config = data_config.modality_config()
+    if args.fast_start:
+        # load the model while the transforms (and their Eagle processor) are built
+        Gr00tPolicy.prefetch_model(args.model_path, modality_config, backbone_pool=backbone_pool)
+    policy = Gr00tPolicy(
+        model_path=args.model_path,
+        modality_config=modality_config,
+        modality_transform=data_config.transform(),
+        embodiment_tag=args.embodiment_tag,
+        denoising_steps=args.denoising_steps,
+        backbone_cache=(
+            BackboneCacheConfig(
+                frame_change_threshold=args.backbone_cache_threshold,
+                refresh_interval=args.backbone_cache_refresh_interval,
+            )
+            if args.backbone_cache
+            else None
+        ),
+        denoising=denoising if denoising != DenoisingConfig() else None,
+        backbone_pool=backbone_pool,
+        fast_start=args.fast_start,
+    )
+
+    assert not (
+        args.backbone_cache and (args.use_tensorrt or args.use_onnxruntime)
+    ), "The backbone cache runs the PyTorch backbone, it cannot be used with the engines"
+    assert not (
+        policy.denoising is not None and (args.use_tensorrt or args.use_onnxruntime)
+    ), "The engines run uniform Euler steps, they cannot be used with another denoising"
+
+    # Setup TensorRT if requested
+    if args.use_tensorrt:
+        print(f"Setting up TensorRT engines from: {args.trt_engine_path}")
+        print(f"  ViT dtype: {args.vit_dtype}")
+        print(f"  LLM dtype: {args.llm_dtype}")
+        print(f"  DiT dtype: {args.dit_dtype}")
+        from deployment_scripts.trt_model_forward import setup_tensorrt_engines
+
+        setup_tensorrt_engines(
+            policy, args.trt_engine_path, args.vit_dtype, args.llm_dtype, args.dit_dtype
+        )
+        print("TensorRT engines loaded successfully!")
+
+    # Setup ONNX Runtime if requested
+    if args.use_onnxruntime:
+        assert not args.use_tensorrt, "Only one of use_tensorrt and use_onnxruntime can be set"
+        print(f"Setting up ONNX Runtime sessions from: {args.onnx_model_path}")
+        print(f"  Providers: {list(args.ort_providers)}")
+        print(f"  Intra/inter op threads: {args.ort_intra_op_threads}/{args.ort_inter_op_threads}")
+        from deployment_scripts.ort_model_forward import setup_onnxruntime_sessions
+
+        setup_onnxruntime_sessions(
+            policy,
+            args.onnx_model_path,
+            providers=args.ort_providers,
+            intra_op_num_threads=args.ort_intra_op_threads,
+            inter_op_num_threads=args.ort_inter_op_threads,
+            graph_optimization_level=args.ort_graph_optimization_level,
+        )
+        print("ONNX Runtime sessions loaded successfully!")
+    return policy
+
+
 def main(args: ArgsConfig):
     if args.server:
         # Create a policy
@@ -181,40 +435,72 @@ def main(args: ArgsConfig):
         # construct your own modality config and transform
         # see gr00t/utils/data.py for more details
         data_config = load_data_config(args.data_config)
-        modality_config = data_config.modality_config()
-        modality_transform = data_config.transform()
-
-        policy = Gr00tPolicy(
-            model_path=args.model_path,
-            modality_config=modality_config,
-            modality_transform=modality_transform,
-            embodiment_tag=args.embodiment_tag,
-            denoising_steps=args.denoising_steps,
-        )
-
-        # Setup TensorRT if requested
-        if args.use_tensorrt:
-            print(f"Setting up TensorRT engines from: {args.trt_engine_path}")
-            print(f"  ViT dtype: {args.vit_dtype}")
-            print(f"  LLM dtype: {args.llm_dtype}")
-            print(f"  DiT dtype: {args.dit_dtype}")
-            from deployment_scripts.trt_model_forward import setup_tensorrt_engines
-
-            setup_tensorrt_engines(
-                policy, args.trt_engine_path, args.vit_dtype, args.llm_dtype, args.dit_dtype
+        if args.stub_policy:
+            modality_config = data_config.modality_config()
+            policies = [
+                StubPolicy(modality_config, latency_ms=args.stub_latency_ms)
+                for _ in range(args.num_workers)
+            ]
+        elif args.hosted_models:
+            # the engines release the PyTorch modules of the backbones shared by the policies, and
+            # are built for a single checkpoint
+            assert not (
+                args.use_tensorrt or args.use_onnxruntime
+            ), "--hosted-models runs the PyTorch models, it cannot be used with the engines"
+
+            def load_hosted_policy(spec: HostedPolicySpec, backbone_pool: BackbonePool):
+                spec_args = replace(
+                    args,
+                    model_path=spec.model_path,
+                    embodiment_tag=spec.embodiment_tag,
+                    data_config=spec.data_config,
+                )
+                return _load_policy(spec_args, load_data_config(spec.data_config), backbone_pool)
+
+            host = PolicyHost(
+                [HostedPolicySpec.parse(spec) for spec in args.hosted_models],
+                loader=load_hosted_policy,
+                max_loaded_policies=args.max_loaded_policies,
+                max_memory_gb=args.max_memory_gb,
             )
-            print("TensorRT engines loaded successfully!")
+            # the workers share the host, the requests to different policies run concurrently
+            policies = [host] * args.num_workers
+        else:
+            policies = [_load_policy(args, data_config) for _ in range(args.num_workers)]
+        admission = AdmissionConfig(
+            max_queue_depth=args.max_queue_depth,
+            max_age_ms=args.max_age_ms,
+            default_timeout_ms=args.request_timeout_ms,
+            newest_first=args.newest_first,
+        )
 
         # Start the server
         if args.http_server:
             from gr00t.eval.http_server import HTTPInferenceServer  # noqa: F401
 
+            assert args.num_workers == 1, "The HTTP server runs a single policy"
             server = HTTPInferenceServer(
-                policy, port=args.port, host=args.host, api_token=args.api_token
+                policies[0],
+                port=args.port,
+                host=args.host,
+                api_token=args.api_token,
+                admission=admission,
+            )
+            server.run()
+        elif args.num_workers > 1:
+            server = MultiWorkerRobotInferenceServer(
+                policies,
+                port=args.port,
+                api_token=args.api_token,
+                admission=admission,
+                # the backbone cache keeps per-episode state in the replica of the client
+                sticky_clients=args.backbone_cache,
             )
             server.run()
         else:
-            server = RobotInferenceServer(policy, port=args.port, api_token=args.api_token)
+            server = RobotInferenceServer(
+                policies[0], port=args.port, api_token=args.api_token, admission=admission
+            )
             server.run()
 
     # Here is mainly a testing code
@@ -248,7 +534,9 @@ def main(args: ArgsConfig):
         if args.http_server:
             action = _example_http_client_call(obs, args.host, args.port, args.api_token)
         else:
-            action = _example_zmq_client_call(obs, args.host, args.port, args.api_token)
+            action = _example_zmq_client_call(
+                obs, args.host, args.port, args.api_token, args.deadline_ms, args.model
+            )
 
         for key, value in action.items():
             print(f"Action: {key}: {value.shape}")
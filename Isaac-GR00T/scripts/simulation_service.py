@@ -62,6 +62,13 @@ if __name__ == "__main__":
     parser.add_argument(
         "--max_episode_steps", type=int, help="Maximum number of steps per episode.", default=1440
     )
+    parser.add_argument(
+        "--vector_env_backend",
+        type=str,
+        choices=["async", "shared_memory"],
+        help="How parallel environments return observations.",
+        default="async",
+    )
     # server mode
     parser.add_argument("--server", action="store_true", help="Run the server.")
     # client mode
@@ -96,6 +103,7 @@ if __name__ == "__main__":
             multistep=MultiStepConfig(
                 n_action_steps=args.n_action_steps, max_episode_steps=args.max_episode_steps
             ),
+            vector_env_backend=args.vector_env_backend,
         )
 
         # Run the simulation
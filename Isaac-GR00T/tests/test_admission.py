@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pytest
+
+from gr00t.eval.admission import (
+    BUSY,
+    EXPIRED,
+    SUPERSEDED,
+    AdmissionConfig,
+    AdmissionController,
+    AdmissionQueue,
+    RequestMetadata,
+    RequestRejectedError,
+)
+
+
+def _push(queue, client, **kwargs):
+    timeout_ms = kwargs.pop("timeout_ms", None)
+    endpoint = kwargs.pop("endpoint", "get_action")
+    entry = queue.make_entry(client, client, RequestMetadata(**kwargs), endpoint, timeout_ms)
+    return entry, queue.push(entry)
+
+
+def test_deadline_is_relative_to_the_client_timestamp():
+    queue = AdmissionQueue()
+    # a client clock 1 hour ahead of the server clock
+    timestamp = time.time() + 3600.0
+    entry, _ = _push(queue, "a", timestamp=timestamp, deadline=timestamp + 0.05)
+    # the epoch timestamps carry rounding errors of ~1e-7 s
+    assert entry.expires_at - entry.received_at == pytest.approx(0.05, abs=1e-6)
+
+    # the observation age needs synchronized clocks
+    queue = AdmissionQueue(AdmissionConfig(max_age_ms=100))
+    entry, rejected = _push(queue, "a", timestamp=time.time() - 1.0)
+    assert rejected == [entry] and entry.status == EXPIRED
+
+
+def test_expired_requests_are_dropped():
+    queue = AdmissionQueue(AdmissionConfig(default_timeout_ms=20))
+    _push(queue, "a")
+    _push(queue, "b", timeout_ms=1000)
+    time.sleep(0.05)
+    assert [entry.status for entry in queue.expire()] == [EXPIRED]
+    assert queue.pop().client == "b"
+    assert queue.pop() is None
+    stats = queue.stats()
+    assert stats["expired"] == 1 and stats["served"] == 1 and stats["queue_depth"] == 0
+
+
+def test_busy_and_superseded():
+    queue = AdmissionQueue(AdmissionConfig(max_queue_depth=2, newest_first=True))
+    first, _ = _push(queue, "a")
+    _push(queue, "a", endpoint="reset")
+    # supersedes the first observation of the client, not its reset
+    second, rejected = _push(queue, "a")
+    assert rejected == [first] and first.status == SUPERSEDED
+    third, rejected = _push(queue, "b")
+    assert rejected == [third] and third.status == BUSY
+    assert [entry.endpoint for entry in queue.entries] == ["reset", "get_action"]
+    stats = queue.stats()
+    assert stats["received"] == 4 and stats["superseded"] == 1 and stats["busy"] == 1
+
+
+def test_serving_order():
+    queue = AdmissionQueue()
+    _push(queue, "a", timeout_ms=1000)
+    _push(queue, "a", timeout_ms=100)
+    _push(queue, "b", timeout_ms=1000)
+    _push(queue, "c", timeout_ms=5000, priority=1)
+    # priority first
+    assert queue.pop().client == "c"
+    # then the earliest deadline of the clients never served
+    first = queue.pop()
+    assert first.client == "a" and first.expires_at - first.received_at == pytest.approx(0.1)
+    # then round robin
+    assert [queue.pop().client, queue.pop().client] == ["b", "a"]
+
+
+def test_controller_runs_one_request_at_a_time():
+    controller = AdmissionController(AdmissionConfig(max_queue_depth=1))
+    running = []
+    errors = []
+
+    def call(client, sleep):
+        try:
+            with controller.admit(client, RequestMetadata()):
+                running.append(client)
+                assert len(running) == 1
+                time.sleep(sleep)
+                running.remove(client)
+        except RequestRejectedError as e:
+            errors.append(e.status)
+
+    threads = [threading.Thread(target=call, args=("a", 0.2))]
+    threads[0].start()
+    time.sleep(0.05)
+    for client in ("b", "c"):
+        threads.append(threading.Thread(target=call, args=(client, 0.0)))
+        threads[-1].start()
+        time.sleep(0.05)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert errors == [BUSY]
+    stats = controller.stats()
+    assert stats["served"] == 2 and stats["busy"] == 1 and stats["queue_depth"] == 0
@@ -0,0 +1,89 @@
+import os
+
+import torch
+from torch.utils.data import Dataset
+from transformers import PretrainedConfig, PreTrainedModel, TrainingArguments
+from transformers.trainer_utils import get_last_checkpoint
+
+from gr00t.experiment.trainer import DualBrainTrainer
+from gr00t.utils.async_checkpoint import AsyncCheckpointWriter
+
+
+class TinyConfig(PretrainedConfig):
+    model_type = "tiny_regressor"
+
+
+class TinyModel(PreTrainedModel):
+    config_class = TinyConfig
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.linear = torch.nn.Linear(4, 1)
+
+    def forward(self, inputs):
+        pred = self.linear(inputs["x"])
+        return {"loss": torch.nn.functional.mse_loss(pred, inputs["y"])}
+
+
+class TinyDataset(Dataset):
+    def __len__(self):
+        return 32
+
+    def __getitem__(self, index):
+        x = torch.full((4,), float(index))
+        return {"x": x, "y": x.sum(dim=0, keepdim=True)}
+
+
+def _collate(features):
+    return {key: torch.stack([f[key] for f in features]) for key in features[0]}
+
+
+def test_async_checkpoint_writer_snapshot(tmp_path):
+    writer = AsyncCheckpointWriter(max_inflight=1)
+    weight = torch.zeros(3)
+
+    def write_fn(checkpoint_dir, host_state):
+        torch.save(host_state, checkpoint_dir / "state.pt")
+
+    writer.save({"weight": weight}, write_fn, tmp_path / "checkpoint-1")
+    # Mutating the live tensor after `save` returns must not affect the checkpoint
+    weight += 1
+    writer.close()
+    saved = torch.load(tmp_path / "checkpoint-1" / "state.pt", weights_only=True)
+    assert torch.equal(saved["weight"], torch.zeros(3))
+    assert not AsyncCheckpointWriter.tmp_dir_for(tmp_path / "checkpoint-1").exists()
+
+
+def test_dual_brain_trainer_async_checkpoint(tmp_path):
+    args = TrainingArguments(
+        output_dir=str(tmp_path),
+        per_device_train_batch_size=4,
+        max_steps=6,
+        save_strategy="steps",
+        save_steps=2,
+        save_total_limit=2,
+        report_to=[],
+        remove_unused_columns=False,
+        use_cpu=True,
+        dataloader_num_workers=0,
+    )
+    trainer = DualBrainTrainer(
+        model=TinyModel(TinyConfig()),
+        args=args,
+        train_dataset=TinyDataset(),
+        data_collator=_collate,
+        compute_dtype=torch.float32,
+        async_checkpoint=True,
+    )
+    trainer.train()
+
+    checkpoints = sorted(p for p in os.listdir(tmp_path) if p.startswith("checkpoint-"))
+    assert checkpoints == ["checkpoint-4", "checkpoint-6"]
+    assert not [p for p in os.listdir(tmp_path) if p.startswith(".tmp-")]
+    last = get_last_checkpoint(str(tmp_path))
+    assert last.endswith("checkpoint-6")
+    for name in ["trainer_state.json", "optimizer.pt", "scheduler.pt", "rng_state.pth"]:
+        assert os.path.exists(os.path.join(last, name)), name
+    reloaded = TinyModel.from_pretrained(last)
+    for key, value in trainer.model.state_dict().items():
+        assert torch.equal(value, reloaded.state_dict()[key])
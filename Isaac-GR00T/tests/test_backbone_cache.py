@@ -0,0 +1,168 @@
+import importlib.util
+import sys
+import types
+from unittest import mock
+
+import torch
+from transformers import Qwen3ForCausalLM, SiglipVisionModel
+from transformers.feature_extraction_utils import BatchFeature
+
+from gr00t.model.backbone import BackboneCache, BackboneCacheConfig, EagleBackbone
+
+
+def _flash_attn_stubs() -> dict:
+    """
+    Placeholder flash_attn modules for the import of the Eagle model code without flash_attn.
+    The tiny model below runs with sdpa on any device and never calls them.
+    """
+    if importlib.util.find_spec("flash_attn") is not None:
+        return {}
+
+    def unavailable(*args, **kwargs):
+        raise RuntimeError("flash_attn is not installed")
+
+    interface = types.ModuleType("flash_attn.flash_attn_interface")
+    interface.flash_attn_varlen_qkvpacked_func = unavailable
+    bert_padding = types.ModuleType("flash_attn.bert_padding")
+    bert_padding.pad_input = bert_padding.unpad_input = unavailable
+    return {
+        "flash_attn": types.ModuleType("flash_attn"),
+        "flash_attn.flash_attn_interface": interface,
+        "flash_attn.bert_padding": bert_padding,
+    }
+
+
+# the Eagle model code imports flash_attn and queries the CUDA device capability on import
+_stubs = _flash_attn_stubs()
+sys.modules.update(_stubs)
+try:
+    with mock.patch("torch.cuda.get_device_capability", return_value=(8, 0)):
+        from gr00t.model.backbone.eagle2_hg_model.configuration_eagle2_5_vl import (
+            Eagle2_5_VLConfig,
+        )
+        from gr00t.model.backbone.eagle2_hg_model.modeling_eagle2_5_vl import (
+            Eagle2_5_VLForConditionalGeneration,
+        )
+finally:
+    for name in _stubs:
+        sys.modules.pop(name)
+
+IMAGE_TOKEN_INDEX = 63
+NUM_IMAGE_TOKENS = 4  # (28 / 14) ** 2 patches per image
+NUM_IMAGES = 2
+
+
+def _tiny_backbone():
+    config = Eagle2_5_VLConfig(
+        vision_config=dict(
+            model_type="siglip_vision_model",
+            hidden_size=16,
+            intermediate_size=32,
+            num_hidden_layers=1,
+            num_attention_heads=2,
+            image_size=28,
+            patch_size=14,
+        ),
+        text_config=dict(
+            architectures=["Qwen3ForCausalLM"],
+            model_type="qwen3",
+            hidden_size=32,
+            intermediate_size=64,
+            num_hidden_layers=2,
+            num_attention_heads=4,
+            num_key_value_heads=2,
+            head_dim=8,
+            vocab_size=64,
+            sliding_window=None,
+        ),
+        _attn_implementation="sdpa",
+        select_layer=-1,
+        force_image_size=28,
+        image_token_index=IMAGE_TOKEN_INDEX,
+        use_pixel_shuffle=False,
+        mlp_connector_layers=1,
+    )
+    torch.manual_seed(0)
+    eagle_model = Eagle2_5_VLForConditionalGeneration(
+        config,
+        vision_model=SiglipVisionModel(config.vision_config),
+        language_model=Qwen3ForCausalLM(config.text_config),
+    )
+    # EagleBackbone builds the full size model from its checkpoint config
+    backbone = EagleBackbone.__new__(EagleBackbone)
+    torch.nn.Module.__init__(backbone)
+    backbone.eagle_model = eagle_model
+    backbone.eagle_linear = torch.nn.Linear(32, 24)
+    backbone.select_layer = 2
+    backbone.tune_llm = False
+    backbone.tune_visual = False
+    return backbone.eval()
+
+
+def _vl_input(pixel_values, instruction=(5, 6, 7)):
+    # chat template prefix, the image tokens of each image, then the instruction
+    input_ids = [1, 2, 3] + [IMAGE_TOKEN_INDEX] * NUM_IMAGE_TOKENS * NUM_IMAGES
+    input_ids = torch.tensor([input_ids + list(instruction) + [4]])
+    return BatchFeature(
+        data={
+            "eagle_pixel_values": pixel_values,
+            "eagle_input_ids": input_ids,
+            "eagle_attention_mask": torch.ones_like(input_ids),
+            "eagle_image_sizes": None,
+        }
+    )
+
+
+def _expected(backbone, vl_input):
+    with torch.no_grad():
+        return backbone(BatchFeature(data=dict(vl_input)))["backbone_features"]
+
+
+def test_backbone_cache_matches_backbone():
+    backbone = _tiny_backbone()
+    cache = BackboneCache(backbone)
+    generator = torch.Generator().manual_seed(1)
+    pixel_values = torch.randn(NUM_IMAGES, 3, 28, 28, generator=generator)
+
+    vl_input = _vl_input(pixel_values)
+    features = cache(vl_input)["backbone_features"]
+    torch.testing.assert_close(features, _expected(backbone, vl_input))
+    assert cache._prefix_length == 3
+    assert cache.num_recomputed_images == NUM_IMAGES
+
+    # same images: the output is reused
+    assert torch.equal(cache(_vl_input(pixel_values.clone()))["backbone_features"], features)
+    assert cache.num_reused_outputs == 1
+    assert cache.num_recomputed_images == NUM_IMAGES
+
+    # one camera changed: only its vision tokens are recomputed, after the cached prefix
+    pixel_values[1] += 0.5
+    vl_input = _vl_input(pixel_values)
+    features = cache(vl_input)["backbone_features"]
+    torch.testing.assert_close(features, _expected(backbone, vl_input))
+    assert cache.num_recomputed_images == NUM_IMAGES + 1
+
+    # a new instruction starts over
+    vl_input = _vl_input(pixel_values, instruction=(8, 9))
+    torch.testing.assert_close(cache(vl_input)["backbone_features"], _expected(backbone, vl_input))
+    assert cache.num_calls == 1
+
+
+def test_backbone_cache_threshold_and_refresh():
+    backbone = _tiny_backbone()
+    cache = BackboneCache(
+        backbone, BackboneCacheConfig(frame_change_threshold=0.1, refresh_interval=3)
+    )
+    pixel_values = torch.zeros(NUM_IMAGES, 3, 28, 28)
+    features = cache(_vl_input(pixel_values))["backbone_features"]
+
+    # a change below the threshold reuses the output, until the refresh
+    pixel_values[0] += 0.05
+    assert torch.equal(cache(_vl_input(pixel_values))["backbone_features"], features)
+    assert torch.equal(cache(_vl_input(pixel_values))["backbone_features"], features)
+    vl_input = _vl_input(pixel_values)
+    torch.testing.assert_close(cache(vl_input)["backbone_features"], _expected(backbone, vl_input))
+    assert cache.num_recomputed_images == 2 * NUM_IMAGES
+
+    cache.reset()
+    assert cache.num_calls == 0 and cache._output is None
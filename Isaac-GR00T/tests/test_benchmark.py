@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import pytest
+
+from gr00t.data.dataset import LeRobotSingleDataset
+from gr00t.data.embodiment_tags import EmbodimentTag
+from gr00t.experiment.data_config import load_data_config
+from gr00t.utils.benchmark import StageTimer, profile_dataset_stages
+
+
+@pytest.fixture
+def dataset_path():
+    return Path(__file__).parents[1] / "demo_data/robot_sim.PickNPlace"
+
+
+def test_stage_timer_summary():
+    timer = StageTimer()
+    for latency in [0.001, 0.002, 0.003]:
+        timer.add("stage", latency)
+    summary = timer.summary()
+    assert summary["stage"]["count"] == 3
+    assert summary["stage"]["mean_ms"] == pytest.approx(2.0)
+    assert summary["stage"]["p50_ms"] == pytest.approx(2.0)
+
+
+def test_profile_dataset_stages(dataset_path):
+    data_config = load_data_config("fourier_gr1_arms_only")
+    dataset = LeRobotSingleDataset(
+        dataset_path,
+        data_config.modality_config(),
+        embodiment_tag=EmbodimentTag.GR1,
+        video_backend="decord",
+        transforms=data_config.transform(),
+    )
+    results = profile_dataset_stages(dataset, [0, 10], video_backends=["decord"])
+    assert results["num_samples"] == 2
+    assert results["samples_per_second"] > 0
+    stages = results["stages"]
+    assert stages["video_decode/decord"]["count"] == 2
+    assert "parquet_load" in stages
+    assert any(stage.endswith("GR00TTransform") for stage in stages)
@@ -0,0 +1,230 @@
+import json
+import math
+import threading
+import time
+
+import pytest
+import torch
+from accelerate import init_empty_weights
+from safetensors.torch import save_model
+from torch import nn
+
+import gr00t.model.gr00t_n1 as gr00t_n1
+from gr00t.data.dataset import ModalityConfig
+from gr00t.data.transform.base import ComposedModalityTransform
+from gr00t.data.transform.state_action import StateActionToTensor, StateActionTransform
+from gr00t.model.backbone import BackbonePool
+from gr00t.model.fast_load import (
+    IncompleteCheckpointError,
+    assign_weights,
+    is_serving_snapshot,
+    load_safetensors,
+    prefetch,
+    take_prefetched,
+)
+from gr00t.model.gr00t_n1 import GR00T_N1_5
+
+
+class TiedModel(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.embedding = nn.Embedding(10, 4)
+        self.head = nn.Linear(4, 10, bias=False)
+        self.norm = nn.LayerNorm(4)
+        self.register_buffer("positions", torch.arange(10), persistent=False)
+        self.tie_weights()
+
+    def tie_weights(self):
+        self.head.weight = self.embedding.weight
+
+    def forward(self, x):
+        return self.head(self.norm(self.embedding(x)))
+
+
+def test_load_safetensors_dtypes(tmp_path):
+    model = TiedModel()
+    save_model(model, str(tmp_path / "model.safetensors"))
+
+    state_dict = load_safetensors(str(tmp_path), dtype=torch.bfloat16)
+    assert all(tensor.dtype == torch.bfloat16 for tensor in state_dict.values())
+    # the tied weights are saved once
+    assert "positions" not in state_dict
+    assert len(state_dict) == 3
+
+    state_dict = load_safetensors(
+        str(tmp_path),
+        dtype=torch.bfloat16,
+        dtype_fn=lambda name: torch.float32 if name.startswith("norm.") else None,
+    )
+    assert state_dict["norm.weight"].dtype == torch.float32
+    assert state_dict["embedding.weight"].dtype == torch.bfloat16
+
+    with pytest.raises(AssertionError):
+        load_safetensors(str(tmp_path / "missing"))
+
+
+def test_assign_weights(tmp_path):
+    model = TiedModel()
+    save_model(model, str(tmp_path / "model.safetensors"))
+    x = torch.arange(5)
+
+    with init_empty_weights(include_buffers=False):
+        skeleton = TiedModel()
+    assert skeleton.embedding.weight.is_meta
+    assign_weights(skeleton, load_safetensors(str(tmp_path)))
+    assert skeleton.head.weight is skeleton.embedding.weight
+    assert torch.equal(skeleton.positions, torch.arange(10))
+    assert torch.allclose(skeleton(x), model(x))
+
+    # the tied weights saved under their other name
+    state_dict = load_safetensors(str(tmp_path))
+    state_dict["head.weight"] = state_dict.pop("embedding.weight")
+    with init_empty_weights(include_buffers=False):
+        skeleton = TiedModel()
+    assign_weights(skeleton, state_dict)
+    assert skeleton.head.weight is skeleton.embedding.weight
+    assert torch.allclose(skeleton(x), model(x))
+
+    state_dict = load_safetensors(str(tmp_path))
+    del state_dict["norm.bias"]
+    with init_empty_weights(include_buffers=False):
+        skeleton = TiedModel()
+    with pytest.raises(IncompleteCheckpointError, match="norm.bias"):
+        assign_weights(skeleton, state_dict)
+
+
+def test_prefetch():
+    def load(value):
+        time.sleep(0.05)
+        return value
+
+    future = prefetch(("test", 1), load, "model")
+    # a second prefetch of the key does not load again
+    assert prefetch(("test", 1), load, "other") is future
+    assert take_prefetched(("test", 1)).result() == "model"
+    assert take_prefetched(("test", 1)) is None
+    assert take_prefetched(("test", 2)) is None
+
+
+def test_is_serving_snapshot(tmp_path):
+    assert not is_serving_snapshot(str(tmp_path))
+    (tmp_path / "serving_snapshot.json").write_text("{}")
+    assert is_serving_snapshot(str(tmp_path))
+
+
+class TinyGr00t(nn.Module):
+    """A stand-in of `GR00T_N1_5`, the Eagle backbone needs CUDA."""
+
+    load_weights_fast = GR00T_N1_5.load_weights_fast
+
+    def __init__(self, backbone_seed=0, head_seed=0):
+        super().__init__()
+        torch.manual_seed(backbone_seed)
+        self.backbone = nn.Linear(8, 8)
+        torch.manual_seed(head_seed)
+        self.action_head = nn.Linear(8, 2)
+
+
+def _checkpoint(path, backbone_seed=0, head_seed=0):
+    path.mkdir()
+    save_model(TinyGr00t(backbone_seed, head_seed), str(path / "model.safetensors"))
+    (path / "experiment_cfg").mkdir()
+
+    def stats(value):
+        return {key: [value] for key in ("max", "min", "mean", "std", "q01", "q99")}
+
+    def field(shape):
+        return {"absolute": True, "rotation_type": None, "shape": shape, "continuous": True}
+
+    metadata = {
+        "statistics": {
+            "state": {},
+            "action": {"arm": {**stats(0.1234567), "max": [1.0]}, "rot": stats(0.0)},
+        },
+        "modalities": {
+            "video": {"cam": {"resolution": [8, 8], "channels": 3, "fps": 10.0}},
+            "state": {},
+            "action": {"arm": field([1]), "rot": {**field([4]), "rotation_type": "quaternion"}},
+        },
+        "embodiment_tag": "new_embodiment",
+    }
+    with open(path / "experiment_cfg" / "metadata.json", "w") as f:
+        json.dump({"new_embodiment": metadata}, f)
+    return str(path)
+
+
+@pytest.fixture
+def tiny_gr00t(monkeypatch):
+    """Builds `TinyGr00t` skeletons for `Gr00tPolicy(fast_start=True)`, and slows their loading."""
+    build_threads = []
+
+    def from_pretrained_empty(model_path, action_horizon=None):
+        build_threads.append(threading.current_thread())
+        with init_empty_weights(include_buffers=False):
+            model = TinyGr00t()
+        model._fast_load_source = (model_path, False, False)
+        return model
+
+    def slow_load_safetensors(*args, **kwargs):
+        time.sleep(0.1)
+        return load_safetensors(*args, **kwargs)
+
+    monkeypatch.setattr(GR00T_N1_5, "from_pretrained_empty", from_pretrained_empty)
+    monkeypatch.setattr(gr00t_n1, "load_safetensors", slow_load_safetensors)
+    return build_threads
+
+
+def _policy(model_path, **kwargs):
+    from gr00t.model.policy import Gr00tPolicy
+
+    return Gr00tPolicy(
+        model_path=model_path,
+        embodiment_tag="new_embodiment",
+        modality_config={
+            "video": ModalityConfig(delta_indices=[0], modality_keys=["video.cam"]),
+            "action": ModalityConfig(
+                delta_indices=[0, 1], modality_keys=["action.arm", "action.rot"]
+            ),
+        },
+        modality_transform=ComposedModalityTransform(
+            transforms=[
+                StateActionToTensor(apply_to=["action.arm", "action.rot"]),
+                StateActionTransform(
+                    apply_to=["action.arm", "action.rot"],
+                    normalization_modes={"action.arm": "min_max", "action.rot": "min_max"},
+                    target_rotations={"action.rot": "euler_angles_rpy"},
+                ),
+            ]
+        ),
+        device="cpu",
+        fast_start=True,
+        **kwargs,
+    )
+
+
+def test_fast_start_keeps_the_metadata_dtype(tmp_path, tiny_gr00t):
+    policy = _policy(_checkpoint(tmp_path / "ckpt"))
+    # the skeleton is built before the concurrent metadata loading, in the calling thread
+    assert tiny_gr00t == [threading.main_thread()]
+    assert policy.model.backbone.weight.dtype == torch.bfloat16
+    assert torch.allclose(
+        policy.model.backbone.weight.float(), TinyGr00t().backbone.weight, atol=1e-2
+    )
+
+    # the normalization statistics created while the weights load keep their precision, instead of
+    # being created in the bfloat16 of the weights: float64 from the numpy dataset statistics, and
+    # the default float32 from the python lists of the rotation bounds
+    normalizers = policy._modality_transform.transforms[1]._normalizers
+    assert normalizers["action.arm"].statistics["min"].dtype == torch.float64
+    assert normalizers["action.arm"].statistics["min"].item() == 0.1234567
+    assert normalizers["action.rot"].statistics["max"].dtype == torch.float32
+    assert normalizers["action.rot"].statistics["max"][0].item() == pytest.approx(math.pi)
+
+
+def test_fast_start_backbone_pool(tmp_path, tiny_gr00t):
+    pool = BackbonePool()
+    policy = _policy(_checkpoint(tmp_path / "a", head_seed=1), backbone_pool=pool)
+    other = _policy(_checkpoint(tmp_path / "b", head_seed=2), backbone_pool=pool)
+    assert other.model.backbone is policy.model.backbone
+    assert not torch.equal(other.model.action_head.weight, policy.model.action_head.weight)
+    assert pool.num_shared == 1 and len(pool) == 1
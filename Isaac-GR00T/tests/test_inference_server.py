@@ -0,0 +1,237 @@
+import socket
+import threading
+import time
+
+import numpy as np
+import pytest
+import zmq
+
+from gr00t.eval.admission import AdmissionConfig, RequestRejectedError
+from gr00t.eval.robot import (
+    MultiWorkerRobotInferenceServer,
+    RobotInferenceClient,
+    RobotInferenceServer,
+)
+from gr00t.eval.service import MsgSerializer
+from gr00t.model.policy import BasePolicy
+from gr00t.model.policy_host import HostedPolicySpec, PolicyHost
+
+
+class SleepPolicy(BasePolicy):
+    def __init__(self, name, log):
+        self.name = name
+        self.log = log
+        self.num_resets = 0
+
+    def get_action(self, observations):
+        self.log.append((self.name, observations["client"]))
+        time.sleep(observations.get("sleep", 0.0))
+        return {"action.arm": np.full((4, 2), observations["value"]), "worker": self.name}
+
+    def get_modality_config(self):
+        return {}
+
+    def reset(self):
+        self.num_resets += 1
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(num_workers=2, **kwargs):
+        log = []
+        policies = [SleepPolicy(worker, log) for worker in range(num_workers)]
+        port = _free_port()
+        server = MultiWorkerRobotInferenceServer(policies, host="127.0.0.1", port=port, **kwargs)
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        servers.append((server, thread))
+        return server, port, log
+
+    yield start
+    for server, thread in servers:
+        server.running = False
+        thread.join(timeout=5)
+
+
+def _dealer(port):
+    dealer = zmq.Context.instance().socket(zmq.DEALER)
+    dealer.connect(f"tcp://127.0.0.1:{port}")
+    return dealer
+
+
+def _send(dealer, request):
+    # the empty delimiter frame of a REQ socket
+    dealer.send_multipart([b"", MsgSerializer.to_bytes(request)])
+
+
+def _recv(dealer, timeout_ms=5000):
+    assert dealer.poll(timeout_ms), "No reply from the server"
+    return MsgSerializer.from_bytes(dealer.recv_multipart()[-1])
+
+
+def test_req_client_compatibility(serve):
+    server, port, _ = serve()
+    client = RobotInferenceClient(port=port)
+    assert client.ping()
+    assert client.get_modality_config() == {}
+    action = client.get_action({"client": "a", "value": 3.0})
+    np.testing.assert_array_equal(action["action.arm"], np.full((4, 2), 3.0))
+    client.reset()
+    assert sum(policy.num_resets for policy in server.models) == 1
+
+
+def test_slow_request_does_not_block_other_clients(serve):
+    _, port, _ = serve(num_workers=2)
+    slow = _dealer(port)
+    _send(slow, {"endpoint": "get_action", "data": {"client": "slow", "value": 0, "sleep": 1.0}})
+    time.sleep(0.1)
+
+    client = RobotInferenceClient(port=port)
+    start = time.monotonic()
+    client.get_action({"client": "fast", "value": 1.0})
+    assert time.monotonic() - start < 0.5
+    assert _recv(slow)["worker"] in (0, 1)
+
+
+def test_request_timeout_and_cancel(serve):
+    _, port, _ = serve(num_workers=1)
+    dealer = _dealer(port)
+    _send(dealer, {"endpoint": "get_action", "data": {"client": "a", "value": 0, "sleep": 0.5}})
+    time.sleep(0.1)
+
+    # queued behind the running request
+    data = {"client": "a", "value": 1}
+    _send(dealer, {"endpoint": "get_action", "data": data, "timeout_ms": 50})
+    _send(dealer, {"endpoint": "get_action", "data": data, "request_id": 7})
+    _send(dealer, {"endpoint": "cancel", "data": {"request_id": 7}})
+
+    replies = [_recv(dealer) for _ in range(4)]
+    errors = [reply["error"] for reply in replies if "error" in reply]
+    assert any(error.startswith("Request expired") for error in errors)
+    assert "Request cancelled" in errors
+    assert {"status": "ok", "cancelled": True} in replies
+    assert sum("action.arm" in reply for reply in replies) == 1
+
+
+def test_kill_answers_the_waiting_requests(serve):
+    server, port, _ = serve(num_workers=1)
+    dealer = _dealer(port)
+    _send(dealer, {"endpoint": "get_action", "data": {"client": "a", "value": 0, "sleep": 0.5}})
+    time.sleep(0.1)
+    # queued behind the running request
+    _send(dealer, {"endpoint": "get_action", "data": {"client": "b", "value": 1}})
+    killer = _dealer(port)
+    _send(killer, {"endpoint": "kill"})
+
+    _recv(killer)
+    replies = [_recv(dealer) for _ in range(2)]
+    # the running request is finished, the queued one is cancelled instead of left unanswered
+    assert {"error": "Request cancelled", "status": "cancelled"} in replies
+    assert sum("action.arm" in reply for reply in replies) == 1
+    assert not server.running
+
+
+def test_round_robin_across_clients(serve):
+    _, port, log = serve(num_workers=1)
+    greedy = _dealer(port)
+    polite = _dealer(port)
+    for _ in range(4):
+        _send(greedy, {"data": {"client": "greedy", "value": 0, "sleep": 0.2}})
+    time.sleep(0.1)
+    _send(polite, {"data": {"client": "polite", "value": 0}})
+
+    for _ in range(4):
+        _recv(greedy)
+    _recv(polite)
+    # the polite client is served right after the request running when it arrived
+    assert [client for _, client in log].index("polite") == 1
+
+
+def test_sticky_clients(serve):
+    _, port, log = serve(num_workers=2, sticky_clients=True)
+    clients = [RobotInferenceClient(port=port) for _ in range(2)]
+    for _ in range(3):
+        for name, client in enumerate(clients):
+            client.get_action({"client": name, "value": 0})
+
+    workers = {}
+    for worker, name in log:
+        workers.setdefault(name, set()).add(worker)
+    assert workers == {0: {workers[0].copy().pop()}, 1: {1 - workers[0].copy().pop()}}
+
+
+def test_admission_control(serve):
+    _, port, log = serve(num_workers=1, admission=AdmissionConfig(newest_first=True))
+    dealer = _dealer(port)
+    _send(dealer, {"data": {"client": "slow", "value": 0, "sleep": 0.3}, "client_id": "other"})
+    time.sleep(0.1)
+    for value in range(3):
+        _send(dealer, {"data": {"client": "robot", "value": value}, "client_id": "robot"})
+    replies = [_recv(dealer) for _ in range(4)]
+    assert [reply["status"] for reply in replies if "error" in reply] == ["superseded"] * 2
+    # only the newest observation of the robot is served
+    assert replies[-1]["action.arm"][0, 0] == 2
+    assert log == [(0, "slow"), (0, "robot")]
+
+    client = RobotInferenceClient(port=port, deadline_ms=0)
+    with pytest.raises(RequestRejectedError) as error:
+        client.get_action({"client": "late", "value": 0})
+    assert error.value.status == "expired"
+    stats = client.stats()
+    assert stats["served"] == 2 and stats["superseded"] == 2 and stats["expired"] == 1
+
+
+def test_rep_server_admission_control():
+    port = _free_port()
+    server = RobotInferenceServer(SleepPolicy(0, []), host="127.0.0.1", port=port)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    try:
+        client = RobotInferenceClient(port=port, client_id="robot", deadline_ms=0)
+        with pytest.raises(RequestRejectedError):
+            client.get_action({"client": "robot", "value": 0})
+        client.deadline_ms = 1000
+        client.get_action({"client": "robot", "value": 0})
+        assert client.stats()["expired"] == 1 and client.stats()["served"] == 1
+    finally:
+        server.running = False
+        client.socket.close()
+
+
+def test_hosted_policy_routing():
+    specs = [HostedPolicySpec("a", "gr1", "fourier_gr1_arms_waist", name=name) for name in "ab"]
+
+    class NamedPolicy(SleepPolicy):
+        def get_modality_config(self):
+            return {"name": self.name}
+
+    host = PolicyHost(specs, loader=lambda spec, pool: NamedPolicy(spec.name, []))
+    port = _free_port()
+    server = RobotInferenceServer(host, host="127.0.0.1", port=port)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    try:
+        client = RobotInferenceClient(port=port, model="b")
+        assert client.get_modality_config() == {"name": "b"}
+        client.reset()
+        # a client without model gets the default policy, as the clients of older versions
+        default_client = RobotInferenceClient(port=port)
+        assert default_client.call_endpoint("get_modality_config", requires_input=False) == {
+            "name": "a"
+        }
+        assert {name: hosted.policy.num_resets for name, hosted in host._loaded.items()} == {
+            "a": 0,
+            "b": 1,
+        }
+    finally:
+        server.running = False
+        client.socket.close()
+        default_client.socket.close()
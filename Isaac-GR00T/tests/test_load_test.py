@@ -0,0 +1,116 @@
+import socket
+import threading
+
+import numpy as np
+import pytest
+import zmq
+
+from gr00t.data.dataset import ModalityConfig
+from gr00t.eval.load_test import (
+    LoadTestConfig,
+    StubPolicy,
+    _schedule,
+    run_load_test,
+    synthetic_observations,
+)
+from gr00t.eval.robot import (
+    MultiWorkerRobotInferenceServer,
+    RobotInferenceClient,
+    RobotInferenceServer,
+)
+from gr00t.eval.service import MsgSerializer
+
+MODALITY_CONFIG = {
+    "video": ModalityConfig(delta_indices=[0], modality_keys=["video.ego_view"]),
+    "state": ModalityConfig(delta_indices=[0], modality_keys=["state.arm"]),
+    "action": ModalityConfig(delta_indices=list(range(16)), modality_keys=["action.arm"]),
+    "language": ModalityConfig(delta_indices=[0], modality_keys=["annotation.task"]),
+}
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def stub_server():
+    servers = []
+
+    def start(num_workers=1, latency_ms=0.0):
+        policies = [StubPolicy(MODALITY_CONFIG, latency_ms=latency_ms) for _ in range(num_workers)]
+        port = _free_port()
+        if num_workers == 1:
+            server = RobotInferenceServer(policies[0], host="127.0.0.1", port=port)
+        else:
+            server = MultiWorkerRobotInferenceServer(policies, host="127.0.0.1", port=port)
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        servers.append((server, thread))
+        return port
+
+    yield start
+    for server, thread in servers:
+        server.running = False
+
+
+def test_synthetic_observations_and_stub_policy():
+    observations = synthetic_observations(MODALITY_CONFIG, 2, image_size=(32, 48), state_dim=5)
+    assert len(observations) == 2
+    assert observations[0]["video.ego_view"].shape == (1, 32, 48, 3)
+    assert observations[0]["state.arm"].shape == (1, 5)
+    assert observations[0]["annotation.task"] == ["do your thing!"]
+    assert not np.array_equal(observations[0]["video.ego_view"], observations[1]["video.ego_view"])
+
+    action = StubPolicy(MODALITY_CONFIG).get_action(observations[0])
+    assert action["action.arm"].shape == (16, 7)
+
+
+def test_schedule():
+    config = LoadTestConfig(num_clients=2, rate_hz=20.0, duration_s=1.0, warmup_s=0.5)
+    schedules = [_schedule(config, client, start=0.0) for client in range(2)]
+    assert [len(schedule) for schedule in schedules] == [15, 15]
+    # the clients are staggered
+    merged = np.sort(np.concatenate(schedules))
+    np.testing.assert_allclose(np.diff(merged), 0.05)
+
+    config = LoadTestConfig(num_clients=2, rate_hz=200.0, duration_s=5.0, poisson=True)
+    schedule = _schedule(config, 0, start=0.0)
+    assert schedule.max() < 6.0 and len(schedule) == pytest.approx(600, rel=0.15)
+
+
+def test_server_timing(stub_server):
+    port = stub_server(latency_ms=10.0)
+    observation = synthetic_observations(MODALITY_CONFIG, 1)[0]
+    req = zmq.Context.instance().socket(zmq.REQ)
+    req.connect(f"tcp://127.0.0.1:{port}")
+    for request in ({"data": observation}, {"data": observation, "server_timing": True}):
+        req.send(MsgSerializer.to_bytes({**request, "request_id": 3}))
+        reply = MsgSerializer.from_bytes(req.recv())
+    req.close()
+    assert reply["action.arm"].shape == (16, 7)
+    assert reply["server_timing"]["request_id"] == 3
+    assert reply["server_timing"]["inference_ms"] >= 10.0
+
+    # the clients are unchanged
+    reply = RobotInferenceClient(port=port).get_action(observation)
+    assert "server_timing" not in reply
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_load_test(stub_server, num_workers):
+    port = stub_server(num_workers=num_workers, latency_ms=5.0)
+    config = LoadTestConfig(
+        host="127.0.0.1", port=port, num_clients=3, rate_hz=60.0, duration_s=1.0, warmup_s=0.2
+    )
+    result = run_load_test(config, synthetic_observations(MODALITY_CONFIG, 4))
+    assert result["sent"] == 60
+    assert result["completed"] == 60 and result["errors"] == {} and result["unanswered"] == 0
+    assert result["throughput_hz"] == pytest.approx(60.0, rel=0.1)
+
+    latency = result["latency"]
+    assert set(latency) == {"total", "serialize", "network", "inference"}
+    assert set(latency["total"]) == {"count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "p99.9_ms"}
+    assert latency["inference"]["p50_ms"] == pytest.approx(5.0, abs=3.0)
+    assert latency["total"]["p50_ms"] >= latency["inference"]["p50_ms"]
@@ -0,0 +1,149 @@
+import math
+
+import pytest
+import torch
+from transformers.feature_extraction_utils import BatchFeature
+
+from deployment_scripts.action_head_utils import action_head_pytorch_forward
+from gr00t.model.action_head.denoising_benchmark import benchmark_denoising
+from gr00t.model.action_head.flow_matching_action_head import (
+    FlowmatchingActionHead,
+    FlowmatchingActionHeadConfig,
+)
+from gr00t.model.action_head.ode_solvers import (
+    ODE_SOLVERS,
+    TIMESTEP_SCHEDULES,
+    DenoisingConfig,
+    solve,
+)
+
+
+def _tiny_action_head():
+    config = FlowmatchingActionHeadConfig(
+        add_pos_embed=True,
+        input_embedding_dim=16,
+        backbone_embedding_dim=16,
+        hidden_size=24,
+        max_seq_len=64,
+        action_dim=4,
+        action_horizon=8,
+        num_timestep_buckets=1000,
+        num_inference_timesteps=4,
+        max_num_embodiments=4,
+        max_state_dim=6,
+        num_target_vision_tokens=4,
+        use_vlln=True,
+        diffusion_model_cfg=dict(
+            num_attention_heads=2,
+            attention_head_dim=8,
+            output_dim=24,
+            num_layers=2,
+            cross_attention_dim=16,
+            dropout=0.0,
+            final_dropout=False,
+        ),
+        vl_self_attention_cfg=dict(
+            num_attention_heads=2,
+            attention_head_dim=8,
+            output_dim=16,
+            num_layers=1,
+            dropout=0.0,
+            final_dropout=False,
+        ),
+    )
+    torch.manual_seed(0)
+    return FlowmatchingActionHead(config).eval()
+
+
+def _inputs(head, batch_size=2):
+    generator = torch.Generator().manual_seed(1)
+    backbone_output = BatchFeature(
+        data={
+            "backbone_features": torch.randn(
+                batch_size, 10, head.config.backbone_embedding_dim, generator=generator
+            )
+        }
+    )
+    action_input = BatchFeature(
+        data={
+            "state": torch.randn(batch_size, 1, head.config.max_state_dim, generator=generator),
+            "embodiment_id": torch.arange(batch_size, dtype=torch.int64),
+        }
+    )
+    return backbone_output, action_input
+
+
+@pytest.mark.parametrize("schedule", list(TIMESTEP_SCHEDULES))
+def test_timestep_schedules(schedule):
+    timesteps = TIMESTEP_SCHEDULES[schedule](5)
+    assert len(timesteps) == 6
+    assert timesteps[0] == 0.0
+    assert timesteps[-1] == pytest.approx(1.0)
+    assert all(t < t_next for t, t_next in zip(timesteps[:-1], timesteps[1:]))
+
+
+def test_solvers_on_analytic_ode():
+    # dx/dt = x, x(1) = e * x(0)
+    x = torch.ones(3)
+    errors = {}
+    for solver in ODE_SOLVERS:
+        actions, num_evaluations = solve(
+            lambda x, t: x, x, num_steps=4, config=DenoisingConfig(solver=solver)
+        )
+        errors[solver] = float((actions - math.e).abs().max())
+        assert num_evaluations == {"euler": 4, "midpoint": 8, "heun": 7}[solver]
+    assert errors["midpoint"] < errors["heun"] < errors["euler"]
+
+    # all the solvers converge
+    for solver in ODE_SOLVERS:
+        actions, _ = solve(lambda x, t: x, x, num_steps=256, config=DenoisingConfig(solver=solver))
+        torch.testing.assert_close(actions, torch.full((3,), math.e), atol=1e-2, rtol=0)
+
+
+def test_adaptive_early_stop():
+    x = torch.zeros(2, 3)
+    config = DenoisingConfig(num_steps=8, adaptive_tolerance=1e-6)
+
+    # a straight flow stops once two velocities agree, and still ends at t=1
+    actions, num_evaluations = solve(lambda x, t: torch.ones_like(x), x, 0, config)
+    assert num_evaluations == 2
+    torch.testing.assert_close(actions, torch.ones_like(x))
+
+    # a curved flow runs every step
+    _, num_evaluations = solve(lambda x, t: torch.full_like(x, t), x, 0, config)
+    assert num_evaluations == 8
+
+
+def test_default_denoising_matches_euler_loop():
+    head = _tiny_action_head()
+    with torch.inference_mode():
+        torch.manual_seed(2)
+        expected = action_head_pytorch_forward(head, *_inputs(head))["action_pred"]
+        torch.manual_seed(2)
+        output = head.get_action(*_inputs(head))
+    torch.testing.assert_close(output["action_pred"], expected)
+    assert output["num_evaluations"] == head.num_inference_timesteps
+
+    with torch.inference_mode():
+        torch.manual_seed(2)
+        output = head.get_action(*_inputs(head), denoising=DenoisingConfig("heun", 2, "cosine"))
+    assert output["action_pred"].shape == expected.shape
+    assert output["num_evaluations"] == 3
+
+
+def test_benchmark_denoising():
+    head = _tiny_action_head()
+    denoisings = [
+        DenoisingConfig(num_steps=16),
+        DenoisingConfig(num_steps=1),
+        DenoisingConfig("midpoint", 2, "cosine"),
+    ]
+    results = benchmark_denoising(
+        head, *_inputs(head), denoisings, reference_steps=16, num_repeats=2
+    )
+    assert [result["denoising"]["num_steps"] for result in results] == [16, 1, 2]
+    assert [result["num_evaluations"] for result in results] == [16, 1, 4]
+    # the reference setting reproduces the reference actions
+    assert results[0]["l1_max_error"] == 0.0
+    assert results[1]["l1_mean_error"] > 0.0
+    assert results[1]["stages"]["get_action"]["count"] == 2
@@ -0,0 +1,290 @@
+import copy
+from functools import partial
+
+import pytest
+import torch
+from transformers.feature_extraction_utils import BatchFeature
+
+pytest.importorskip("onnxruntime")
+
+from deployment_scripts.action_head_plan import action_head_plan_forward  # noqa: E402
+from deployment_scripts.action_head_utils import (  # noqa: E402
+    action_head_pytorch_forward,
+)
+from deployment_scripts.export_onnx import export_fused_action_head  # noqa: E402
+from deployment_scripts.gr00t_inference import compare_predictions  # noqa: E402
+from deployment_scripts.ort_torch import Session  # noqa: E402
+from deployment_scripts.trt_model_forward import (  # noqa: E402
+    action_head_fused_forward,
+    action_head_tensorrt_forward,
+)
+from gr00t.model.action_head.flow_matching_action_head import (  # noqa: E402
+    FlowmatchingActionHead,
+    FlowmatchingActionHeadConfig,
+)
+
+STATE_HORIZON = 1
+VL_SEQ_LEN = 10
+
+
+def _tiny_action_head():
+    config = FlowmatchingActionHeadConfig(
+        add_pos_embed=True,
+        input_embedding_dim=16,
+        backbone_embedding_dim=16,
+        hidden_size=24,
+        max_seq_len=64,
+        action_dim=4,
+        action_horizon=8,
+        num_timestep_buckets=1000,
+        num_inference_timesteps=4,
+        max_num_embodiments=4,
+        max_state_dim=6,
+        num_target_vision_tokens=4,
+        use_vlln=True,
+        diffusion_model_cfg=dict(
+            num_attention_heads=2,
+            attention_head_dim=8,
+            output_dim=24,
+            num_layers=2,
+            cross_attention_dim=16,
+            dropout=0.0,
+            final_dropout=False,
+        ),
+        vl_self_attention_cfg=dict(
+            num_attention_heads=2,
+            attention_head_dim=8,
+            output_dim=16,
+            num_layers=1,
+            dropout=0.0,
+            final_dropout=False,
+        ),
+    )
+    torch.manual_seed(0)
+    return FlowmatchingActionHead(config).eval()
+
+
+class _VLLNSelfAttention(torch.nn.Module):
+    def __init__(self, vlln, vl_self_attention):
+        super().__init__()
+        self.vlln = vlln
+        self.vl_self_attention = vl_self_attention
+
+    def forward(self, backbone_features):
+        return self.vl_self_attention(self.vlln(backbone_features))
+
+
+def _export(module, args, path, input_names):
+    # same graph names and batch axes as deployment_scripts/export_onnx.py
+    torch.onnx.export(
+        module,
+        args,
+        str(path),
+        do_constant_folding=True,
+        input_names=input_names,
+        output_names=["output"],
+        dynamic_axes={name: {0: "batch_size"} for name in input_names + ["output"]},
+    )
+    return Session(str(path))
+
+
+def _setup_sessions(head, tmp_path, dtype):
+    config = head.config
+    sa_len = STATE_HORIZON + config.action_horizon + config.num_target_vision_tokens
+    embodiment_id = torch.ones(1, dtype=torch.int64)
+    timesteps = torch.ones(1, dtype=torch.int64)
+    # `to` converts the modules in place, export a copy
+    head = copy.deepcopy(head).to(dtype)
+    return dict(
+        vlln_vl_self_attention_engine=_export(
+            _VLLNSelfAttention(head.vlln, head.vl_self_attention),
+            (torch.randn(1, VL_SEQ_LEN, config.backbone_embedding_dim, dtype=dtype),),
+            tmp_path / "vlln_vl_self_attention.onnx",
+            ["backbone_features"],
+        ),
+        state_encoder_engine=_export(
+            head.state_encoder,
+            (torch.randn(1, STATE_HORIZON, config.max_state_dim, dtype=dtype), embodiment_id),
+            tmp_path / "state_encoder.onnx",
+            ["state", "embodiment_id"],
+        ),
+        action_encoder_engine=_export(
+            head.action_encoder,
+            (
+                torch.randn(1, config.action_horizon, config.action_dim, dtype=dtype),
+                timesteps,
+                embodiment_id,
+            ),
+            tmp_path / "action_encoder.onnx",
+            ["actions", "timesteps_tensor", "embodiment_id"],
+        ),
+        DiT_engine=_export(
+            head.model,
+            (
+                torch.randn(1, sa_len, config.input_embedding_dim, dtype=dtype),
+                torch.randn(1, VL_SEQ_LEN, config.backbone_embedding_dim, dtype=dtype),
+                timesteps,
+            ),
+            tmp_path / "DiT.onnx",
+            ["sa_embs", "vl_embs", "timesteps_tensor"],
+        ),
+        action_decoder_engine=_export(
+            head.action_decoder,
+            (torch.randn(1, sa_len, config.hidden_size, dtype=dtype), embodiment_id),
+            tmp_path / "action_decoder.onnx",
+            ["model_output", "embodiment_id"],
+        ),
+    )
+
+
+def _inputs(head, batch_size):
+    generator = torch.Generator().manual_seed(1)
+    backbone_output = BatchFeature(
+        data={
+            "backbone_features": torch.randn(
+                batch_size, VL_SEQ_LEN, head.config.backbone_embedding_dim, generator=generator
+            )
+        }
+    )
+    action_input = BatchFeature(
+        data={
+            "state": torch.randn(
+                batch_size, STATE_HORIZON, head.config.max_state_dim, generator=generator
+            ),
+            "embodiment_id": torch.arange(batch_size, dtype=torch.int64) % 4,
+        }
+    )
+    return backbone_output, action_input
+
+
+def test_session_upcasts_float16_graph(tmp_path):
+    torch.manual_seed(0)
+    module = torch.nn.Sequential(
+        torch.nn.Linear(8, 32), torch.nn.LayerNorm(32), torch.nn.GELU(), torch.nn.Linear(32, 4)
+    ).eval()
+    x = torch.randn(3, 8)
+    torch.onnx.export(
+        module.to(torch.float16),
+        (x.to(torch.float16),),
+        str(tmp_path / "mlp.onnx"),
+        input_names=["x"],
+        output_names=["y"],
+        dynamic_axes={"x": {0: "batch_size"}, "y": {0: "batch_size"}},
+    )
+
+    session = Session(str(tmp_path / "mlp.onnx"))
+    assert session.file.endswith("mlp_fp32.onnx")
+    assert session.in_meta[0][2] == torch.float32
+    y = session(x)["y"]
+    assert y.dtype == torch.float32
+    expected = module.to(torch.float32)(x)
+    torch.testing.assert_close(y, expected.detach(), atol=1e-2, rtol=1e-2)
+
+    # the float16 graph is kept as exported when not upcast
+    session = Session(str(tmp_path / "mlp.onnx"), upcast_fp16=False)
+    assert session.in_meta[0][2] == torch.float16
+    assert session(x.to(torch.float16), return_list=True)[0].dtype == torch.float16
+
+
+@pytest.mark.parametrize("dtype", [torch.float32, torch.float16])
+def test_action_head_onnxruntime_parity(tmp_path, dtype):
+    head = _tiny_action_head()
+    batch_size = 2
+    head.init_actions = torch.randn(1, head.config.action_horizon, head.config.action_dim)
+
+    backbone_output, action_input = _inputs(head, batch_size)
+    with torch.inference_mode():
+        expected = action_head_pytorch_forward(head, backbone_output, action_input)["action_pred"]
+
+    for name, session in _setup_sessions(head, tmp_path, dtype).items():
+        setattr(head, name, session)
+    get_action = partial(action_head_tensorrt_forward, head)
+    backbone_output, action_input = _inputs(head, batch_size)
+    with torch.inference_mode():
+        actions = get_action(backbone_output, action_input)["action_pred"]
+
+    assert actions.shape == expected.shape
+    metrics = compare_predictions(
+        {"action_pred": actions.float().numpy()},
+        {"action_pred": expected.float().numpy()},
+        min_cosine_similarity=0.999,
+        backend="ONNX Runtime",
+    )
+    assert metrics["action_pred"]["l1_max_distance"] < 5e-2
+
+
+def test_action_head_execution_plan(tmp_path):
+    head = _tiny_action_head()
+    head.init_actions = torch.randn(1, head.config.action_horizon, head.config.action_dim)
+    for name, session in _setup_sessions(head, tmp_path, torch.float32).items():
+        setattr(head, name, session)
+
+    for batch_size in [2, 3, 2]:
+        backbone_output, action_input = _inputs(head, batch_size)
+        with torch.inference_mode():
+            expected = action_head_pytorch_forward(head, backbone_output, action_input)
+            reference = action_head_tensorrt_forward(head, backbone_output, action_input)
+            actions = action_head_plan_forward(head, backbone_output, action_input)
+        compare_predictions(
+            {"action_pred": actions["action_pred"].numpy()},
+            {"action_pred": expected["action_pred"].numpy()},
+            min_cosine_similarity=0.999,
+            backend="ONNX Runtime",
+        )
+        # the plan only skips the float16 rounding of the engine inputs of the reference forward
+        torch.testing.assert_close(
+            actions["action_pred"], reference["action_pred"].float(), atol=1e-2, rtol=1e-2
+        )
+
+    # one plan per shape, replayed on the same shapes
+    assert len(head.execution_plans) == 2
+    plan = next(iter(head.execution_plans.values()))
+    assert plan.batch_size == 3
+
+    # a new number of denoising steps builds a new plan
+    head.num_inference_timesteps = 2
+    backbone_output, action_input = _inputs(head, 2)
+    with torch.inference_mode():
+        expected = action_head_pytorch_forward(head, backbone_output, action_input)
+        actions = action_head_plan_forward(head, backbone_output, action_input)
+    compare_predictions(
+        {"action_pred": actions["action_pred"].numpy()},
+        {"action_pred": expected["action_pred"].numpy()},
+        min_cosine_similarity=0.999,
+        backend="ONNX Runtime",
+    )
+    assert len(head.execution_plans) == 3
+    plan = next(reversed(head.execution_plans.values()))
+    assert plan.num_steps == 2
+
+
+@pytest.mark.parametrize("denoising_steps", [1, 4])
+def test_fused_action_head_export_parity(tmp_path, denoising_steps):
+    head = _tiny_action_head()
+    head.num_inference_timesteps = denoising_steps
+    head.init_actions = torch.randn(1, head.config.action_horizon, head.config.action_dim)
+
+    backbone_output, action_input = _inputs(head, 1)
+    export_fused_action_head(
+        head,
+        str(tmp_path / "action_head_fused.onnx"),
+        backbone_output.backbone_features,
+        action_input.state,
+        denoising_steps=denoising_steps,
+    )
+    head.fused_action_head_engine = Session(str(tmp_path / "action_head_fused.onnx"))
+    assert [item[0] for item in head.fused_action_head_engine.in_meta] == [
+        "backbone_features",
+        "state",
+        "embodiment_id",
+        "init_actions",
+    ]
+
+    # the batch size is dynamic
+    batch_size = 3
+    with torch.inference_mode():
+        expected = action_head_pytorch_forward(head, *_inputs(head, batch_size))["action_pred"]
+        actions = action_head_fused_forward(head, *_inputs(head, batch_size))["action_pred"]
+
+    assert actions.shape == expected.shape
+    torch.testing.assert_close(actions, expected, atol=1e-4, rtol=1e-4)
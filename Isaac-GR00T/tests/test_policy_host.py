@@ -0,0 +1,126 @@
+import gc
+
+import pytest
+import torch
+from torch import nn
+
+from gr00t.model.backbone import BackbonePool
+from gr00t.model.policy import BasePolicy
+from gr00t.model.policy_host import HostedPolicySpec, PolicyHost
+
+
+class TinyModel(nn.Module):
+    def __init__(self, backbone_seed, head_seed):
+        super().__init__()
+        torch.manual_seed(backbone_seed)
+        self.backbone = nn.Linear(64, 64)
+        torch.manual_seed(head_seed)
+        self.action_head = nn.Linear(64, 4)
+
+
+class TinyPolicy(BasePolicy):
+    def __init__(self, spec, backbone_pool):
+        # "<backbone seed>/<action head seed>" checkpoints
+        backbone_seed, head_seed = map(int, spec.model_path.split("/"))
+        self.spec = spec
+        self.model = TinyModel(backbone_seed, head_seed)
+        self.model.backbone = backbone_pool.share(self.model.backbone)
+        self.num_resets = 0
+
+    def get_action(self, observations):
+        return {"model": self.spec.name, "keys": sorted(observations)}
+
+    def get_modality_config(self):
+        return {"name": self.spec.name}
+
+    def reset(self):
+        self.num_resets += 1
+
+
+def _host(**kwargs):
+    specs = [
+        HostedPolicySpec.parse("so100=0/1,new_embodiment,so100"),
+        HostedPolicySpec("0/2", "gr1", "fourier_gr1_arms_waist"),
+        HostedPolicySpec.parse("g1=3/3,unitree_g1,unitree_g1"),
+    ]
+    return PolicyHost(specs, loader=TinyPolicy, **kwargs)
+
+
+def test_spec_parsing():
+    spec = HostedPolicySpec.parse("so100=nvidia/GR00T-N1.5-3B,new_embodiment,module:Config")
+    assert (spec.name, spec.model_path, spec.data_config) == (
+        "so100",
+        "nvidia/GR00T-N1.5-3B",
+        "module:Config",
+    )
+    assert HostedPolicySpec.parse("ckpt,gr1,fourier_gr1_arms_waist").name == "ckpt:gr1"
+
+
+def test_routing():
+    host = _host()
+    assert host.get_action({"state.arm": 0})["model"] == "so100"
+    action = host.get_action({"state.arm": 0, "model": "0/2:gr1"})
+    assert action == {"model": "0/2:gr1", "keys": ["state.arm"]}
+    assert host.get_modality_config() == {"name": "so100"}
+    assert host.get_modality_config("0/2:gr1") == {"name": "0/2:gr1"}
+    with pytest.raises(ValueError, match="Unknown model"):
+        host.get_action({"model": "missing"})
+
+    # a reset only resets the policy of its client
+    host.reset("0/2:gr1")
+    assert [hosted.policy.num_resets for hosted in host._loaded.values()] == [0, 1]
+    host.reset()
+    assert [hosted.policy.num_resets for hosted in host._loaded.values()] == [1, 1]
+    # a policy that is not loaded is not loaded to be reset
+    host.reset("g1")
+    assert host.loaded_policies == ["so100", "0/2:gr1"]
+
+
+def test_backbone_deduplication():
+    pool = BackbonePool()
+    backbone = nn.Linear(8, 8)
+    copy = nn.Linear(8, 8)
+    copy.load_state_dict(backbone.state_dict())
+    assert pool.share(backbone) is backbone
+    assert pool.share(copy) is backbone
+    with torch.no_grad():
+        copy.weight[-1, -1] += 1.0
+    # same fingerprint, different weights
+    assert pool.share(copy) is copy
+    assert len(pool) == 2 and pool.num_shared == 1
+
+    host = _host()
+    for name in ("so100", "0/2:gr1", "g1"):
+        host.get_action({"model": name})
+    models = [hosted.policy.model for hosted in host._loaded.values()]
+    assert models[0].backbone is models[1].backbone
+    assert models[2].backbone is not models[0].backbone
+    assert len(host.backbone_pool) == 2
+
+    def linear_bytes(size):
+        return (size * size + size) * 4
+
+    # the shared backbone is counted once
+    assert host.memory_bytes() == 2 * linear_bytes(64) + 3 * (64 * 4 + 4) * 4
+
+
+def test_lru_eviction():
+    host = _host(max_loaded_policies=2)
+    host.get_action({"model": "so100"})
+    host.get_action({"model": "g1"})
+    host.get_action({"model": "so100"})
+    host.get_action({"model": "0/2:gr1"})
+    # g1 was the least recently used
+    assert host.loaded_policies == ["so100", "0/2:gr1"]
+    assert (host.num_loads, host.num_evictions) == (3, 1)
+    gc.collect()
+    assert len(host.backbone_pool) == 1
+
+    # a memory budget of one model
+    host = _host(max_memory_gb=(64 * 64 + 64 + 64 * 4 + 4) * 4 * 1.5 / 1e9)
+    host.get_action({"model": "so100"})
+    host.get_action({"model": "0/2:gr1"})
+    # the second model only adds its action head, with the shared backbone
+    assert host.loaded_policies == ["so100", "0/2:gr1"]
+    host.get_action({"model": "g1"})
+    assert host.loaded_policies == ["g1"]
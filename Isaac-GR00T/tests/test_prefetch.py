@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+import torch
+from torch.utils.data import DataLoader, Dataset
+from transformers.feature_extraction_utils import BatchFeature
+
+from gr00t.utils.prefetch import DevicePrefetchLoader
+
+
+class RangeDataset(Dataset):
+    def __init__(self, length: int = 10, fail_at: int | None = None):
+        self.length = length
+        self.fail_at = fail_at
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if index == self.fail_at:
+            raise ValueError(f"bad sample {index}")
+        return {"state": torch.full((3,), float(index)), "index": index}
+
+
+def _collate(features):
+    return {
+        "state": torch.stack([f["state"] for f in features]),
+        "eagle_inputs": BatchFeature({"ids": torch.tensor([f["index"] for f in features])}),
+    }
+
+
+def _prefetch_threads():
+    return [t for t in threading.enumerate() if t.name == "device-prefetch"]
+
+
+def test_prefetch_loader_matches_loader():
+    loader = DataLoader(RangeDataset(), batch_size=3, collate_fn=_collate)
+    prefetch_loader = DevicePrefetchLoader(loader, device="cpu", num_prefetch=2)
+    assert len(prefetch_loader) == len(loader)
+    assert prefetch_loader.batch_size == 3
+
+    for _ in range(2):
+        batches = list(prefetch_loader)
+        expected = list(loader)
+        assert len(batches) == len(expected)
+        for batch, ref in zip(batches, expected):
+            assert isinstance(batch["eagle_inputs"], BatchFeature)
+            assert torch.equal(batch["state"], ref["state"])
+            assert torch.equal(batch["eagle_inputs"]["ids"], ref["eagle_inputs"]["ids"])
+
+    stats = prefetch_loader.stall_stats(reset=True)
+    assert stats["num_batches"] == 2 * len(loader)
+    assert stats["stall_s"] >= 0.0
+    assert prefetch_loader.stall_stats()["num_batches"] == 0
+
+
+def test_prefetch_loader_early_exit_and_errors():
+    loader = DataLoader(RangeDataset(length=20), batch_size=1, collate_fn=_collate)
+    prefetch_loader = DevicePrefetchLoader(loader, device="cpu", num_prefetch=1)
+    for i, _ in enumerate(prefetch_loader):
+        if i == 2:
+            break
+    assert not _prefetch_threads()
+
+    loader = DataLoader(RangeDataset(fail_at=4), batch_size=2, collate_fn=_collate)
+    with pytest.raises(ValueError, match="bad sample 4"):
+        list(DevicePrefetchLoader(loader, device="cpu"))
+    assert not _prefetch_threads()
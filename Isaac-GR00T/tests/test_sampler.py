@@ -0,0 +1,118 @@
+import json
+import os
+
+import numpy as np
+import pytest
+import torch
+from torch.utils.data import Dataset
+from transformers import PretrainedConfig, PreTrainedModel, TrainingArguments
+
+from gr00t.data.sampler import ShardedSampler, feistel_permute
+from gr00t.experiment.trainer import SAMPLER_STATE_NAME, DualBrainTrainer
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 16, 1000, 4097])
+def test_feistel_permute_is_bijection(size):
+    image = feistel_permute(np.arange(size), size, key=1234)
+    assert sorted(image.tolist()) == list(range(size))
+    if size > 4:
+        assert not np.array_equal(image, feistel_permute(np.arange(size), size, key=4321))
+
+
+@pytest.mark.parametrize("num_indices,block_size", [(1, 1), (10, 3), (1000, 1), (1003, 16)])
+def test_sharded_sampler_permutation(num_indices, block_size):
+    sampler = ShardedSampler(range(num_indices), seed=7, block_size=block_size)
+    epoch_0 = list(sampler)
+    assert sorted(epoch_0) == list(range(num_indices))
+    assert list(sampler) == epoch_0
+    sampler.set_epoch(1)
+    epoch_1 = list(sampler)
+    assert sorted(epoch_1) == list(range(num_indices))
+    if num_indices > 10:
+        assert epoch_0 != epoch_1
+
+    # All the indices of a full block are yielded contiguously
+    if block_size > 1:
+        blocks = np.asarray(epoch_1) // block_size
+        assert (np.diff(blocks) != 0).sum() == num_indices // block_size - (
+            num_indices % block_size == 0
+        )
+
+
+def test_sharded_sampler_ranks_and_resume():
+    samplers = [ShardedSampler(range(101), seed=3, num_replicas=4, rank=r) for r in range(4)]
+    shards = [list(s) for s in samplers]
+    assert all(len(shard) == 26 for shard in shards)
+    assert set().union(*shards) == set(range(101))
+
+    sampler = ShardedSampler(range(101), seed=3, block_size=4, chunk_size=8)
+    sampler.set_epoch(2)
+    full = list(sampler)
+    state = sampler.state_dict(num_consumed=37)
+    resumed = ShardedSampler(range(101), seed=3, block_size=4, chunk_size=8)
+    resumed.load_state_dict(state)
+    resumed.set_epoch(2)
+    assert list(resumed) == full[37:]
+    # The saved position only applies to the resumed epoch
+    assert list(resumed) == full
+    with pytest.raises(ValueError, match="block_size"):
+        ShardedSampler(range(101), seed=3, block_size=8).load_state_dict(state)
+
+
+class IndexConfig(PretrainedConfig):
+    model_type = "index_recorder"
+
+
+class IndexRecorder(PreTrainedModel):
+    config_class = IndexConfig
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.weight = torch.nn.Parameter(torch.zeros(1))
+        self.seen = []
+
+    def forward(self, inputs):
+        self.seen.extend(inputs["index"].tolist())
+        return {"loss": (self.weight * inputs["index"].float()).mean()}
+
+
+class IndexDataset(Dataset):
+    def __len__(self):
+        return 40
+
+    def __getitem__(self, index):
+        return {"index": torch.tensor(index)}
+
+
+def _train(output_dir, max_steps, resume=False):
+    args = TrainingArguments(
+        output_dir=str(output_dir),
+        per_device_train_batch_size=4,
+        max_steps=max_steps,
+        save_strategy="steps",
+        save_steps=3,
+        report_to=[],
+        use_cpu=True,
+        remove_unused_columns=False,
+        dataloader_num_workers=0,
+    )
+    trainer = DualBrainTrainer(
+        model=IndexRecorder(IndexConfig()),
+        args=args,
+        train_dataset=IndexDataset(),
+        compute_dtype=torch.float32,
+        sampler_block_size=2,
+    )
+    trainer.train(resume_from_checkpoint=resume)
+    return trainer.model.seen
+
+
+def test_trainer_resumes_sampler_mid_epoch(tmp_path):
+    # 10 steps per epoch: checkpoint-3 is in the middle of the first epoch, checkpoint-12 of the second
+    reference = _train(tmp_path / "reference", max_steps=15)
+    _train(tmp_path / "resumed", max_steps=12)
+    with open(tmp_path / "resumed" / "checkpoint-12" / SAMPLER_STATE_NAME) as f:
+        assert json.load(f)["num_consumed"] == 8
+    resumed = _train(tmp_path / "resumed", max_steps=15, resume=True)
+    assert resumed == reference[12 * 4 :]
+    assert os.path.exists(tmp_path / "resumed" / "checkpoint-15")
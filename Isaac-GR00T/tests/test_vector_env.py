@@ -0,0 +1,67 @@
+from functools import partial
+
+import gymnasium as gym
+import numpy as np
+from gymnasium import spaces
+
+from gr00t.eval.vector_env import SharedMemoryVectorEnv
+
+
+class DummyRobotEnv(gym.Env):
+    """Tiny env with the same observation layout as the GR00T simulation envs."""
+
+    def __init__(self, episode_length: int = 3):
+        self.episode_length = episode_length
+        self.observation_space = spaces.Dict(
+            {
+                "video.ego_view": spaces.Box(0, 255, shape=(1, 8, 8, 3), dtype=np.uint8),
+                "state.left_arm": spaces.Box(-1, 1, shape=(1, 7), dtype=np.float64),
+                "annotation.human.action.task_description": spaces.Text(max_length=64),
+            }
+        )
+        self.action_space = spaces.Box(-1, 1, shape=(7,), dtype=np.float32)
+        self.t = 0
+
+    def _obs(self):
+        return {
+            "video.ego_view": np.full((1, 8, 8, 3), self.t, dtype=np.uint8),
+            "state.left_arm": np.full((1, 7), self.t, dtype=np.float64),
+            "annotation.human.action.task_description": f"pick the cube, step {self.t}!",
+        }
+
+    def reset(self, seed=None, options=None):
+        super().reset(seed=seed)
+        self.t = 0
+        return self._obs(), {}
+
+    def step(self, action):
+        self.t += 1
+        done = self.t >= self.episode_length
+        return self._obs(), float(self.t), done, False, {"success": done}
+
+
+def _make_env(episode_length):
+    return DummyRobotEnv(episode_length=episode_length)
+
+
+def test_shared_memory_vector_env_matches_sync():
+    env_fns = [partial(_make_env, episode_length=i + 2) for i in range(2)]
+    sync_env = gym.vector.SyncVectorEnv(env_fns)
+    shm_env = SharedMemoryVectorEnv(env_fns)
+    try:
+        sync_obs, _ = sync_env.reset()
+        shm_obs, _ = shm_env.reset()
+        for _ in range(6):
+            for key in sync_obs:
+                if isinstance(sync_obs[key], np.ndarray):
+                    np.testing.assert_array_equal(sync_obs[key], shm_obs[key])
+                else:
+                    assert tuple(sync_obs[key]) == tuple(shm_obs[key])
+            actions = sync_env.action_space.sample()
+            sync_obs, sync_rew, sync_term, _, _ = sync_env.step(actions)
+            shm_obs, shm_rew, shm_term, _, _ = shm_env.step(actions)
+            np.testing.assert_array_equal(sync_rew, shm_rew)
+            np.testing.assert_array_equal(sync_term, shm_term)
+    finally:
+        sync_env.close()
+        shm_env.close()
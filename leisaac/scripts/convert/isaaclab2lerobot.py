@@ -174,15 +174,18 @@ LEROBOT_JOINT_POS_LIMIT_RANGE = [
 ]
 
 
+_ISAACLAB_MIN, _ISAACLAB_MAX = np.array(ISAACLAB_JOINT_POS_LIMIT_RANGE, dtype=np.float64).T
+_LEROBOT_MIN, _LEROBOT_MAX = np.array(LEROBOT_JOINT_POS_LIMIT_RANGE, dtype=np.float64).T
+# lerobot = radian * scale + offset, precomputed once for all joints
+JOINT_POS_SCALE = 180.0 / np.pi * (_LEROBOT_MAX - _LEROBOT_MIN) / (_ISAACLAB_MAX - _ISAACLAB_MIN)
+JOINT_POS_OFFSET = _LEROBOT_MIN - _ISAACLAB_MIN * (_LEROBOT_MAX - _LEROBOT_MIN) / (_ISAACLAB_MAX - _ISAACLAB_MIN)
+
+
 def preprocess_joint_pos(joint_pos: np.ndarray) -> np.ndarray:
-    joint_pos = joint_pos / np.pi * 180
-    for i in range(6):
-        isaaclab_min, isaaclab_max = ISAACLAB_JOINT_POS_LIMIT_RANGE[i]
-        lerobot_min, lerobot_max = LEROBOT_JOINT_POS_LIMIT_RANGE[i]
-        isaac_range = isaaclab_max - isaaclab_min
-        lerobot_range = lerobot_max - lerobot_min
-        joint_pos[:, i] = (joint_pos[:, i] - isaaclab_min) / isaac_range * lerobot_range + lerobot_min
-    return joint_pos
+    """Convert joint positions of shape (..., 6 * num_arms) from IsaacLab radians to the LeRobot motor range."""
+    arm_joint_pos = joint_pos.reshape(*joint_pos.shape[:-1], -1, len(JOINT_POS_SCALE))
+    processed = arm_joint_pos * JOINT_POS_SCALE + JOINT_POS_OFFSET
+    return processed.reshape(joint_pos.shape).astype(joint_pos.dtype, copy=False)
 
 
 def process_single_arm_data(dataset: LeRobotDataset, task: str, demo_group: h5py.Group, demo_name: str) -> bool:
@@ -0,0 +1,350 @@
+import argparse
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from pathlib import Path
+
+import h5py
+import numpy as np
+import pandas as pd
+from isaaclab2lerobot import BI_ARM_FEATURES, SINGLE_ARM_FEATURES, preprocess_joint_pos
+from lerobot.constants import HF_LEROBOT_HOME
+from lerobot.datasets.compute_stats import aggregate_stats
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from tqdm import tqdm
+
+"""
+Parallel, streaming version of isaaclab2lerobot.py.
+
+NOTE: Please use the environment of lerobot (https://github.com/huggingface/lerobot/tree/v0.3.3, dataset format v2.1).
+
+The demos of all the hdf5 files are distributed over `--num_workers` processes, balanced by number of frames.
+Each worker streams its demos from the hdf5 file `--chunk_size` frames at a time and writes them to its own
+shard LeRobotDataset, so the frame writing and the video encoding of `save_episode` run in parallel.
+The shards are then merged into a single dataset: episodes are renumbered in the order of the hdf5 files/demos,
+the parquet files and videos are moved to the chunk layout, and meta/{info.json, tasks.jsonl, episodes.jsonl,
+episodes_stats.jsonl, stats.json} are rebuilt.
+
+Example:
+    python scripts/convert/isaaclab2lerobot_parallel.py \\
+        --repo_id EverNorif/so101_test_orange_pick \\
+        --hdf5_files ./datasets/dataset.hdf5 \\
+        --task "Grab orange and place into plate" \\
+        --num_workers 8
+"""
+
+# skip the first frames of every demo, and demos that are too short (same as isaaclab2lerobot.py)
+SKIP_FRAMES = 5
+MIN_FRAMES = 10
+
+# hdf5 keys of the joint positions (concatenated into observation.state) and of the cameras, per robot type
+ROBOT_SPECS = {
+    "so101_follower": {
+        "features": SINGLE_ARM_FEATURES,
+        "state_keys": ["obs/joint_pos"],
+        "image_keys": {
+            "observation.images.front": "obs/front",
+            "observation.images.wrist": "obs/wrist",
+        },
+    },
+    "bi_so101_follower": {
+        "features": BI_ARM_FEATURES,
+        "state_keys": ["obs/left_joint_pos", "obs/right_joint_pos"],
+        "image_keys": {
+            "observation.images.left_wrist": "obs/left_wrist",
+            "observation.images.top": "obs/top",
+            "observation.images.right_wrist": "obs/right_wrist",
+        },
+    },
+}
+
+# columns whose values change when the shards are merged
+RENUMBERED_COLUMNS = ["episode_index", "index", "task_index"]
+
+
+def list_demos(hdf5_files: list[str], robot_type: str) -> list[tuple[int, str, str, int]]:
+    """List the (ordinal, hdf5 file, demo name, number of frames) of the demos to convert, in conversion order."""
+    spec = ROBOT_SPECS[robot_type]
+    required_keys = ["actions"] + spec["state_keys"] + list(spec["image_keys"].values())
+    demos = []
+    for hdf5_file in hdf5_files:
+        with h5py.File(hdf5_file, "r") as f:
+            for demo_name in f["data"].keys():
+                demo_group = f["data"][demo_name]
+                if "success" in demo_group.attrs and not demo_group.attrs["success"]:
+                    print(f"Demo {demo_name} of {hdf5_file} is not successful, skip it")
+                    continue
+                if any(key not in demo_group for key in required_keys):
+                    print(f"Demo {demo_name} of {hdf5_file} is not valid, skip it")
+                    continue
+                num_frames = demo_group["actions"].shape[0]
+                if num_frames < MIN_FRAMES:
+                    print(f"Demo {demo_name} of {hdf5_file} has less than {MIN_FRAMES} frames, skip it")
+                    continue
+                demos.append((len(demos), hdf5_file, demo_name, num_frames))
+    return demos
+
+
+def balance_demos(demos: list[tuple[int, str, str, int]], num_shards: int) -> list[list[tuple[int, str, str, int]]]:
+    """Assign the demos to shards, longest first to the least loaded shard, keeping the demo order within a shard."""
+    shards = [[] for _ in range(num_shards)]
+    loads = np.zeros(num_shards, dtype=np.int64)
+    for demo in sorted(demos, key=lambda demo: demo[3], reverse=True):
+        shard_index = int(np.argmin(loads))
+        shards[shard_index].append(demo)
+        loads[shard_index] += demo[3]
+    return [sorted(shard) for shard in shards if shard]
+
+
+def write_demo(dataset: LeRobotDataset, demo_group: h5py.Group, robot_type: str, task: str, chunk_size: int):
+    """Stream one demo into `dataset`, reading at most `chunk_size` frames of images at a time."""
+    spec = ROBOT_SPECS[robot_type]
+    # low-dim data is small, convert it for the whole demo at once
+    actions = preprocess_joint_pos(demo_group["actions"][SKIP_FRAMES:])
+    state = np.concatenate([preprocess_joint_pos(demo_group[key][SKIP_FRAMES:]) for key in spec["state_keys"]], axis=-1)
+    num_frames = demo_group["actions"].shape[0]
+    for start in range(SKIP_FRAMES, num_frames, chunk_size):
+        stop = min(start + chunk_size, num_frames)
+        images = {feature: demo_group[key][start:stop] for feature, key in spec["image_keys"].items()}
+        for i in range(stop - start):
+            frame = {
+                "action": actions[start - SKIP_FRAMES + i],
+                "observation.state": state[start - SKIP_FRAMES + i],
+            }
+            for feature, chunk in images.items():
+                frame[feature] = chunk[i]
+            dataset.add_frame(frame=frame, task=task)
+
+
+def convert_shard(
+    shard_root: str,
+    repo_id: str,
+    robot_type: str,
+    fps: int,
+    task: str,
+    demos: list[tuple[int, str, str, int]],
+    chunk_size: int,
+    image_writer_threads: int,
+) -> list[int]:
+    """
+    Convert `demos` into a new LeRobotDataset at `shard_root`. Runs in a worker process.
+
+    Returns:
+        list[int]: the demo ordinal of each episode of the shard, in shard episode order.
+    """
+    dataset = LeRobotDataset.create(
+        repo_id=repo_id,
+        root=shard_root,
+        fps=fps,
+        robot_type=robot_type,
+        features=ROBOT_SPECS[robot_type]["features"],
+        image_writer_threads=image_writer_threads,
+    )
+    converted = []
+    hdf5_handles = {}
+    try:
+        for ordinal, hdf5_file, demo_name, _ in demos:
+            if hdf5_file not in hdf5_handles:
+                hdf5_handles[hdf5_file] = h5py.File(hdf5_file, "r")
+            write_demo(dataset, hdf5_handles[hdf5_file]["data"][demo_name], robot_type, task, chunk_size)
+            dataset.save_episode()
+            converted.append(ordinal)
+    finally:
+        for handle in hdf5_handles.values():
+            handle.close()
+        if dataset.image_writer is not None:
+            dataset.stop_image_writer()
+    return converted
+
+
+def _read_jsonl(path: Path) -> list[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _write_jsonl(path: Path, items: list[dict]):
+    with open(path, "w") as f:
+        for item in items:
+            f.write(json.dumps(item) + "\n")
+
+
+def _column_stats(values: np.ndarray) -> dict:
+    values = values.astype(np.float64)
+    return {
+        "min": [values.min()],
+        "max": [values.max()],
+        "mean": [values.mean()],
+        "std": [values.std()],
+        "count": [len(values)],
+    }
+
+
+def merge_shards(shard_roots: list[Path], shard_ordinals: list[list[int]], output_root: Path):
+    """
+    Merge the shard datasets into a single dataset at `output_root` (LeRobot dataset format v2.1).
+
+    Args:
+        shard_roots (list[Path]): The root of every shard dataset.
+        shard_ordinals (list[list[int]]): The demo ordinal of every episode of every shard, see `convert_shard`.
+        output_root (Path): The root of the merged dataset, must not exist.
+    """
+    info = json.loads((shard_roots[0] / "meta/info.json").read_text())
+    chunks_size = info["chunks_size"]
+    video_keys = [key for key, feature in info["features"].items() if feature["dtype"] == "video"]
+    (output_root / "meta").mkdir(parents=True)
+
+    # the merged episodes follow the demo order, whichever worker converted them
+    sources = sorted(
+        (ordinal, shard_index, shard_episode_index)
+        for shard_index, ordinals in enumerate(shard_ordinals)
+        for shard_episode_index, ordinal in enumerate(ordinals)
+    )
+    shard_tasks = [
+        {task["task_index"]: task["task"] for task in _read_jsonl(root / "meta/tasks.jsonl")} for root in shard_roots
+    ]
+    shard_episodes = [
+        {ep["episode_index"]: ep for ep in _read_jsonl(root / "meta/episodes.jsonl")} for root in shard_roots
+    ]
+    shard_episode_stats = [
+        {ep["episode_index"]: ep["stats"] for ep in _read_jsonl(root / "meta/episodes_stats.jsonl")}
+        for root in shard_roots
+    ]
+
+    task_to_index: dict[str, int] = {}
+    episodes, episodes_stats = [], []
+    total_frames = 0
+    for episode_index, (_, shard_index, shard_episode_index) in enumerate(tqdm(sources, desc="Merging episodes")):
+        shard_root = shard_roots[shard_index]
+        shard_chunk = shard_episode_index // chunks_size
+        chunk = episode_index // chunks_size
+
+        data = pd.read_parquet(
+            shard_root / info["data_path"].format(episode_chunk=shard_chunk, episode_index=shard_episode_index)
+        )
+        task_index_map = {}
+        for shard_task_index in data["task_index"].unique():
+            task = shard_tasks[shard_index][int(shard_task_index)]
+            task_index_map[shard_task_index] = task_to_index.setdefault(task, len(task_to_index))
+        data["task_index"] = data["task_index"].map(task_index_map).astype(data["task_index"].dtype)
+        data["episode_index"] = episode_index
+        data["index"] = np.arange(total_frames, total_frames + len(data), dtype=data["index"].dtype)
+        data_path = output_root / info["data_path"].format(episode_chunk=chunk, episode_index=episode_index)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        data.to_parquet(data_path, index=False)
+
+        for video_key in video_keys:
+            src = shard_root / info["video_path"].format(
+                episode_chunk=shard_chunk, video_key=video_key, episode_index=shard_episode_index
+            )
+            dst = output_root / info["video_path"].format(
+                episode_chunk=chunk, video_key=video_key, episode_index=episode_index
+            )
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(src, dst)
+
+        episode = dict(shard_episodes[shard_index][shard_episode_index], episode_index=episode_index)
+        episodes.append(episode)
+        stats = shard_episode_stats[shard_index][shard_episode_index]
+        for column in RENUMBERED_COLUMNS:
+            if column in stats:
+                stats[column] = _column_stats(data[column].to_numpy())
+        episodes_stats.append({"episode_index": episode_index, "stats": stats})
+        total_frames += len(data)
+
+    num_episodes = len(episodes)
+    tasks = [{"task_index": index, "task": task} for task, index in task_to_index.items()]
+    _write_jsonl(output_root / "meta/tasks.jsonl", tasks)
+    _write_jsonl(output_root / "meta/episodes.jsonl", episodes)
+    _write_jsonl(output_root / "meta/episodes_stats.jsonl", episodes_stats)
+
+    stats = aggregate_stats(
+        [{key: {k: np.array(v) for k, v in s.items()} for key, s in ep["stats"].items()} for ep in episodes_stats]
+    )
+    with open(output_root / "meta/stats.json", "w") as f:
+        json.dump({key: {k: v.tolist() for k, v in s.items()} for key, s in stats.items()}, f, indent=4)
+
+    info.update(
+        total_episodes=num_episodes,
+        total_frames=total_frames,
+        total_tasks=len(tasks),
+        total_videos=num_episodes * len(video_keys),
+        total_chunks=(num_episodes + chunks_size - 1) // chunks_size if num_episodes else 0,
+        splits={"train": f"0:{num_episodes}"},
+    )
+    with open(output_root / "meta/info.json", "w") as f:
+        json.dump(info, f, indent=4)
+
+
+def convert_isaaclab_to_lerobot_parallel(args: argparse.Namespace):
+    assert args.robot_type in ROBOT_SPECS, f"robot_type must be one of {list(ROBOT_SPECS)}"
+    output_root = Path(args.root) if args.root is not None else HF_LEROBOT_HOME / args.repo_id
+    assert not output_root.exists(), f"Output dataset {output_root} already exists"
+    shards_dir = output_root.parent / f".{output_root.name}_shards"
+    if shards_dir.exists():
+        shutil.rmtree(shards_dir)
+
+    demos = list_demos(args.hdf5_files, args.robot_type)
+    print(f"Found {len(demos)} valid demos ({sum(demo[3] for demo in demos)} frames) in {len(args.hdf5_files)} files")
+    assert len(demos) > 0, "No valid demo to convert"
+    shards = balance_demos(demos, min(args.num_workers, len(demos)))
+
+    shard_roots = [shards_dir / f"shard_{i:03d}" for i in range(len(shards))]
+    shard_ordinals: list[list[int]] = [[] for _ in shards]
+    # spawn: h5py and the video encoders are not fork safe
+    with ProcessPoolExecutor(max_workers=len(shards), mp_context=get_context("spawn")) as executor:
+        futures = {
+            executor.submit(
+                convert_shard,
+                str(shard_root),
+                args.repo_id,
+                args.robot_type,
+                args.fps,
+                args.task,
+                shard,
+                args.chunk_size,
+                args.image_writer_threads,
+            ): i
+            for i, (shard_root, shard) in enumerate(zip(shard_roots, shards))
+        }
+        with tqdm(total=len(demos), desc="Converting demos") as progress:
+            for future in as_completed(futures):
+                shard_ordinals[futures[future]] = future.result()
+                progress.update(len(shards[futures[future]]))
+
+    merge_shards(shard_roots, shard_ordinals, output_root)
+    shutil.rmtree(shards_dir)
+    print(f"Saved {len(demos)} episodes to {output_root}")
+
+    if args.push_to_hub:
+        LeRobotDataset(args.repo_id, root=output_root).push_to_hub()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert IsaacLab hdf5 demos to a LeRobotDataset in parallel.")
+    parser.add_argument("--repo_id", type=str, default="EverNorif/so101_test_orange_pick", help="Dataset repo id.")
+    parser.add_argument(
+        "--root", type=str, default=None, help="Output directory, defaults to $HF_LEROBOT_HOME/<repo_id>."
+    )
+    parser.add_argument(
+        "--robot_type",
+        type=str,
+        default="so101_follower",
+        choices=list(ROBOT_SPECS),
+        help="Robot type of the demos.",
+    )
+    parser.add_argument("--fps", type=int, default=30, help="Frame rate of the demos.")
+    parser.add_argument(
+        "--hdf5_files", type=str, nargs="+", default=["./datasets/dataset.hdf5"], help="hdf5 files to convert."
+    )
+    parser.add_argument("--task", type=str, default="Grab orange and place into plate", help="Task description.")
+    parser.add_argument(
+        "--num_workers", type=int, default=max(1, os.cpu_count() // 2), help="Number of conversion/encoding processes."
+    )
+    parser.add_argument("--chunk_size", type=int, default=64, help="Number of frames read from hdf5 at a time.")
+    parser.add_argument(
+        "--image_writer_threads", type=int, default=4, help="Threads writing the frames to disk, per worker."
+    )
+    parser.add_argument("--push_to_hub", action="store_true", help="Push the merged dataset to the hub.")
+    convert_isaaclab_to_lerobot_parallel(parser.parse_args())
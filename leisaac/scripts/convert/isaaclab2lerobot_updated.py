@@ -210,28 +210,29 @@ LEROBOT_ACTION_LIMIT_RANGE = [
 ]
 
 
+def _scale_offset(isaaclab_limit_range: list, lerobot_limit_range: list) -> tuple[np.ndarray, np.ndarray]:
+    """Per-dimension `scale` and `offset` such that lerobot value = isaaclab radian * scale + offset."""
+    isaaclab_min, isaaclab_max = np.array(isaaclab_limit_range, dtype=np.float64).T
+    lerobot_min, lerobot_max = np.array(lerobot_limit_range, dtype=np.float64).T
+    ratio = (lerobot_max - lerobot_min) / (isaaclab_max - isaaclab_min)
+    return 180.0 / np.pi * ratio, lerobot_min - isaaclab_min * ratio
+
+
+# precomputed once for all dimensions
+JOINT_POS_SCALE, JOINT_POS_OFFSET = _scale_offset(ISAACLAB_JOINT_POS_LIMIT_RANGE, LEROBOT_JOINT_POS_LIMIT_RANGE)
+ACTION_SCALE, ACTION_OFFSET = _scale_offset(ISAACLAB_ACTION_LIMIT_RANGE, LEROBOT_ACTION_LIMIT_RANGE)
+
+
 def preprocess_joint_pos(joint_pos: np.ndarray) -> np.ndarray:
-    """Preprocess 6D joint positions (observations)"""
-    joint_pos = joint_pos / np.pi * 180
-    for i in range(6):
-        isaaclab_min, isaaclab_max = ISAACLAB_JOINT_POS_LIMIT_RANGE[i]
-        lerobot_min, lerobot_max = LEROBOT_JOINT_POS_LIMIT_RANGE[i]
-        isaac_range = isaaclab_max - isaaclab_min
-        lerobot_range = lerobot_max - lerobot_min
-        joint_pos[:, i] = (joint_pos[:, i] - isaaclab_min) / isaac_range * lerobot_range + lerobot_min
-    return joint_pos
+    """Preprocess 6D joint positions (observations), of shape (..., 6 * num_arms)"""
+    arm_joint_pos = joint_pos.reshape(*joint_pos.shape[:-1], -1, len(JOINT_POS_SCALE))
+    processed = arm_joint_pos * JOINT_POS_SCALE + JOINT_POS_OFFSET
+    return processed.reshape(joint_pos.shape).astype(joint_pos.dtype, copy=False)
 
 
 def preprocess_actions(actions: np.ndarray) -> np.ndarray:
     """Preprocess 8D actions"""
-    actions = actions / np.pi * 180
-    for i in range(8):
-        isaaclab_min, isaaclab_max = ISAACLAB_ACTION_LIMIT_RANGE[i]
-        lerobot_min, lerobot_max = LEROBOT_ACTION_LIMIT_RANGE[i]
-        isaac_range = isaaclab_max - isaaclab_min
-        lerobot_range = lerobot_max - lerobot_min
-        actions[:, i] = (actions[:, i] - isaaclab_min) / isaac_range * lerobot_range + lerobot_min
-    return actions
+    return (actions * ACTION_SCALE + ACTION_OFFSET).astype(actions.dtype, copy=False)
 
 
 def process_single_arm_data(dataset: LeRobotDataset, task: str, demo_group: h5py.Group, demo_name: str) -> bool:
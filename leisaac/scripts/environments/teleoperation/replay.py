@@ -14,6 +14,12 @@ parser = argparse.ArgumentParser(description="leisaac replay for leisaac in the
 parser.add_argument("--task", type=str, default=None, help="Name of the task.")
 parser.add_argument("--num_envs", type=int, default=1, help="Number of environments to simulate.")
 parser.add_argument("--step_hz", type=int, default=60, help="Environment stepping rate in Hz.")
+parser.add_argument(
+    "--fast", action="store_true", help="Replay as fast as possible, without limiting the stepping rate to step_hz."
+)
+parser.add_argument(
+    "--num_prefetch", type=int, default=4, help="Number of episodes loaded ahead of time by a background thread."
+)
 parser.add_argument(
     "--dataset_file", type=str, default="./datasets/dataset.hdf5", help="File path to load recorded demos."
 )
@@ -59,12 +65,19 @@ import time
 import gymnasium as gym
 import torch
 from isaaclab.envs import DirectRLEnv, ManagerBasedRLEnv
-from isaaclab.utils.datasets import EpisodeData, HDF5DatasetFileHandler
+from isaaclab.utils.datasets import HDF5DatasetFileHandler
 from isaaclab_tasks.utils import parse_env_cfg
 from leisaac.utils.env_utils import (
     dynamic_reset_gripper_effort_limit_sim,
     get_task_type,
 )
+from leisaac.utils.replay_utils import (
+    BatchedEpisodeReplayer,
+    EpisodePrefetcher,
+    replay_keys,
+    replay_sequence,
+    stack_states,
+)
 
 import leisaac  # noqa: F401
 
@@ -97,21 +110,6 @@ class RateLimiter:
                 self.last_time += self.sleep_duration
 
 
-def get_next_action(episode_data: EpisodeData, return_state: bool = False, task_type: str = None):
-    if return_state:
-        next_state = episode_data.get_next_state()
-        if next_state is None:
-            return None
-        if task_type == "bi-so101leader":
-            left_joint_pos = next_state["articulation"]["left_arm"]["joint_position"]
-            right_joint_pos = next_state["articulation"]["right_arm"]["joint_position"]
-            return torch.cat([left_joint_pos, right_joint_pos], dim=0)
-        else:
-            return next_state["articulation"]["robot"]["joint_position"]
-    else:
-        return episode_data.get_next_action()
-
-
 def main():
     """Replay episodes loaded from a file."""
 
@@ -160,64 +158,61 @@ def main():
         env.initialize()
     env.reset()
 
-    rate_limiter = RateLimiter(args_cli.step_hz)
+    rate_limiter = None if args_cli.fast else RateLimiter(args_cli.step_hz)
 
-    # simulate environment -- run everything in inference mode
+    # episodes are loaded by a background thread while the current ones are replayed
     episode_names = list(dataset_file_handler.get_episode_names())
+    episode_indices_to_replay = [index for index in episode_indices_to_replay if index < episode_count]
+    dataset_file_handler.close()
+    prefetcher = EpisodePrefetcher(
+        args_cli.dataset_file,
+        [episode_names[index] for index in episode_indices_to_replay],
+        keys=replay_keys(args_cli.replay_mode),
+        num_prefetch=args_cli.num_prefetch,
+    )
+    episodes = zip(episode_indices_to_replay, prefetcher)
+    replayer = BatchedEpisodeReplayer(idle_action.to(env.device))
+
+    # simulate environment -- run everything in inference mode
     replayed_episode_count = 0
     with contextlib.suppress(KeyboardInterrupt) and torch.inference_mode():
         while simulation_app.is_running() and not simulation_app.is_exiting():
-            env_episode_data_map = {index: EpisodeData() for index in range(num_envs)}
-            has_next_action = True
-            while has_next_action:
-                # initialize actions with idle action so those without next action will not move
-                actions = idle_action
-                has_next_action = False
-                for env_id in range(num_envs):
-                    env_next_action = get_next_action(
-                        env_episode_data_map[env_id], return_state=args_cli.replay_mode == "state", task_type=task_type
-                    )
-                    if env_next_action is None:
-                        next_episode_index = None
-                        while episode_indices_to_replay:
-                            next_episode_index = episode_indices_to_replay.pop(0)
-                            if next_episode_index < episode_count:
-                                break
-                            next_episode_index = None
-
-                        if next_episode_index is not None:
-                            replayed_episode_count += 1
-                            print(f"{replayed_episode_count :4}: Loading #{next_episode_index} episode to env_{env_id}")
-                            episode_data = dataset_file_handler.load_episode(
-                                episode_names[next_episode_index], env.device
-                            )
-                            env_episode_data_map[env_id] = episode_data
-                            # Set initial state for the new episode
-                            initial_state = episode_data.get_initial_state()
-                            env.reset_to(
-                                initial_state,
-                                torch.tensor([env_id], device=env.device),
-                                seed=int(episode_data.seed) if episode_data.seed is not None else None,
-                                is_relative=True,
-                            )
-                            # Get the first action for the new episode
-                            env_next_action = get_next_action(
-                                env_episode_data_map[env_id],
-                                return_state=args_cli.replay_mode == "state",
-                                task_type=task_type,
-                            )
-                            has_next_action = True
-                        else:
-                            continue
-                    else:
-                        has_next_action = True
-                    actions[env_id] = env_next_action
-                if args_cli.replay_mode == "action":
-                    if env.cfg.dynamic_reset_gripper_effort_limit:
-                        dynamic_reset_gripper_effort_limit_sim(env, task_type)
-                env.step(actions)
+            # load the next episodes in the environments that are done
+            new_episodes = {}
+            for env_id in replayer.done_env_ids():
+                next_episode = next(episodes, None)
+                if next_episode is None:
+                    break
+                next_episode_index, (_, episode_data) = next_episode
+                replayed_episode_count += 1
+                print(f"{replayed_episode_count :4}: Loading #{next_episode_index} episode to env_{env_id}")
+                replayer.load(env_id, replay_sequence(episode_data, args_cli.replay_mode, task_type))
+                new_episodes[env_id] = episode_data
+            if len(replayer.done_env_ids()) == num_envs:
+                break
+
+            # reset the environments of the new episodes, batched by seed
+            seeds = {env_id: episode.seed for env_id, episode in new_episodes.items()}
+            for seed in set(seeds.values()):
+                env_ids = [env_id for env_id in new_episodes if seeds[env_id] == seed]
+                initial_state = stack_states(
+                    [new_episodes[env_id].get_initial_state() for env_id in env_ids], env.device
+                )
+                env.reset_to(
+                    initial_state,
+                    torch.tensor(env_ids, device=env.device),
+                    seed=int(seed) if seed is not None else None,
+                    is_relative=True,
+                )
+
+            actions = replayer.next_actions()
+            if args_cli.replay_mode == "action":
+                if env.cfg.dynamic_reset_gripper_effort_limit:
+                    dynamic_reset_gripper_effort_limit_sim(env, task_type)
+            env.step(actions)
+            if rate_limiter is not None:
                 rate_limiter.sleep(env)
-            break
+    prefetcher.close()
     # Close environment after replay in complete
     plural_trailing_s = "s" if replayed_episode_count > 1 else ""
     print(f"Finished replaying {replayed_episode_count} episode{plural_trailing_s}.")
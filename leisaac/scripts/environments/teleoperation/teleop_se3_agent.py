@@ -50,11 +50,35 @@ parser.add_argument(
     "--dataset_file", type=str, default="./datasets/dataset.hdf5", help="File path to export recorded demos."
 )
 parser.add_argument("--resume", action="store_true", help="whether to resume recording in the existing dataset file")
+parser.add_argument(
+    "--record_writer_mode",
+    type=str,
+    default="thread",
+    choices=["thread", "process"],
+    help="write the recorded episodes from a background thread or from a separate writer process",
+)
+parser.add_argument(
+    "--record_num_writers",
+    type=int,
+    default=1,
+    help="number of writers recording the environments to separate dataset shards, merged on exit",
+)
 parser.add_argument(
     "--num_demos", type=int, default=0, help="Number of demonstrations to record. Set to 0 for infinite."
 )
 
 parser.add_argument("--recalibrate", action="store_true", help="recalibrate SO101-Leader or Bi-SO101Leader")
+parser.add_argument(
+    "--polling_rate",
+    type=float,
+    default=None,
+    help=(
+        "poll SO101-Leader or Bi-SO101Leader at this rate (Hz) in background threads instead of reading them every step"
+    ),
+)
+parser.add_argument(
+    "--interpolate", action="store_true", help="interpolate the polled leader positions, requires --polling_rate"
+)
 parser.add_argument("--quality", action="store_true", help="whether to enable quality render mode.")
 
 # append AppLauncher cli args
@@ -194,9 +218,10 @@ def main():  # noqa: C901
     # replace the original recorder manager with the streaming recorder manager
     if args_cli.record:
         del env.recorder_manager
-        env.recorder_manager = StreamingRecorderManager(env_cfg.recorders, env)
+        env.recorder_manager = StreamingRecorderManager(env_cfg.recorders, env, num_writers=args_cli.record_num_writers)
         env.recorder_manager.flush_steps = 100
         env.recorder_manager.compression = "lzf"
+        env.recorder_manager.writer_mode = args_cli.record_writer_mode
 
     # create controller
     if args_cli.teleop_device == "keyboard":
@@ -210,12 +235,23 @@ def main():  # noqa: C901
     elif args_cli.teleop_device == "so101leader":
         from leisaac.devices import SO101Leader
 
-        teleop_interface = SO101Leader(env, port=args_cli.port, recalibrate=args_cli.recalibrate)
+        teleop_interface = SO101Leader(
+            env,
+            port=args_cli.port,
+            recalibrate=args_cli.recalibrate,
+            polling_rate=args_cli.polling_rate,
+            interpolate=args_cli.interpolate,
+        )
     elif args_cli.teleop_device == "bi-so101leader":
         from leisaac.devices import BiSO101Leader
 
         teleop_interface = BiSO101Leader(
-            env, left_port=args_cli.left_arm_port, right_port=args_cli.right_arm_port, recalibrate=args_cli.recalibrate
+            env,
+            left_port=args_cli.left_arm_port,
+            right_port=args_cli.right_arm_port,
+            recalibrate=args_cli.recalibrate,
+            polling_rate=args_cli.polling_rate,
+            interpolate=args_cli.interpolate,
         )
     else:
         raise ValueError(
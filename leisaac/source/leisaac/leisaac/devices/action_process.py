@@ -2,7 +2,7 @@ from typing import Any
 
 import isaaclab.envs.mdp as mdp
 import torch
-from leisaac.assets.robots.lerobot import SO101_FOLLOWER_USD_JOINT_LIMLITS
+from leisaac.utils.robot_utils import lerobot_joint_pos_to_leisaac
 
 
 def init_action_cfg(action_cfg, device):
@@ -93,18 +93,11 @@ joint_names_to_motor_ids = {
 def convert_action_from_so101_leader(
     joint_state: dict[str, float], motor_limits: dict[str, tuple[float, float]], teleop_device
 ) -> torch.Tensor:
-    processed_action = torch.zeros(teleop_device.env.num_envs, 6, device=teleop_device.env.device)
-    joint_limits = SO101_FOLLOWER_USD_JOINT_LIMLITS
-    for joint_name, motor_id in joint_names_to_motor_ids.items():
-        motor_limit_range = motor_limits[joint_name]
-        joint_limit_range = joint_limits[joint_name]
-        motor_range = motor_limit_range[1] - motor_limit_range[0]
-        joint_range = joint_limit_range[1] - joint_limit_range[0]
-        motor_degree = joint_state[joint_name] - motor_limit_range[0]
-        processed_degree = motor_degree / motor_range * joint_range + joint_limit_range[0]
-        processed_radius = processed_degree / 180.0 * torch.pi  # convert degree to radius
-        processed_action[:, motor_id] = processed_radius
-    return processed_action
+    motor_pos = torch.tensor(
+        [joint_state[joint_name] for joint_name in joint_names_to_motor_ids], device=teleop_device.env.device
+    )
+    processed_action = lerobot_joint_pos_to_leisaac(motor_pos, motor_limits)
+    return processed_action.repeat(teleop_device.env.num_envs, 1)
 
 
 def preprocess_device_action(action: dict[str, Any], teleop_device) -> torch.Tensor:
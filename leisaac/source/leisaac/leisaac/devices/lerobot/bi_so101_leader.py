@@ -3,16 +3,35 @@ from .so101_leader import SO101Leader
 
 
 class BiSO101Leader(Device):
+    """
+    Two SO101 Leader devices for bimanual SE(3) control.
+
+    With `polling_rate`, each arm is polled by its own background thread, so the two buses are read concurrently,
+    see `SO101Leader`.
+    """
+
     def __init__(
-        self, env, left_port: str = "/dev/ttyACM0", right_port: str = "/dev/ttyACM1", recalibrate: bool = False
+        self,
+        env,
+        left_port: str = "/dev/ttyACM0",
+        right_port: str = "/dev/ttyACM1",
+        recalibrate: bool = False,
+        polling_rate: float | None = None,
+        interpolate: bool = False,
+        stale_timeout: float = 0.1,
     ):
         super().__init__(env, "bi_so101_leader")
+        polling_kwargs = dict(polling_rate=polling_rate, interpolate=interpolate, stale_timeout=stale_timeout)
 
         # use left so101 leader as the main device to store state
         print("Connecting to left_so101_leader...")
-        self.left_so101_leader = SO101Leader(env, left_port, recalibrate, "left_so101_leader.json", verbose=False)
+        self.left_so101_leader = SO101Leader(
+            env, left_port, recalibrate, "left_so101_leader.json", verbose=False, **polling_kwargs
+        )
         print("Connecting to right_so101_leader...")
-        self.right_so101_leader = SO101Leader(env, right_port, recalibrate, "right_so101_leader.json", verbose=False)
+        self.right_so101_leader = SO101Leader(
+            env, right_port, recalibrate, "right_so101_leader.json", verbose=False, **polling_kwargs
+        )
 
         self.left_so101_leader._stop_keyboard_listener()
         self.right_so101_leader._stop_keyboard_listener()
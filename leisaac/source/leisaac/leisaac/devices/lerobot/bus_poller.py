@@ -0,0 +1,130 @@
+import threading
+import time
+from collections.abc import Callable
+from typing import NamedTuple
+
+import numpy as np
+
+
+class BusSample(NamedTuple):
+    values: np.ndarray
+    timestamp: float
+
+
+class BusPoller:
+    """
+    Polls a motors bus at a fixed rate in a background thread, so that reading the device never waits for the
+    serial bus.
+
+    The two latest samples are published as a single immutable tuple: replacing it is one atomic reference
+    assignment, so the reader never takes a lock and always sees a consistent pair.
+
+    Args:
+        read_fn: Reads the bus, returning the values of the motors as an array.
+        rate_hz: The polling rate, in Hz.
+        stale_timeout: Age (in seconds) above which the latest sample is considered stale.
+        name: The name of the polling thread.
+    """
+
+    def __init__(
+        self,
+        read_fn: Callable[[], np.ndarray],
+        rate_hz: float = 200.0,
+        stale_timeout: float = 0.1,
+        name: str = "bus-poller",
+    ):
+        assert rate_hz > 0, f"rate_hz must be > 0, got {rate_hz}"
+        self.read_fn = read_fn
+        self.period = 1.0 / rate_hz
+        self.stale_timeout = stale_timeout
+        self.name = name
+        # (previous sample, latest sample)
+        self._samples: tuple[BusSample | None, BusSample | None] = (None, None)
+        self._error: BaseException | None = None
+        self._num_errors = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def num_errors(self) -> int:
+        """The number of failed reads since the poller was started."""
+        return self._num_errors
+
+    def start(self):
+        if self.is_running:
+            return
+        # read once synchronously, so that a sample is available as soon as the poller is started
+        self._publish(self.read_fn())
+        self._error = None
+        self._num_errors = 0
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _publish(self, values: np.ndarray):
+        self._samples = (self._samples[1], BusSample(values, time.monotonic()))
+
+    def _poll(self):
+        next_time = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self._publish(self.read_fn())
+            except Exception as e:
+                # a corrupted or lost packet only delays the next sample, persisting failures show up as staleness
+                self._error = e
+                self._num_errors += 1
+            next_time += self.period
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                # the bus is slower than the requested rate, poll as fast as it allows without catching up
+                next_time = time.monotonic()
+
+    def age(self) -> float:
+        """Time (in seconds) since the latest sample was read."""
+        latest = self._samples[1]
+        if latest is None:
+            return float("inf")
+        return time.monotonic() - latest.timestamp
+
+    def is_stale(self) -> bool:
+        return self.age() > self.stale_timeout
+
+    @property
+    def last_error(self) -> BaseException | None:
+        """The error of the latest failed read."""
+        return self._error
+
+    def latest(self, interpolate: bool = False) -> BusSample:
+        """
+        The latest sample, returned immediately.
+
+        Args:
+            interpolate: Instead of the latest sample, interpolate the two latest samples at one polling period in
+                the past. This smooths the steps between samples when the device is read faster than it is polled,
+                at the cost of one period of latency.
+        """
+        previous, latest = self._samples
+        if latest is None:
+            raise RuntimeError(f"{self.name} has no sample, it must be started first.")
+        if not interpolate or previous is None:
+            return latest
+        query_time = time.monotonic() - self.period
+        span = latest.timestamp - previous.timestamp
+        if span <= 0 or query_time >= latest.timestamp:
+            return latest
+        if query_time <= previous.timestamp:
+            return previous
+        alpha = (query_time - previous.timestamp) / span
+        return BusSample(previous.values + alpha * (latest.values - previous.values), query_time)
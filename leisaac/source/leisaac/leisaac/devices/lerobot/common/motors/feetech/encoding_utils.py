@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def encode_sign_magnitude(value: int, sign_bit_index: int):
     """
     https://en.wikipedia.org/wiki/Signed_number_representations#Sign%E2%80%93magnitude
@@ -19,3 +22,12 @@ def decode_sign_magnitude(encoded_value: int, sign_bit_index: int):
     magnitude_mask = (1 << sign_bit_index) - 1
     magnitude = encoded_value & magnitude_mask
     return -magnitude if direction_bit else magnitude
+
+
+def decode_sign_magnitude_array(encoded_values: np.ndarray, sign_bit_indices: np.ndarray) -> np.ndarray:
+    """
+    Vectorized `decode_sign_magnitude` of integer `encoded_values`, each with its own sign bit index.
+    """
+    direction_bits = (encoded_values >> sign_bit_indices) & 1
+    magnitudes = encoded_values & ((1 << sign_bit_indices) - 1)
+    return np.where(direction_bits == 1, -magnitudes, magnitudes)
@@ -17,6 +17,8 @@ from copy import deepcopy
 from enum import Enum
 from pprint import pformat
 
+import numpy as np
+
 from ..motors_bus import (
     Motor,
     MotorCalibration,
@@ -25,7 +27,11 @@ from ..motors_bus import (
     Value,
     get_address,
 )
-from .encoding_utils import decode_sign_magnitude, encode_sign_magnitude
+from .encoding_utils import (
+    decode_sign_magnitude,
+    decode_sign_magnitude_array,
+    encode_sign_magnitude,
+)
 from .tables import (
     FIRMWARE_MAJOR_VERSION,
     FIRMWARE_MINOR_VERSION,
@@ -139,6 +145,8 @@ class FeetechMotorsBus(MotorsBus):
         self.sync_writer = scs.GroupSyncWrite(self.port_handler, self.packet_handler, 0, 0)
         self._comm_success = scs.COMM_SUCCESS
         self._no_error = 0x00
+        # sign bit of each motor in the encoding of a register, keyed by (data_name, motor ids)
+        self._sign_bits: dict[tuple[str, tuple[int, ...]], np.ndarray | None] = {}
 
         if any(MODEL_PROTOCOL[model] != self.protocol_version for model in self.models):
             raise ValueError(f"Some motors are incompatible with protocol_version={self.protocol_version}")
@@ -325,6 +333,22 @@ class FeetechMotorsBus(MotorsBus):
 
         return ids_values
 
+    def _decode_sign_array(self, data_name: str, motor_ids: tuple[int, ...], values: np.ndarray) -> np.ndarray:
+        key = (data_name, motor_ids)
+        if key not in self._sign_bits:
+            sign_bits = [self.model_encoding_table.get(self._id_to_model(id_), {}).get(data_name) for id_ in motor_ids]
+            # None when the register is unsigned on every motor, otherwise -1 marks the unsigned motors
+            self._sign_bits[key] = (
+                None
+                if all(sign_bit is None for sign_bit in sign_bits)
+                else np.array([-1 if sign_bit is None else sign_bit for sign_bit in sign_bits], dtype=np.int64)
+            )
+        sign_bits = self._sign_bits[key]
+        if sign_bits is None:
+            return values
+        decoded = decode_sign_magnitude_array(values, np.maximum(sign_bits, 0))
+        return np.where(sign_bits >= 0, decoded, values)
+
     def _split_into_byte_chunks(self, value: int, length: int) -> list[int]:
         return _split_into_byte_chunks(value, length)
 
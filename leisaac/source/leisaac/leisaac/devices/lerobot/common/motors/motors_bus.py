@@ -26,6 +26,7 @@ from functools import cached_property
 from pprint import pformat
 from typing import Protocol, TypeAlias
 
+import numpy as np
 import serial
 from deepdiff import DeepDiff
 from tqdm import tqdm
@@ -337,8 +338,23 @@ class MotorsBus(abc.ABC):
         self._id_to_name_dict = {m.id: motor for motor, m in self.motors.items()}
         self._model_nb_to_model_dict = {v: k for k, v in self.model_number_table.items()}
 
+        # configured sync readers, keyed by (addr, length, motor ids)
+        self._sync_readers: dict[tuple[int, int, tuple[int, ...]], GroupSyncRead] = {}
+        # byte weights decoding a register of each length from its little/big-endian bytes
+        self._byte_weights: dict[int, np.ndarray] = {}
+
         self._validate_motors()
 
+    @property
+    def calibration(self) -> dict[str, MotorCalibration]:
+        return self._calibration
+
+    @calibration.setter
+    def calibration(self, calibration: dict[str, MotorCalibration]) -> None:
+        self._calibration = calibration
+        # precomputed calibration arrays, keyed by motor ids
+        self._calibration_arrays: dict[tuple[int, ...], dict[str, np.ndarray]] = {}
+
     def __len__(self):
         return len(self.motors)
 
@@ -824,64 +840,86 @@ class MotorsBus(abc.ABC):
 
         return mins, maxes
 
-    def _normalize(self, ids_values: dict[int, int]) -> dict[int, float]:
+    def _get_calibration_arrays(self, motor_ids: tuple[int, ...]) -> dict[str, np.ndarray]:
+        """Per-motor calibration of `motor_ids` as arrays, computed once per motor set and calibration."""
+        arrays = self._calibration_arrays.get(motor_ids)
+        if arrays is not None:
+            return arrays
+
         if not self.calibration:
             raise RuntimeError(f"{self} has no calibration registered.")
 
-        normalized_values = {}
-        for id_, val in ids_values.items():
+        mins, maxes, drive_modes, max_res, norm_modes = [], [], [], [], []
+        for id_ in motor_ids:
             motor = self._id_to_name(id_)
             min_ = self.calibration[motor].range_min
             max_ = self.calibration[motor].range_max
-            drive_mode = self.apply_drive_mode and self.calibration[motor].drive_mode
             if max_ == min_:
                 raise ValueError(f"Invalid calibration for motor '{motor}': min and max are equal.")
-
-            bounded_val = min(max_, max(min_, val))
-            if self.motors[motor].norm_mode is MotorNormMode.RANGE_M100_100:
-                norm = (((bounded_val - min_) / (max_ - min_)) * 200) - 100
-                normalized_values[id_] = -norm if drive_mode else norm
-            elif self.motors[motor].norm_mode is MotorNormMode.RANGE_0_100:
-                norm = ((bounded_val - min_) / (max_ - min_)) * 100
-                normalized_values[id_] = 100 - norm if drive_mode else norm
-            elif self.motors[motor].norm_mode is MotorNormMode.DEGREES:
-                mid = (min_ + max_) / 2
-                max_res = self.model_resolution_table[self._id_to_model(id_)] - 1
-                normalized_values[id_] = (val - mid) * 360 / max_res
-            else:
+            if self.motors[motor].norm_mode not in MotorNormMode:
                 raise NotImplementedError
+            mins.append(min_)
+            maxes.append(max_)
+            drive_modes.append(bool(self.apply_drive_mode and self.calibration[motor].drive_mode))
+            max_res.append(self.model_resolution_table[self._id_to_model(id_)] - 1)
+            norm_modes.append(self.motors[motor].norm_mode)
+
+        mins = np.array(mins, dtype=np.float64)
+        maxes = np.array(maxes, dtype=np.float64)
+        drive_modes = np.array(drive_modes)
+        max_res = np.array(max_res, dtype=np.float64)
+        m100_100 = np.array([mode is MotorNormMode.RANGE_M100_100 for mode in norm_modes])
+        r0_100 = np.array([mode is MotorNormMode.RANGE_0_100 for mode in norm_modes])
+        degrees = np.array([mode is MotorNormMode.DEGREES for mode in norm_modes])
+
+        # normalization as a single affine map of the values clipped to [lower, upper]
+        scale = np.select([m100_100, r0_100], [200 / (maxes - mins), 100 / (maxes - mins)], 360 / max_res)
+        offset = np.select([m100_100, r0_100], [-100 - mins * scale, -mins * scale], -(mins + maxes) / 2 * scale)
+        flip = drive_modes & ~degrees
+        offset = np.where(flip & r0_100, 100 - offset, np.where(flip, -offset, offset))
+        scale = np.where(flip, -scale, scale)
+        arrays = {
+            "lower": np.where(degrees, -np.inf, mins),
+            "upper": np.where(degrees, np.inf, maxes),
+            "scale": scale,
+            "offset": offset,
+            "min": mins,
+            "mid": (mins + maxes) / 2,
+            "range": maxes - mins,
+            "max_res": max_res,
+            "drive_mode": drive_modes,
+            "m100_100": m100_100,
+            "0_100": r0_100,
+        }
+        self._calibration_arrays[motor_ids] = arrays
+        return arrays
+
+    def _normalize_array(self, motor_ids: tuple[int, ...], values: np.ndarray) -> np.ndarray:
+        """Vectorized :pymeth:`_normalize` of the raw `values` of `motor_ids`."""
+        cal = self._get_calibration_arrays(motor_ids)
+        return np.clip(values, cal["lower"], cal["upper"]) * cal["scale"] + cal["offset"]
+
+    def _unnormalize_array(self, motor_ids: tuple[int, ...], values: np.ndarray) -> np.ndarray:
+        """Vectorized :pymeth:`_unnormalize` of the normalized `values` of `motor_ids`."""
+        cal = self._get_calibration_arrays(motor_ids)
+        values = np.asarray(values, dtype=np.float64)
+        m100_100 = np.clip(np.where(cal["drive_mode"], -values, values), -100.0, 100.0)
+        m100_100 = ((m100_100 + 100) / 200) * cal["range"] + cal["min"]
+        r0_100 = np.clip(np.where(cal["drive_mode"], 100 - values, values), 0.0, 100.0)
+        r0_100 = (r0_100 / 100) * cal["range"] + cal["min"]
+        degrees = (values * cal["max_res"] / 360) + cal["mid"]
+        # the cast truncates towards zero, as int() does
+        return np.select([cal["m100_100"], cal["0_100"]], [m100_100, r0_100], degrees).astype(np.int64)
 
-        return normalized_values
+    def _normalize(self, ids_values: dict[int, int]) -> dict[int, float]:
+        motor_ids = tuple(ids_values)
+        normalized = self._normalize_array(motor_ids, np.fromiter(ids_values.values(), np.float64, len(motor_ids)))
+        return dict(zip(motor_ids, normalized.tolist(), strict=True))
 
     def _unnormalize(self, ids_values: dict[int, float]) -> dict[int, int]:
-        if not self.calibration:
-            raise RuntimeError(f"{self} has no calibration registered.")
-
-        unnormalized_values = {}
-        for id_, val in ids_values.items():
-            motor = self._id_to_name(id_)
-            min_ = self.calibration[motor].range_min
-            max_ = self.calibration[motor].range_max
-            drive_mode = self.apply_drive_mode and self.calibration[motor].drive_mode
-            if max_ == min_:
-                raise ValueError(f"Invalid calibration for motor '{motor}': min and max are equal.")
-
-            if self.motors[motor].norm_mode is MotorNormMode.RANGE_M100_100:
-                val = -val if drive_mode else val
-                bounded_val = min(100.0, max(-100.0, val))
-                unnormalized_values[id_] = int(((bounded_val + 100) / 200) * (max_ - min_) + min_)
-            elif self.motors[motor].norm_mode is MotorNormMode.RANGE_0_100:
-                val = 100 - val if drive_mode else val
-                bounded_val = min(100.0, max(0.0, val))
-                unnormalized_values[id_] = int((bounded_val / 100) * (max_ - min_) + min_)
-            elif self.motors[motor].norm_mode is MotorNormMode.DEGREES:
-                mid = (min_ + max_) / 2
-                max_res = self.model_resolution_table[self._id_to_model(id_)] - 1
-                unnormalized_values[id_] = int((val * max_res / 360) + mid)
-            else:
-                raise NotImplementedError
-
-        return unnormalized_values
+        motor_ids = tuple(ids_values)
+        unnormalized = self._unnormalize_array(motor_ids, np.fromiter(ids_values.values(), np.float64, len(motor_ids)))
+        return dict(zip(motor_ids, unnormalized.tolist(), strict=True))
 
     @abc.abstractmethod
     def _encode_sign(self, data_name: str, ids_values: dict[int, int]) -> dict[int, int]:
@@ -891,6 +929,11 @@ class MotorsBus(abc.ABC):
     def _decode_sign(self, data_name: str, ids_values: dict[int, int]) -> dict[int, int]:
         pass
 
+    def _decode_sign_array(self, data_name: str, motor_ids: tuple[int, ...], values: np.ndarray) -> np.ndarray:
+        """Vectorized :pymeth:`_decode_sign`, implementations should override it with a vectorized decoding."""
+        ids_values = self._decode_sign(data_name, dict(zip(motor_ids, values.tolist(), strict=True)))
+        return np.array([ids_values[id_] for id_ in motor_ids], dtype=np.int64)
+
     def _serialize_data(self, value: int, length: int) -> list[int]:
         """
         Converts an unsigned integer value into a list of byte-sized integers to be sent via a communication
@@ -918,6 +961,19 @@ class MotorsBus(abc.ABC):
         """Convert an integer into a list of byte-sized integers."""
         pass
 
+    def _get_byte_weights(self, length: int) -> np.ndarray:
+        """
+        Weights of the bytes of a `length`-byte register, such that `bytes @ weights` is its value. The byte order
+        follows :pymeth:`_split_into_byte_chunks`, so it matches the protocol.
+        """
+        weights = self._byte_weights.get(length)
+        if weights is None:
+            weights = np.zeros(length, dtype=np.int64)
+            for byte in range(length):
+                weights[self._split_into_byte_chunks(1 << (8 * byte), length).index(1)] = 1 << (8 * byte)
+            self._byte_weights[length] = weights
+        return weights
+
     def ping(self, motor: NameOrID, num_retry: int = 0, raise_on_error: bool = False) -> int | None:
         """Ping a single motor and return its model number.
 
@@ -1118,6 +1174,33 @@ class MotorsBus(abc.ABC):
         Returns:
             dict[str, Value]: Mapping *motor name → value*.
         """
+        names = self._get_motors_list(motors)
+        values = self.sync_read_array(data_name, names, normalize=normalize, num_retry=num_retry)
+        return dict(zip(names, values.tolist(), strict=True))
+
+    def sync_read_array(
+        self,
+        data_name: str,
+        motors: str | list[str] | None = None,
+        *,
+        normalize: bool = True,
+        num_retry: int = 0,
+    ) -> np.ndarray:
+        """Read the same register from several motors at once, as an array.
+
+        This is the fast path of :pymeth:`sync_read`: the sync reader of each register and motor set is configured
+        once and reused, the replies are decoded with a single matrix product and the calibration is applied with
+        precomputed per-motor arrays.
+
+        Args:
+            data_name (str): Register name.
+            motors (str | list[str] | None, optional): Motors to query. `None` (default) reads every motor.
+            normalize (bool, optional): Normalisation flag.  Defaults to `True`.
+            num_retry (int, optional): Retry attempts.  Defaults to `0`.
+
+        Returns:
+            np.ndarray: The values of the motors, in the order of `motors`. Integers, or floats when normalized.
+        """
         if not self.is_connected:
             raise DeviceNotConnectedError(
                 f"{self.__class__.__name__}('{self.port}') is not connected. You need to run"
@@ -1127,7 +1210,7 @@ class MotorsBus(abc.ABC):
         self._assert_protocol_is_compatible("sync_read")
 
         names = self._get_motors_list(motors)
-        ids = [self.motors[motor].id for motor in names]
+        ids = tuple(self.motors[motor].id for motor in names)
         models = [self.motors[motor].model for motor in names]
 
         if self._has_different_ctrl_tables:
@@ -1136,15 +1219,19 @@ class MotorsBus(abc.ABC):
         model = next(iter(models))
         addr, length = get_address(self.model_ctrl_table, model, data_name)
 
-        err_msg = f"Failed to sync read '{data_name}' on {ids=} after {num_retry + 1} tries."
-        ids_values, _ = self._sync_read(addr, length, ids, num_retry=num_retry, raise_on_error=True, err_msg=err_msg)
+        reader = self._get_sync_reader(ids, addr, length)
+        comm = self._txrx_sync_read(reader, addr, length, ids, num_retry)
+        if not self._is_comm_success(comm):
+            err_msg = f"Failed to sync read '{data_name}' on ids={list(ids)} after {num_retry + 1} tries."
+            raise ConnectionError(f"{err_msg} {self.packet_handler.getTxRxResult(comm)}")
 
-        ids_values = self._decode_sign(data_name, ids_values)
+        packets = np.array([reader.data_dict[id_] for id_ in ids], dtype=np.int64).reshape(len(ids), length)
+        values = self._decode_sign_array(data_name, ids, packets @ self._get_byte_weights(length))
 
         if normalize and data_name in self.normalized_data:
-            ids_values = self._normalize(ids_values)
+            values = self._normalize_array(ids, values)
 
-        return {self._id_to_name(id_): value for id_, value in ids_values.items()}
+        return values
 
     def _sync_read(
         self,
@@ -1156,28 +1243,41 @@ class MotorsBus(abc.ABC):
         raise_on_error: bool = True,
         err_msg: str = "",
     ) -> tuple[dict[int, int], int]:
-        self._setup_sync_reader(motor_ids, addr, length)
+        reader = self._get_sync_reader(tuple(motor_ids), addr, length)
+        comm = self._txrx_sync_read(reader, addr, length, motor_ids, num_retry)
+
+        if not self._is_comm_success(comm) and raise_on_error:
+            raise ConnectionError(f"{err_msg} {self.packet_handler.getTxRxResult(comm)}")
+
+        values = {id_: reader.getData(id_, addr, length) for id_ in motor_ids}
+        return values, comm
+
+    def _txrx_sync_read(
+        self, reader: GroupSyncRead, addr: int, length: int, motor_ids: list[int], num_retry: int
+    ) -> int:
         for n_try in range(1 + num_retry):
-            comm = self.sync_reader.txRxPacket()
+            comm = reader.txRxPacket()
             if self._is_comm_success(comm):
                 break
             logger.debug(
                 f"Failed to sync read @{addr=} ({length=}) on {motor_ids=} ({n_try=}): "
                 + self.packet_handler.getTxRxResult(comm)
             )
+        return comm
 
-        if not self._is_comm_success(comm) and raise_on_error:
-            raise ConnectionError(f"{err_msg} {self.packet_handler.getTxRxResult(comm)}")
-
-        values = {id_: self.sync_reader.getData(id_, addr, length) for id_ in motor_ids}
-        return values, comm
-
-    def _setup_sync_reader(self, motor_ids: list[int], addr: int, length: int) -> None:
-        self.sync_reader.clearParam()
-        self.sync_reader.start_address = addr
-        self.sync_reader.data_length = length
-        for id_ in motor_ids:
-            self.sync_reader.addParam(id_)
+    def _get_sync_reader(self, motor_ids: tuple[int, ...], addr: int, length: int) -> GroupSyncRead:
+        """
+        The sync reader of the register at `addr` on `motor_ids`. Each (register, motor set) gets its own reader,
+        configured once, instead of reconfiguring a shared reader on every read.
+        """
+        key = (addr, length, motor_ids)
+        reader = self._sync_readers.get(key)
+        if reader is None:
+            reader = type(self.sync_reader)(self.port_handler, self.packet_handler, addr, length)
+            for id_ in motor_ids:
+                reader.addParam(id_)
+            self._sync_readers[key] = reader
+        return reader
 
     # TODO(aliberts, pkooij): Implementing something like this could get even much faster read times if need be.
     # Would have to handle the logic of checking if a packet has been sent previously though but doable.
@@ -4,6 +4,7 @@ import os
 from leisaac.assets.robots.lerobot import SO101_FOLLOWER_MOTOR_LIMITS
 
 from ..device_base import Device
+from .bus_poller import BusPoller
 from .common.errors import DeviceAlreadyConnectedError, DeviceNotConnectedError
 from .common.motors import (
     FeetechMotorsBus,
@@ -15,7 +16,19 @@ from .common.motors import (
 
 
 class SO101Leader(Device):
-    """A SO101 Leader device for SE(3) control."""
+    """
+    A SO101 Leader device for SE(3) control.
+
+    By default the motors are read synchronously in `advance`. With `polling_rate`, a background thread polls them
+    at that rate instead, and `advance` returns the latest sample immediately, so that the teleoperation loop does
+    not wait for the serial bus.
+
+    Args:
+        polling_rate: Rate (in Hz) of the background polling of the motors, None to read them synchronously.
+        interpolate: Interpolate the two latest polled samples instead of using the latest one, see
+            `BusPoller.latest`.
+        stale_timeout: Age (in seconds) above which a polled sample is reported as stale.
+    """
 
     def __init__(
         self,
@@ -23,9 +36,16 @@ class SO101Leader(Device):
         port: str = "/dev/ttyACM0",
         recalibrate: bool = False,
         calibration_file_name: str = "so101_leader.json",
+        verbose: bool = True,
+        polling_rate: float | None = None,
+        interpolate: bool = False,
+        stale_timeout: float = 0.1,
     ):
-        super().__init__(env, "so101_leader")
+        super().__init__(env, "so101_leader", verbose=verbose)
         self.port = port
+        self.interpolate = interpolate
+        self._poller = None
+        self._is_stale = False
 
         # calibration
         self.calibration_path = os.path.join(os.path.dirname(__file__), ".cache", calibration_file_name)
@@ -46,6 +66,14 @@ class SO101Leader(Device):
             calibration=calibration,
         )
         self._motor_limits = SO101_FOLLOWER_MOTOR_LIMITS
+        self._motor_names = list(self._bus.motors)
+        if polling_rate is not None:
+            self._poller = BusPoller(
+                lambda: self._bus.sync_read_array("Present_Position"),
+                rate_hz=polling_rate,
+                stale_timeout=stale_timeout,
+                name=f"so101-leader-poller({self.port})",
+            )
 
         # connect
         self.connect()
@@ -63,7 +91,32 @@ class SO101Leader(Device):
         return msg
 
     def get_device_state(self):
-        return self._bus.sync_read("Present_Position")
+        if self._poller is None:
+            return self._bus.sync_read("Present_Position")
+        sample = self._poller.latest(self.interpolate)
+        self._report_staleness()
+        return dict(zip(self._motor_names, sample.values.tolist(), strict=True))
+
+    @property
+    def state_age(self) -> float:
+        """Age (in seconds) of the latest motor positions, 0 when they are read synchronously."""
+        return 0.0 if self._poller is None else self._poller.age()
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the latest polled motor positions are older than the stale timeout."""
+        return self._poller is not None and self._poller.is_stale()
+
+    def _report_staleness(self):
+        is_stale = self._poller.is_stale()
+        if is_stale and not self._is_stale:
+            print(
+                f"[WARNING] SO101-Leader on {self.port}: no motor positions for {self._poller.age() * 1000:.0f} ms"
+                f" (last error: {self._poller.last_error!r})"
+            )
+        elif not is_stale and self._is_stale:
+            print(f"[INFO] SO101-Leader on {self.port}: motor positions received again")
+        self._is_stale = is_stale
 
     def input2action(self):
         ac_dict = super().input2action()
@@ -81,6 +134,8 @@ class SO101Leader(Device):
     def disconnect(self):
         if not self.is_connected:
             raise DeviceNotConnectedError("SO101-Leader is not connected.")
+        if self._poller is not None:
+            self._poller.stop()
         self._bus.disconnect()
         print("SO101-Leader disconnected.")
 
@@ -89,6 +144,8 @@ class SO101Leader(Device):
             raise DeviceAlreadyConnectedError("SO101-Leader is already connected.")
         self._bus.connect()
         self.configure()
+        if self._poller is not None:
+            self._poller.start()
         print("SO101-Leader connected.")
 
     def configure(self) -> None:
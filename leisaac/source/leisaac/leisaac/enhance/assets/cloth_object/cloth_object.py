@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING
 import isaaclab.sim as sim_utils
 import torch
 from isaaclab.scene import InteractiveScene
-from isaacsim.core.prims import SingleClothPrim, SingleParticleSystem
+from isaacsim.core.prims import ClothPrim, SingleClothPrim, SingleParticleSystem
 from isaacsim.core.simulation_manager import SimulationManager
 
 if TYPE_CHECKING:
@@ -51,6 +51,11 @@ class SingleClothObject(SingleClothPrim):
 class ClothObject:
     """
     Manages all single cloth object instances in the environment.
+
+    The cloths are also wrapped in a single batched view, so that their particles are read for all the environments
+    with one physics view query. The point positions are copied into a preallocated (num_cloths, num_points, 3)
+    buffer, which is cached until the next physics step: the observations and terminations of a step share a
+    single query.
     """
 
     cfg: ClothObjectCfg
@@ -65,33 +70,78 @@ class ClothObject:
             self.cloth_objects.append(
                 self.cfg.class_type(prim_path, self.cfg.mesh_subfix, self.cfg.particle_system_subfix)
             )
+        # batched view over the cloth meshes of all the environments, in the order of `cloth_objects`
+        self._cloth_view = ClothPrim(
+            [f"{prim_path}/{self.cfg.mesh_subfix}" for prim_path in matching_prims],
+            name=f"{self.cfg.prim_path.split('/')[-1]}_cloth_view",
+        )
+        self._point_positions: torch.Tensor | None = None
+        self._point_positions_step = -1
+        self._keypoint_indices: dict[tuple[int, ...], torch.Tensor] = {}
+
+    @property
+    def num_cloths(self) -> int:
+        return len(self.cloth_objects)
 
     def initialize(self):
         for cloth_object in self.cloth_objects:
             cloth_object.initialize()
+        self._cloth_view.initialize(SimulationManager.get_physics_sim_view())
+
+        # get initial info of the particles and poses of all the cloths at once
+        self.initial_point_positions = self._cloth_view.get_world_positions()
+        self.init_world_pos, self.init_world_quat = self._cloth_view.get_world_poses()
+        self._point_positions = torch.empty_like(self.initial_point_positions)
+        self._invalidate_point_positions()
 
     def reset(self):
-        for cloth_object in self.cloth_objects:
-            cloth_object.reset()
+        self._cloth_view.set_world_positions(self.initial_point_positions)
+        self._cloth_view.set_world_poses(self.init_world_pos, self.init_world_quat)
+        self._invalidate_point_positions()
 
     def set_world_poses(self, positions, quats):
-        for i in range(len(self.cloth_objects)):
-            self.cloth_objects[i].set_world_pose(positions[i], quats[i])
+        self._cloth_view.set_world_poses(positions, quats)
+        self._invalidate_point_positions()
 
     def get_world_poses(self):
-        pos_w_list, quat_w_list = [], []
-        for cloth_object in self.cloth_objects:
-            pos_w, quat_w = cloth_object.get_world_pose()  # xyz, wxyz
-            pos_w_list.append(pos_w)
-            quat_w_list.append(quat_w)
-        return torch.stack(pos_w_list), torch.stack(quat_w_list)
+        return self._cloth_view.get_world_poses()  # xyz, wxyz
+
+    def _invalidate_point_positions(self):
+        self._point_positions_step = -1
 
     @property
-    def point_positions(self):
-        point_positions = []
-        for cloth_object in self.cloth_objects:
-            point_positions.append(cloth_object.point_positions)
-        return torch.cat(point_positions, dim=0)
+    def point_positions(self) -> torch.Tensor:
+        """
+        The world positions of the cloth particles, queried at most once per physics step.
+
+        The returned tensor is the cached buffer, overwritten by the next query: clone it to keep it across steps,
+        and do not modify it in place.
+
+        Returns:
+            The point positions.(num_cloths, num_points, 3)
+        """
+        step = SimulationManager.get_num_physics_steps()
+        if self._point_positions_step != step:
+            self._point_positions.copy_(self._cloth_view.get_world_positions(clone=False))
+            self._point_positions_step = step
+        return self._point_positions
+
+    def keypoint_positions(self, keypoint_indices: list[int]) -> torch.Tensor:
+        """
+        The world positions of selected cloth particles (e.g. the keypoints of the task), gathered in one op.
+
+        Args:
+            keypoint_indices: The indices of the particles.
+        Returns:
+            The keypoint positions.(num_cloths, num_keypoints, 3)
+        """
+        key = tuple(keypoint_indices)
+        index = self._keypoint_indices.get(key)
+        if index is None:
+            index = self._keypoint_indices[key] = torch.tensor(
+                key, dtype=torch.long, device=self._point_positions.device
+            )
+        return self.point_positions.index_select(1, index)
 
     @property
     def root_pose_w(self):
@@ -1 +1,5 @@
 from .hdf5_dataset_file_handler import StreamingHDF5DatasetFileHandler, StreamWriteMode
+from .sharded_hdf5_dataset_file_handler import (
+    ShardedHDF5DatasetFileHandler,
+    merge_hdf5_shards,
+)
@@ -1,39 +1,84 @@
 import copy
 import enum
+import json
 import os
+import subprocess
+import sys
+import threading
+from collections.abc import Iterator
 from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Listener
+from multiprocessing.shared_memory import SharedMemory
 
 import h5py
+import numpy as np
+import torch
 from isaaclab.utils.datasets import EpisodeData, HDF5DatasetFileHandler
 
+from . import hdf5_writer_process
+from .hdf5_writer_process import (
+    AUTHKEY_ENV_VAR,
+    PreallocatedHDF5Writer,
+    compression_kwargs,
+)
+
 
 class StreamWriteMode(enum.Enum):
     APPEND = 0  # Append the record
     LAST = 1  # Write the last record
 
 
+def _flatten_episode_data(data: dict, prefix: str = "") -> Iterator[tuple[str, torch.Tensor]]:
+    """Yield the (dataset path, tensor) leaves of the nested episode data."""
+    for key, value in data.items():
+        if isinstance(value, dict):
+            yield from _flatten_episode_data(value, f"{prefix}{key}/")
+        else:
+            yield f"{prefix}{key}", value
+
+
 class StreamingHDF5DatasetFileHandler(HDF5DatasetFileHandler):
+    WRITER_MODES = ["thread", "process"]
+
     def __init__(self):
         """
         compression options:
         - gzip: high compression ratio (50-80%), high latency due to CPU-intensive compression
+        - gzip1: gzip at level 1, much lower latency for a slightly lower compression ratio
         - lzf: moderate compression ratio (30-50%), low latency, fast compression algorithm
+        - lz4 / blosc: fast lossless compression from hdf5plugin (readers need to `import hdf5plugin`)
         - None: don't use compression, will cause minimum latency but largest file size
+
+        writer modes:
+        - thread: episodes are deep-copied and written by a background thread of this process
+        - process: episodes are copied into a bounded shared memory buffer and written by a separate process,
+          which keeps the HDF5 writes (and compression) off the simulation process. The file is owned by the
+          writer process, so it can only be written through this handler.
+
+        In both modes, datasets are preallocated to the predicted episode length, grown geometrically and trimmed
+        to their written length when the episode is finished.
         """
         super().__init__()
         self._chunks_length = 100
         self._compression = None
-        self._writer = self.SingleThreadHDF5DatasetWriter(self)
+        self._expected_episode_length = 1000
+        self._writer_mode = "thread"
+        self._file_path = None
+        # unfinished episodes: {episode key: [group name, number of samples written so far]}
+        self._open_episodes = {}
+        self._next_demo_index = 0
+        self._writer = None
 
     def create(self, file_path: str, env_name: str = None, resume: bool = False):
         """Create a new dataset file."""
-        if self._hdf5_file_stream is not None:
+        if self._hdf5_file_stream is not None or self._writer is not None:
             raise RuntimeError("HDF5 dataset file stream is already in use")
         if not file_path.endswith(".hdf5"):
             file_path += ".hdf5"
         dir_path = os.path.dirname(file_path)
         if not os.path.isdir(dir_path):
             os.makedirs(dir_path)
+        self._file_path = file_path
         if resume:
             self._hdf5_file_stream = h5py.File(file_path, "a")
             self._hdf5_data_group = self._hdf5_file_stream["data"]
@@ -47,48 +92,210 @@ class StreamingHDF5DatasetFileHandler(HDF5DatasetFileHandler):
 
             env_name = env_name if env_name is not None else ""
             self.add_env_args({"env_name": env_name, "type": 2})
+        self._open_episodes = {}
+        self._next_demo_index = self._demo_count
+        self._start_writer()
+
+    def _start_writer(self):
+        if self._writer_mode == "process":
+            # the writer process owns the file from now on
+            self._hdf5_file_stream.close()
+            self._hdf5_file_stream = None
+            self._hdf5_data_group = None
+            self._writer = self.SharedMemoryProcessWriter(self)
+        else:
+            if self._hdf5_file_stream is None:
+                self._hdf5_file_stream = h5py.File(self._file_path, "a")
+                self._hdf5_data_group = self._hdf5_file_stream["data"]
+            self._writer = self.SingleThreadHDF5DatasetWriter(self)
 
     class SingleThreadHDF5DatasetWriter:
         def __init__(self, file_handler):
             self.executor = ThreadPoolExecutor(max_workers=1)
             self.file_handler = file_handler
+            self.writer = PreallocatedHDF5Writer(file_handler._hdf5_file_stream, **file_handler.writer_config)
+
+        def configure(self, **config):
+            # applied in order with the pending writes
+            self.executor.submit(lambda: [setattr(self.writer, key, value) for key, value in config.items()])
 
-        def write_episode(self, h5_episode_group: h5py.Group, episode: EpisodeData, write_mode: StreamWriteMode):
+        def write_episode(self, group_name: str, attrs: dict, episode: EpisodeData, write_mode: StreamWriteMode):
             episode_copy = copy.deepcopy(episode)
-            funture = self.executor.submit(self._do_write_episode, h5_episode_group, episode_copy)
-            return funture.result() if write_mode == StreamWriteMode.LAST else funture
-
-        def _do_write_episode(self, h5_episode_group: h5py.Group, episode: EpisodeData):
-            def create_dataset_helper(group, key, value):
-                """Helper method to create dataset that contains recursive dict objects."""
-                if isinstance(value, dict):
-                    key_group = group[key] if key in group else group.create_group(key)
-                    for sub_key, sub_value in value.items():
-                        create_dataset_helper(key_group, sub_key, sub_value)
-                else:
-                    data = value.cpu().numpy()
-                    if key not in group:
-                        dataset = group.create_dataset(
-                            key,
-                            shape=data.shape,
-                            maxshape=(None, *data.shape[1:]),
-                            chunks=(self.file_handler.chunks_length, *data.shape[1:]),
-                            dtype=data.dtype,
-                            compression=self.file_handler.compression,
-                        )
-                        dataset[0 : data.shape[0]] = data
-                    else:
-                        dataset = group[key]
-                        dataset.resize(dataset.shape[0] + data.shape[0], axis=0)
-                        dataset[dataset.shape[0] - data.shape[0] :] = data
-
-            for key, value in episode.data.items():
-                create_dataset_helper(h5_episode_group, key, value)
-
-            self.file_handler.flush()
+            future = self.executor.submit(self._do_write_episode, group_name, attrs, episode_copy, write_mode)
+            return future.result() if write_mode == StreamWriteMode.LAST else future
+
+        def _do_write_episode(self, group_name: str, attrs: dict, episode: EpisodeData, write_mode: StreamWriteMode):
+            self.writer.set_attrs(group_name, attrs)
+            for key_path, value in _flatten_episode_data(episode.data):
+                self.writer.append(group_name, key_path, value.cpu().numpy())
+            if write_mode == StreamWriteMode.LAST:
+                self.writer.finish_episode(group_name, attrs["num_samples"])
+            self.writer.hdf5_file.flush()
+
+        def flush(self):
+            self.executor.submit(self.writer.hdf5_file.flush).result()
 
         def shutdown(self):
             self.executor.shutdown(wait=True)
+            # trim the unfinished episode, the next writer continues after its written length
+            self.writer.trim_all()
+
+    class SharedMemoryProcessWriter:
+        """
+        Feeds a writer process (see hdf5_writer_process.py) through `num_blocks` shared memory blocks of
+        `block_bytes` bytes. Tensors are copied straight into the blocks (no deepcopy), and `write_episode` only
+        blocks when all the blocks are waiting to be written, which bounds the memory used by pending writes.
+        """
+
+        def __init__(self, file_handler, num_blocks: int = 4, block_bytes: int = 64 << 20):
+            self.file_handler = file_handler
+            self.block_bytes = block_bytes
+            self.shm = SharedMemory(create=True, size=num_blocks * block_bytes)
+            self._free_blocks = list(range(num_blocks))
+            authkey = os.urandom(32)
+            listener = Listener(("127.0.0.1", 0), authkey=authkey)
+            host, port = listener.address
+            self.process = subprocess.Popen(
+                [
+                    sys.executable,
+                    os.path.abspath(hdf5_writer_process.__file__),
+                    "--host",
+                    host,
+                    "--port",
+                    str(port),
+                    "--shm_name",
+                    self.shm.name,
+                ],
+                env={**os.environ, AUTHKEY_ENV_VAR: authkey.hex()},
+            )
+            try:
+                self.conn = self._accept(listener)
+                self.conn.send(("open", file_handler._file_path, "a", file_handler.writer_config))
+                self._wait_for("opened")
+            except BaseException:
+                self.process.kill()
+                self.process.wait()
+                self.shm.close()
+                self.shm.unlink()
+                raise
+
+        def _accept(self, listener: Listener):
+            """Accept the connection of the writer process, failing if it exits before connecting."""
+            result = {}
+
+            def _do_accept():
+                try:
+                    result["conn"] = listener.accept()
+                except Exception as e:
+                    result["error"] = e
+
+            accept_thread = threading.Thread(target=_do_accept, daemon=True)
+            accept_thread.start()
+            while accept_thread.is_alive():
+                accept_thread.join(timeout=0.1)
+                if accept_thread.is_alive() and self.process.poll() is not None:
+                    listener.close()
+                    raise RuntimeError(f"HDF5 writer process exited with code {self.process.returncode}")
+            listener.close()
+            if "conn" not in result:
+                raise RuntimeError("HDF5 writer process failed to connect") from result.get("error")
+            return result["conn"]
+
+        def _handle(self, message: tuple):
+            if message[0] == "free":
+                self._free_blocks.append(message[1])
+            elif message[0] == "error":
+                raise RuntimeError(f"HDF5 writer process failed:\n{message[1]}")
+
+        def _recv(self) -> tuple:
+            try:
+                message = self.conn.recv()
+            except EOFError as e:
+                raise RuntimeError(f"HDF5 writer process exited with code {self.process.poll()}") from e
+            self._handle(message)
+            return message
+
+        def _wait_for(self, reply: str) -> tuple:
+            while True:
+                message = self._recv()
+                if message[0] == reply:
+                    return message
+
+        def _drain(self):
+            while self.conn.poll():
+                self._recv()
+
+        def _acquire_block(self) -> int:
+            while not self._free_blocks:
+                self._recv()
+            return self._free_blocks.pop()
+
+        def configure(self, **config):
+            self.conn.send(("config", config))
+
+        def write_episode(self, group_name: str, attrs: dict, episode: EpisodeData, write_mode: StreamWriteMode):
+            self._drain()
+            self.conn.send(("attrs", group_name, attrs))
+            block_id, offset, pieces = None, 0, []
+            for key_path, value in _flatten_episode_data(episode.data):
+                value = value.detach()
+                np_dtype = torch.empty(0, dtype=value.dtype).numpy().dtype
+                row_bytes = max(1, value[0].numel() * value.element_size()) if len(value) > 0 else 1
+                if row_bytes > self.block_bytes:
+                    raise ValueError(f"A row of '{key_path}' ({row_bytes} bytes) does not fit in a shared memory block")
+                start = 0
+                while start < len(value):
+                    if block_id is None:
+                        block_id, offset, pieces = self._acquire_block(), 0, []
+                    num_rows = min(len(value) - start, (self.block_bytes - offset) // row_bytes)
+                    if num_rows <= 0:
+                        self.conn.send(("write", block_id, pieces))
+                        block_id = None
+                        continue
+                    block_offset = block_id * self.block_bytes + offset
+                    view = np.ndarray(
+                        (num_rows, *value.shape[1:]), dtype=np_dtype, buffer=self.shm.buf, offset=block_offset
+                    )
+                    torch.from_numpy(view).copy_(value[start : start + num_rows])
+                    pieces.append((group_name, key_path, np_dtype.str, view.shape, block_offset))
+                    del view
+                    # keep the pieces 64-byte aligned
+                    offset += -(-num_rows * row_bytes // 64) * 64
+                    start += num_rows
+            if block_id is not None:
+                self.conn.send(("write", block_id, pieces))
+            if write_mode == StreamWriteMode.LAST:
+                self.conn.send(("finish", group_name, attrs["num_samples"]))
+
+        def set_env_args(self, env_args: str):
+            self.conn.send(("env_args", env_args))
+
+        def flush(self):
+            self.conn.send(("flush",))
+            self._wait_for("flushed")
+
+        def shutdown(self):
+            try:
+                if self.process.poll() is None:
+                    self.conn.send(("close",))
+                    self._wait_for("closed")
+            finally:
+                self.conn.close()
+                self.process.wait()
+                self.shm.close()
+                self.shm.unlink()
+
+    @property
+    def writer_config(self) -> dict:
+        return {
+            "chunks_length": self._chunks_length,
+            "compression": self._compression,
+            "expected_episode_length": self._expected_episode_length,
+        }
+
+    def _configure_writer(self):
+        if self._writer is not None:
+            self._writer.configure(**self.writer_config)
 
     @property
     def chunks_length(self) -> int:
@@ -97,6 +304,7 @@ class StreamingHDF5DatasetFileHandler(HDF5DatasetFileHandler):
     @chunks_length.setter
     def chunks_length(self, chunks_length: int):
         self._chunks_length = chunks_length
+        self._configure_writer()
 
     @property
     def compression(self) -> str | None:
@@ -104,43 +312,95 @@ class StreamingHDF5DatasetFileHandler(HDF5DatasetFileHandler):
 
     @compression.setter
     def compression(self, compression: str | None):
+        # fail early on unknown compressions or a missing hdf5plugin
+        compression_kwargs(compression)
         self._compression = compression
+        self._configure_writer()
+
+    @property
+    def expected_episode_length(self) -> int:
+        """Initial length of the datasets of an episode, then predicted from the length of the last episode."""
+        return self._expected_episode_length
+
+    @expected_episode_length.setter
+    def expected_episode_length(self, expected_episode_length: int):
+        self._expected_episode_length = expected_episode_length
+        self._configure_writer()
 
-    def write_episode(self, episode: EpisodeData, write_mode: StreamWriteMode):
+    @property
+    def writer_mode(self) -> str:
+        return self._writer_mode
+
+    @writer_mode.setter
+    def writer_mode(self, writer_mode: str):
+        if writer_mode not in self.WRITER_MODES:
+            raise ValueError(f"Unknown writer mode '{writer_mode}', must be one of {self.WRITER_MODES}")
+        if writer_mode == self._writer_mode:
+            return
+        self._writer_mode = writer_mode
+        if self._writer is not None:
+            # hand the opened file over to the new writer
+            self._writer.shutdown()
+            self._start_writer()
+
+    def add_env_args(self, env_args: dict):
+        if self._writer_mode != "process" or self._writer is None:
+            super().add_env_args(env_args)
+            return
+        self._env_args.update(env_args)
+        self._writer.set_env_args(json.dumps(self._env_args))
+
+    def write_episode(self, episode: EpisodeData, write_mode: StreamWriteMode, episode_key=None):
+        """
+        Append the records of an episode.
+
+        Args:
+            episode: The records to append.
+            write_mode: LAST if these are the last records of the episode.
+            episode_key: Identifies the episode the records belong to (e.g. the env id), so that the episodes of
+                several environments can be streamed at the same time. Each key gets its own demo group.
+        """
         self._raise_if_not_initialized()
         if episode.is_empty():
             return
 
-        group_name = f"demo_{self._demo_count}"
-        h5_episode_group = (
-            self._hdf5_data_group[group_name]
-            if group_name in self._hdf5_data_group
-            else self._hdf5_data_group.create_group(group_name)
-        )
+        if episode_key not in self._open_episodes:
+            self._open_episodes[episode_key] = [f"demo_{self._next_demo_index}", 0]
+            self._next_demo_index += 1
+        open_episode = self._open_episodes[episode_key]
+        group_name = open_episode[0]
 
         # store number of steps taken
         if "actions" in episode.data:
-            if "num_samples" not in h5_episode_group.attrs:
-                h5_episode_group.attrs["num_samples"] = 0
-            h5_episode_group.attrs["num_samples"] += len(episode.data["actions"])
+            open_episode[1] += len(episode.data["actions"])
         else:
-            h5_episode_group.attrs["num_samples"] = 0
+            open_episode[1] = 0
+        attrs = {"num_samples": open_episode[1]}
 
         if episode.seed is not None:
-            h5_episode_group.attrs["seed"] = episode.seed
+            attrs["seed"] = episode.seed
 
         if episode.success is not None:
-            h5_episode_group.attrs["success"] = episode.success
+            attrs["success"] = episode.success
 
         if write_mode == StreamWriteMode.LAST:
-            # increment total step counts
-            self._hdf5_data_group.attrs["total"] += h5_episode_group.attrs["num_samples"]
-
+            # the total step count is incremented by the writer when the episode is finished
+            del self._open_episodes[episode_key]
             # increment total demo counts
             self._demo_count += 1
 
-        self._writer.write_episode(h5_episode_group, episode, write_mode)
+        self._writer.write_episode(group_name, attrs, episode, write_mode)
+
+    def flush(self):
+        self._raise_if_not_initialized()
+        self._writer.flush()
 
     def close(self):
-        self._writer.shutdown()
+        if self._writer is not None:
+            self._writer.shutdown()
+            self._writer = None
         super().close()
+
+    def _raise_if_not_initialized(self):
+        if self._writer is None and self._hdf5_file_stream is None:
+            raise RuntimeError("HDF5 dataset file stream is not initialized")
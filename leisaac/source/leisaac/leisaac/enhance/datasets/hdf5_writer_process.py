@@ -0,0 +1,213 @@
+"""
+Standalone HDF5 writer process used by StreamingHDF5DatasetFileHandler in "process" writer mode.
+
+NOTE: this file is executed by path in a separate interpreter (not through multiprocessing, which would re-run the
+top-level code of the launching script, e.g. the Isaac Sim app launcher), so it must only depend on the standard
+library, numpy and h5py (and hdf5plugin for the lz4/blosc compressions).
+
+The parent copies each flush into fixed-size blocks of a shared memory segment and sends the layout of every
+piece over a multiprocessing connection; the writer appends the pieces to preallocated datasets and hands the blocks
+back. The parent blocks when all the blocks are in use, which bounds the memory used by pending writes.
+"""
+
+import argparse
+import math
+import os
+import traceback
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Client
+from multiprocessing.shared_memory import SharedMemory
+
+import h5py
+import numpy as np
+
+# name of the environment variable used to pass the connection authkey to the writer process
+AUTHKEY_ENV_VAR = "LEISAAC_HDF5_WRITER_AUTHKEY"
+# target size of a chunk of a camera-like dataset (camera frames are stored one or a few frames per chunk)
+CHUNK_TARGET_BYTES = 1 << 20
+
+COMPRESSIONS = [None, "lzf", "gzip", "gzip1", "lz4", "blosc"]
+
+
+def compression_kwargs(compression: str | None) -> dict:
+    """
+    Keyword arguments of `h5py.Group.create_dataset` for the given compression.
+
+    - None: no compression, minimum latency but largest files
+    - lzf: moderate ratio, fast, always available in h5py
+    - gzip / gzip1: high ratio / gzip at level 1 (much faster, slightly lower ratio)
+    - lz4 / blosc: fast lossless compressions from hdf5plugin, which readers also need to import
+    """
+    if compression is None:
+        return {}
+    if compression == "lzf":
+        return {"compression": "lzf"}
+    if compression == "gzip":
+        return {"compression": "gzip"}
+    if compression == "gzip1":
+        return {"compression": "gzip", "compression_opts": 1}
+    if compression in ["lz4", "blosc"]:
+        try:
+            import hdf5plugin
+        except ImportError as e:
+            raise ImportError(f"compression '{compression}' requires hdf5plugin: pip install hdf5plugin") from e
+        if compression == "lz4":
+            return dict(hdf5plugin.LZ4())
+        return dict(hdf5plugin.Blosc(cname="lz4", clevel=5, shuffle=hdf5plugin.Blosc.SHUFFLE))
+    raise ValueError(f"Unknown compression '{compression}', must be one of {COMPRESSIONS}")
+
+
+def chunk_shape(shape: tuple[int, ...], itemsize: int, chunks_length: int) -> tuple[int, ...]:
+    """
+    Chunk shape of a dataset whose rows have shape `shape[1:]`.
+
+    Low-dim rows (states, actions) are grouped `chunks_length` rows per chunk, while large rows (camera frames) get
+    as many rows as fit in CHUNK_TARGET_BYTES, i.e. usually one frame per chunk.
+    """
+    row_bytes = max(1, math.prod(shape[1:]) * itemsize)
+    rows = max(1, min(chunks_length, CHUNK_TARGET_BYTES // row_bytes))
+    return (rows, *shape[1:])
+
+
+class PreallocatedHDF5Writer:
+    """
+    Appends rows to the datasets of an HDF5 file, preallocating them to the predicted episode length and growing
+    them geometrically. Datasets are trimmed to their written length when their episode is finished.
+    """
+
+    def __init__(
+        self,
+        hdf5_file: h5py.File,
+        chunks_length: int = 100,
+        compression: str | None = None,
+        expected_episode_length: int = 1000,
+        growth_factor: float = 2.0,
+    ):
+        assert growth_factor > 1.0, f"growth_factor must be > 1, got {growth_factor}"
+        self.hdf5_file = hdf5_file
+        self.chunks_length = chunks_length
+        self.compression = compression
+        self.expected_episode_length = expected_episode_length
+        self.growth_factor = growth_factor
+        # written length of the datasets of the unfinished episodes: {group name: {dataset path: length}}
+        self._lengths: dict[str, dict[str, int]] = {}
+
+    def set_attrs(self, group_name: str, attrs: dict):
+        group = self.hdf5_file["data"].require_group(group_name)
+        for key, value in attrs.items():
+            group.attrs[key] = value
+
+    def append(self, group_name: str, key_path: str, data: np.ndarray):
+        group = self.hdf5_file["data"].require_group(group_name)
+        lengths = self._lengths.setdefault(group_name, {})
+        if key_path not in group:
+            dataset = group.create_dataset(
+                key_path,
+                shape=(max(self.expected_episode_length, data.shape[0]), *data.shape[1:]),
+                maxshape=(None, *data.shape[1:]),
+                chunks=chunk_shape(data.shape, data.dtype.itemsize, self.chunks_length),
+                dtype=data.dtype,
+                **compression_kwargs(self.compression),
+            )
+            lengths[key_path] = 0
+        else:
+            dataset = group[key_path]
+            lengths.setdefault(key_path, dataset.shape[0])
+        length = lengths[key_path]
+        if length + data.shape[0] > dataset.shape[0]:
+            dataset.resize(max(length + data.shape[0], math.ceil(dataset.shape[0] * self.growth_factor)), axis=0)
+        dataset[length : length + data.shape[0]] = data
+        lengths[key_path] = length + data.shape[0]
+
+    def trim(self, group_name: str):
+        """Trim the datasets of an episode to their written length."""
+        group = self.hdf5_file["data"][group_name] if group_name in self.hdf5_file["data"] else None
+        for key_path, length in self._lengths.pop(group_name, {}).items():
+            if group is not None and group[key_path].shape[0] != length:
+                group[key_path].resize(length, axis=0)
+
+    def trim_all(self):
+        """Trim the datasets of all the unfinished episodes, appending to them later continues after their end."""
+        for group_name in list(self._lengths):
+            self.trim(group_name)
+
+    def finish_episode(self, group_name: str, num_samples: int):
+        """Trim the datasets of the episode, count its samples and update the predicted length of the next episodes."""
+        self.trim(group_name)
+        self.hdf5_file["data"].attrs["total"] += num_samples
+        if num_samples > 0:
+            # leave some margin so that slightly longer episodes do not need to grow
+            self.expected_episode_length = math.ceil(num_samples * 1.25)
+
+    def close(self):
+        self.trim_all()
+        self.hdf5_file.close()
+
+
+def serve(address: tuple[str, int], authkey: bytes, shm_name: str):
+    """Main loop of the writer process."""
+    shm = SharedMemory(name=shm_name)
+    # the segment is owned (and unlinked) by the parent process
+    resource_tracker.unregister(shm._name, "shared_memory")
+    conn = Client(address, authkey=authkey)
+    writer = None
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                # the parent exited without closing the file, keep what has been written
+                break
+            command, args = message[0], message[1:]
+            if command == "open":
+                file_path, mode, config = args
+                hdf5_file = h5py.File(file_path, mode)
+                writer = PreallocatedHDF5Writer(hdf5_file, **config)
+                conn.send(("opened", len(hdf5_file["data"])))
+            elif command == "config":
+                for key, value in args[0].items():
+                    setattr(writer, key, value)
+            elif command == "env_args":
+                writer.hdf5_file["data"].attrs["env_args"] = args[0]
+            elif command == "attrs":
+                writer.set_attrs(*args)
+            elif command == "write":
+                block_id, pieces = args
+                for group_name, key_path, dtype, shape, offset in pieces:
+                    data = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+                    writer.append(group_name, key_path, data)
+                    del data
+                conn.send(("free", block_id))
+            elif command == "finish":
+                writer.finish_episode(*args)
+                writer.hdf5_file.flush()
+            elif command == "flush":
+                writer.hdf5_file.flush()
+                conn.send(("flushed",))
+            elif command == "close":
+                writer.close()
+                writer = None
+                conn.send(("closed",))
+                break
+            else:
+                raise RuntimeError(f"Unknown command {command}")
+    except Exception:
+        try:
+            conn.send(("error", traceback.format_exc()))
+        except OSError:
+            pass
+        raise
+    finally:
+        if writer is not None:
+            writer.close()
+        conn.close()
+        shm.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HDF5 writer process of StreamingHDF5DatasetFileHandler.")
+    parser.add_argument("--host", type=str, required=True)
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--shm_name", type=str, required=True)
+    args = parser.parse_args()
+    serve((args.host, args.port), bytes.fromhex(os.environ[AUTHKEY_ENV_VAR]), args.shm_name)
@@ -0,0 +1,212 @@
+import glob
+import json
+import os
+from pathlib import Path
+
+import h5py
+from isaaclab.utils.datasets import EpisodeData, HDF5DatasetFileHandler
+
+from .hdf5_dataset_file_handler import StreamingHDF5DatasetFileHandler, StreamWriteMode
+from .hdf5_writer_process import compression_kwargs
+
+MERGE_MODES = ["link", "copy"]
+
+
+def shard_paths_of(file_path: str) -> list[str]:
+    """Paths of the existing shards of a sharded dataset file, in the order of their shard ids."""
+    shard_paths = glob.glob(os.path.join(shards_dir_of(file_path), "shard_*.hdf5"))
+    return sorted(shard_paths, key=lambda path: int(Path(path).stem.split("_")[1]))
+
+
+def shards_dir_of(file_path: str) -> str:
+    return os.path.splitext(file_path)[0] + "_shards"
+
+
+def merge_hdf5_shards(shard_paths: list[str], output_path: str, merge_mode: str = "link"):
+    """
+    Merge the demos of several HDF5 dataset files into `output_path`, renumbered demo_0, demo_1, ...
+
+    Args:
+        shard_paths: The dataset files to merge, in order.
+        output_path: The merged dataset file, overwritten if it exists.
+        merge_mode: "link" writes an index of external links to the demos of the shards (instant, but the shards
+            must stay next to the index file), "copy" copies the demos into a standalone file.
+    """
+    if merge_mode not in MERGE_MODES:
+        raise ValueError(f"Unknown merge mode '{merge_mode}', must be one of {MERGE_MODES}")
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    with h5py.File(output_path, "w") as output_file:
+        data_group = output_file.create_group("data")
+        data_group.attrs["total"] = 0
+        data_group.attrs["num_shards"] = len(shard_paths)
+        env_args = {}
+        demo_index = 0
+        for shard_path in shard_paths:
+            with h5py.File(shard_path, "r") as shard_file:
+                shard_data = shard_file["data"]
+                if "env_args" in shard_data.attrs:
+                    env_args.update(json.loads(shard_data.attrs["env_args"]))
+                data_group.attrs["total"] += shard_data.attrs.get("total", 0)
+                # keep the demos of a shard in the order they were started
+                for demo_name in sorted(shard_data, key=lambda name: int(name.split("_")[-1])):
+                    if merge_mode == "link":
+                        data_group[f"demo_{demo_index}"] = h5py.ExternalLink(
+                            os.path.relpath(os.path.abspath(shard_path), output_dir), f"/data/{demo_name}"
+                        )
+                    else:
+                        shard_file.copy(shard_data[demo_name], data_group, name=f"demo_{demo_index}")
+                    demo_index += 1
+        data_group.attrs["env_args"] = json.dumps(env_args)
+
+
+class ShardedHDF5DatasetFileHandler(HDF5DatasetFileHandler):
+    """
+    Streams the episodes into `num_shards` dataset files, each written by its own StreamingHDF5DatasetFileHandler
+    writer, so that the writes of many environments are spread over several writers instead of going through a
+    single one. The episodes of an environment always go to the same shard (`episode_key % num_shards`).
+
+    For `file_path` "dir/dataset.hdf5", the shards are written to "dir/dataset_shards/shard_{i}.hdf5" and, when the
+    handler is closed, "dir/dataset.hdf5" is (re)built from the shards with `merge_hdf5_shards`.
+
+    NOTE: h5py serializes all the HDF5 calls of a process, so the shards only write in parallel with the "process"
+    writer mode, where each shard has its own writer process.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._num_shards = 1
+        self._merge_mode = "link"
+        self._shard_config = {}
+        self._shards: list[StreamingHDF5DatasetFileHandler] = []
+        self._file_path = None
+        self._env_name = None
+        self._resume = False
+
+    def create(self, file_path: str, env_name: str = None, resume: bool = False):
+        """
+        Set up a sharded dataset file. The shards are only created on the first write, so that `num_shards` can
+        still be changed after `create`.
+        """
+        if self._file_path is not None:
+            raise RuntimeError("HDF5 dataset file stream is already in use")
+        if not file_path.endswith(".hdf5"):
+            file_path += ".hdf5"
+        if resume and os.path.exists(file_path):
+            with h5py.File(file_path, "r") as f:
+                if "num_shards" not in f["data"].attrs and len(f["data"]) > 0:
+                    raise ValueError(f"Cannot resume the sharded recording of {file_path}, it is not a sharded dataset")
+        os.makedirs(shards_dir_of(file_path), exist_ok=True)
+        if not resume:
+            for shard_path in shard_paths_of(file_path):
+                os.remove(shard_path)
+        self._file_path = file_path
+        self._env_name = env_name
+        self._resume = resume
+
+    def _open_shards(self) -> list[StreamingHDF5DatasetFileHandler]:
+        if not self._shards:
+            self._raise_if_not_initialized()
+            for shard_id in range(self._num_shards):
+                shard_path = os.path.join(shards_dir_of(self._file_path), f"shard_{shard_id}.hdf5")
+                shard = StreamingHDF5DatasetFileHandler()
+                for key, value in self._shard_config.items():
+                    setattr(shard, key, value)
+                shard.create(shard_path, env_name=self._env_name, resume=self._resume and os.path.exists(shard_path))
+                if self._env_args:
+                    shard.add_env_args(self._env_args)
+                self._shards.append(shard)
+        return self._shards
+
+    def _set_shard_config(self, key: str, value):
+        self._shard_config[key] = value
+        for shard in self._shards:
+            setattr(shard, key, value)
+
+    @property
+    def num_shards(self) -> int:
+        return self._num_shards
+
+    @num_shards.setter
+    def num_shards(self, num_shards: int):
+        if self._shards:
+            raise RuntimeError("num_shards cannot be changed once the shards are created")
+        assert num_shards >= 1, f"num_shards must be >= 1, got {num_shards}"
+        self._num_shards = num_shards
+
+    @property
+    def merge_mode(self) -> str:
+        """How the shards are merged into the dataset file on close, see `merge_hdf5_shards`."""
+        return self._merge_mode
+
+    @merge_mode.setter
+    def merge_mode(self, merge_mode: str):
+        if merge_mode not in MERGE_MODES:
+            raise ValueError(f"Unknown merge mode '{merge_mode}', must be one of {MERGE_MODES}")
+        self._merge_mode = merge_mode
+
+    @property
+    def chunks_length(self) -> int:
+        return self._shard_config.get("chunks_length", 100)
+
+    @chunks_length.setter
+    def chunks_length(self, chunks_length: int):
+        self._set_shard_config("chunks_length", chunks_length)
+
+    @property
+    def compression(self) -> str | None:
+        return self._shard_config.get("compression")
+
+    @compression.setter
+    def compression(self, compression: str | None):
+        compression_kwargs(compression)
+        self._set_shard_config("compression", compression)
+
+    @property
+    def writer_mode(self) -> str:
+        return self._shard_config.get("writer_mode", "thread")
+
+    @writer_mode.setter
+    def writer_mode(self, writer_mode: str):
+        if writer_mode not in StreamingHDF5DatasetFileHandler.WRITER_MODES:
+            raise ValueError(
+                f"Unknown writer mode '{writer_mode}', must be one of {StreamingHDF5DatasetFileHandler.WRITER_MODES}"
+            )
+        self._set_shard_config("writer_mode", writer_mode)
+
+    @property
+    def demo_count(self) -> int:
+        return sum(shard.demo_count for shard in self._shards)
+
+    def get_num_episodes(self) -> int:
+        return self.demo_count
+
+    def add_env_args(self, env_args: dict):
+        self._raise_if_not_initialized()
+        self._env_args.update(env_args)
+        for shard in self._shards:
+            shard.add_env_args(env_args)
+
+    def write_episode(self, episode: EpisodeData, write_mode: StreamWriteMode, episode_key=None):
+        if episode.is_empty():
+            return
+        shards = self._open_shards()
+        shard_id = episode_key % len(shards) if isinstance(episode_key, int) else hash(episode_key) % len(shards)
+        shards[shard_id].write_episode(episode, write_mode, episode_key=episode_key)
+
+    def flush(self):
+        self._raise_if_not_initialized()
+        for shard in self._shards:
+            shard.flush()
+
+    def close(self):
+        if self._file_path is None:
+            return
+        for shard in self._shards:
+            shard.close()
+        self._shards = []
+        merge_hdf5_shards(shard_paths_of(self._file_path), self._file_path, self._merge_mode)
+        self._file_path = None
+
+    def _raise_if_not_initialized(self):
+        if self._file_path is None:
+            raise RuntimeError("HDF5 dataset file stream is not initialized")
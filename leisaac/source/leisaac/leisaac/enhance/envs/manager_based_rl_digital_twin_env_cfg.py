@@ -9,10 +9,11 @@ from isaaclab.utils import configclass
 class ManagerBasedRLDigitalTwinEnvCfg(ManagerBasedRLEnvCfg):
     """Configuration for the ManagerBasedRLDigitalTwinEnv."""
 
-    rgb_overlay_paths: dict[str, str] | None = None
+    rgb_overlay_paths: dict[str, str | list[str]] | None = None
     """A dictionary of rgb overlay paths.
 
-    The key is the name of the rgb sensor, and the value is the path to the background image.
+    The key is the name of the rgb sensor, and the value is the path to the background image, or a list of paths
+    assigned to the environments in turn.
     example:{"camera_name": "path/to/greenscreen/background.png"}
     """
 
@@ -25,6 +26,12 @@ class ManagerBasedRLDigitalTwinEnvCfg(ManagerBasedRLEnvCfg):
     - "background": overlay the background image(1.0 opacity) on the original render image.
     """
 
+    rgb_overlay_output_size: tuple[int, int] | None = None
+    """The resolution (width, height) of the overlaid camera observations, e.g. the input resolution of the policy.
+
+    The rendered images are resized to it before compositing. Defaults to None, the resolution of the camera.
+    """
+
     render_objects: list[SceneEntityCfg] | None = []
     """Objects need to be rendered on the background image. If render objects are empty, then the background image will be used as the foreground image.
 
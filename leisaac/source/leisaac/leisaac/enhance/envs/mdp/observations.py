@@ -30,62 +30,22 @@ def overlay_image(
     """
     assert data_type == "rgb", "Only 'rgb' is supported for overlay_image."
 
-    sim_image = image(env, sensor_cfg, data_type, convert_perspective_to_orthogonal, normalize)
-
-    def image_overlapping(
-        back_image: torch.Tensor,  # [num_env, H, W, C]
-        fore_image: torch.Tensor,  # [num_env, H, W, C]
-        back_mask: torch.Tensor | None = None,  # [num_env, H, W]
-        fore_mask: torch.Tensor | None = None,  # [num_env, H, W]
-        back_alpha: float = 0.5,
-        fore_alpha: float = 0.5,
-    ) -> torch.Tensor:
-        """
-        Overlap two images with masks.
-
-        Args:
-            back_image: background image [num_env, H, W, C]
-            fore_image: foreground image [num_env, H, W, C]
-            back_mask: background mask [num_env, H, W]
-            fore_mask: foreground mask [num_env, H, W]
-            back_alpha: background opacity (0-1)
-            fore_alpha: foreground opacity (0-1)
+    compositor = env.rgb_overlay_compositors.get(sensor_cfg.name)
+    semantic_id = env.foreground_semantic_id_mapping.get(sensor_cfg.name)
+    if compositor is None or semantic_id is None:
+        return image(env, sensor_cfg, data_type, convert_perspective_to_orthogonal, normalize)
 
-        Returns:
-            Overlapped image [num_env, H, W, C]
-        """
-        if back_mask is None:
-            back_mask = torch.ones_like(back_image[:, :, :, 0], dtype=torch.bool, device=back_image.device)
-            back_mask = back_mask.unsqueeze(-1)
-        if fore_mask is None:
-            fore_mask = torch.ones_like(fore_image[:, :, :, 0], dtype=torch.bool, device=fore_image.device)
-            fore_mask = fore_mask.unsqueeze(-1)
-        image = back_alpha * back_image * back_mask + fore_alpha * fore_image * fore_mask
-        return torch.clamp(image, 0.0, 255.0).to(torch.uint8)
+    # composite the raw uint8 render, the compositor returns a new tensor so the sensor data is not cloned
+    camera_output = env.scene.sensors[sensor_cfg.name].data.output
+    foreground_mask = camera_output["semantic_segmentation"] == semantic_id if compositor.mode == "background" else None
+    images = compositor(camera_output[data_type], foreground_mask)
 
-    semantic_id = env.foreground_semantic_id_mapping.get(sensor_cfg.name)
-    if semantic_id is not None:
-        camera_output = env.scene.sensors[sensor_cfg.name].data.output
-        if env.cfg.rgb_overlay_mode == "background":
-            semantic_mask = camera_output["semantic_segmentation"]
-            overlay_mask = semantic_mask == semantic_id
-            sim_image = image_overlapping(
-                back_image=env.rgb_overlay_images[sensor_cfg.name],
-                fore_image=sim_image,
-                back_mask=torch.logical_not(overlay_mask),
-                fore_mask=overlay_mask,
-                back_alpha=1.0,
-                fore_alpha=1.0,
-            )
-        elif env.cfg.rgb_overlay_mode == "debug":
-            sim_image = image_overlapping(
-                back_image=env.rgb_overlay_images[sensor_cfg.name],
-                fore_image=sim_image,
-                back_alpha=0.5,
-                fore_alpha=0.5,
-            )
+    if normalize:
+        # same normalization as `isaaclab.envs.mdp.image`
+        images = images.float() / 255.0
+        images -= torch.mean(images, dim=(1, 2), keepdim=True)
 
-    return sim_image
+    return images
 
 
 def ee_frame_state(
@@ -0,0 +1,123 @@
+import cv2
+import torch
+import torch.nn.functional as F
+
+
+def read_overlay_image(path: str, target_size: tuple[int, int]) -> torch.Tensor:
+    """
+    Read an overlay image and resize it to the target size.
+
+    Args:
+        path: the path to the overlay image.
+        target_size: the target size of the overlay image.(width, height)
+    Returns:
+        the resized overlay image.(H, W, C) uint8
+    """
+    image = cv2.imread(path)
+    if image is None:
+        raise FileNotFoundError(f"Cannot read the overlay image {path}")
+    image = torch.from_numpy(cv2.cvtColor(image, cv2.COLOR_BGR2RGB)).permute(2, 0, 1)  # [C, H, W]
+    size = (target_size[1], target_size[0])
+    if tuple(image.shape[-2:]) != size:
+        # the bilinear interpolation of the uint8 image on the CPU, as the overlay images have always been read
+        image = F.interpolate(image.unsqueeze(0), size=size, mode="bilinear").squeeze(0)
+    return image.permute(1, 2, 0)  # [H, W, C]
+
+
+def resize_images(images: torch.Tensor, target_size: tuple[int, int], mode: str = "bilinear") -> torch.Tensor:
+    """
+    Resize a batch of uint8 or integer images.
+
+    Args:
+        images: the images to resize.(N, C, H, W)
+        target_size: the target size.(width, height)
+        mode: the interpolation mode, "nearest" keeps the values (e.g. of semantic masks) unchanged.
+    Returns:
+        the resized images, with the dtype of `images`.(N, C, target_height, target_width)
+    """
+    size = (target_size[1], target_size[0])
+    if tuple(images.shape[-2:]) == size:
+        return images
+    if mode == "nearest":
+        return F.interpolate(images, size=size, mode="nearest")
+    resized = F.interpolate(images.float(), size=size, mode=mode, align_corners=False)
+    return resized.round_().clamp_(0, 255).to(images.dtype)
+
+
+class RGBOverlayCompositor:
+    """
+    Composites the rendered images of a camera with overlay images, for all the environments at once.
+
+    The overlay images are read and resized once, and cached on the device as uint8 images of the output resolution.
+    A single image is shared by (broadcast to) all the environments, several images are assigned to the
+    environments in turn. Compositing stays in uint8:
+
+    - "background": the rendered foreground pixels over the overlay image, a single masked select.
+    - "debug": the average of the rendered image and the overlay image.
+    - "none": the rendered image.
+
+    When `output_size` differs from the camera resolution, the rendered images and masks are resized to it before
+    compositing, so the overlay is composited (and returned) at the resolution of the policy.
+
+    Args:
+        paths: The overlay image(s) of the camera.
+        camera_size: The resolution of the camera.(width, height)
+        num_envs: The number of environments.
+        device: The device of the camera images.
+        mode: The overlay mode, see `ManagerBasedRLDigitalTwinEnvCfg.rgb_overlay_mode`.
+        output_size: The resolution of the composited images, defaults to the camera resolution.(width, height)
+    """
+
+    MODES = ["none", "debug", "background"]
+
+    def __init__(
+        self,
+        paths: str | list[str],
+        camera_size: tuple[int, int],
+        num_envs: int,
+        device: str | torch.device,
+        mode: str = "background",
+        output_size: tuple[int, int] | None = None,
+    ):
+        mode = "none" if mode is None else mode
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown rgb overlay mode '{mode}', must be one of {self.MODES}")
+        self.mode = mode
+        self.camera_size = tuple(camera_size)
+        self.output_size = self.camera_size if output_size is None else tuple(output_size)
+        paths = [paths] if isinstance(paths, str) else list(paths)
+        images = torch.stack([read_overlay_image(path, self.output_size) for path in paths])
+        if len(paths) > 1:
+            # assign the images to the environments in turn
+            images = images[torch.arange(num_envs) % len(paths)]
+        # [1 or num_envs, H, W, C]
+        self.overlay_images = images.to(device)
+
+    def resize(self, images: torch.Tensor, mode: str = "bilinear") -> torch.Tensor:
+        """Resize [N, H, W, C] images to the output resolution."""
+        if self.output_size == self.camera_size:
+            return images
+        return resize_images(images.permute(0, 3, 1, 2), self.output_size, mode).permute(0, 2, 3, 1)
+
+    def __call__(self, sim_images: torch.Tensor, foreground_masks: torch.Tensor | None = None) -> torch.Tensor:
+        """
+        Composite the rendered images with the overlay images.
+
+        Args:
+            sim_images: the rendered rgb images.(num_envs, H, W, C) uint8
+            foreground_masks: the pixels of the rendered foreground objects, required by the "background" mode.
+                (num_envs, H, W, 1) bool
+        Returns:
+            the composited images, at the output resolution.(num_envs, H, W, C) uint8
+        """
+        sim_images = self.resize(sim_images)
+        if self.mode == "background":
+            if foreground_masks is None:
+                raise ValueError("The 'background' rgb overlay mode requires the foreground masks")
+            foreground_masks = self.resize(foreground_masks.to(torch.uint8), mode="nearest").bool()
+            return torch.where(foreground_masks, sim_images, self.overlay_images)
+        if self.mode == "debug":
+            # floor of the average, as the truncation of the 0.5 / 0.5 blend
+            return ((sim_images.to(torch.int16) + self.overlay_images) >> 1).to(torch.uint8)
+        # without resizing, `sim_images` is still the sensor buffer
+        return sim_images.clone() if self.output_size == self.camera_size else sim_images
@@ -20,7 +20,11 @@ except (ImportError, AttributeError):  # fallback for PyPI build
 from isaaclab.envs import ManagerBasedEnv
 from isaaclab.managers import DatasetExportMode, RecorderManager
 
-from ..datasets import StreamingHDF5DatasetFileHandler, StreamWriteMode
+from ..datasets import (
+    ShardedHDF5DatasetFileHandler,
+    StreamingHDF5DatasetFileHandler,
+    StreamWriteMode,
+)
 
 
 class EnhanceDatasetExportMode(enum.IntEnum):
@@ -31,9 +35,20 @@ class EnhanceDatasetExportMode(enum.IntEnum):
 
 
 class StreamingRecorderManager(RecorderManager):
-    def __init__(self, cfg: object, env: ManagerBasedEnv) -> None:
+    def __init__(self, cfg: object, env: ManagerBasedEnv, num_writers: int = 1) -> None:
+        """
+        Every environment streams its episode to its own demo group and flushes on its own schedule: the flushes of
+        the environments are staggered over the `flush_steps` steps instead of all happening at the same step.
+
+        With `num_writers > 1`, the episodes are written to `num_writers` dataset shards by independent writers
+        (environment `i` goes to shard `i % num_writers`), which are merged into the dataset file on close, see
+        ShardedHDF5DatasetFileHandler. Use it with `writer_mode = "process"` so that the writers run in parallel.
+        """
         # use streaming_hdf5_dataset_file_handler
-        cfg.dataset_file_handler_class_type = StreamingHDF5DatasetFileHandler
+        if num_writers > 1:
+            cfg.dataset_file_handler_class_type = ShardedHDF5DatasetFileHandler
+        else:
+            cfg.dataset_file_handler_class_type = StreamingHDF5DatasetFileHandler
 
         super().__init__(cfg, env)
 
@@ -47,13 +62,17 @@ class StreamingRecorderManager(RecorderManager):
             self._dataset_file_handler.create(
                 os.path.join(cfg.dataset_export_dir_path, cfg.dataset_filename), resume=True
             )
+        if num_writers > 1 and self._dataset_file_handler is not None:
+            self._dataset_file_handler.num_shards = num_writers
 
-        self._env_steps_record = torch.zeros(self._env.num_envs)
         self._flush_steps = 100
+        self._env_steps_record = self._flush_offsets()
         self._compression = None
+        self._writer_mode = "thread"
         if self._dataset_file_handler is not None:
             self._dataset_file_handler.chunks_length = self._flush_steps
             self._dataset_file_handler.compression = self._compression
+            self._dataset_file_handler.writer_mode = self._writer_mode
 
     @property
     def flush_steps(self) -> int:
@@ -62,6 +81,7 @@ class StreamingRecorderManager(RecorderManager):
     @flush_steps.setter
     def flush_steps(self, flush_steps: int) -> None:
         self._flush_steps = flush_steps
+        self._env_steps_record = self._flush_offsets()
         if self._dataset_file_handler is not None:
             self._dataset_file_handler.chunks_length = self._flush_steps
 
@@ -75,6 +95,20 @@ class StreamingRecorderManager(RecorderManager):
         if self._dataset_file_handler is not None:
             self._dataset_file_handler.compression = self._compression
 
+    @property
+    def writer_mode(self) -> str:
+        return self._writer_mode
+
+    @writer_mode.setter
+    def writer_mode(self, writer_mode: str):
+        self._writer_mode = writer_mode
+        if self._dataset_file_handler is not None:
+            self._dataset_file_handler.writer_mode = self._writer_mode
+
+    def _flush_offsets(self) -> torch.Tensor:
+        """Initial step counts of the environments, which spread their flushes over `flush_steps` steps."""
+        return (torch.arange(self._env.num_envs) * self._flush_steps // self._env.num_envs).float()
+
     def __str__(self) -> str:
         msg = "[Enhanced] StreamingRecorderManager. \n"
         msg += super().__str__()
@@ -116,7 +150,7 @@ class StreamingRecorderManager(RecorderManager):
                     target_dataset_file_handler = self._dataset_file_handler
                 if target_dataset_file_handler is not None:
                     write_mode = StreamWriteMode.APPEND if from_step else StreamWriteMode.LAST
-                    target_dataset_file_handler.write_episode(self._episodes[env_id], write_mode)
+                    target_dataset_file_handler.write_episode(self._episodes[env_id], write_mode, episode_key=env_id)
                     self._clear_episode_cache([env_id])
                 if episode_succeeded:
                     self._exported_successful_episode_count[env_id] = (
@@ -131,6 +165,7 @@ class StreamingRecorderManager(RecorderManager):
         for env_id in env_ids:
             del self._episodes[env_id]._data
             self._episodes[env_id].data = dict()
+            # the offsets only stagger the first flushes, the environments then flush every `flush_steps` steps
             self._env_steps_record[env_id] = 0
 
     def record_pre_reset(self, env_ids: Sequence[int] | None, force_export_or_skip=None) -> None:
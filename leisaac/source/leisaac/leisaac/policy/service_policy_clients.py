@@ -7,7 +7,7 @@ import torch
 from leisaac.utils.constant import SINGLE_ARM_JOINT_NAMES
 from leisaac.utils.robot_utils import (
     convert_leisaac_action_to_lerobot,
-    convert_lerobot_action_to_leisaac,
+    lerobot_joint_pos_to_leisaac,
 )
 
 from .base import Policy, WebsocketServicePolicy, ZMQServicePolicy
@@ -79,9 +79,9 @@ class Gr00tServicePolicyClient(ZMQServicePolicy):
             [action_chunk["action.single_arm"], action_chunk["action.gripper"]],
             axis=1,
         )
-        concat_action = convert_lerobot_action_to_leisaac(concat_action)
+        concat_action = lerobot_joint_pos_to_leisaac(torch.from_numpy(concat_action))
 
-        return torch.from_numpy(concat_action[:, None, :])
+        return concat_action[:, None, :]
 
 
 class LeRobotServicePolicyClient(Policy):
@@ -128,7 +128,7 @@ class LeRobotServicePolicyClient(Policy):
                 "shape": (6,),
                 "names": [f"{joint_name}.pos" for joint_name in SINGLE_ARM_JOINT_NAMES],
             }
-            self.last_action = np.zeros((1, 6))
+            self.last_action = torch.zeros(1, 6)
         # TODO: add bi-arm support
 
         for camera_key, camera_image_shape in camera_infos.items():
@@ -225,16 +225,16 @@ class LeRobotServicePolicyClient(Policy):
         action_chunk = self._receive_action()
         if action_chunk is None:
             self.skip_send_observation = True
-            return torch.from_numpy(self.last_action).repeat(self.actions_per_chunk, 1)[:, None, :]
+            return self.last_action.repeat(self.actions_per_chunk, 1)[:, None, :]
 
         action_list = [action.get_action()[None, :] for action in action_chunk]
         concat_action = torch.cat(action_list, dim=0)
-        concat_action = convert_lerobot_action_to_leisaac(concat_action)
+        concat_action = lerobot_joint_pos_to_leisaac(concat_action)
 
         self.last_action = concat_action[-1, :]
         self.skip_send_observation = False
 
-        return torch.from_numpy(concat_action[:, None, :])
+        return concat_action[:, None, :]
 
 
 class OpenPIServicePolicyClient(WebsocketServicePolicy):
@@ -296,6 +296,6 @@ class OpenPIServicePolicyClient(WebsocketServicePolicy):
             Example of action_chunk for single arm task:
             action_chunk: np.zeros((10, 6))
         """
-        processed_action = convert_lerobot_action_to_leisaac(action_chunk)
+        processed_action = lerobot_joint_pos_to_leisaac(torch.from_numpy(action_chunk))
 
-        return torch.from_numpy(processed_action[:, None, :])
+        return processed_action[:, None, :]
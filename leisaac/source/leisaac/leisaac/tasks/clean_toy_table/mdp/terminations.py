@@ -1,8 +1,8 @@
 import torch
-from isaaclab.assets import RigidObject
 from isaaclab.envs import DirectRLEnv, ManagerBasedRLEnv
 from isaaclab.managers import SceneEntityCfg
 from leisaac.utils.robot_utils import is_so101_at_rest_pose
+from leisaac.utils.success_checks import all_within_box, scene_root_positions
 
 
 def objs_in_box(
@@ -27,19 +27,12 @@ def objs_in_box(
     Returns:
         Boolean tensor indicating which environments have completed the task.
     """
-    done = torch.ones(env.num_envs, dtype=torch.bool, device=env.device)
-    box: RigidObject = env.scene[box_cfg.name]
-    box_x = box.data.root_pos_w[:, 0] - env.scene.env_origins[:, 0]
-    box_y = box.data.root_pos_w[:, 1] - env.scene.env_origins[:, 1]
-
-    for object_cfg in object_cfg_list:
-        object: RigidObject = env.scene[object_cfg.name]
-        object_x = object.data.root_pos_w[:, 0] - env.scene.env_origins[:, 0]
-        object_y = object.data.root_pos_w[:, 1] - env.scene.env_origins[:, 1]
-        done = torch.logical_and(done, object_x < box_x + x_range[1])
-        done = torch.logical_and(done, object_x > box_x + x_range[0])
-        done = torch.logical_and(done, object_y < box_y + y_range[1])
-        done = torch.logical_and(done, object_y > box_y + y_range[0])
+    # [num_envs, 1 + num_objects, 3], the box first
+    positions = scene_root_positions(env, (box_cfg.name, *(object_cfg.name for object_cfg in object_cfg_list)))
+    # only x/y are checked
+    done = all_within_box(
+        positions[:, 1:, :2], positions[:, 0, :2], lower=(x_range[0], y_range[0]), upper=(x_range[1], y_range[1])
+    )
 
     if "robot" in env.scene.keys():
         done = torch.logical_and(
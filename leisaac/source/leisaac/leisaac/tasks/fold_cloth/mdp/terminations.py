@@ -3,6 +3,15 @@ from isaaclab.envs import DirectRLEnv, ManagerBasedEnv
 from isaaclab.managers import SceneEntityCfg
 from leisaac.enhance.assets import ClothObject
 from leisaac.utils.robot_utils import is_so101_at_rest_pose
+from leisaac.utils.success_checks import pairs_within_distance
+
+# pairs of cloth keypoints that are close to each other once the cloth is folded
+CLOTH_FOLDED_KEYPOINT_PAIRS = [
+    (0, 4),  # left sleeve -> right shoulder
+    (3, 1),  # right sleeve -> left shoulder
+    (2, 1),  # left hem -> left shoulder
+    (5, 4),  # right hem -> right shoulder
+]
 
 
 def cloth_folded(
@@ -35,18 +44,10 @@ def cloth_folded(
     done = torch.logical_and(done, is_rest)
 
     cloth: ClothObject = env.scene.particle_objects[cloth_cfg.name]
-    cloth_keypoints_pos = cloth.point_positions[:, cloth_keypoints_index[:6]]
-    done = torch.logical_and(
-        done, torch.norm(cloth_keypoints_pos[:, 0] - cloth_keypoints_pos[:, 4]) < distance_threshold
-    )  # left sleeve -> right shoulder
-    done = torch.logical_and(
-        done, torch.norm(cloth_keypoints_pos[:, 3] - cloth_keypoints_pos[:, 1]) < distance_threshold
-    )  # right sleeve -> left shoulder
+    cloth_keypoints_pos = cloth.keypoint_positions(cloth_keypoints_index[:6])
+    # the distances are checked per environment
     done = torch.logical_and(
-        done, torch.norm(cloth_keypoints_pos[:, 2] - cloth_keypoints_pos[:, 1]) < distance_threshold
-    )  # left hem -> left shoulder
-    done = torch.logical_and(
-        done, torch.norm(cloth_keypoints_pos[:, 5] - cloth_keypoints_pos[:, 4]) < distance_threshold
-    )  # right hem -> right shoulder
+        done, pairs_within_distance(cloth_keypoints_pos, CLOTH_FOLDED_KEYPOINT_PAIRS, distance_threshold)
+    )
 
     return done
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import torch
-from isaaclab.assets import RigidObject
 from isaaclab.envs import DirectRLEnv, ManagerBasedRLEnv
 from isaaclab.managers import SceneEntityCfg
 from leisaac.utils.robot_utils import is_so101_at_rest_pose
+from leisaac.utils.success_checks import all_within_box, scene_root_positions
 
 
 def task_done(
@@ -32,24 +32,14 @@ def task_done(
     Returns:
         Boolean tensor indicating which environments have completed the task.
     """
-    done = torch.ones(env.num_envs, dtype=torch.bool, device=env.device)
-    plate: RigidObject = env.scene[plate_cfg.name]
-    plate_x = plate.data.root_pos_w[:, 0] - env.scene.env_origins[:, 0]
-    plate_y = plate.data.root_pos_w[:, 1] - env.scene.env_origins[:, 1]
-    plate_height = plate.data.root_pos_w[:, 2] - env.scene.env_origins[:, 2]
-
-    for orange_cfg in oranges_cfg:
-        orange: RigidObject = env.scene[orange_cfg.name]
-        orange_x = orange.data.root_pos_w[:, 0] - env.scene.env_origins[:, 0]
-        orange_y = orange.data.root_pos_w[:, 1] - env.scene.env_origins[:, 1]
-        orange_height = orange.data.root_pos_w[:, 2] - env.scene.env_origins[:, 2]
-
-        done = torch.logical_and(done, orange_x < plate_x + x_range[1])
-        done = torch.logical_and(done, orange_x > plate_x + x_range[0])
-        done = torch.logical_and(done, orange_y < plate_y + y_range[1])
-        done = torch.logical_and(done, orange_y > plate_y + y_range[0])
-        done = torch.logical_and(done, orange_height < plate_height + height_range[1])
-        done = torch.logical_and(done, orange_height > plate_height + height_range[0])
+    # [num_envs, 1 + num_oranges, 3], the plate first
+    positions = scene_root_positions(env, (plate_cfg.name, *(orange_cfg.name for orange_cfg in oranges_cfg)))
+    done = all_within_box(
+        positions[:, 1:],
+        positions[:, 0],
+        lower=(x_range[0], y_range[0], height_range[0]),
+        upper=(x_range[1], y_range[1], height_range[1]),
+    )
 
     joint_pos = env.scene["robot"].data.joint_pos
     joint_names = env.scene["robot"].data.joint_names
@@ -0,0 +1,188 @@
+import queue
+import threading
+from collections.abc import Iterator
+
+import h5py
+import numpy as np
+import torch
+from isaaclab.utils.datasets import EpisodeData
+
+_END = object()
+
+
+def _load_group(group: h5py.Group, keys: list[str] | None, pin_memory: bool) -> dict:
+    data = {}
+    for key in group:
+        if keys is not None and not any(k == key or k.startswith(f"{key}/") for k in keys):
+            continue
+        if isinstance(group[key], h5py.Group):
+            # a key naming the whole group loads all of it
+            sub_keys = None
+            if keys is not None and key not in keys:
+                sub_keys = [k[len(key) + 1 :] for k in keys if k.startswith(f"{key}/")]
+            data[key] = _load_group(group[key], sub_keys, pin_memory)
+        else:
+            tensor = torch.from_numpy(np.asarray(group[key]))
+            data[key] = tensor.pin_memory() if pin_memory else tensor
+    return data
+
+
+def replay_keys(replay_mode: str) -> list[str]:
+    """Keys of an episode needed to replay it, the observations (e.g. camera frames) are not loaded."""
+    if replay_mode == "state":
+        return ["initial_state", "states/articulation"]
+    return ["initial_state", "actions"]
+
+
+def replay_sequence(episode: EpisodeData, replay_mode: str, task_type: str | None = None) -> torch.Tensor:
+    """
+    The [T, action_dim] sequence applied when replaying the episode: its actions, or its joint positions in
+    "state" mode.
+    """
+    if replay_mode == "state":
+        articulation = episode.data["states"]["articulation"]
+        if task_type == "bi-so101leader":
+            return torch.cat(
+                [articulation["left_arm"]["joint_position"], articulation["right_arm"]["joint_position"]], dim=-1
+            )
+        return articulation["robot"]["joint_position"]
+    return episode.data["actions"]
+
+
+class EpisodePrefetcher:
+    """
+    Loads episodes of an HDF5 dataset in a background thread, so that loading the next episodes overlaps with the
+    replay of the current ones.
+
+    Only `keys` (e.g. "actions", or "states/articulation" for a whole sub-group) are read, into pinned CPU tensors
+    when CUDA is available, so that the device copies can be asynchronous.
+
+    Args:
+        dataset_file: The HDF5 dataset file.
+        episode_names: The names of the episodes to load, in order.
+        keys: The keys to load, None to load everything.
+        num_prefetch: The maximum number of loaded episodes waiting to be consumed.
+        pin_memory: Whether to pin the loaded tensors.
+    """
+
+    def __init__(
+        self,
+        dataset_file: str,
+        episode_names: list[str],
+        keys: list[str] | None = None,
+        num_prefetch: int = 4,
+        pin_memory: bool = True,
+    ):
+        assert num_prefetch >= 1, f"num_prefetch must be >= 1, got {num_prefetch}"
+        self.dataset_file = dataset_file
+        self.episode_names = list(episode_names)
+        self.keys = keys
+        self.pin_memory = pin_memory and torch.cuda.is_available()
+        self._queue = queue.Queue(maxsize=num_prefetch)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._load, name="episode-prefetch", daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _load(self):
+        try:
+            with h5py.File(self.dataset_file, "r") as f:
+                for episode_name in self.episode_names:
+                    h5_episode_group = f["data"][episode_name]
+                    episode = EpisodeData()
+                    episode.data = _load_group(h5_episode_group, self.keys, self.pin_memory)
+                    if "seed" in h5_episode_group.attrs:
+                        episode.seed = h5_episode_group.attrs["seed"]
+                    if "success" in h5_episode_group.attrs:
+                        episode.success = h5_episode_group.attrs["success"]
+                    if not self._put((episode_name, episode)):
+                        return
+        except BaseException as e:
+            self._put(e)
+            return
+        self._put(_END)
+
+    def __iter__(self) -> Iterator[tuple[str, EpisodeData]]:
+        while True:
+            item = self._queue.get()
+            if item is _END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+
+class BatchedEpisodeReplayer:
+    """
+    Replays one sequence per environment in lockstep: `next_actions` returns the next step of every environment in
+    a single [num_envs, action_dim] tensor, and environments whose sequence is over (or that have none) get the
+    idle action. The sequences are kept in a padded device buffer, so a step costs one gather.
+
+    Args:
+        idle_action: The [num_envs, action_dim] actions of the environments without a sequence.
+    """
+
+    def __init__(self, idle_action: torch.Tensor):
+        self.idle_action = idle_action
+        self.num_envs, self.action_dim = idle_action.shape
+        self.device = idle_action.device
+        self._buffer = torch.zeros(self.num_envs, 1, self.action_dim, dtype=idle_action.dtype, device=self.device)
+        self._env_ids = torch.arange(self.num_envs, device=self.device)
+        # kept on the CPU, so that checking which environments are done does not synchronize with the device
+        self._cursors = torch.zeros(self.num_envs, dtype=torch.int64)
+        self._lengths = torch.zeros(self.num_envs, dtype=torch.int64)
+
+    def load(self, env_id: int, sequence: torch.Tensor):
+        """Start replaying `sequence` ([T, action_dim]) in environment `env_id`."""
+        length = sequence.shape[0]
+        if length > self._buffer.shape[1]:
+            # grow geometrically to amortize the reallocations
+            buffer = torch.zeros(
+                self.num_envs,
+                max(length, 2 * self._buffer.shape[1]),
+                self.action_dim,
+                dtype=self._buffer.dtype,
+                device=self.device,
+            )
+            buffer[:, : self._buffer.shape[1]] = self._buffer
+            self._buffer = buffer
+        self._buffer[env_id, :length] = sequence.reshape(length, self.action_dim).to(
+            self.device, dtype=self._buffer.dtype, non_blocking=True
+        )
+        self._cursors[env_id] = 0
+        self._lengths[env_id] = length
+
+    def done_env_ids(self) -> list[int]:
+        """The environments that have no step left to replay."""
+        return (self._cursors >= self._lengths).nonzero().flatten().tolist()
+
+    def next_actions(self) -> torch.Tensor:
+        """The next step of every environment, and advance the environments that are not done."""
+        active = self._cursors < self._lengths
+        index = torch.clamp(self._cursors, max=self._buffer.shape[1] - 1)
+        actions = torch.where(
+            active.to(self.device, non_blocking=True)[:, None],
+            self._buffer[self._env_ids, index.to(self.device, non_blocking=True)],
+            self.idle_action,
+        )
+        self._cursors += active.long()
+        return actions
+
+
+def stack_states(states: list[dict], device: str | torch.device) -> dict:
+    """Concatenate the (nested) states of single environments along the environment dimension, on `device`."""
+    if isinstance(states[0], dict):
+        return {key: stack_states([state[key] for state in states], device) for key in states[0]}
+    return torch.cat(states, dim=0).to(device)
@@ -1,3 +1,6 @@
+import functools
+import math
+
 import numpy as np
 import torch
 from leisaac.assets.robots.lerobot import (
@@ -5,65 +8,84 @@ from leisaac.assets.robots.lerobot import (
     SO101_FOLLOWER_REST_POSE_RANGE,
     SO101_FOLLOWER_USD_JOINT_LIMLITS,
 )
+from leisaac.utils.success_checks import joint_ranges_in_radians, joints_within_ranges
+
+_SO101_REST_POSE_RANGE_ITEMS = tuple((name, tuple(bounds)) for name, bounds in SO101_FOLLOWER_REST_POSE_RANGE.items())
 
 
 def is_so101_at_rest_pose(joint_pos: torch.Tensor, joint_names: list[str]) -> torch.Tensor:
     """
     Check if the robot is in the rest pose.
     """
-    is_reset = torch.ones(joint_pos.shape[0], dtype=torch.bool, device=joint_pos.device)
-    reset_pose_range = SO101_FOLLOWER_REST_POSE_RANGE
-    joint_pos = joint_pos / torch.pi * 180.0  # change to degree
-    for joint_name, (min_pos, max_pos) in reset_pose_range.items():
-        joint_idx = joint_names.index(joint_name)
-        is_reset = torch.logical_and(
-            is_reset, torch.logical_and(joint_pos[:, joint_idx] > min_pos, joint_pos[:, joint_idx] < max_pos)
-        )
-    return is_reset
+    joint_ids, lower, upper = joint_ranges_in_radians(
+        tuple(joint_names), _SO101_REST_POSE_RANGE_ITEMS, joint_pos.device, joint_pos.dtype
+    )
+    return joints_within_ranges(joint_pos, joint_ids, lower, upper)
 
 
-def convert_leisaac_action_to_lerobot(action: torch.Tensor | np.ndarray) -> np.ndarray:
+@functools.lru_cache(maxsize=32)
+def _joint_to_motor_scale_offset(
+    motor_limits: tuple[tuple[float, float], ...], device: torch.device, dtype: torch.dtype
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """Per-joint `scale` and `offset` such that motor value = joint position (radian) * scale + offset."""
+    joint_limits = torch.tensor(list(SO101_FOLLOWER_USD_JOINT_LIMLITS.values()), dtype=torch.float64)
+    motor_limits = torch.tensor(motor_limits, dtype=torch.float64)
+    ratio = (motor_limits[:, 1] - motor_limits[:, 0]) / (joint_limits[:, 1] - joint_limits[:, 0])
+    scale = ratio * 180.0 / math.pi  # radian to degree
+    offset = motor_limits[:, 0] - joint_limits[:, 0] * ratio
+    return scale.to(device=device, dtype=dtype), offset.to(device=device, dtype=dtype)
+
+
+def _scale_offset_for(
+    joint_pos: torch.Tensor, motor_limits: dict[str, tuple[float, float]] | None
+) -> tuple[torch.Tensor, torch.Tensor]:
+    motor_limits = SO101_FOLLOWER_MOTOR_LIMITS if motor_limits is None else motor_limits
+    motor_limits_key = tuple(tuple(motor_limits[joint_name]) for joint_name in SO101_FOLLOWER_USD_JOINT_LIMLITS)
+    return _joint_to_motor_scale_offset(motor_limits_key, joint_pos.device, joint_pos.dtype)
+
+
+def leisaac_joint_pos_to_lerobot(
+    joint_pos: torch.Tensor, motor_limits: dict[str, tuple[float, float]] | None = None
+) -> torch.Tensor:
     """
-    Convert the action from LeIsaac to Lerobot. Just convert value, not include the format.
+    Convert SO101 joint positions from LeIsaac (radian) to LeRobot (normalized motor range).
+
+    Args:
+        joint_pos: Tensor of shape (..., 6 * num_arms), e.g. (num_envs, 6) or (num_envs, T, 12), on any device.
+        motor_limits: Motor limits of each joint, defaults to SO101_FOLLOWER_MOTOR_LIMITS.
     """
-    if isinstance(action, torch.Tensor):
-        action = action.cpu().numpy()
+    if not joint_pos.is_floating_point():
+        joint_pos = joint_pos.float()
+    scale, offset = _scale_offset_for(joint_pos, motor_limits)
+    return (joint_pos.unflatten(-1, (-1, scale.shape[0])) * scale + offset).flatten(-2)
+
 
-    processed_action = np.zeros_like(action)
-    joint_limits = SO101_FOLLOWER_USD_JOINT_LIMLITS
-    motor_limits = SO101_FOLLOWER_MOTOR_LIMITS
-    action = action / torch.pi * 180.0  # convert to degree
+def lerobot_joint_pos_to_leisaac(
+    motor_pos: torch.Tensor, motor_limits: dict[str, tuple[float, float]] | None = None
+) -> torch.Tensor:
+    """
+    Convert SO101 joint positions from LeRobot (normalized motor range) to LeIsaac (radian), the inverse of
+    `leisaac_joint_pos_to_lerobot`.
+    """
+    if not motor_pos.is_floating_point():
+        motor_pos = motor_pos.float()
+    scale, offset = _scale_offset_for(motor_pos, motor_limits)
+    return ((motor_pos.unflatten(-1, (-1, scale.shape[0])) - offset) / scale).flatten(-2)
 
-    for idx, joint_name in enumerate(joint_limits):
-        motor_limit_range = motor_limits[joint_name]
-        joint_limit_range = joint_limits[joint_name]
-        joint_range = joint_limit_range[1] - joint_limit_range[0]
-        motor_range = motor_limit_range[1] - motor_limit_range[0]
-        joint_degree = action[:, idx] - joint_limit_range[0]
-        processed_action[:, idx] = joint_degree / joint_range * motor_range + motor_limit_range[0]
 
-    return processed_action
+def convert_leisaac_action_to_lerobot(action: torch.Tensor | np.ndarray) -> np.ndarray:
+    """
+    Convert the action from LeIsaac to Lerobot. Just convert value, not include the format.
+    """
+    if isinstance(action, np.ndarray):
+        action = torch.from_numpy(action)
+    return leisaac_joint_pos_to_lerobot(action).cpu().numpy()
 
 
 def convert_lerobot_action_to_leisaac(action: torch.Tensor | np.ndarray) -> np.ndarray:
     """
     Convert the action from Lerobot to LeIsaac. Just convert value, not include the format.
     """
-    if isinstance(action, torch.Tensor):
-        action = action.cpu().numpy()
-
-    processed_action = np.zeros_like(action)
-    joint_limits = SO101_FOLLOWER_USD_JOINT_LIMLITS
-    motor_limits = SO101_FOLLOWER_MOTOR_LIMITS
-
-    for idx, joint_name in enumerate(joint_limits):
-        motor_limit_range = motor_limits[joint_name]
-        joint_limit_range = joint_limits[joint_name]
-        motor_range = motor_limit_range[1] - motor_limit_range[0]
-        joint_range = joint_limit_range[1] - joint_limit_range[0]
-        motor_degree = action[:, idx] - motor_limit_range[0]
-        processed_degree = motor_degree / motor_range * joint_range + joint_limit_range[0]
-        processed_radius = processed_degree / 180.0 * torch.pi  # convert to radian
-        processed_action[:, idx] = processed_radius
-
-    return processed_action
+    if isinstance(action, np.ndarray):
+        action = torch.from_numpy(action)
+    return lerobot_joint_pos_to_leisaac(action).cpu().numpy()
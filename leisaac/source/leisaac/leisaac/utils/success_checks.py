@@ -0,0 +1,131 @@
+"""
+Batched success predicates of the task terminations.
+
+Each predicate works on the state of all the environments at once, as [num_envs, num_objects, ...] tensors, and
+returns a [num_envs] (or [num_envs, num_objects]) boolean tensor, so that checking the task success of thousands of
+environments costs a few tensor ops instead of a Python loop over objects and joints.
+
+The predicates only depend on torch, so they can be checked on the CPU against synthetic states without Isaac Sim,
+see test/test_success_checks.py.
+"""
+
+import functools
+import math
+
+import torch
+
+
+def within_box(
+    positions: torch.Tensor,
+    reference_positions: torch.Tensor,
+    lower: tuple[float, ...],
+    upper: tuple[float, ...],
+) -> torch.Tensor:
+    """
+    Whether each position is strictly within [lower, upper] of its reference position.
+
+    Args:
+        positions: The positions of the objects.(num_envs, num_objects, D)
+        reference_positions: The reference positions, shared by the objects of an environment or one per object.
+            (num_envs, D) or (num_envs, num_objects, D)
+        lower: The lower bounds of the offsets, -inf for no bound.(D,)
+        upper: The upper bounds of the offsets, inf for no bound.(D,)
+    Returns:
+        Whether each object is within the box.(num_envs, num_objects)
+    """
+    if reference_positions.dim() == positions.dim() - 1:
+        reference_positions = reference_positions.unsqueeze(1)
+    offsets = positions - reference_positions
+    lower = torch.tensor(lower, dtype=offsets.dtype, device=offsets.device)
+    upper = torch.tensor(upper, dtype=offsets.dtype, device=offsets.device)
+    return torch.logical_and(offsets > lower, offsets < upper).all(dim=-1)
+
+
+def all_within_box(
+    positions: torch.Tensor,
+    reference_positions: torch.Tensor,
+    lower: tuple[float, ...],
+    upper: tuple[float, ...],
+) -> torch.Tensor:
+    """Whether all the objects of each environment are within the box, see `within_box`.(num_envs,)"""
+    if reference_positions.dim() == positions.dim() - 1:
+        reference_positions = reference_positions.unsqueeze(1)
+    offsets = positions - reference_positions
+    lower = torch.tensor(lower, dtype=offsets.dtype, device=offsets.device)
+    upper = torch.tensor(upper, dtype=offsets.dtype, device=offsets.device)
+    if offsets.shape[1] == 0:
+        return torch.ones(offsets.shape[0], dtype=torch.bool, device=offsets.device)
+    # only the extreme offsets of each environment need to be compared with the bounds
+    return torch.logical_and(offsets.amin(dim=1) > lower, offsets.amax(dim=1) < upper).all(dim=-1)
+
+
+def pairs_within_distance(points: torch.Tensor, pairs: list[tuple[int, int]], threshold: float) -> torch.Tensor:
+    """
+    Whether the distance between the points of every pair is below the threshold, per environment.
+
+    Args:
+        points: The points (e.g. cloth keypoints) of each environment.(num_envs, num_points, D)
+        pairs: The indices of the pairs of points.
+        threshold: The maximum distance between the points of a pair.
+    Returns:
+        Whether all the pairs of each environment are close enough.(num_envs,)
+    """
+    first, second = zip(*pairs, strict=True)
+    distances = torch.linalg.vector_norm(points[:, list(first)] - points[:, list(second)], dim=-1)
+    return (distances < threshold).all(dim=-1)
+
+
+def joints_within_ranges(
+    joint_pos: torch.Tensor, joint_ids: torch.Tensor, lower: torch.Tensor, upper: torch.Tensor
+) -> torch.Tensor:
+    """
+    Whether the selected joints are strictly within their ranges.
+
+    Args:
+        joint_pos: The joint positions.(num_envs, num_joints)
+        joint_ids: The indices of the checked joints.(R,)
+        lower: The lower bound of each checked joint.(R,)
+        upper: The upper bound of each checked joint.(R,)
+    Returns:
+        Whether all the checked joints of each environment are within their ranges.(num_envs,)
+    """
+    selected = joint_pos[:, joint_ids]
+    return torch.logical_and(selected > lower, selected < upper).all(dim=-1)
+
+
+@functools.lru_cache(maxsize=32)
+def joint_ranges_in_radians(
+    joint_names: tuple[str, ...],
+    ranges_in_degrees: tuple[tuple[str, tuple[float, float]], ...],
+    device: torch.device,
+    dtype: torch.dtype,
+) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    """
+    Joint indices and bounds, in radians, of ranges given in degrees, computed once per robot and device.
+
+    Args:
+        joint_names: The joint names of the robot.
+        ranges_in_degrees: The (joint name, (min, max)) ranges.
+    Returns:
+        The joint indices, lower bounds and upper bounds, for `joints_within_ranges`.
+    """
+    joint_ids = torch.tensor([joint_names.index(name) for name, _ in ranges_in_degrees], device=device)
+    bounds = torch.tensor([bounds for _, bounds in ranges_in_degrees], dtype=torch.float64) * (math.pi / 180.0)
+    return joint_ids, bounds[:, 0].to(device, dtype), bounds[:, 1].to(device, dtype)
+
+
+def scene_root_positions(env, entity_names: tuple[str, ...]) -> torch.Tensor:
+    """
+    The root positions of scene entities relative to their environment origins.
+
+    The entity handles are resolved once per environment and entity set.
+
+    Returns:
+        The positions.(num_envs, num_entities, 3)
+    """
+    entities_cache = env.__dict__.setdefault("_success_check_entities", {})
+    entities = entities_cache.get(entity_names)
+    if entities is None:
+        entities = entities_cache[entity_names] = [env.scene[name] for name in entity_names]
+    positions = torch.stack([entity.data.root_pos_w for entity in entities], dim=1)
+    return positions - env.scene.env_origins.unsqueeze(1)
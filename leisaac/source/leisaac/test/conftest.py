@@ -0,0 +1,96 @@
+import importlib
+import json
+import os
+import sys
+import types
+
+import pytest
+
+LEISAAC_PACKAGE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "leisaac"))
+
+
+@pytest.fixture
+def leisaac_import(monkeypatch):
+    """
+    Imports a leisaac module without the tasks imported by `leisaac/__init__.py`, which need Isaac Sim, and with
+    placeholder modules given as {module name: {attribute name: value}}.
+    """
+
+    def import_module(name: str, placeholders: dict[str, dict] | None = None):
+        placeholders = placeholders or {}
+        for module_name in placeholders:
+            parts = module_name.split(".")
+            for i in range(1, len(parts) + 1):
+                parent_name = ".".join(parts[:i])
+                if parent_name not in placeholders and parent_name in sys.modules:
+                    continue
+                module = types.ModuleType(parent_name)
+                for key, value in placeholders.get(parent_name, {}).items():
+                    setattr(module, key, value)
+                monkeypatch.setitem(sys.modules, parent_name, module)
+        leisaac = types.ModuleType("leisaac")
+        leisaac.__path__ = [LEISAAC_PACKAGE_DIR]
+        monkeypatch.setitem(sys.modules, "leisaac", leisaac)
+        for module_name in list(sys.modules):
+            if module_name.startswith("leisaac."):
+                monkeypatch.delitem(sys.modules, module_name)
+        return importlib.import_module(name)
+
+    return import_module
+
+
+class EpisodeData:
+    """A placeholder of isaaclab's EpisodeData."""
+
+    def __init__(self, data: dict | None = None, seed=None, success=None):
+        self.data = data or {}
+        self.seed = seed
+        self.success = success
+
+    def is_empty(self) -> bool:
+        return not self.data
+
+
+class HDF5DatasetFileHandler:
+    """A placeholder of isaaclab's HDF5DatasetFileHandler."""
+
+    def __init__(self):
+        self._hdf5_file_stream = None
+        self._hdf5_data_group = None
+        self._demo_count = 0
+        self._env_args = {}
+
+    def add_env_args(self, env_args: dict):
+        self._raise_if_not_initialized()
+        self._env_args.update(env_args)
+        self._hdf5_data_group.attrs["env_args"] = json.dumps(self._env_args)
+
+    @property
+    def demo_count(self) -> int:
+        return self._demo_count
+
+    def close(self):
+        if self._hdf5_file_stream is not None:
+            self._hdf5_file_stream.close()
+            self._hdf5_file_stream = None
+
+    def _raise_if_not_initialized(self):
+        if self._hdf5_file_stream is None:
+            raise RuntimeError("HDF5 dataset file stream is not initialized")
+
+
+@pytest.fixture
+def isaaclab_datasets() -> dict[str, dict]:
+    """The placeholder of the isaaclab.utils.datasets module, for `leisaac_import`."""
+    return {
+        "isaaclab.utils.datasets": {
+            "EpisodeData": EpisodeData,
+            "HDF5DatasetFileHandler": HDF5DatasetFileHandler,
+        }
+    }
+
+
+@pytest.fixture
+def hdf5_datasets(leisaac_import, isaaclab_datasets):
+    """The leisaac.enhance.datasets package, with placeholder isaaclab datasets."""
+    return leisaac_import("leisaac.enhance.datasets", isaaclab_datasets)
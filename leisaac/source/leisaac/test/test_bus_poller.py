@@ -0,0 +1,112 @@
+import importlib.util
+import os
+import time
+
+import numpy as np
+import pytest
+
+BUS_POLLER_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "leisaac", "devices", "lerobot", "bus_poller.py")
+)
+
+
+@pytest.fixture(scope="module")
+def bus_poller():
+    """The bus poller module, loaded from its file since the devices package needs lerobot."""
+    spec = importlib.util.spec_from_file_location("bus_poller", BUS_POLLER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeBus:
+    """A motors bus whose n-th read returns n for all the motors, and fails from the `fail_from`-th read on."""
+
+    def __init__(self, fail_reads: tuple[int, ...] = (), fail_from: int | None = None):
+        self.num_reads = 0
+        self.fail_reads = fail_reads
+        self.fail_from = fail_from
+
+    def sync_read_array(self) -> np.ndarray:
+        self.num_reads += 1
+        if self.num_reads in self.fail_reads or (self.fail_from is not None and self.num_reads >= self.fail_from):
+            raise OSError(f"lost packet {self.num_reads}")
+        return np.full(6, float(self.num_reads))
+
+
+def wait_until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_latest_sample_handoff(bus_poller):
+    bus = FakeBus()
+    poller = bus_poller.BusPoller(bus.sync_read_array, rate_hz=500.0)
+    with pytest.raises(RuntimeError):
+        poller.latest()
+    poller.start()
+    try:
+        # the first sample is read synchronously
+        assert poller.latest().values[0] >= 1
+        wait_until(lambda: poller.latest().values[0] >= 5)
+        previous, latest = poller._samples
+        assert latest.values[0] == previous.values[0] + 1
+        assert previous.timestamp <= latest.timestamp
+        assert poller.age() < 1.0 and not poller.is_stale()
+        interpolated = poller.latest(interpolate=True)
+        assert 1 <= interpolated.values[0] <= poller.latest().values[0]
+    finally:
+        poller.stop()
+
+
+def test_read_errors_are_surfaced(bus_poller):
+    bus = FakeBus(fail_reads=(3,))
+    poller = bus_poller.BusPoller(bus.sync_read_array, rate_hz=500.0)
+    poller.start()
+    try:
+        # a lost packet only skips a sample
+        wait_until(lambda: poller.latest().values[0] >= 5)
+        assert poller.num_errors == 1
+        assert isinstance(poller.last_error, OSError) and str(poller.last_error) == "lost packet 3"
+    finally:
+        poller.stop()
+
+    # persisting failures show up as staleness, and the latest sample is kept
+    bus = FakeBus(fail_from=3)
+    poller = bus_poller.BusPoller(bus.sync_read_array, rate_hz=500.0, stale_timeout=0.05)
+    poller.start()
+    try:
+        wait_until(poller.is_stale)
+        assert poller.latest().values[0] == 2
+        assert poller.num_errors >= 1 and str(poller.last_error).startswith("lost packet")
+    finally:
+        poller.stop()
+
+    # a failure of the first read is raised by start
+    poller = bus_poller.BusPoller(FakeBus(fail_from=1).sync_read_array)
+    with pytest.raises(OSError):
+        poller.start()
+    assert not poller.is_running
+
+
+def test_stop_joins_the_polling_thread(bus_poller):
+    bus = FakeBus()
+    poller = bus_poller.BusPoller(bus.sync_read_array, rate_hz=1000.0)
+    poller.start()
+    thread = poller._thread
+    assert poller.is_running and thread.is_alive()
+    wait_until(lambda: bus.num_reads >= 3)
+
+    poller.stop()
+    assert not thread.is_alive() and not poller.is_running
+    num_reads = bus.num_reads
+    time.sleep(0.02)
+    assert bus.num_reads == num_reads
+    # stopping twice is a no-op, and the poller can be restarted
+    poller.stop()
+    poller.start()
+    assert poller.is_running and poller._thread is not thread
+    poller.stop()
+    assert not poller.is_running
@@ -0,0 +1,127 @@
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+NUM_CLOTHS, NUM_POINTS = 3, 10
+
+
+class SimulationManager:
+    """A placeholder of Isaac Sim's SimulationManager, with a settable physics step count."""
+
+    num_physics_steps = 0
+
+    @classmethod
+    def get_num_physics_steps(cls) -> int:
+        return cls.num_physics_steps
+
+    @classmethod
+    def get_physics_sim_view(cls):
+        return "physics_sim_view"
+
+
+class ClothPrim:
+    """A placeholder of the batched cloth prim view, whose particles move by one at every query."""
+
+    def __init__(self, prim_paths_expr: list[str], name: str):
+        self.prim_paths = prim_paths_expr
+        self.num_queries = 0
+        self.positions = torch.arange(NUM_CLOTHS * NUM_POINTS * 3, dtype=torch.float32).reshape(
+            NUM_CLOTHS, NUM_POINTS, 3
+        )
+
+    def initialize(self, physics_sim_view):
+        assert physics_sim_view == "physics_sim_view"
+
+    def get_world_positions(self, clone: bool = True) -> torch.Tensor:
+        self.num_queries += 1
+        self.positions = self.positions + 1
+        return self.positions.clone() if clone else self.positions
+
+    def get_world_poses(self):
+        return torch.zeros(NUM_CLOTHS, 3), torch.tensor([[1.0, 0.0, 0.0, 0.0]]).repeat(NUM_CLOTHS, 1)
+
+    def set_world_poses(self, positions, quats):
+        pass
+
+
+class SingleClothObject:
+    def __init__(self, prim_path: str, mesh_subfix: str, particle_system_subfix: str):
+        self.prim_path = prim_path
+
+    def initialize(self):
+        pass
+
+
+@pytest.fixture
+def cloth_object(leisaac_import, monkeypatch):
+    """A ClothObject over placeholder cloth prims of three environments, initialized at physics step 0."""
+    monkeypatch.setattr(SimulationManager, "num_physics_steps", 0)
+    prim_paths = [f"/World/envs/env_{i}/Cloth" for i in range(NUM_CLOTHS)]
+    module = leisaac_import(
+        "leisaac.enhance.assets.cloth_object.cloth_object",
+        {
+            "isaaclab.assets": {"AssetBaseCfg": object},
+            "isaaclab.utils": {"configclass": lambda cls: cls},
+            "isaaclab.sim": {"find_matching_prim_paths": lambda prim_path: prim_paths},
+            "isaaclab.scene": {"InteractiveScene": object},
+            "isaacsim.core.prims": {
+                "ClothPrim": ClothPrim,
+                "SingleClothPrim": object,
+                "SingleParticleSystem": object,
+            },
+            "isaacsim.core.simulation_manager": {"SimulationManager": SimulationManager},
+        },
+    )
+    cfg = SimpleNamespace(
+        prim_path="/World/envs/env_.*/Cloth",
+        mesh_subfix="mesh",
+        particle_system_subfix="ParticleSystem",
+        class_type=SingleClothObject,
+    )
+    cloth = module.ClothObject(cfg, scene=None)
+    cloth.initialize()
+    return cloth
+
+
+def test_point_positions_are_queried_once_per_physics_step(cloth_object):
+    view = cloth_object._cloth_view
+    assert view.prim_paths == [f"/World/envs/env_{i}/Cloth/mesh" for i in range(NUM_CLOTHS)]
+    assert cloth_object.num_cloths == NUM_CLOTHS
+    num_queries = view.num_queries
+
+    positions = cloth_object.point_positions
+    assert positions.shape == (NUM_CLOTHS, NUM_POINTS, 3)
+    assert torch.equal(positions, view.positions)
+    assert cloth_object.point_positions is positions
+    assert view.num_queries == num_queries + 1
+
+    SimulationManager.num_physics_steps = 1
+    assert torch.equal(cloth_object.point_positions, view.positions)
+    assert view.num_queries == num_queries + 2
+    # the positions are copied into the same buffer
+    assert cloth_object.point_positions is positions
+
+    # moving the cloths queries the particles again within the step
+    cloth_object.set_world_poses(*cloth_object.get_world_poses())
+    assert torch.equal(cloth_object.point_positions, view.positions)
+    assert view.num_queries == num_queries + 3
+
+
+def test_keypoint_positions(cloth_object):
+    view = cloth_object._cloth_view
+    keypoints = cloth_object.keypoint_positions([7, 0, 3])
+    assert keypoints.shape == (NUM_CLOTHS, 3, 3)
+    assert torch.equal(keypoints, view.positions[:, [7, 0, 3]])
+
+    num_queries = view.num_queries
+    # the keypoints of the same step share the query, and their indices are built once
+    assert torch.equal(cloth_object.keypoint_positions([7, 0, 3]), keypoints)
+    assert torch.equal(cloth_object.keypoint_positions([1]), view.positions[:, [1]])
+    assert view.num_queries == num_queries
+    assert len(cloth_object._keypoint_indices) == 2
+
+    SimulationManager.num_physics_steps = 1
+    assert torch.equal(cloth_object.keypoint_positions([7, 0, 3]), view.positions[:, [7, 0, 3]])
+    assert not torch.equal(cloth_object.keypoint_positions([7, 0, 3]), keypoints)
+    assert view.num_queries == num_queries + 1
@@ -0,0 +1,90 @@
+import json
+
+import h5py
+import numpy as np
+import torch
+
+
+def episode_records(hdf5_datasets, env_id: int, start: int, num_steps: int, success=None):
+    """The records of `num_steps` steps of an environment, with low-dim and camera-like datasets."""
+    steps = torch.arange(start, start + num_steps, dtype=torch.float32)
+    joint_pos = steps[:, None] + env_id * 100 + torch.arange(6) / 10
+    image = ((steps[:, None, None, None] + env_id * 7 + torch.arange(3)) % 256).to(torch.uint8).expand(-1, 16, 16, 3)
+    return hdf5_datasets.hdf5_dataset_file_handler.EpisodeData(
+        data={"actions": joint_pos * 2, "obs": {"joint_pos": joint_pos, "front": image.contiguous()}},
+        seed=42,
+        success=success,
+    )
+
+
+def record(hdf5_datasets, file_path: str, writer_mode: str):
+    """Streams the interleaved episodes of two environments, in several flushes."""
+    handler = hdf5_datasets.StreamingHDF5DatasetFileHandler()
+    handler.writer_mode = writer_mode
+    handler.chunks_length = 2
+    handler.compression = "lzf"
+    handler.expected_episode_length = 4
+    handler.create(file_path, env_name="Test-Env")
+    handler.add_env_args({"num_envs": 2})
+    flushes = {0: [3, 5, 2, 4], 1: [4, 1, 6]}
+    written = {0: 0, 1: 0}
+    for i in range(max(len(steps) for steps in flushes.values())):
+        for env_id, steps in flushes.items():
+            if i >= len(steps):
+                continue
+            last = i == len(steps) - 1
+            episode = episode_records(
+                hdf5_datasets, env_id, written[env_id], steps[i], success=env_id == 0 if last else None
+            )
+            write_mode = hdf5_datasets.StreamWriteMode.LAST if last else hdf5_datasets.StreamWriteMode.APPEND
+            handler.write_episode(episode, write_mode, episode_key=env_id)
+            written[env_id] += steps[i]
+        if i == 1:
+            handler.flush()
+    # an unfinished episode is trimmed on close
+    handler.write_episode(episode_records(hdf5_datasets, 0, 0, 3), hdf5_datasets.StreamWriteMode.APPEND, episode_key=0)
+    handler.close()
+    return written
+
+
+def read_file(file_path: str) -> dict:
+    """The attributes and datasets of a dataset file, by path."""
+    contents = {}
+
+    def visit(name, obj):
+        contents[name] = obj[()] if isinstance(obj, h5py.Dataset) else None
+        contents[f"{name}@attrs"] = {key: np.asarray(value).tolist() for key, value in obj.attrs.items()}
+
+    with h5py.File(file_path, "r") as f:
+        f.visititems(visit)
+    return contents
+
+
+def test_process_writer_matches_thread_writer(hdf5_datasets, tmp_path, monkeypatch):
+    # small shared memory blocks, so that the flushes are split over blocks which are handed back and reused
+    monkeypatch.setattr(
+        hdf5_datasets.StreamingHDF5DatasetFileHandler.SharedMemoryProcessWriter.__init__, "__defaults__", (2, 4096)
+    )
+    written = record(hdf5_datasets, str(tmp_path / "thread.hdf5"), "thread")
+    record(hdf5_datasets, str(tmp_path / "process.hdf5"), "process")
+
+    expected = read_file(str(tmp_path / "thread.hdf5"))
+    actual = read_file(str(tmp_path / "process.hdf5"))
+    assert expected.keys() == actual.keys()
+    for key, value in expected.items():
+        if isinstance(value, np.ndarray):
+            assert value.dtype == actual[key].dtype, key
+            np.testing.assert_array_equal(actual[key], value, err_msg=key)
+        else:
+            assert actual[key] == value, key
+
+    # the finished episodes, then the unfinished one
+    assert expected["data@attrs"]["total"] == sum(written.values())
+    assert json.loads(expected["data@attrs"]["env_args"]) == {"env_name": "Test-Env", "type": 2, "num_envs": 2}
+    assert expected["data/demo_0@attrs"] == {"num_samples": written[0], "seed": 42, "success": True}
+    assert expected["data/demo_0/obs/front"].shape == (written[0], 16, 16, 3)
+    assert expected["data/demo_1/actions"].shape == (written[1], 6)
+    assert expected["data/demo_2/actions"].shape == (3, 6)
+    np.testing.assert_array_equal(
+        expected["data/demo_0/obs/joint_pos"], episode_records(hdf5_datasets, 0, 0, written[0]).data["obs"]["joint_pos"]
+    )
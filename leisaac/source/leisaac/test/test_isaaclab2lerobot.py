@@ -0,0 +1,55 @@
+import importlib
+import os
+import sys
+import types
+
+import numpy as np
+import pytest
+
+LEISAAC_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+CONVERT_DIR = os.path.join(LEISAAC_ROOT, "scripts", "convert")
+
+
+@pytest.fixture
+def isaaclab2lerobot(monkeypatch):
+    """The converter module, with a placeholder lerobot when it is not installed."""
+    if importlib.util.find_spec("lerobot") is None:
+        lerobot_dataset = types.ModuleType("lerobot.datasets.lerobot_dataset")
+        lerobot_dataset.LeRobotDataset = object
+        monkeypatch.setitem(sys.modules, "lerobot", types.ModuleType("lerobot"))
+        monkeypatch.setitem(sys.modules, "lerobot.datasets", types.ModuleType("lerobot.datasets"))
+        monkeypatch.setitem(sys.modules, "lerobot.datasets.lerobot_dataset", lerobot_dataset)
+    monkeypatch.syspath_prepend(CONVERT_DIR)
+    monkeypatch.delitem(sys.modules, "isaaclab2lerobot", raising=False)
+    return importlib.import_module("isaaclab2lerobot")
+
+
+def reference_preprocess_joint_pos(module, joint_pos: np.ndarray) -> np.ndarray:
+    """The per-joint loop of the original single-arm conversion."""
+    joint_pos = joint_pos / np.pi * 180
+    for i in range(6):
+        isaaclab_min, isaaclab_max = module.ISAACLAB_JOINT_POS_LIMIT_RANGE[i]
+        lerobot_min, lerobot_max = module.LEROBOT_JOINT_POS_LIMIT_RANGE[i]
+        isaac_range = isaaclab_max - isaaclab_min
+        lerobot_range = lerobot_max - lerobot_min
+        joint_pos[:, i] = (joint_pos[:, i] - isaaclab_min) / isaac_range * lerobot_range + lerobot_min
+    return joint_pos
+
+
+def test_preprocess_single_arm(isaaclab2lerobot):
+    joint_pos = np.random.default_rng(0).uniform(-2, 2, (20, 6)).astype(np.float32)
+    processed = isaaclab2lerobot.preprocess_joint_pos(joint_pos)
+    assert processed.shape == (20, 6) and processed.dtype == np.float32
+    np.testing.assert_allclose(
+        processed, reference_preprocess_joint_pos(isaaclab2lerobot, joint_pos), rtol=1e-5, atol=1e-4
+    )
+
+
+def test_preprocess_bi_arm(isaaclab2lerobot):
+    # the actions of bi_so101_follower are (N, 12), the left arm then the right arm
+    joint_pos = np.random.default_rng(1).uniform(-2, 2, (20, 12)).astype(np.float32)
+    processed = isaaclab2lerobot.preprocess_joint_pos(joint_pos)
+    assert processed.shape == (20, 12) and processed.dtype == np.float32
+    for arm in (slice(0, 6), slice(6, 12)):
+        expected = reference_preprocess_joint_pos(isaaclab2lerobot, joint_pos[:, arm])
+        np.testing.assert_allclose(processed[:, arm], expected, rtol=1e-5, atol=1e-4)
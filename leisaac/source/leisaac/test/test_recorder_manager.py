@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+
+class RecorderManager:
+    """A placeholder of isaaclab's RecorderManager with one active term."""
+
+    active_terms = ["term"]
+
+    def __init__(self, cfg, env):
+        self.cfg = cfg
+        self._env = env
+        self._episodes = {}
+        self._dataset_file_handler = None
+        self._exported_successful_episode_count = {}
+        self._exported_failed_episode_count = {}
+
+    def record_pre_step(self):
+        pass
+
+
+class Episode:
+    seed = None
+    success = False
+
+    def __init__(self):
+        self._data = {}
+
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+
+    def is_empty(self):
+        return False
+
+    def pre_export(self):
+        pass
+
+
+class DatasetFileHandler:
+    def __init__(self, env):
+        self._env = env
+        self.flushes = {}
+
+    def write_episode(self, episode, write_mode, episode_key):
+        self.flushes.setdefault(episode_key, []).append(self._env.step)
+
+
+@pytest.fixture
+def recorder_manager(leisaac_import):
+    """The recorder manager module, with placeholder isaaclab modules."""
+    return leisaac_import(
+        "leisaac.enhance.managers.recorder_manager",
+        {
+            "isaaclab": {"__version__": "0.47.1"},
+            "isaaclab.envs": {"ManagerBasedEnv": object},
+            "isaaclab.managers": {
+                "DatasetExportMode": SimpleNamespace(EXPORT_ALL=1),
+                "RecorderManager": RecorderManager,
+            },
+            "isaaclab.utils.datasets": {"EpisodeData": Episode, "HDF5DatasetFileHandler": object},
+        },
+    )
+
+
+def test_per_env_flush_cadence(recorder_manager):
+    env = SimpleNamespace(num_envs=4, step=0, cfg=SimpleNamespace(seed=None))
+    cfg = SimpleNamespace(dataset_export_mode=1)
+    manager = recorder_manager.StreamingRecorderManager(cfg, env)
+    manager._dataset_file_handler = DatasetFileHandler(env)
+    manager._episodes = {env_id: Episode() for env_id in range(env.num_envs)}
+    manager.flush_steps = 4
+
+    for env.step in range(1, 13):
+        manager.record_pre_step()
+
+    # the first flushes are staggered over the environments, then every environment flushes every 4 steps
+    assert manager._dataset_file_handler.flushes == {
+        0: [4, 8, 12],
+        1: [3, 7, 11],
+        2: [2, 6, 10],
+        3: [1, 5, 9],
+    }
+    assert torch.equal(manager._env_steps_record, torch.tensor([0.0, 1.0, 2.0, 3.0]))
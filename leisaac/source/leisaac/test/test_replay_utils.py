@@ -0,0 +1,99 @@
+import h5py
+import numpy as np
+import pytest
+import torch
+
+EPISODE_LENGTHS = {"demo_0": 5, "demo_1": 2, "demo_2": 3}
+
+
+@pytest.fixture
+def replay_utils(leisaac_import, isaaclab_datasets):
+    return leisaac_import("leisaac.utils.replay_utils", isaaclab_datasets)
+
+
+def episode_actions(episode_index: int, length: int) -> np.ndarray:
+    return np.arange(length * 2, dtype=np.float32).reshape(length, 2) + 100 * episode_index
+
+
+@pytest.fixture
+def dataset_file(tmp_path) -> str:
+    """A dataset of episodes of unequal lengths, with actions, initial states and camera observations."""
+    file_path = str(tmp_path / "dataset.hdf5")
+    with h5py.File(file_path, "w") as f:
+        for i, (name, length) in enumerate(EPISODE_LENGTHS.items()):
+            group = f.create_group(f"data/{name}")
+            group.attrs["seed"] = i
+            group.attrs["success"] = i != 1
+            group["actions"] = episode_actions(i, length)
+            group["initial_state/articulation/robot/joint_position"] = np.full((1, 2), i, dtype=np.float32)
+            group["obs/front"] = np.zeros((length, 4, 4, 3), dtype=np.uint8)
+    return file_path
+
+
+def test_prefetcher_loads_the_episodes_in_order(replay_utils, dataset_file):
+    names = ["demo_2", "demo_0", "demo_1"]
+    prefetcher = replay_utils.EpisodePrefetcher(
+        dataset_file, names, keys=replay_utils.replay_keys("action"), num_prefetch=1
+    )
+    episodes = list(prefetcher)
+    prefetcher.close()
+    assert not prefetcher._thread.is_alive()
+
+    assert [name for name, _ in episodes] == names
+    for name, episode in episodes:
+        i = int(name.split("_")[1])
+        # the observations are not loaded
+        assert episode.data.keys() == {"actions", "initial_state"}
+        np.testing.assert_array_equal(episode.data["actions"].numpy(), episode_actions(i, EPISODE_LENGTHS[name]))
+        assert episode.data["initial_state"]["articulation"]["robot"]["joint_position"][0, 0] == i
+        assert episode.seed == i and episode.success == (i != 1)
+
+
+def test_prefetcher_shuts_down_cleanly(replay_utils, dataset_file):
+    # the loading thread waits on the full queue, and stops when the prefetcher is closed
+    prefetcher = replay_utils.EpisodePrefetcher(dataset_file, list(EPISODE_LENGTHS), num_prefetch=1)
+    iterator = iter(prefetcher)
+    assert next(iterator)[0] == "demo_0"
+    prefetcher.close()
+    assert not prefetcher._thread.is_alive()
+
+    # a loading error is raised by the iteration
+    prefetcher = replay_utils.EpisodePrefetcher(dataset_file, ["demo_0", "missing"])
+    with pytest.raises(KeyError):
+        list(prefetcher)
+    prefetcher.close()
+    assert not prefetcher._thread.is_alive()
+
+
+def test_batched_replayer_pads_and_terminates(replay_utils):
+    idle_action = torch.full((3, 2), -1.0)
+    replayer = replay_utils.BatchedEpisodeReplayer(idle_action)
+    # environment 2 has no sequence
+    assert replayer.done_env_ids() == [0, 1, 2]
+    replayer.load(0, torch.from_numpy(episode_actions(0, 5)))
+    replayer.load(1, torch.from_numpy(episode_actions(1, 2)))
+    assert replayer.done_env_ids() == [2]
+
+    done_env_ids = []
+    actions = []
+    for _ in range(6):
+        actions.append(replayer.next_actions())
+        done_env_ids.append(replayer.done_env_ids())
+    actions = torch.stack(actions)
+
+    # the environments whose sequence is over get the idle action
+    np.testing.assert_array_equal(actions[:5, 0].numpy(), episode_actions(0, 5))
+    np.testing.assert_array_equal(actions[:2, 1].numpy(), episode_actions(1, 2))
+    assert torch.equal(actions[5, 0], idle_action[0])
+    assert torch.equal(actions[2:, 1], idle_action[1].expand(4, 2))
+    assert torch.equal(actions[:, 2], idle_action[2].expand(6, 2))
+    assert done_env_ids == [[2], [1, 2], [1, 2], [1, 2], [0, 1, 2], [0, 1, 2]]
+
+    # a longer sequence grows the buffer, and restarts its environment without touching the others
+    replayer.load(1, torch.from_numpy(episode_actions(2, 12)))
+    replayer.load(0, torch.from_numpy(episode_actions(0, 1)))
+    assert replayer.done_env_ids() == [2]
+    np.testing.assert_array_equal(
+        replayer.next_actions()[:2].numpy(), np.stack([episode_actions(0, 1)[0], episode_actions(2, 12)[0]])
+    )
+    assert replayer.done_env_ids() == [0, 2]
@@ -0,0 +1,103 @@
+import importlib.util
+import os
+
+import cv2
+import numpy as np
+import pytest
+import torch
+import torch.nn.functional as F
+
+RGB_OVERLAY_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "leisaac", "enhance", "envs", "rgb_overlay.py")
+)
+
+CAMERA_SIZE = (64, 48)
+
+
+@pytest.fixture(scope="module")
+def rgb_overlay():
+    """The rgb overlay module, loaded from its file since the leisaac package needs Isaac Lab."""
+    spec = importlib.util.spec_from_file_location("rgb_overlay", RGB_OVERLAY_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_image(path, seed: int, size=(80, 60)) -> str:
+    image = np.random.default_rng(seed).integers(0, 256, (size[1], size[0], 3), dtype=np.uint8)
+    cv2.imwrite(str(path), image)
+    return str(path)
+
+
+def reference_overlay_image(path: str, target_size: tuple[int, int]) -> torch.Tensor:
+    """The overlay image read of the original digital twin environment.(H, W, C)"""
+    image = torch.from_numpy(cv2.cvtColor(cv2.imread(path), cv2.COLOR_BGR2RGB)).permute(2, 0, 1)
+    return F.interpolate(image.unsqueeze(0), size=(target_size[1], target_size[0]), mode="bilinear")[0].permute(1, 2, 0)
+
+
+def reference_blend(back_image, fore_image, back_mask, fore_mask, back_alpha, fore_alpha):
+    """The float blend of the original `overlay_image` observation."""
+    image = back_alpha * back_image * back_mask + fore_alpha * fore_image * fore_mask
+    return torch.clamp(image, 0.0, 255.0).to(torch.uint8)
+
+
+def sim_images(num_envs: int, size=CAMERA_SIZE) -> torch.Tensor:
+    generator = torch.Generator().manual_seed(1)
+    return torch.randint(0, 256, (num_envs, size[1], size[0], 3), dtype=torch.uint8, generator=generator)
+
+
+def test_read_overlay_image(rgb_overlay, tmp_path):
+    path = write_image(tmp_path / "overlay.png", seed=0)
+    assert torch.equal(rgb_overlay.read_overlay_image(path, CAMERA_SIZE), reference_overlay_image(path, CAMERA_SIZE))
+    with pytest.raises(FileNotFoundError):
+        rgb_overlay.read_overlay_image(str(tmp_path / "missing.png"), CAMERA_SIZE)
+
+
+def test_background_and_debug_match_the_float_blend(rgb_overlay, tmp_path):
+    path = write_image(tmp_path / "overlay.png", seed=0)
+    overlay = reference_overlay_image(path, CAMERA_SIZE).unsqueeze(0)
+    images = sim_images(num_envs=3)
+    masks = torch.rand(3, CAMERA_SIZE[1], CAMERA_SIZE[0], 1, generator=torch.Generator().manual_seed(2)) > 0.5
+
+    background = rgb_overlay.RGBOverlayCompositor(path, CAMERA_SIZE, num_envs=3, device="cpu", mode="background")
+    expected = reference_blend(overlay, images, torch.logical_not(masks), masks, 1.0, 1.0)
+    assert torch.equal(background(images, masks), expected)
+    with pytest.raises(ValueError):
+        background(images)
+
+    debug = rgb_overlay.RGBOverlayCompositor(path, CAMERA_SIZE, num_envs=3, device="cpu", mode="debug")
+    assert torch.equal(debug(images), reference_blend(overlay, images, 1, 1, 0.5, 0.5))
+
+    none = rgb_overlay.RGBOverlayCompositor(path, CAMERA_SIZE, num_envs=3, device="cpu", mode=None)
+    result = none(images)
+    assert torch.equal(result, images) and result.data_ptr() != images.data_ptr()
+
+
+def test_output_size(rgb_overlay, tmp_path):
+    path = write_image(tmp_path / "overlay.png", seed=0)
+    output_size = (32, 24)
+    compositor = rgb_overlay.RGBOverlayCompositor(
+        path, CAMERA_SIZE, num_envs=2, device="cpu", mode="background", output_size=output_size
+    )
+    images = sim_images(num_envs=2)
+    masks = torch.zeros(2, CAMERA_SIZE[1], CAMERA_SIZE[0], 1, dtype=torch.bool)
+    # the left half of the images is foreground
+    masks[:, :, : CAMERA_SIZE[0] // 2] = True
+
+    result = compositor(images, masks)
+    assert result.shape == (2, output_size[1], output_size[0], 3) and result.dtype == torch.uint8
+    resized_images = rgb_overlay.resize_images(images.permute(0, 3, 1, 2), output_size).permute(0, 2, 3, 1)
+    overlay = reference_overlay_image(path, output_size)
+    assert torch.equal(result[:, :, : output_size[0] // 2], resized_images[:, :, : output_size[0] // 2])
+    assert torch.equal(result[:, :, output_size[0] // 2 :], overlay[:, output_size[0] // 2 :].expand(2, -1, -1, -1))
+
+
+def test_overlay_images_are_assigned_in_turn(rgb_overlay, tmp_path):
+    paths = [write_image(tmp_path / f"overlay_{i}.png", seed=i) for i in range(2)]
+    compositor = rgb_overlay.RGBOverlayCompositor(paths, CAMERA_SIZE, num_envs=5, device="cpu", mode="background")
+    assert compositor.overlay_images.shape == (5, CAMERA_SIZE[1], CAMERA_SIZE[0], 3)
+
+    images = sim_images(num_envs=5)
+    result = compositor(images, torch.zeros(5, CAMERA_SIZE[1], CAMERA_SIZE[0], 1, dtype=torch.bool))
+    for env_id in range(5):
+        assert torch.equal(result[env_id], reference_overlay_image(paths[env_id % 2], CAMERA_SIZE))
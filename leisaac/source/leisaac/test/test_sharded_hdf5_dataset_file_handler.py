@@ -0,0 +1,30 @@
+import os
+
+import h5py
+import numpy as np
+import pytest
+import torch
+
+
+@pytest.mark.parametrize("merge_mode", ["link", "copy"])
+def test_merge_follows_the_shard_ids(hdf5_datasets, tmp_path, merge_mode):
+    num_shards = 12
+    file_path = str(tmp_path / "dataset.hdf5")
+    handler = hdf5_datasets.ShardedHDF5DatasetFileHandler()
+    handler.num_shards = num_shards
+    handler.merge_mode = merge_mode
+    handler.create(file_path)
+    EpisodeData = hdf5_datasets.hdf5_dataset_file_handler.EpisodeData
+    # environment i goes to shard i
+    for env_id in range(num_shards):
+        episode = EpisodeData(data={"actions": torch.full((env_id + 1, 2), float(env_id))}, success=True)
+        handler.write_episode(episode, hdf5_datasets.StreamWriteMode.LAST, episode_key=env_id)
+    handler.close()
+
+    shard_paths = hdf5_datasets.sharded_hdf5_dataset_file_handler.shard_paths_of(file_path)
+    assert [os.path.basename(path) for path in shard_paths] == [f"shard_{i}.hdf5" for i in range(num_shards)]
+    with h5py.File(file_path, "r") as f:
+        assert f["data"].attrs["num_shards"] == num_shards
+        assert f["data"].attrs["total"] == sum(range(1, num_shards + 1))
+        for env_id in range(num_shards):
+            np.testing.assert_array_equal(f[f"data/demo_{env_id}/actions"][()], np.full((env_id + 1, 2), env_id))
@@ -0,0 +1,96 @@
+import importlib.util
+import os
+
+import pytest
+import torch
+
+SUCCESS_CHECKS_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "leisaac", "utils", "success_checks.py")
+)
+
+LOWER, UPPER = (-0.10, -0.10, -0.07), (0.10, 0.10, 0.07)
+JOINT_NAMES = ("shoulder_pan", "shoulder_lift", "elbow_flex", "wrist_flex", "wrist_roll", "gripper")
+REST_RANGES = (
+    ("shoulder_pan", (-30.0, 30.0)),
+    ("shoulder_lift", (-130.0, -70.0)),
+    ("elbow_flex", (60.0, 120.0)),
+    ("wrist_flex", (20.0, 80.0)),
+    ("wrist_roll", (-30.0, 30.0)),
+    ("gripper", (-40.0, 20.0)),
+)
+
+
+@pytest.fixture(scope="module")
+def success_checks():
+    """The success checks module, loaded from its file since the leisaac package needs Isaac Lab."""
+    spec = importlib.util.spec_from_file_location("success_checks", SUCCESS_CHECKS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def reference_within_box(positions, reference_positions, lower, upper):
+    """The per-object and per-axis loop of the original terminations."""
+    done = torch.ones(positions.shape[0], dtype=torch.bool)
+    for i in range(positions.shape[1]):
+        for axis in range(positions.shape[2]):
+            done = torch.logical_and(done, positions[:, i, axis] < reference_positions[:, axis] + upper[axis])
+            done = torch.logical_and(done, positions[:, i, axis] > reference_positions[:, axis] + lower[axis])
+    return done
+
+
+def reference_joints_within_ranges(joint_pos, joint_names, ranges_in_degrees):
+    """The per-joint loop, in degrees, of the original rest pose check."""
+    done = torch.ones(joint_pos.shape[0], dtype=torch.bool)
+    joint_pos = joint_pos / torch.pi * 180.0
+    for name, (min_pos, max_pos) in ranges_in_degrees:
+        idx = joint_names.index(name)
+        done = torch.logical_and(done, torch.logical_and(joint_pos[:, idx] > min_pos, joint_pos[:, idx] < max_pos))
+    return done
+
+
+@pytest.mark.parametrize("num_envs", [1024, 16384])
+@pytest.mark.parametrize("num_objects", [3, 16])
+def test_all_within_box(success_checks, num_envs, num_objects):
+    torch.manual_seed(0)
+    plate = torch.rand(num_envs, 3)
+    # about half of the objects of each environment are within the box
+    objects = plate.unsqueeze(1) + (torch.rand(num_envs, num_objects, 3) - 0.5) * 0.3
+    objects[: num_envs // 2] = plate[: num_envs // 2].unsqueeze(1) + 0.05 * torch.rand(num_envs // 2, 1, 3)
+
+    batched = success_checks.all_within_box(objects, plate, LOWER, UPPER)
+    assert batched.any()
+    assert torch.equal(batched, reference_within_box(objects, plate, LOWER, UPPER))
+    assert torch.equal(batched, success_checks.within_box(objects, plate, LOWER, UPPER).all(dim=-1))
+
+
+def test_all_within_box_without_objects(success_checks):
+    assert success_checks.all_within_box(torch.zeros(4, 0, 3), torch.zeros(4, 3), LOWER, UPPER).all()
+
+
+@pytest.mark.parametrize("num_envs", [1024, 16384])
+def test_joints_within_ranges(success_checks, num_envs):
+    torch.manual_seed(0)
+    rest_pose = torch.deg2rad(torch.tensor([0.0, -100.0, 90.0, 50.0, 0.0, -10.0]))
+    joint_pos = rest_pose + 0.6 * (torch.rand(num_envs, 6) - 0.5)
+
+    ids, low, high = success_checks.joint_ranges_in_radians(
+        JOINT_NAMES, REST_RANGES, torch.device("cpu"), joint_pos.dtype
+    )
+    batched = success_checks.joints_within_ranges(joint_pos, ids, low, high)
+    reference = reference_joints_within_ranges(joint_pos, list(JOINT_NAMES), REST_RANGES)
+    # degrees and radians may only disagree within rounding of the bounds
+    assert int((batched != reference).sum()) <= num_envs * 1e-4
+
+
+@pytest.mark.parametrize("num_envs", [1024, 16384])
+def test_pairs_within_distance(success_checks, num_envs):
+    torch.manual_seed(0)
+    pairs = [(0, 4), (3, 1), (2, 1), (5, 4)]
+    keypoints = torch.rand(num_envs, 6, 3) * 0.2
+
+    batched = success_checks.pairs_within_distance(keypoints, pairs, 0.10)
+    reference = torch.ones(num_envs, dtype=torch.bool)
+    for a, b in pairs:
+        reference &= torch.norm(keypoints[:, a] - keypoints[:, b], dim=-1) < 0.10
+    assert torch.equal(batched, reference)